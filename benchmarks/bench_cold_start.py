@@ -0,0 +1,90 @@
+"""Бенчмарк холодного старта: время от запуска процесса до первого предсказания."""
+
+import argparse
+import logging
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# Целевое время до первого предсказания из ADR-002
+TARGET_SECONDS = 5.0
+
+# Пакеты, время импорта которых выводится в профиле
+PROFILED_PACKAGES = ("torch", "sklearn", "transformers", "sentence_transformers")
+
+
+def import_profile(module: str = "categoraize.models.classifier") -> dict[str, float]:
+    """
+    Профиль импорта модуля в отдельном процессе (python -X importtime).
+
+    Args:
+        module: Импортируемый модуль
+
+    Returns:
+        Словарь {пакет: накопленное время импорта в секундах}; время пакета
+        включает вложенные импорты, которые он выполнил первым
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if name in (*PROFILED_PACKAGES, module) and cumulative.strip().isdigit():
+            profile[name] = int(cumulative) / 1e6
+    return profile
+
+
+def main() -> None:
+    """Запуск бенчмарка. Запускайте в отдельном процессе, чтобы учесть импорт."""
+    parser = argparse.ArgumentParser(description="Бенчмарк холодного старта модели")
+    parser.add_argument("model_path", type=str, help="Путь к сохраненной модели")
+    parser.add_argument(
+        "--title", default="Пятёрочка хлеб молоко", help="Название для предсказания"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    start = time.perf_counter()
+    from categoraize.models.classifier import ProductCategoryClassifier
+
+    imported = time.perf_counter()
+    model = ProductCategoryClassifier.from_pretrained(args.model_path)
+    loaded = time.perf_counter()
+    prediction = model.predict([args.title])
+    first_prediction = time.perf_counter()
+    model.predict([args.title + " 2"])
+    second_prediction = time.perf_counter()
+
+    total = first_prediction - start
+    logger.info(f"Импорт пакета:          {imported - start:.2f} с")
+    logger.info(f"from_pretrained:        {loaded - imported:.2f} с")
+    logger.info(
+        f"Первое предсказание:    {first_prediction - loaded:.2f} с (включая загрузку эмбеддера)"
+    )
+    logger.info(f"Второе предсказание:    {(second_prediction - first_prediction) * 1000:.1f} мс")
+    logger.info(f"Итого до предсказания:  {total:.2f} с (цель ADR <= {TARGET_SECONDS:.0f} с)")
+    logger.info(f"Предсказание: {prediction[0]}")
+
+    profile = import_profile()
+    logger.info("Профиль импорта (python -X importtime, с вложенными импортами):")
+    for name, seconds in sorted(profile.items(), key=lambda item: -item[1]):
+        logger.info(f"  {name:32s} {seconds:5.2f} с")
+    if total > TARGET_SECONDS:
+        logger.warning(
+            f"Время холодного старта превышает целевое на {total - TARGET_SECONDS:.2f} с; "
+            f"импорт пакета - {imported - start:.2f} с из {total:.2f} с"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Бенчмарк загрузки датасета: форматы CSV, Parquet, Arrow IPC и Feather, целиком и чанками."""
+
+import argparse
+import logging
+import multiprocessing
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from categoraize.data.loader import DEFAULT_CHUNK_SIZE, DataLoader
+
+logger = logging.getLogger(__name__)
+
+
+def make_dataset(path: Path, rows: int, categories: int) -> pd.DataFrame:
+    """Синтетический датасет: название, категория и лишние колонки, как в сырых выгрузках."""
+    rng = np.random.default_rng(42)
+    words = np.array(["phone", "laptop", "case", "charger", "pro", "max", "mini", "air", "ultra"])
+    titles = [" ".join(rng.choice(words, size=6)) + f" {idx}" for idx in range(rows)]
+    df = pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "title": titles,
+            "description": [title * 4 for title in titles],
+            "price": rng.uniform(1, 1000, size=rows).round(2),
+            "category": [f"category_{idx}" for idx in rng.integers(0, categories, size=rows)],
+        }
+    )
+    df.to_csv(path, index=False)
+    return df
+
+
+def load_all_columns(path: Path, _chunk_size: int) -> pd.DataFrame:
+    """Прежний путь: чтение всех колонок CSV и копия нужных."""
+    df = pd.read_csv(path).rename(columns={"title": "product_title"})
+    return df[["product_title", "category"]].copy()
+
+
+def load_full(path: Path, _chunk_size: int) -> pd.DataFrame:
+    """Загрузка целиком через DataLoader."""
+    return DataLoader(path.parent).load_kaggle_dataset(path.name)
+
+
+def load_chunked(path: Path, chunk_size: int) -> pd.DataFrame:
+    """Потоковая загрузка через DataLoader с накоплением чанков."""
+    chunks = DataLoader(path.parent).iter_kaggle_dataset(path.name, chunk_size=chunk_size)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def status_kb(field: str) -> int:
+    """Поле /proc/self/status в КБ (VmRSS - текущая память, VmHWM - пиковая)."""
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith(f"{field}:"):
+            return int(line.split()[1])
+    return 0
+
+
+def measure(
+    func: Callable[[Path, int], pd.DataFrame],
+    path: Path,
+    chunk_size: int,
+    queue: multiprocessing.Queue,
+) -> None:
+    """
+    Замер в отдельном процессе: время, прирост пикового RSS и память результата.
+
+    Пиковый RSS учитывает и буферы парсера CSV, и пул памяти Arrow, которые
+    не видны tracemalloc. Счетчик пика сбрасывается через /proc/self/clear_refs.
+    """
+    Path("/proc/self/clear_refs").write_text("5")
+    before = status_kb("VmRSS")
+    start = time.perf_counter()
+    df = func(path, chunk_size)
+    seconds = time.perf_counter() - start
+    peak_mb = (status_kb("VmHWM") - before) / 1024
+    result_mb = df.memory_usage(deep=True).sum() / 2**20
+    queue.put((len(df), seconds, peak_mb, result_mb, str(df["product_title"].dtype)))
+
+
+def write_columnar(df: pd.DataFrame, directory: Path) -> dict[str, Path]:
+    """Запись датасета в Parquet, Arrow IPC и Feather (если установлен pyarrow)."""
+    try:
+        import pyarrow as pa
+        from pyarrow import feather, parquet
+    except ImportError:
+        logger.warning("pyarrow не установлен, колоночные форматы пропущены")
+        return {}
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    paths = {
+        "Parquet": directory / "product_titles.parquet",
+        "Feather": directory / "product_titles.feather",
+        "Arrow IPC": directory / "product_titles.arrow",
+    }
+    parquet.write_table(table, paths["Parquet"])
+    feather.write_feather(table, paths["Feather"])
+    with (
+        pa.OSFile(str(paths["Arrow IPC"]), "wb") as sink,
+        pa.ipc.new_file(sink, table.schema) as writer,
+    ):
+        writer.write_table(table)
+    return paths
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    parser = argparse.ArgumentParser(description="Бенчмарк загрузки датасета")
+    parser.add_argument("--rows", type=int, default=500_000, help="Число строк датасета")
+    parser.add_argument("--categories", type=int, default=5692, help="Число категорий")
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Число строк в чанке"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "product_titles.csv"
+        columnar = write_columnar(make_dataset(csv_path, args.rows, args.categories), Path(tmp))
+
+        cases: list[tuple[str, Callable[[Path, int], pd.DataFrame], Path]] = [
+            ("CSV, все колонки", load_all_columns, csv_path),
+            ("CSV", load_full, csv_path),
+            ("CSV, чанками", load_chunked, csv_path),
+        ]
+        for name, path in columnar.items():
+            cases.append((name, load_full, path))
+            cases.append((f"{name}, чанками", load_chunked, path))
+
+        logger.info(f"Датасет: {args.rows} строк, {args.categories} категорий")
+        for name, func, path in cases:
+            queue: multiprocessing.Queue = context.Queue()
+            process = context.Process(target=measure, args=(func, path, args.chunk_size, queue))
+            process.start()
+            rows, seconds, peak_mb, result_mb, dtype = queue.get()
+            process.join()
+            logger.info(
+                f"{name:20s}: файл {path.stat().st_size / 2**20:5.0f} МБ, {rows} строк за "
+                f"{seconds:5.2f} с, пик памяти +{peak_mb:5.0f} МБ, "
+                f"результат {result_mb:5.0f} МБ ({dtype})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Бенчмарк кодирования продуктов: настройки эмбеддера по умолчанию против
+обрезки по max_seq_length и батчей по бюджету токенов.
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from categoraize.models.classifier import ProductCategoryClassifier
+
+logger = logging.getLogger(__name__)
+
+SHORT_TITLES = ["Пятёрочка", "хлеб", "молоко 3.2%", "кофе", "Яндекс Go", "АЗС Лукойл"]
+LONG_WORDS = "оплата покупки в магазине по карте чек номер позиция товар скидка бонусы".split()
+
+
+def make_titles(n_titles: int, seed: int = 42) -> list[str]:
+    """
+    Генерация названий смешанной длины, похожих на описания транзакций.
+
+    Args:
+        n_titles: Количество названий
+        seed: Seed для воспроизводимости
+
+    Returns:
+        Список названий
+    """
+    rng = random.Random(seed)
+    titles = []
+    for idx in range(n_titles):
+        if rng.random() < 0.8:
+            titles.append(f"{rng.choice(SHORT_TITLES)} {idx}")
+        else:
+            titles.append(" ".join(rng.choices(LONG_WORDS, k=rng.randint(20, 80))) + f" {idx}")
+    return titles
+
+
+def measure(model: ProductCategoryClassifier, titles: list[str], repeats: int) -> float:
+    """
+    Среднее время кодирования (без кэшей, каждый раз через эмбеддер).
+
+    Args:
+        model: Модель
+        titles: Названия продуктов
+        repeats: Количество повторов
+
+    Returns:
+        Среднее время в секундах
+    """
+    model._embed(titles[:8])  # прогрев
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model._embed(titles)
+    return (time.perf_counter() - start) / repeats
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    parser = argparse.ArgumentParser(description="Бенчмарк кодирования продуктов")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--n-titles", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-tokens-per-batch", type=int, default=2048)
+    parser.add_argument("--max-seq-length", type=int, default=128)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    titles = make_titles(args.n_titles)
+
+    baseline = ProductCategoryClassifier(args.model)
+    budgeted = ProductCategoryClassifier(
+        args.model,
+        max_seq_length=args.max_seq_length,
+        max_tokens_per_batch=args.max_tokens_per_batch,
+    )
+
+    baseline_time = measure(baseline, titles, args.repeats)
+    budgeted_time = measure(budgeted, titles, args.repeats)
+    metrics = budgeted.encode_metrics()
+
+    logger.info(
+        f"Фиксированные батчи: {baseline_time:.3f} с ({len(titles) / baseline_time:.0f} текстов/с)"
+    )
+    logger.info(
+        f"Бюджет токенов {args.max_tokens_per_batch}: {budgeted_time:.3f} с "
+        f"({len(titles) / budgeted_time:.0f} текстов/с)"
+    )
+    logger.info(f"Ускорение: x{baseline_time / budgeted_time:.2f}")
+    logger.info(f"Доля полезных токенов: {metrics['padding_efficiency']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
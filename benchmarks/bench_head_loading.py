@@ -0,0 +1,159 @@
+"""Бенчмарк массовой загрузки моделей пользователей: joblib против компактного формата."""
+
+import argparse
+import cProfile
+import io
+import logging
+import pstats
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from categoraize.models.artifacts import load_head_arrays, restore_head
+from categoraize.models.classifier import ProductCategoryClassifier
+
+logger = logging.getLogger(__name__)
+
+# Цель запроса: загрузка 10 тысяч моделей при старте сервиса за секунды
+TARGET_SECONDS = 10.0
+
+# Файлы модели, копируемые каждому пользователю (эмбеддер общий, по ссылке)
+_MODEL_FILES = ("metadata.json", "classifier.joblib", "head.json", "head.npy")
+
+
+def make_template(classifier_type: str, n_classes: int, root: Path) -> Path:
+    """
+    Сохранение одной обученной модели в обоих форматах.
+
+    Args:
+        classifier_type: Тип классификатора ('lr' или 'mlp')
+        n_classes: Количество категорий
+        root: Директория для шаблонов
+
+    Returns:
+        Директория с эмбеддером, общим для всех моделей пользователей
+    """
+    rng = np.random.default_rng(42)
+    model = ProductCategoryClassifier(
+        classifier_type=classifier_type, classifier_params={"max_iter": 50}
+    )
+    embeddings = rng.normal(size=(n_classes * 10, model.embedding_dim)).astype(np.float32)
+    model.fit_from_embeddings(embeddings, [f"category_{idx % n_classes}" for idx in range(200)])
+    for head_format in ("joblib", "npy"):
+        model.save_pretrained(root / f"template_{head_format}", head_format=head_format)
+    model.close()
+    return root / "template_npy" / "embedder"
+
+
+def make_users(template: Path, embedder: Path, n_users: int, root: Path) -> list[Path]:
+    """Копирование шаблона в директории пользователей."""
+    user_dirs = []
+    for idx in range(n_users):
+        user_dir = root / f"user_{idx:05d}"
+        user_dir.mkdir(parents=True)
+        for name in _MODEL_FILES:
+            if (template / name).exists():
+                shutil.copyfile(template / name, user_dir / name)
+        (user_dir / "embedder").symlink_to(embedder, target_is_directory=True)
+        user_dirs.append(user_dir)
+    return user_dirs
+
+
+def load_all(user_dirs: list[Path]) -> float:
+    """
+    Загрузка моделей всех пользователей через from_pretrained.
+
+    Returns:
+        Время загрузки, с
+    """
+    start = time.perf_counter()
+    for user_dir in user_dirs:
+        ProductCategoryClassifier.from_pretrained(user_dir)
+    return time.perf_counter() - start
+
+
+def profile_loading(user_dirs: list[Path], top: int) -> str:
+    """Профиль from_pretrained по накопленному времени функций."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for user_dir in user_dirs:
+        ProductCategoryClassifier.from_pretrained(user_dir)
+    profiler.disable()
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+    return stream.getvalue()
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    parser = argparse.ArgumentParser(description="Бенчмарк загрузки моделей пользователей")
+    parser.add_argument("--users", type=int, default=10_000, help="Количество пользователей")
+    parser.add_argument("--classes", type=int, default=20, help="Количество категорий")
+    parser.add_argument(
+        "--classifier-type", choices=("lr", "mlp"), default="lr", help="Тип классификатора"
+    )
+    parser.add_argument(
+        "--profile-users",
+        type=int,
+        default=0,
+        help="Профилировать загрузку первых N моделей в формате npy",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        embedder = make_template(args.classifier_type, args.classes, root)
+
+        times = {}
+        for head_format in ("joblib", "npy"):
+            user_dirs = make_users(
+                root / f"template_{head_format}", embedder, args.users, root / head_format
+            )
+            size = sum(
+                (user_dir / name).stat().st_size
+                for user_dir in user_dirs
+                for name in _MODEL_FILES
+                if (user_dir / name).exists()
+            )
+            times[head_format] = load_all(user_dirs)
+            logger.info(
+                f"{head_format:6s}: {args.users} моделей за {times[head_format]:.2f} с "
+                f"({times[head_format] / args.users * 1000:.3f} мс на модель), "
+                f"{size / 2**20:.1f} МБ на диске"
+            )
+
+        # Доля восстановления классификатора sklearn в загрузке npy
+        start = time.perf_counter()
+        for user_dir in user_dirs:
+            load_head_arrays(user_dir)
+        arrays_time = time.perf_counter() - start
+        template = ProductCategoryClassifier.from_pretrained(user_dirs[0])
+        header, arrays = load_head_arrays(user_dirs[0])
+        start = time.perf_counter()
+        for _ in user_dirs:
+            restore_head(header, arrays, template._build_classifier())
+        restore_time = time.perf_counter() - start
+        logger.info(
+            f"npy: чтение head.json и memory map весов {arrays_time:.2f} с, "
+            f"восстановление классификатора sklearn {restore_time:.2f} с"
+        )
+
+        if args.profile_users:
+            logger.info(profile_loading(user_dirs[: args.profile_users], top=20))
+
+    logger.info(f"Ускорение npy относительно joblib: x{times['joblib'] / times['npy']:.2f}")
+    if times["npy"] > TARGET_SECONDS:
+        logger.warning(
+            f"Загрузка {args.users} моделей ({times['npy']:.2f} с) не укладывается "
+            f"в цель {TARGET_SECONDS:.0f} с"
+        )
+
+
+if __name__ == "__main__":
+    main()
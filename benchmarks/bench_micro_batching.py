@@ -0,0 +1,75 @@
+"""Бенчмарк конкурентных одиночных запросов: прямые вызовы модели против микро-батчей."""
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from categoraize.models.batching import MicroBatcher
+from categoraize.models.classifier import ProductCategoryClassifier
+
+logger = logging.getLogger(__name__)
+
+
+def run_load(
+    predict: Callable[[str], object], titles: list[str], threads: int
+) -> tuple[float, np.ndarray]:
+    """Запросы из нескольких потоков: пропускная способность и задержки в мс."""
+
+    def timed(title: str) -> float:
+        start = time.perf_counter()
+        predict(title)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = np.fromiter(executor.map(timed, titles), dtype=np.float64)
+    return len(titles) / (time.perf_counter() - start), latencies
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    parser = argparse.ArgumentParser(description="Бенчмарк микро-батчей")
+    parser.add_argument("--requests", type=int, default=2000, help="Число запросов")
+    parser.add_argument("--threads", type=int, default=32, help="Число потоков-клиентов")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Размер микро-батча")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Ожидание батча, мс")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+
+    rng = np.random.default_rng(42)
+    words = ["phone", "laptop", "tablet", "case", "charger", "pro", "max", "mini", "air", "ultra"]
+    train_titles = [" ".join(rng.choice(words, size=4)) for _ in range(200)]
+    model = ProductCategoryClassifier(classifier_type="lr")
+    model.fit(train_titles, [title.split()[0] for title in train_titles])
+
+    # Уникальные названия, чтобы кэши не влияли на результат
+    titles = [f"{' '.join(rng.choice(words, size=5))} {idx}" for idx in range(args.requests)]
+
+    direct_rps, direct = run_load(
+        lambda title: model.predict_with_confidence([title]), titles, args.threads
+    )
+    with MicroBatcher(model, args.max_batch_size, args.max_wait_ms) as batcher:
+        batched_rps, batched = run_load(batcher.predict_with_confidence, titles, args.threads)
+        mean_batch = batcher.stats()["mean_batch_size"]
+
+    for name, rps, latencies in (
+        ("Прямые вызовы", direct_rps, direct),
+        ("Микро-батчи", batched_rps, batched),
+    ):
+        logger.info(
+            f"{name:14s}: {rps:7.0f} запросов/с, p50 {np.percentile(latencies, 50):6.1f} мс, "
+            f"p99 {np.percentile(latencies, 99):6.1f} мс"
+        )
+    logger.info(
+        f"Средний размер микро-батча: {mean_batch:.1f}, ускорение x{batched_rps / direct_rps:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
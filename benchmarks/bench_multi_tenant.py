@@ -0,0 +1,72 @@
+"""Бенчмарк пакетного инференса по моделям многих пользователей."""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.models.multi_tenant import MultiTenantScorer
+
+logger = logging.getLogger(__name__)
+
+
+def make_models(n_users: int, n_classes: int, rng: np.random.Generator) -> dict:
+    """Создание моделей пользователей с обученными на случайных данных регрессиями."""
+    models = {}
+    for user in range(n_users):
+        model = ProductCategoryClassifier(classifier_type="lr")
+        X = rng.normal(size=(n_classes * 5, model.embedding_dim)).astype(np.float32)
+        y = np.arange(len(X)) % n_classes
+        model.classifier = LogisticRegression(max_iter=20).fit(X, y)
+        model.id_to_label = {idx: f"category_{idx}" for idx in range(n_classes)}
+        model.label_to_id = {label: idx for idx, label in model.id_to_label.items()}
+        model.is_fitted = True
+        models[f"user_{user}"] = model
+    return models
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    parser = argparse.ArgumentParser(description="Бенчмарк пакетного инференса")
+    parser.add_argument("--batch-size", type=int, default=1024, help="Размер батча")
+    parser.add_argument(
+        "--users", type=int, nargs="+", default=[1, 10, 100, 500], help="Числа пользователей"
+    )
+    parser.add_argument("--classes", type=int, default=20, help="Количество категорий")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+
+    rng = np.random.default_rng(42)
+    models = make_models(max(args.users), args.classes, rng)
+    dim = next(iter(models.values())).embedding_dim
+    embeddings = rng.normal(size=(args.batch_size, dim)).astype(np.float32)
+
+    for n_users in args.users:
+        subset = dict(list(models.items())[:n_users])
+        scorer = MultiTenantScorer(subset)
+        user_ids = [f"user_{idx}" for idx in rng.integers(0, n_users, size=args.batch_size)]
+
+        start = time.perf_counter()
+        scorer.predict_embeddings(user_ids, embeddings)
+        batched = time.perf_counter() - start
+
+        # Базовый вариант: отдельный вызов sklearn для каждого пользователя батча
+        start = time.perf_counter()
+        users = np.array(user_ids)
+        for user_id in np.unique(users):
+            subset[user_id].classifier.predict_proba(embeddings[users == user_id])
+        looped = time.perf_counter() - start
+
+        logger.info(
+            f"Пользователей {n_users:4d}: пакетно {batched * 1000:7.1f} мс, "
+            f"цикл по моделям {looped * 1000:7.1f} мс (x{looped / batched:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Бенчмарк задержки классификатора на одной строке: sklearn против NumpyHead."""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.neural_network import MLPClassifier
+
+from categoraize.models.numpy_head import NumpyHead
+
+logger = logging.getLogger(__name__)
+
+
+def measure(func, x_data: np.ndarray, repeats: int) -> float:
+    """Медианная задержка вызова в микросекундах."""
+    timings = np.empty(repeats)
+    for idx in range(repeats):
+        start = time.perf_counter()
+        func(x_data)
+        timings[idx] = time.perf_counter() - start
+    return float(np.median(timings) * 1e6)
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    parser = argparse.ArgumentParser(description="Бенчмарк инференса классификатора")
+    parser.add_argument("--dim", type=int, default=384, help="Размерность эмбеддингов")
+    parser.add_argument("--classes", type=int, default=20, help="Количество категорий")
+    parser.add_argument("--repeats", type=int, default=2000, help="Число повторов")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(args.classes * 20, args.dim)).astype(np.float32)
+    y = np.arange(len(X)) % args.classes
+    labels = [f"category_{idx}" for idx in range(args.classes)]
+
+    classifiers = {
+        "lr": LogisticRegression(max_iter=50),
+        "mlp": MLPClassifier(hidden_layer_sizes=(256,), max_iter=20, random_state=42),
+    }
+    for name, classifier in classifiers.items():
+        classifier.fit(X, y)
+        head = NumpyHead.from_estimator(classifier, labels)
+        row = X[:1]
+
+        sklearn_us = measure(classifier.predict_proba, row, args.repeats)
+        numpy_us = measure(head.predict_proba, row, args.repeats)
+        max_diff = np.abs(head.predict_proba(X) - classifier.predict_proba(X)).max()
+
+        logger.info(
+            f"{name}: sklearn {sklearn_us:6.1f} мкс, NumPy {numpy_us:6.1f} мкс "
+            f"(x{sklearn_us / numpy_us:.1f}), макс. расхождение {max_diff:.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Бенчмарк pre-fork сервиса: масштабирование пропускной способности и память воркеров."""
+
+import argparse
+import json
+import logging
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.serving.prefork import available_cores, process_memory
+
+logger = logging.getLogger(__name__)
+
+
+def free_port() -> int:
+    """Свободный TCP-порт."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def children(pid: int) -> list[int]:
+    """Дочерние процессы (воркеры) по /proc."""
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(child) for child in path.read_text().split()] if path.exists() else []
+
+
+def start_server(models_dir: Path, port: int, workers: int) -> subprocess.Popen:
+    """Запуск categoraize-serve и ожидание готовности всех воркеров."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "categoraize.serve",
+            "--models-dir",
+            str(models_dir),
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--max-wait-ms",
+            "1",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1):
+                pass
+            if workers == 1 or len(children(process.pid)) == workers:
+                return process
+        except OSError:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise TimeoutError("Сервис не запустился")
+
+
+def run_load(url: str, titles: list[str], threads: int) -> tuple[float, np.ndarray]:
+    """Запросы /predict из нескольких потоков: пропускная способность и задержки в мс."""
+
+    def timed(title: str) -> float:
+        request = urllib.request.Request(
+            f"{url}/predict",
+            data=json.dumps({"user_id": "bench", "product_title": title}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        start = time.perf_counter()
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = np.fromiter(executor.map(timed, titles), dtype=np.float64)
+    return len(titles) / (time.perf_counter() - start), latencies
+
+
+def main() -> None:
+    """Запуск бенчмарка."""
+    parser = argparse.ArgumentParser(description="Бенчмарк pre-fork сервиса")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=available_cores(),
+        help="Максимальное число воркеров (замеры для 1..N)",
+    )
+    parser.add_argument("--requests", type=int, default=1000, help="Число запросов на замер")
+    parser.add_argument("--threads", type=int, default=32, help="Число потоков-клиентов")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+
+    rng = np.random.default_rng(42)
+    words = ["phone", "laptop", "tablet", "case", "charger", "pro", "max", "mini", "air", "ultra"]
+    train_titles = [" ".join(rng.choice(words, size=4)) for _ in range(200)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        models_dir = Path(tmp)
+        ProductCategoryClassifier(classifier_type="lr").fit(
+            train_titles, [title.split()[0] for title in train_titles]
+        ).save_pretrained(models_dir / "bench")
+
+        logger.info(f"Доступно ядер: {available_cores()}")
+        baseline = None
+        for workers in range(1, args.max_workers + 1):
+            port = free_port()
+            process = start_server(models_dir, port, workers)
+            try:
+                url = f"http://127.0.0.1:{port}"
+                # Прогрев: токенизатор и пул потоков torch инициализируются в каждом воркере
+                run_load(url, [f"warmup {idx}" for idx in range(args.threads * 2)], args.threads)
+                # Уникальные названия, чтобы кэши не влияли на результат
+                titles = [
+                    f"{' '.join(rng.choice(words, size=5))} {workers} {idx}"
+                    for idx in range(args.requests)
+                ]
+                rps, latencies = run_load(url, titles, args.threads)
+                pids = children(process.pid) if workers > 1 else [process.pid]
+                memory = [process_memory(pid) for pid in pids]
+            finally:
+                process.send_signal(signal.SIGTERM)
+                process.wait(timeout=60)
+
+            baseline = baseline or rps
+            rss = np.mean([m.get("rss_bytes", 0) for m in memory]) / 2**20
+            pss = sum(m.get("pss_bytes", 0) for m in memory) / 2**20
+            private = np.mean([m.get("private_bytes", 0) for m in memory]) / 2**20
+            logger.info(
+                f"Воркеров {workers}: {rps:7.0f} запросов/с (x{rps / baseline:.2f}), "
+                f"p50 {np.percentile(latencies, 50):6.1f} мс, "
+                f"p99 {np.percentile(latencies, 99):6.1f} мс, "
+                f"RSS воркера {rss:6.0f} МБ, личная память воркера {private:5.0f} МБ, "
+                f"PSS всех воркеров {pss:6.0f} МБ"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,13 @@
 """Модуль для работы с данными."""
 
+from categoraize.data.formats import detect_format, iter_columnar, read_columnar
 from categoraize.data.loader import DataLoader
 from categoraize.data.preprocessor import DataPreprocessor
 
-__all__ = ["DataLoader", "DataPreprocessor"]
+__all__ = [
+    "DataLoader",
+    "DataPreprocessor",
+    "detect_format",
+    "iter_columnar",
+    "read_columnar",
+]
@@ -0,0 +1,206 @@
+"""Модуль для чтения файлов данных в колоночных форматах (Parquet, Arrow IPC, Feather)."""
+
+import logging
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Форматы по расширению файла
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".ipc": "arrow",
+    ".feather": "feather",
+}
+SUPPORTED_FORMATS = ("csv", "parquet", "arrow", "feather")
+COLUMNAR_FORMATS = ("parquet", "arrow", "feather")
+
+
+def _import_pyarrow() -> Any:
+    """Импорт pyarrow (опциональная зависимость)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow не установлен. Установите: pip install pyarrow "
+            "(или poetry install -E parquet)"
+        ) from e
+    return pa
+
+
+def detect_format(path: str | Path, data_format: str | None = None) -> str:
+    """
+    Определение формата файла данных.
+
+    Args:
+        path: Путь к файлу
+        data_format: Явно указанный формат (по умолчанию - по расширению файла)
+
+    Returns:
+        Формат: csv, parquet, arrow или feather
+    """
+    if data_format is not None:
+        if data_format not in SUPPORTED_FORMATS:
+            raise ValueError(
+                f"Неподдерживаемый формат данных: {data_format}. "
+                f"Доступные форматы: {list(SUPPORTED_FORMATS)}"
+            )
+        return data_format
+
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMAT_EXTENSIONS:
+        raise ValueError(
+            f"Неподдерживаемый формат файла данных: {suffix}. "
+            f"Укажите формат явно ({list(SUPPORTED_FORMATS)})"
+        )
+    return FORMAT_EXTENSIONS[suffix]
+
+
+def read_columns(path: str | Path, data_format: str | None = None) -> list[str]:
+    """
+    Чтение названий колонок без чтения данных.
+
+    Для колоночных форматов читается только схема из метаданных файла.
+
+    Args:
+        path: Путь к файлу
+        data_format: Формат файла (по умолчанию - по расширению)
+
+    Returns:
+        Список названий колонок
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Файл данных не найден: {path}")
+
+    data_format = detect_format(path, data_format)
+    if data_format == "csv":
+        return [str(column) for column in pd.read_csv(path, nrows=0).columns]
+
+    pa = _import_pyarrow()
+    if data_format == "parquet":
+        return list(pa.parquet.read_schema(path).names)
+    with pa.memory_map(str(path)) as source:
+        return list(pa.ipc.open_file(source).schema.names)
+
+
+def _to_pandas(data: Any, columns: list[str]) -> pd.DataFrame:
+    """
+    Преобразование таблицы Arrow в DataFrame со строками на Arrow.
+
+    Строковые колонки получают тип string[pyarrow]: данные остаются в
+    буферах Arrow, без Python-объекта на каждое значение.
+
+    Args:
+        data: Таблица или батч Arrow
+        columns: Порядок колонок результата
+
+    Returns:
+        DataFrame
+    """
+    pa = _import_pyarrow()
+    string_dtype = pd.StringDtype("pyarrow")
+    types_mapper = {pa.string(): string_dtype, pa.large_string(): string_dtype}.get
+    return data.to_pandas(types_mapper=types_mapper)[columns]
+
+
+def _open_ipc(pa: Any, source: Any, columns: list[str]) -> Any:
+    """Открытие файла Arrow IPC (Feather v2) с чтением только указанных колонок."""
+    schema = pa.ipc.open_file(source).schema
+    included = [schema.get_field_index(column) for column in columns]
+    return pa.ipc.open_file(source, options=pa.ipc.IpcReadOptions(included_fields=included))
+
+
+def read_columnar(
+    path: str | Path, columns: list[str], data_format: str | None = None
+) -> pd.DataFrame:
+    """
+    Чтение указанных колонок файла Parquet, Arrow IPC или Feather.
+
+    Остальные колонки не читаются и не распаковываются (проекция).
+
+    Args:
+        path: Путь к файлу
+        columns: Читаемые колонки
+        data_format: Формат файла (по умолчанию - по расширению)
+
+    Returns:
+        DataFrame с указанными колонками (строки - string[pyarrow])
+    """
+    data_format = detect_format(path, data_format)
+    if data_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Формат {data_format} не является колоночным")
+
+    pa = _import_pyarrow()
+    if data_format == "parquet":
+        return _to_pandas(pa.parquet.read_table(path, columns=columns), columns)
+    with pa.memory_map(str(path)) as source:
+        return _to_pandas(_open_ipc(pa, source, columns).read_all(), columns)
+
+
+def _rechunk(batches: Iterable[Any], chunk_size: int, skip_rows: int) -> Iterator[Any]:
+    """
+    Нарезка батчей Arrow на части не больше chunk_size строк.
+
+    Args:
+        batches: Батчи Arrow
+        chunk_size: Максимальное число строк в части
+        skip_rows: Число пропускаемых строк от начала
+
+    Yields:
+        Батчи Arrow (срезы без копирования)
+    """
+    for batch in batches:
+        if skip_rows >= batch.num_rows:
+            skip_rows -= batch.num_rows
+            continue
+        rest = batch.slice(skip_rows)
+        skip_rows = 0
+        for offset in range(0, rest.num_rows, chunk_size):
+            yield rest.slice(offset, chunk_size)
+
+
+def iter_columnar(
+    path: str | Path,
+    columns: list[str],
+    chunk_size: int,
+    data_format: str | None = None,
+    skip_rows: int = 0,
+) -> Iterator[pd.DataFrame]:
+    """
+    Чтение указанных колонок файла Parquet, Arrow IPC или Feather по частям.
+
+    Args:
+        path: Путь к файлу
+        columns: Читаемые колонки
+        chunk_size: Максимальное число строк в чанке
+        data_format: Формат файла (по умолчанию - по расширению)
+        skip_rows: Число пропускаемых строк от начала файла
+
+    Yields:
+        DataFrame с указанными колонками (строки - string[pyarrow])
+    """
+    data_format = detect_format(path, data_format)
+    if data_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Формат {data_format} не является колоночным")
+
+    pa = _import_pyarrow()
+    if data_format == "parquet":
+        batches = pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns)
+        for batch in _rechunk(batches, chunk_size, skip_rows):
+            yield _to_pandas(batch, columns)
+        return
+
+    with pa.memory_map(str(path)) as source:
+        reader = _open_ipc(pa, source, columns)
+        batches = (reader.get_batch(idx) for idx in range(reader.num_record_batches))
+        for batch in _rechunk(batches, chunk_size, skip_rows):
+            yield _to_pandas(batch, columns)
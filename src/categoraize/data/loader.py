@@ -1,39 +1,52 @@
 """Модуль для загрузки данных из различных источников."""
 
 import logging
+from collections.abc import Iterator
 from pathlib import Path
 
 import pandas as pd
 
+from categoraize.data.formats import detect_format, iter_columnar, read_columnar, read_columns
+
 logger = logging.getLogger(__name__)
 
+# Возможные варианты названий колонок с названием продукта и категорией
+TITLE_COLUMN_VARIANTS = ["product_title", "title", "product_name", "name"]
+CATEGORY_COLUMN_VARIANTS = ["category", "category_name", "cat", "label"]
+
+DEFAULT_CHUNK_SIZE = 100_000
+# Число категорий в логе распределения на уровне INFO
+TOP_CATEGORIES_TO_LOG = 20
+
 
 class DataLoader:
     """Класс для загрузки данных из Kaggle датасета."""
 
-    def __init__(self, data_path: str | Path) -> None:
+    def __init__(self, data_path: str | Path, data_format: str | None = None) -> None:
         """
         Инициализация загрузчика данных.
 
         Args:
             data_path: Путь к директории с данными или к CSV файлу
+            data_format: Формат файлов: csv, parquet, arrow или feather
+                (по умолчанию - по расширению файла)
         """
+        if data_format is not None:
+            detect_format(data_path, data_format)
+
         self.data_path = Path(data_path)
+        self.data_format = data_format
         logger.info(f"Инициализирован DataLoader с путем: {self.data_path}")
 
-    def load_kaggle_dataset(
-        self, filename: str = "product_titles.csv", column_mapping: dict[str, str] | None = None
-    ) -> pd.DataFrame:
+    def _resolve_file(self, filename: str) -> Path:
         """
-        Загрузка датасета из Kaggle (Massive Product Text Classification Dataset).
+        Путь к файлу данных с проверкой существования.
 
         Args:
-            filename: Имя файла с данными (по умолчанию product_titles.csv)
-            column_mapping: Маппинг колонок {стандартное_имя: имя_в_датасете}
-                           Если None, будет использован автодетект
+            filename: Имя файла с данными
 
         Returns:
-            DataFrame с колонками: product_title, category
+            Путь к файлу
         """
         file_path = self.data_path / filename
 
@@ -42,29 +55,39 @@ class DataLoader:
                 f"Файл данных не найден: {file_path}. "
                 "Пожалуйста, скачайте датасет с Kaggle и поместите его в директорию data/"
             )
+        return file_path
 
-        logger.info(f"Загрузка данных из {file_path}")
-        df = pd.read_csv(file_path)
+    @staticmethod
+    def resolve_column_mapping(
+        columns: list[str], column_mapping: dict[str, str] | None = None
+    ) -> dict[str, str]:
+        """
+        Определение колонок датасета по заголовку.
 
+        Args:
+            columns: Колонки файла
+            column_mapping: Маппинг колонок {стандартное_имя: имя_в_датасете}
+                           Если None, будет использован автодетект
+
+        Returns:
+            Маппинг {стандартное_имя: имя_в_датасете} для product_title и category
+        """
         # Стандартные имена колонок
         standard_columns = {"product_title": "product_title", "category": "category"}
 
         # Автодетект колонок, если маппинг не указан
         if column_mapping is None:
             column_mapping = {}
-            # Возможные варианты названий колонок
-            title_variants = ["product_title", "title", "product_name", "name"]
-            category_variants = ["category", "category_name", "cat", "label"]
 
             # Поиск колонки с названием продукта
-            for variant in title_variants:
-                if variant in df.columns:
+            for variant in TITLE_COLUMN_VARIANTS:
+                if variant in columns:
                     column_mapping["product_title"] = variant
                     break
 
             # Поиск колонки с категорией
-            for variant in category_variants:
-                if variant in df.columns:
+            for variant in CATEGORY_COLUMN_VARIANTS:
+                if variant in columns:
                     column_mapping["category"] = variant
                     break
 
@@ -74,33 +97,154 @@ class DataLoader:
         # Проверка наличия необходимых колонок
         missing_columns = []
         for standard_name, actual_name in standard_columns.items():
-            if actual_name not in df.columns:
+            if actual_name not in columns:
                 missing_columns.append(standard_name)
 
         if missing_columns:
             raise ValueError(
                 f"В датасете отсутствуют необходимые колонки: {missing_columns}. "
-                f"Доступные колонки: {list(df.columns)}"
+                f"Доступные колонки: {list(columns)}"
             )
 
-        # Переименовываем колонки в стандартные имена
-        df_renamed = df.rename(columns={v: k for k, v in standard_columns.items()})
+        return standard_columns
+
+    def load_kaggle_dataset(
+        self, filename: str = "product_titles.csv", column_mapping: dict[str, str] | None = None
+    ) -> pd.DataFrame:
+        """
+        Загрузка датасета из Kaggle (Massive Product Text Classification Dataset).
 
-        # Оставляем только нужные колонки
-        df_renamed = df_renamed[["product_title", "category"]].copy()
+        Колонки определяются по заголовку (для Parquet, Arrow IPC и Feather -
+        по схеме), из файла читаются только название продукта и категория.
+        Колоночные форматы читаются с проекцией колонок, строки остаются
+        в буферах Arrow (string[pyarrow]).
 
-        logger.info(f"Загружено {len(df_renamed)} записей")
-        logger.info(f"Количество категорий: {df_renamed['category'].nunique()}")
-        logger.info(f"Распределение категорий:\n{df_renamed['category'].value_counts()}")
+        Args:
+            filename: Имя файла с данными (по умолчанию product_titles.csv)
+            column_mapping: Маппинг колонок {стандартное_имя: имя_в_датасете}
+                           Если None, будет использован автодетект
 
+        Returns:
+            DataFrame с колонками: product_title, category
+        """
+        file_path = self._resolve_file(filename)
+
+        data_format = detect_format(file_path, self.data_format)
+
+        logger.info(f"Загрузка данных из {file_path} (формат {data_format})")
+        header = read_columns(file_path, data_format)
+        standard_columns = self.resolve_column_mapping(header, column_mapping)
+        columns = list(dict.fromkeys(standard_columns.values()))
+
+        if data_format == "csv":
+            df = pd.read_csv(file_path, usecols=columns)
+        else:
+            df = read_columnar(file_path, columns, data_format)
+
+        # Переименовываем колонки в стандартные имена и оставляем только нужные
+        df_renamed = df.rename(columns={v: k for k, v in standard_columns.items()})[
+            ["product_title", "category"]
+        ]
+
+        self._log_summary(len(df_renamed), df_renamed["category"].value_counts())
         return df_renamed
 
-    def validate_data(self, df: pd.DataFrame) -> bool:
+    def iter_kaggle_dataset(
+        self,
+        filename: str = "product_titles.csv",
+        column_mapping: dict[str, str] | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Потоковая загрузка датасета частями фиксированного размера.
+
+        Колонки определяются по заголовку (или схеме колоночного формата),
+        из файла читаются только название продукта и категория, в памяти
+        находится один чанк. Колонки читаются как строки, чтобы типы не
+        различались между чанками.
+
+        Args:
+            filename: Имя файла с данными (по умолчанию product_titles.csv)
+            column_mapping: Маппинг колонок {стандартное_имя: имя_в_датасете}
+                           Если None, будет использован автодетект
+            chunk_size: Число строк в чанке
+
+        Yields:
+            DataFrame с колонками: product_title, category
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size должен быть положительным, получено: {chunk_size}")
+
+        file_path = self._resolve_file(filename)
+
+        data_format = detect_format(file_path, self.data_format)
+
+        logger.info(
+            f"Потоковая загрузка данных из {file_path} (формат {data_format}, "
+            f"чанки по {chunk_size} строк)"
+        )
+        header = read_columns(file_path, data_format)
+        standard_columns = self.resolve_column_mapping(header, column_mapping)
+        rename = {v: k for k, v in standard_columns.items()}
+
+        n_rows = 0
+        category_counts: pd.Series = pd.Series(dtype="int64")
+        for raw_chunk in self._iter_raw(file_path, list(rename), chunk_size, data_format):
+            chunk = raw_chunk.rename(columns=rename)[["product_title", "category"]]
+            n_rows += len(chunk)
+            category_counts = category_counts.add(chunk["category"].value_counts(), fill_value=0)
+            yield chunk
+
+        self._log_summary(n_rows, category_counts.astype("int64").sort_values(ascending=False))
+
+    @staticmethod
+    def _iter_raw(
+        file_path: Path, columns: list[str], chunk_size: int, data_format: str
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Чтение указанных колонок файла по частям.
+
+        Args:
+            file_path: Путь к файлу
+            columns: Читаемые колонки
+            chunk_size: Число строк в чанке
+            data_format: Формат файла
+
+        Yields:
+            DataFrame с указанными колонками
+        """
+        if data_format == "csv":
+            with pd.read_csv(file_path, usecols=columns, dtype=str, chunksize=chunk_size) as reader:
+                yield from reader
+        else:
+            yield from iter_columnar(file_path, columns, chunk_size, data_format)
+
+    @staticmethod
+    def _log_summary(n_rows: int, category_counts: pd.Series) -> None:
+        """
+        Логирование размера датасета и распределения категорий.
+
+        Полное распределение логируется только на уровне DEBUG: в датасетах
+        с тысячами категорий оно занимает тысячи строк лога.
+
+        Args:
+            n_rows: Число записей
+            category_counts: Число записей по категориям (по убыванию)
+        """
+        logger.info(f"Загружено {n_rows} записей")
+        logger.info(f"Количество категорий: {len(category_counts)}")
+        logger.info(
+            f"Самые частые категории:\n{category_counts.head(TOP_CATEGORIES_TO_LOG).to_string()}"
+        )
+        logger.debug(f"Распределение категорий:\n{category_counts.to_string()}")
+
+    def validate_data(self, df: pd.DataFrame, min_categories: int = 2) -> bool:
         """
         Валидация загруженных данных.
 
         Args:
             df: DataFrame для валидации
+            min_categories: Минимальное число категорий (1 - для отдельного чанка)
 
         Returns:
             True если данные валидны, иначе выбрасывает исключение
@@ -145,7 +289,7 @@ class DataLoader:
 
         # Проверка минимального количества категорий
         unique_categories = df["category"].nunique()
-        if unique_categories < 2:
+        if unique_categories < min_categories:
             raise ValueError(f"Недостаточно категорий для классификации: {unique_categories}")
 
         logger.info("Валидация данных успешно пройдена")
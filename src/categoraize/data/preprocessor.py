@@ -2,6 +2,7 @@
 
 import logging
 import re
+from collections.abc import Iterable, Iterator
 
 import numpy as np
 import pandas as pd
@@ -55,34 +56,48 @@ class DataPreprocessor:
 
         return text.strip()
 
-    def preprocess_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _preprocess_frame(self, df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
         """
-        Предобработка DataFrame с текстовыми данными.
+        Предобработка DataFrame без логирования.
 
         Args:
             df: DataFrame с колонкой 'product_title'
 
         Returns:
-            DataFrame с обработанными данными
+            Tuple (обработанный DataFrame, число удаленных записей)
         """
-        logger.info("Начало предобработки данных...")
-
         df = df.copy()
 
         # Предобработка названий продуктов
         if "product_title" in df.columns:
-            df["product_title"] = df["product_title"].apply(self.preprocess_text)
-            logger.info("Предобработка названий продуктов завершена")
+            titles = df["product_title"]
+            df["product_title"] = titles.apply(self.preprocess_text)
+            # Строки на Arrow (колоночные форматы) остаются в Arrow
+            if isinstance(titles.dtype, pd.StringDtype):
+                df["product_title"] = df["product_title"].astype(titles.dtype)
 
         # Предобработка категорий (только нормализация)
         if "category" in df.columns:
             df["category"] = df["category"].str.strip()
-            logger.info("Предобработка категорий завершена")
 
         # Удаление пустых строк после предобработки
         initial_len = len(df)
         df = df[df["product_title"].str.len() > 0].reset_index(drop=True)
-        removed = initial_len - len(df)
+        return df, initial_len - len(df)
+
+    def preprocess_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Предобработка DataFrame с текстовыми данными.
+
+        Args:
+            df: DataFrame с колонкой 'product_title'
+
+        Returns:
+            DataFrame с обработанными данными
+        """
+        logger.info("Начало предобработки данных...")
+
+        df, removed = self._preprocess_frame(df)
 
         if removed > 0:
             logger.warning(f"Удалено {removed} записей с пустыми названиями после предобработки")
@@ -90,6 +105,31 @@ class DataPreprocessor:
         logger.info(f"Предобработка завершена. Осталось {len(df)} записей")
         return df
 
+    def preprocess_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Потоковая предобработка частей датасета.
+
+        Каждый чанк обрабатывается по мере поступления, итоги логируются
+        один раз после последнего чанка.
+
+        Args:
+            chunks: Чанки с колонкой 'product_title' (например, из DataLoader.iter_kaggle_dataset)
+
+        Yields:
+            Обработанные чанки
+        """
+        kept = 0
+        removed = 0
+        for chunk in chunks:
+            processed, chunk_removed = self._preprocess_frame(chunk)
+            kept += len(processed)
+            removed += chunk_removed
+            yield processed
+
+        if removed > 0:
+            logger.warning(f"Удалено {removed} записей с пустыми названиями после предобработки")
+        logger.info(f"Потоковая предобработка завершена. Осталось {kept} записей")
+
     def encode_labels(self, labels: pd.Series) -> tuple[pd.Series, dict]:
         """
         Кодирование категорий в числовые метки.
@@ -1,5 +1,23 @@
 """Модуль для моделей машинного обучения."""
 
-from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.models.async_inference import AsyncInferenceExecutor, default_async_executor
+from categoraize.models.batching import MicroBatcher
+from categoraize.models.classifier import InferenceResult, ProductCategoryClassifier
+from categoraize.models.embedder_registry import EmbedderRegistry, default_registry
+from categoraize.models.embedding_cache import DiskEmbeddingCache, MemoryEmbeddingCache
+from categoraize.models.multi_tenant import MultiTenantScorer
+from categoraize.models.numpy_head import NumpyHead
 
-__all__ = ["ProductCategoryClassifier"]
+__all__ = [
+    "ProductCategoryClassifier",
+    "InferenceResult",
+    "EmbedderRegistry",
+    "default_registry",
+    "DiskEmbeddingCache",
+    "MemoryEmbeddingCache",
+    "MultiTenantScorer",
+    "NumpyHead",
+    "MicroBatcher",
+    "AsyncInferenceExecutor",
+    "default_async_executor",
+]
@@ -0,0 +1,305 @@
+"""Модуль для компактного формата сохранения классификаторов."""
+
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sklearn.base import BaseEstimator
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import LabelBinarizer
+
+from categoraize.models.centroid import CentroidClassifier
+from categoraize.models.incremental import write_json_atomic
+from categoraize.models.quantization import check_precision, dequantize, quantize
+
+logger = logging.getLogger(__name__)
+
+HEAD_ARRAYS_FILENAME = "head.npy"
+HEAD_HEADER_FILENAME = "head.json"
+HEAD_FORMAT_VERSION = 1
+
+# Выравнивание массивов внутри файла, чтобы срезы memmap были выровнены
+_ALIGNMENT = 16
+
+
+def export_head(classifier: BaseEstimator) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """
+    Извлечение весов обученного классификатора в виде массивов numpy.
+
+    Args:
+        classifier: Обученный LogisticRegression, SGDClassifier, MLPClassifier
+            или CentroidClassifier
+
+    Returns:
+        Tuple (описание классификатора, словарь {имя: массив весов})
+    """
+    header: dict[str, Any] = {
+        "classes": [int(c) for c in classifier.classes_],
+        "n_features": int(classifier.n_features_in_),
+    }
+    arrays: dict[str, np.ndarray] = {}
+
+    if isinstance(classifier, LogisticRegression | SGDClassifier):
+        header["kind"] = "linear"
+        # SGDClassifier нормирует независимые сигмоиды (one-vs-rest), а не softmax
+        header["multi_class"] = "ovr" if isinstance(classifier, SGDClassifier) else "multinomial"
+        arrays["coef"] = np.asarray(classifier.coef_, dtype=np.float32)
+        arrays["intercept"] = np.asarray(classifier.intercept_, dtype=np.float32)
+    elif isinstance(classifier, MLPClassifier):
+        header["kind"] = "mlp"
+        header["activation"] = classifier.activation
+        header["out_activation"] = classifier.out_activation_
+        header["n_layers"] = len(classifier.coefs_)
+        for idx, (coef, intercept) in enumerate(
+            zip(classifier.coefs_, classifier.intercepts_, strict=True)
+        ):
+            arrays[f"coef_{idx}"] = np.asarray(coef, dtype=np.float32)
+            arrays[f"intercept_{idx}"] = np.asarray(intercept, dtype=np.float32)
+    elif isinstance(classifier, CentroidClassifier):
+        header["kind"] = "centroid"
+        header["temperature"] = float(classifier.temperature)
+        arrays["sums"] = np.asarray(classifier.sums_, dtype=np.float32)
+        arrays["counts"] = np.asarray(classifier.counts_, dtype=np.int64)
+    else:
+        raise TypeError(
+            f"Компактный формат не поддерживает классификатор {type(classifier).__name__}"
+        )
+
+    return header, arrays
+
+
+def _fitted_label_binarizer(classes: np.ndarray) -> LabelBinarizer:
+    """
+    LabelBinarizer для известных меток классов без вызова fit.
+
+    fit проверяет параметры и определяет тип меток через type_of_target,
+    что при массовой загрузке MLP дороже восстановления самих весов.
+
+    Args:
+        classes: Отсортированные целочисленные метки классов
+
+    Returns:
+        Обученный LabelBinarizer
+    """
+    binarizer = LabelBinarizer()
+    binarizer.classes_ = classes
+    binarizer.y_type_ = "binary" if len(classes) <= 2 else "multiclass"
+    binarizer.sparse_input_ = False
+    return binarizer
+
+
+def restore_head(
+    header: dict[str, Any],
+    arrays: dict[str, np.ndarray],
+    classifier: BaseEstimator,
+) -> BaseEstimator:
+    """
+    Восстановление обученного классификатора sklearn из массивов весов.
+
+    Восстановленный классификатор пригоден для предсказаний; веса не
+    копируются, поэтому могут оставаться memory-mapped.
+
+    Args:
+        header: Описание классификатора (см. export_head)
+        arrays: Словарь {имя: массив весов}
+        classifier: Необученный классификатор нужного типа с параметрами модели
+
+    Returns:
+        Классификатор, готовый к predict/predict_proba
+    """
+    classes = np.array(header["classes"])
+
+    if header["kind"] == "linear" and isinstance(classifier, LogisticRegression | SGDClassifier):
+        classifier.coef_ = arrays["coef"]
+        classifier.intercept_ = arrays["intercept"]
+    elif header["kind"] == "mlp" and isinstance(classifier, MLPClassifier):
+        n_layers = header["n_layers"]
+        classifier.coefs_ = [arrays[f"coef_{idx}"] for idx in range(n_layers)]
+        classifier.intercepts_ = [arrays[f"intercept_{idx}"] for idx in range(n_layers)]
+        classifier.activation = header["activation"]
+        classifier.out_activation_ = header["out_activation"]
+        classifier.n_layers_ = n_layers + 1
+        classifier.n_outputs_ = int(classifier.coefs_[-1].shape[1])
+        classifier._label_binarizer = _fitted_label_binarizer(classes)
+    elif header["kind"] == "centroid" and isinstance(classifier, CentroidClassifier):
+        # Центроиды меняются при дообучении, поэтому веса копируются из memory map
+        classifier.temperature = header["temperature"]
+        classifier.sums_ = np.array(arrays["sums"], dtype=np.float32)
+        classifier.counts_ = np.array(arrays["counts"], dtype=np.int64)
+        classifier._update_centroids()
+    else:
+        raise ValueError(
+            f"Артефакт типа '{header['kind']}' не подходит для {type(classifier).__name__}"
+        )
+
+    classifier.classes_ = classes
+    classifier.n_features_in_ = header["n_features"]
+    return classifier
+
+
+def save_head_arrays(
+    save_path: str | Path,
+    header: dict[str, Any],
+    arrays: dict[str, np.ndarray],
+    precision: str = "float32",
+    atomic: bool = False,
+) -> None:
+    """
+    Сохранение весов в один файл head.npy и описания в head.json.
+
+    Все массивы записываются подряд в один байтовый буфер; в JSON
+    сохраняются их типы, формы, смещения и имя файла весов.
+
+    При atomic=True веса пишутся в новый файл с уникальным именем, а
+    head.json заменяется через os.replace последним: параллельные читатели
+    видят либо старую, либо новую версию классификатора целиком. Файлы
+    весов старше предыдущей версии удаляются.
+
+    Args:
+        save_path: Директория модели
+        header: Описание классификатора (метки, тип, гиперпараметры)
+        arrays: Словарь {имя: массив весов}
+        precision: Точность хранения матриц весов ('float32', 'float16' или
+            'int8' с масштабом на строку); смещения хранятся в float32
+        atomic: Публиковать ли новую версию атомарно
+    """
+    save_path = Path(save_path)
+    check_precision(precision)
+
+    # Матрицы весов квантуются, масштабы int8 сохраняются отдельными массивами
+    contiguous: dict[str, np.ndarray] = {}
+    scale_names: dict[str, str] = {}
+    for name, array in arrays.items():
+        if array.ndim == 2 and precision != "float32":
+            data, scales = quantize(array, precision)
+            contiguous[name] = np.ascontiguousarray(data)
+            if scales is not None:
+                scale_names[name] = f"{name}.scale"
+                contiguous[scale_names[name]] = scales
+        else:
+            contiguous[name] = np.ascontiguousarray(array)
+
+    entries: list[dict[str, Any]] = []
+    offsets: list[int] = []
+    offset = 0
+    for name, array in contiguous.items():
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        offsets.append(offset)
+        entries.append(
+            {
+                "name": name,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+        )
+        if name in scale_names:
+            entries[-1]["scale"] = scale_names[name]
+        offset += array.nbytes
+
+    buffer = np.zeros(offset, dtype=np.uint8)
+    for start, array in zip(offsets, contiguous.values(), strict=True):
+        raw = array.view(np.uint8).reshape(-1)
+        buffer[start : start + raw.size] = raw
+
+    header_path = save_path / HEAD_HEADER_FILENAME
+    arrays_filename = HEAD_ARRAYS_FILENAME
+    previous_filename = None
+    if atomic:
+        arrays_filename = f"head-{uuid.uuid4().hex[:12]}.npy"
+        if header_path.exists():
+            with header_path.open(encoding="utf-8") as f:
+                previous_filename = json.load(f).get("arrays_file", HEAD_ARRAYS_FILENAME)
+
+    with (save_path / arrays_filename).open("wb") as f:
+        np.save(f, buffer)
+        if atomic:
+            f.flush()
+            os.fsync(f.fileno())
+
+    full_header = {
+        "format_version": HEAD_FORMAT_VERSION,
+        **header,
+        "precision": precision,
+        "arrays_file": arrays_filename,
+        "arrays": entries,
+    }
+    if not atomic:
+        with header_path.open("w", encoding="utf-8") as f:
+            json.dump(full_header, f, indent=2, ensure_ascii=False)
+        return
+
+    write_json_atomic(header_path, full_header)
+    # Предыдущая версия остается для читателей, успевших прочитать старый head.json
+    _remove_stale_arrays(save_path, keep={arrays_filename, previous_filename})
+
+
+def _remove_stale_arrays(save_path: Path, keep: set[str | None]) -> None:
+    """
+    Удаление файлов весов, на которые больше не ссылается head.json.
+
+    Args:
+        save_path: Директория модели
+        keep: Имена файлов, которые нужно сохранить
+    """
+    for path in [save_path / HEAD_ARRAYS_FILENAME, *save_path.glob("head-*.npy")]:
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+
+
+def load_head_arrays(
+    load_path: str | Path,
+    mmap: bool = True,
+) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """
+    Загрузка весов из head.npy и описания из head.json.
+
+    Веса, сохраненные с пониженной точностью, восстанавливаются в float32
+    (и в этом случае не остаются memory-mapped).
+
+    Args:
+        load_path: Директория модели
+        mmap: Отображать ли файл весов в память вместо чтения целиком
+
+    Returns:
+        Tuple (описание классификатора, словарь {имя: массив весов})
+    """
+    load_path = Path(load_path)
+
+    with (load_path / HEAD_HEADER_FILENAME).open(encoding="utf-8") as f:
+        header: dict[str, Any] = json.load(f)
+
+    version = header.get("format_version")
+    if version != HEAD_FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия формата классификатора: {version}")
+
+    arrays_filename = header.pop("arrays_file", HEAD_ARRAYS_FILENAME)
+    buffer = np.load(load_path / arrays_filename, mmap_mode="r" if mmap else None)
+
+    entries = header.pop("arrays")
+    raw_arrays = {}
+    for entry in entries:
+        dtype = np.dtype(entry["dtype"])
+        size = int(np.prod(entry["shape"], dtype=np.int64)) * dtype.itemsize
+        raw = buffer[entry["offset"] : entry["offset"] + size]
+        raw_arrays[entry["name"]] = raw.view(dtype).reshape(entry["shape"])
+
+    scale_names = {entry["scale"] for entry in entries if "scale" in entry}
+    arrays = {}
+    for entry in entries:
+        name = entry["name"]
+        if name in scale_names:
+            continue
+        if "scale" in entry:
+            arrays[name] = dequantize(raw_arrays[name], raw_arrays[entry["scale"]])
+        elif raw_arrays[name].dtype == np.float16:
+            arrays[name] = dequantize(raw_arrays[name])
+        else:
+            arrays[name] = raw_arrays[name]
+
+    return header, arrays
@@ -0,0 +1,165 @@
+"""Модуль для асинхронного инференса в ограниченном пуле потоков."""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Параметры пула по умолчанию: эмбеддер сериализует прямые проходы,
+# поэтому больше пары потоков не ускоряет инференс
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_PENDING = 256
+
+
+class AsyncInferenceExecutor:
+    """
+    Ограниченный пул потоков для вызова блокирующего инференса из asyncio.
+
+    Кодирование и скоринг выполняются в потоках пула, а корутина ждет
+    результат, не блокируя event loop. Число запросов в работе (в очереди
+    пула и выполняющихся) ограничено max_pending: при переполнении запрос
+    сразу отклоняется с asyncio.QueueFull, чтобы сервис мог ответить 503,
+    а не копить очередь без предела.
+
+    Отмена корутины до начала выполнения снимает запрос с очереди пула;
+    уже выполняющийся вызов доводится до конца, а результат отбрасывается.
+    Один экземпляр можно разделять между моделями и event loop'ами.
+    """
+
+    def __init__(
+        self, max_workers: int = DEFAULT_MAX_WORKERS, max_pending: int = DEFAULT_MAX_PENDING
+    ) -> None:
+        """
+        Инициализация пула. Потоки создаются при первом запросе.
+
+        Args:
+            max_workers: Число потоков пула
+            max_pending: Максимальное число запросов в работе (в очереди и выполняющихся)
+        """
+        if max_workers < 1:
+            raise ValueError(f"Число потоков должно быть положительным, получено: {max_workers}")
+        if max_pending < max_workers:
+            raise ValueError(
+                f"Размер очереди ({max_pending}) не может быть меньше числа потоков ({max_workers})"
+            )
+
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "rejected": 0,
+        }
+
+    def _submit(self, func: Callable[..., T], *args: Any) -> Future:
+        """
+        Постановка вызова в пул с учетом лимита очереди.
+
+        Args:
+            func: Блокирующая функция
+            *args: Аргументы функции
+
+        Returns:
+            Future пула
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._counters["rejected"] += 1
+                raise asyncio.QueueFull(
+                    f"Очередь инференса заполнена: {self.max_pending} запросов в работе"
+                )
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="categoraize-async"
+                )
+            self._pending += 1
+            self._counters["submitted"] += 1
+            future = self._executor.submit(self._call, func, *args)
+
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _call(self, func: Callable[..., T], *args: Any) -> T:
+        """Выполнение вызова в потоке пула с учетом выполняющихся запросов."""
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _on_done(self, future: Future) -> None:
+        """Освобождение места в очереди после завершения или отмены вызова."""
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                self._counters["cancelled"] += 1
+            elif future.exception() is not None:
+                self._counters["failed"] += 1
+            else:
+                self._counters["completed"] += 1
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Выполнение блокирующей функции в пуле без блокировки event loop.
+
+        Args:
+            func: Блокирующая функция
+            *args: Аргументы функции
+
+        Returns:
+            Результат функции
+        """
+        future = self._submit(func, *args)
+        # wrap_future передает отмену корутины в Future пула
+        result: T = await asyncio.wrap_future(future)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Метрики очереди инференса.
+
+        Returns:
+            Словарь с глубиной очереди (queued), числом выполняющихся (running)
+            и всех запросов в работе (pending), а также счетчиками запросов
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                **self._counters,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Остановка потоков пула. При следующем запросе пул создается заново.
+
+        Args:
+            wait: Дождаться завершения уже поставленных вызовов
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+            logger.info("Пул асинхронного инференса остановлен")
+
+
+# Общий пул процесса: ограничивает суммарную нагрузку асинхронного инференса всех моделей
+default_async_executor = AsyncInferenceExecutor()
@@ -0,0 +1,213 @@
+"""Модуль для объединения одиночных запросов инференса в микро-батчи."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+from categoraize.models.classifier import ProductCategoryClassifier
+
+logger = logging.getLogger(__name__)
+
+# Параметры микро-батчей по умолчанию
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 2.0
+
+
+@dataclass
+class _Request:
+    """Запрос на классификацию одного продукта."""
+
+    product_title: str
+    future: Future = field(default_factory=Future)
+
+
+class MicroBatcher:
+    """
+    Потокобезопасный фронтенд модели для одиночных запросов.
+
+    Запросы из разных потоков попадают в общую очередь; фоновый поток
+    собирает их в микро-батч, пока батч не заполнится или не истечет
+    max_wait_ms с момента первого запроса, и выполняет один вызов
+    эмбеддера и классификатора на весь батч. Результаты возвращаются
+    вызывающим потокам через Future.
+
+    Ожидание добавляет к задержке не более max_wait_ms, а пропускная
+    способность растет за счет того, что прямой проход эмбеддера на батче
+    почти не дороже прохода на одной строке.
+    """
+
+    def __init__(
+        self,
+        model: ProductCategoryClassifier,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ) -> None:
+        """
+        Инициализация и запуск фонового потока.
+
+        Args:
+            model: Обученная модель
+            max_batch_size: Максимальный размер микро-батча
+            max_wait_ms: Максимальное ожидание следующих запросов после первого, мс
+        """
+        if not model.is_fitted:
+            raise ValueError("Модель не обучена")
+        if max_batch_size < 1:
+            raise ValueError(f"Размер батча должен быть положительным, получено: {max_batch_size}")
+        if max_wait_ms < 0:
+            raise ValueError(f"Время ожидания не может быть отрицательным, получено: {max_wait_ms}")
+
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: queue.SimpleQueue[_Request | None] = queue.SimpleQueue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._counters = {"requests": 0, "batches": 0, "errors": 0}
+
+        self._thread = threading.Thread(target=self._run, name="categoraize-batcher", daemon=True)
+        self._thread.start()
+
+        logger.info(f"Микро-батчи: до {max_batch_size} запросов, ожидание до {max_wait_ms:.1f} мс")
+
+    def submit(self, product_title: str) -> Future:
+        """
+        Постановка продукта в очередь на классификацию.
+
+        Args:
+            product_title: Название продукта
+
+        Returns:
+            Future с результатом (категория, уверенность)
+        """
+        request = _Request(product_title)
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher остановлен")
+            self._queue.put(request)
+        return request.future
+
+    def predict_with_confidence(
+        self, product_title: str, timeout: float | None = None
+    ) -> tuple[str, float]:
+        """
+        Предсказание категории одного продукта с уровнем уверенности.
+
+        Args:
+            product_title: Название продукта
+            timeout: Максимальное ожидание результата в секундах (опционально)
+
+        Returns:
+            Tuple (категория, уверенность)
+        """
+        result: tuple[str, float] = self.submit(product_title).result(timeout=timeout)
+        return result
+
+    def predict(self, product_title: str, timeout: float | None = None) -> str:
+        """
+        Предсказание категории одного продукта.
+
+        Args:
+            product_title: Название продукта
+            timeout: Максимальное ожидание результата в секундах (опционально)
+
+        Returns:
+            Категория
+        """
+        return self.predict_with_confidence(product_title, timeout=timeout)[0]
+
+    def _collect(self) -> tuple[list[_Request], bool]:
+        """
+        Сбор следующего микро-батча из очереди.
+
+        Returns:
+            Tuple (запросы батча, получен ли сигнал остановки)
+        """
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    request = self._queue.get(timeout=remaining)
+                else:
+                    # После дедлайна забираются только запросы, уже стоящие в очереди
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _run(self) -> None:
+        """Цикл фонового потока: сбор батчей и инференс."""
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            # Отмененные запросы не попадают в батч
+            batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+            if batch:
+                self._process(batch)
+
+    def _process(self, batch: list[_Request]) -> None:
+        """
+        Инференс на микро-батче и раздача результатов.
+
+        Args:
+            batch: Запросы батча
+        """
+        self._counters["requests"] += len(batch)
+        self._counters["batches"] += 1
+        try:
+            labels, confidences = self.model.predict_with_confidence(
+                [request.product_title for request in batch]
+            )
+        except Exception as e:
+            self._counters["errors"] += 1
+            logger.exception(f"Ошибка инференса на батче из {len(batch)} запросов")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        for request, label, confidence in zip(batch, labels, confidences, strict=True):
+            request.future.set_result((label, float(confidence)))
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Статистика микро-батчей.
+
+        Returns:
+            Словарь с числом запросов, батчей, ошибок и средним размером батча
+        """
+        counters = dict(self._counters)
+        return {
+            **counters,
+            "mean_batch_size": counters["requests"] / max(counters["batches"], 1),
+        }
+
+    def close(self) -> None:
+        """Остановка фонового потока после обработки уже поставленных запросов."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self) -> "MicroBatcher":
+        """Вход в контекстный менеджер."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Выход из контекстного менеджера с остановкой фонового потока."""
+        self.close()
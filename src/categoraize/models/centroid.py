@@ -0,0 +1,143 @@
+"""Модуль для классификатора по ближайшему центроиду категории."""
+
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    """Нормализация строк по L2 (нулевые строки остаются нулевыми)."""
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    result: np.ndarray = x / norms
+    return result
+
+
+class CentroidClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Классификатор по косинусной близости к центроидам категорий.
+
+    Для каждой категории хранится сумма нормализованных эмбеддингов и число
+    примеров; центроид - нормализованное среднее. Обучение - один проход по
+    данным без итераций, добавление одного примера - O(embedding_dim).
+    Вероятности - softmax косинусных близостей с температурой.
+    """
+
+    def __init__(self, temperature: float = 0.05) -> None:
+        """
+        Инициализация классификатора.
+
+        Args:
+            temperature: Температура softmax: чем меньше, тем увереннее
+                вероятности при одинаковых косинусных близостях
+        """
+        self.temperature = temperature
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> "CentroidClassifier":
+        """
+        Вычисление центроидов категорий.
+
+        Args:
+            X: Эмбеддинги формы (n_samples, n_features)
+            y: Метки классов
+
+        Returns:
+            self
+        """
+        X = np.asarray(X, dtype=np.float32)
+        self.classes_, inverse = np.unique(np.asarray(y), return_inverse=True)
+        self.n_features_in_ = X.shape[1]
+
+        self.sums_ = np.zeros((len(self.classes_), X.shape[1]), dtype=np.float32)
+        np.add.at(self.sums_, inverse, _normalize(X))
+        self.counts_ = np.bincount(inverse, minlength=len(self.classes_)).astype(np.int64)
+        self._update_centroids()
+        return self
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray) -> "CentroidClassifier":
+        """
+        Добавление примеров к центроидам без пересчета по всей выборке.
+
+        Новые метки добавляются как новые категории.
+
+        Args:
+            X: Эмбеддинги формы (n_samples, n_features)
+            y: Метки классов
+
+        Returns:
+            self
+        """
+        if not hasattr(self, "classes_"):
+            return self.fit(X, y)
+
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y)
+        new_classes = np.setdiff1d(np.unique(y), self.classes_)
+        if len(new_classes) > 0:
+            self.classes_ = np.concatenate([self.classes_, new_classes])
+            self.sums_ = np.vstack(
+                [self.sums_, np.zeros((len(new_classes), self.n_features_in_), dtype=np.float32)]
+            )
+            self.counts_ = np.concatenate(
+                [self.counts_, np.zeros(len(new_classes), dtype=np.int64)]
+            )
+            # classes_ должны оставаться отсортированными, как у sklearn
+            order = np.argsort(self.classes_, kind="stable")
+            self.classes_ = self.classes_[order]
+            self.sums_ = self.sums_[order]
+            self.counts_ = self.counts_[order]
+            self._update_centroids()
+
+        rows = np.searchsorted(self.classes_, y)
+        np.add.at(self.sums_, rows, _normalize(X))
+        np.add.at(self.counts_, rows, 1)
+
+        # Пересчитываются только затронутые центроиды
+        touched = np.unique(rows)
+        self.centroids_[touched] = _normalize(self.sums_[touched])
+        return self
+
+    def _update_centroids(self) -> None:
+        """Пересчет всех центроидов из сумм."""
+        self.centroids_ = _normalize(self.sums_)
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """
+        Косинусные близости эмбеддингов к центроидам.
+
+        Args:
+            X: Эмбеддинги формы (n_samples, n_features)
+
+        Returns:
+            Массив близостей формы (n_samples, n_classes)
+        """
+        scores: np.ndarray = _normalize(np.asarray(X, dtype=np.float32)) @ self.centroids_.T
+        return scores
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Вероятности классов (softmax близостей с температурой).
+
+        Args:
+            X: Эмбеддинги формы (n_samples, n_features)
+
+        Returns:
+            Массив вероятностей формы (n_samples, n_classes)
+        """
+        logits = self.decision_function(X) / self.temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=1, keepdims=True)
+        return logits
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Предсказание классов.
+
+        Args:
+            X: Эмбеддинги формы (n_samples, n_features)
+
+        Returns:
+            Массив меток классов
+        """
+        result: np.ndarray = self.classes_[self.decision_function(X).argmax(axis=1)]
+        return result
@@ -1,17 +1,82 @@
 """Модуль для модели классификации продуктов по категориям."""
 
 import logging
+import shutil
+import threading
+import time
+import weakref
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 import joblib
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
+from sentence_transformers.util import batch_to_device
 from sklearn.base import BaseEstimator
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.neural_network import MLPClassifier
 
+from categoraize.models.artifacts import (
+    export_head,
+    load_head_arrays,
+    restore_head,
+    save_head_arrays,
+)
+from categoraize.models.async_inference import AsyncInferenceExecutor, default_async_executor
+from categoraize.models.centroid import CentroidClassifier
+from categoraize.models.embedder_registry import EmbedderRegistry, default_registry
+from categoraize.models.embedding_cache import (
+    DiskEmbeddingCache,
+    MemoryEmbeddingCache,
+    get_shared_memory_cache,
+    hash_texts,
+)
+from categoraize.models.incremental import (
+    ensure_writable,
+    extend_classes,
+    imprint_class,
+    output_features,
+    proximal_refit,
+    transfer_weights,
+    write_json_atomic,
+)
+from categoraize.models.numpy_head import DEFAULT_BUFFER_ROWS, NumpyHead
+from categoraize.models.projection import EmbeddingProjection
+from categoraize.models.quantization import check_precision, round_trip
+
 logger = logging.getLogger(__name__)
 
+# Форматы сохранения классификатора
+HEAD_FORMATS = ("joblib", "npy")
+
+# Типы классификаторов, поддерживающие дообучение через partial_fit
+PARTIAL_FIT_TYPES = ("centroid", "sgd", "mlp", "lr")
+
+# Типы классификаторов, поддерживающие warm start от предыдущей модели
+WARM_START_TYPES = ("lr", "mlp", "sgd")
+
+# Число текстов, токенизируемых за раз при батчах по бюджету токенов: паддинг
+# окна ограничен его самым длинным текстом, а не всем входом
+TOKENIZE_WINDOW = 4096
+
+
+@dataclass
+class InferenceResult:
+    """Результат инференса для списка продуктов."""
+
+    # Предсказанные категории
+    labels: list[str]
+    # Вероятность предсказанной категории, форма (n_products,)
+    confidences: np.ndarray
+    # Top-k категорий для каждого продукта по убыванию вероятности
+    top_k_labels: list[list[str]]
+    # Вероятности top-k категорий, форма (n_products, k)
+    top_k_scores: np.ndarray
+    # Полная матрица вероятностей, форма (n_products, n_classes)
+    probabilities: np.ndarray
+
 
 class ProductCategoryClassifier:
     """
@@ -21,37 +86,129 @@ class ProductCategoryClassifier:
     затем легкий классификатор для финального предсказания.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         embedding_model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
         classifier_type: str = "mlp",
         classifier_params: dict | None = None,
+        embedding_cache_dir: str | Path | None = None,
+        memory_cache_bytes: int | None = None,
+        max_seq_length: int | None = None,
+        max_tokens_per_batch: int | None = None,
+        embedder_path: str | Path | None = None,
+        classifier: BaseEstimator | None = None,
+        embedder_registry: EmbedderRegistry | None = None,
+        embedding_precision: str = "float32",
+        projection: EmbeddingProjection | None = None,
+        async_executor: AsyncInferenceExecutor | None = None,
     ) -> None:
         """
         Инициализация модели.
 
+        Эмбеддер загружается лениво - при первом кодировании текстов - и берется
+        из разделяемого реестра, поэтому классификаторы с одной моделью
+        эмбеддингов используют общий экземпляр весов.
+
         Args:
             embedding_model_name: Название модели для эмбеддингов
-            classifier_type: Тип классификатора ('lr' или 'mlp')
+            classifier_type: Тип классификатора ('lr', 'mlp', 'centroid' или 'sgd')
             classifier_params: Параметры классификатора
+            embedding_cache_dir: Директория дискового кэша эмбеддингов (опционально)
+            memory_cache_bytes: Бюджет LRU-кэша эмбеддингов в памяти в байтах (опционально)
+            max_seq_length: Максимальная длина входа эмбеддера в токенах,
+                более длинные тексты обрезаются (по умолчанию - из модели)
+            max_tokens_per_batch: Бюджет токенов на батч эмбеддера с учетом паддинга.
+                Если задан, тексты группируются по длине и батчи формируются
+                по бюджету токенов, а не по фиксированному числу текстов
+            embedder_path: Локальная директория с весами эмбеддера. Если задана,
+                эмбеддер загружается из нее без обращения к Hugging Face Hub
+            classifier: Готовый классификатор (например, загруженный с диска).
+                Если не задан, создается по classifier_type и classifier_params
+            embedder_registry: Реестр эмбеддеров (по умолчанию - общий для процесса)
+            embedding_precision: Точность эмбеддингов: 'float32' (по умолчанию),
+                'float16' или 'int8' с масштабом на вектор. Эмбеддинги хранятся
+                в кэшах с этой точностью, а новые эмбеддинги приводятся к ней,
+                чтобы обучение и инференс видели одинаковые векторы
+            projection: Проекция эмбеддингов в пространство меньшей размерности
+                перед классификатором (опционально). Обучается вместе с моделью
+            async_executor: Пул потоков для apredict/apredict_proba/ainfer
+                (по умолчанию - общий для процесса)
         """
         self.embedding_model_name = embedding_model_name
         self.classifier_type = classifier_type
         self.classifier_params = classifier_params or {}
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.embedder_path = Path(embedder_path) if embedder_path is not None else None
+        self.embedding_cache_dir = embedding_cache_dir
+        self.memory_cache_bytes = memory_cache_bytes
+        self.embedding_precision = check_precision(embedding_precision)
+        self.projection = projection
+        self.embedder_registry = (
+            embedder_registry if embedder_registry is not None else default_registry
+        )
+        self.async_executor = (
+            async_executor if async_executor is not None else default_async_executor
+        )
 
-        # Инициализация эмбеддера
-        logger.info(f"Загрузка эмбеддера: {embedding_model_name}")
-        self.embedder = SentenceTransformer(embedding_model_name)
-        self.embedding_dim = self.embedder.get_sentence_embedding_dimension()
-        logger.info(f"Размерность эмбеддингов: {self.embedding_dim}")
+        # Эмбеддер и кэши создаются при первом обращении
+        self._embedder: SentenceTransformer | None = None
+        self._embedder_release: weakref.finalize | None = None
+        self._embedder_lock = threading.Lock()
+        self._inference_lock: threading.Lock | None = None
+        self._embedding_dim: int | None = None
+        self._max_seq_length = max_seq_length
+        self._embedding_cache: DiskEmbeddingCache | None = None
+        self._memory_cache: MemoryEmbeddingCache | None = None
+
+        # Счетчики кодирования для отладочных метрик
+        self._encode_counters = {
+            "texts": 0,
+            "unique_texts": 0,
+            "embedded_texts": 0,
+            "batches": 0,
+            "tokens": 0,
+            "padded_tokens": 0,
+        }
 
         # Инициализация классификатора
-        if classifier_type == "lr":
+        self.classifier: BaseEstimator = (
+            classifier if classifier is not None else self._build_classifier()
+        )
+
+        logger.info(f"Инициализирован классификатор типа: {classifier_type}")
+
+        # Метаданные
+        self.id_to_label: dict[int, str] | None = None
+        self.label_to_id: dict[str, int] | None = None
+        self.is_fitted = False
+        # Номер версии весов: увеличивается при каждом изменении классификатора
+        # и категорий, по нему производные структуры (MultiTenantScorer) узнают,
+        # что их копии весов устарели
+        self.head_version = 0
+        # Удаленные категории: их столбцы маскируются при предсказании
+        self.removed_categories: set[str] = set()
+        # Среднее входов выходного слоя на обучающей выборке (для add_category)
+        self.background_mean: np.ndarray | None = None
+        self._column_labels_cache: np.ndarray | None = None
+        self._removed_columns_cache: np.ndarray | None = None
+        # Скомпилированный классификатор на NumPy (см. compile_head)
+        self._compiled_head: NumpyHead | None = None
+        # Нормализованные эмбеддинги названий категорий (см. category_matrix)
+        self._category_matrix: tuple[tuple[str, ...], np.ndarray] | None = None
+
+    def _build_classifier(self) -> BaseEstimator:
+        """
+        Создание необученного классификатора по classifier_type.
+
+        Returns:
+            Классификатор sklearn
+        """
+        if self.classifier_type == "lr":
             # Убираем max_iter из дефолтных параметров, если он уже есть в classifier_params
             lr_params: dict[str, int] = {"max_iter": 1000, "random_state": 42}
             lr_params.update(self.classifier_params)
-            self.classifier: BaseEstimator = LogisticRegression(**lr_params)
-        elif classifier_type == "mlp":
+            return LogisticRegression(**lr_params)
+        if self.classifier_type == "mlp":
             mlp_params: dict[str, int | tuple[int, int] | bool | float] = {
                 "hidden_layer_sizes": (128, 64),
                 "max_iter": 500,
@@ -60,21 +217,126 @@ class ProductCategoryClassifier:
                 "validation_fraction": 0.1,
             }
             mlp_params.update(self.classifier_params)
-            self.classifier = MLPClassifier(**mlp_params)
-        else:
-            raise ValueError(f"Неизвестный тип классификатора: {classifier_type}")
+            return MLPClassifier(**mlp_params)
+        if self.classifier_type == "centroid":
+            return CentroidClassifier(**self.classifier_params)
+        if self.classifier_type == "sgd":
+            # Логистическая регрессия, обучаемая SGD: поддерживает partial_fit
+            sgd_params: dict[str, Any] = {"loss": "log_loss", "random_state": 42}
+            sgd_params.update(self.classifier_params)
+            return SGDClassifier(**sgd_params)
+        raise ValueError(f"Неизвестный тип классификатора: {self.classifier_type}")
+
+    @property
+    def embedder(self) -> SentenceTransformer:
+        """Эмбеддер; загружается при первом обращении."""
+        if self._embedder is None:
+            with self._embedder_lock:
+                if self._embedder is None:
+                    self._embedder = self._load_embedder()
+        return self._embedder
+
+    def _load_embedder(self) -> SentenceTransformer:
+        """
+        Получение эмбеддера из реестра.
 
-        logger.info(f"Инициализирован классификатор типа: {classifier_type}")
+        Эмбеддер загружается из локальной директории (если задана) или по
+        названию модели только в том случае, если в реестре его еще нет.
+        Ссылка возвращается в реестр при close() или сборке мусора.
 
-        # Метаданные
-        self.id_to_label: dict[int, str] | None = None
-        self.label_to_id: dict[str, int] | None = None
-        self.is_fitted = False
+        Returns:
+            Общий экземпляр эмбеддера
+        """
+        embedder = self.embedder_registry.acquire(
+            self.embedding_model_name,
+            source=self.embedder_path,
+            max_seq_length=self._max_seq_length,
+        )
+        self._embedder_release = weakref.finalize(
+            self,
+            self.embedder_registry.release,
+            self.embedding_model_name,
+            self._max_seq_length,
+        )
+        self._inference_lock = self.embedder_registry.inference_lock(
+            self.embedding_model_name, self._max_seq_length
+        )
+
+        dim = embedder.get_sentence_embedding_dimension()
+        if self._embedding_dim is not None and dim != self._embedding_dim:
+            self._embedder_release()
+            raise ValueError(
+                f"Размерность эмбеддера {self.embedding_model_name} ({dim}) не совпадает "
+                f"с ожидаемой ({self._embedding_dim})"
+            )
+        self._embedding_dim = dim
+
+        return embedder
+
+    def close(self) -> None:
+        """Возврат эмбеддера в реестр. Модель можно продолжать использовать."""
+        with self._embedder_lock:
+            release, self._embedder_release = self._embedder_release, None
+            self._embedder = None
+            self._inference_lock = None
+        if release is not None:
+            release()
+
+    @property
+    def embedding_dim(self) -> int:
+        """Размерность эмбеддингов."""
+        if self._embedding_dim is None:
+            self._embedding_dim = self.embedder.get_sentence_embedding_dimension()
+        return self._embedding_dim
+
+    @property
+    def max_seq_length(self) -> int:
+        """Максимальная длина входа эмбеддера в токенах."""
+        if self._max_seq_length is None:
+            self._max_seq_length = int(self.embedder.max_seq_length)
+        return self._max_seq_length
+
+    @property
+    def embedding_cache(self) -> DiskEmbeddingCache | None:
+        """Дисковый кэш эмбеддингов, общий для перезапусков и параллельных процессов."""
+        if self._embedding_cache is None and self.embedding_cache_dir is not None:
+            self._embedding_cache = DiskEmbeddingCache(
+                self.embedding_cache_dir,
+                embedder_id=self.embedder_id,
+                embedding_dim=self.embedding_dim,
+                precision=self.embedding_precision,
+            )
+        return self._embedding_cache
+
+    @property
+    def memory_cache(self) -> MemoryEmbeddingCache | None:
+        """LRU-кэш в памяти, общий для всех классификаторов с тем же эмбеддером."""
+        if self._memory_cache is None and self.memory_cache_bytes is not None:
+            self._memory_cache = get_shared_memory_cache(
+                self.embedder_id,
+                embedding_dim=self.embedding_dim,
+                max_bytes=self.memory_cache_bytes,
+                precision=self.embedding_precision,
+            )
+        return self._memory_cache
+
+    @property
+    def embedder_id(self) -> str:
+        """Идентификатор эмбеддера, используемый как пространство имен кэша."""
+        return (
+            f"{self.embedding_model_name}|dim={self.embedding_dim}"
+            f"|max_seq_length={self.max_seq_length}"
+        )
 
     def encode_products(self, products: list[str]) -> np.ndarray:
         """
         Получение эмбеддингов для продуктов.
 
+        Дубликаты внутри батча (с точностью до нормализации пробелов)
+        кодируются один раз, результат раскладывается обратно по обратному
+        индексу. Уникальные строки ищутся сначала в LRU-кэше в памяти, затем
+        в дисковом кэше; в эмбеддер передаются только промахи всех уровней.
+
         Args:
             products: Список названий продуктов
 
@@ -82,8 +344,202 @@ class ProductCategoryClassifier:
             Массив эмбеддингов формы (n_products, embedding_dim)
         """
         logger.debug(f"Кодирование {len(products)} продуктов")
-        embeddings = self.embedder.encode(products, show_progress_bar=False)
-        return np.array(embeddings)
+
+        if len(products) == 0:
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
+
+        keys = hash_texts(products)
+        unique_keys, first_idx, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        unique_products = [products[i] for i in first_idx]
+
+        embeddings = np.empty((len(unique_products), self.embedding_dim), dtype=np.float32)
+
+        # Последовательный проход по уровням кэша: каждый следующий уровень
+        # получает только то, что не нашлось на предыдущих
+        caches = [c for c in (self.memory_cache, self.embedding_cache) if c is not None]
+        missing = np.arange(len(unique_products))
+        tier_misses = []
+        for cache in caches:
+            if len(missing) == 0:
+                break
+            cached, found = cache.lookup(unique_keys[missing])
+            embeddings[missing[found]] = cached[found]
+            missing = missing[~found]
+            tier_misses.append((cache, missing))
+
+        if len(missing) > 0:
+            embeddings[missing] = round_trip(
+                self._embed([unique_products[i] for i in missing]), self.embedding_precision
+            )
+
+        # Каждый уровень дополняется тем, что в нем не нашлось
+        for cache, tier_missing in tier_misses:
+            if len(tier_missing) > 0:
+                cache.put(unique_keys[tier_missing], embeddings[tier_missing])
+
+        self._encode_counters["texts"] += len(products)
+        self._encode_counters["unique_texts"] += len(unique_products)
+        self._encode_counters["embedded_texts"] += len(missing)
+        logger.debug(
+            f"Кодирование: {len(products)} текстов, {len(unique_products)} уникальных "
+            f"(дедупликация {1 - len(unique_products) / len(products):.1%}), "
+            f"{len(missing)} переданы в эмбеддер"
+        )
+
+        return embeddings[inverse.reshape(-1)]
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        """
+        Прямой проход эмбеддера без кэширования.
+
+        Вызовы эмбеддера сериализуются блокировкой, общей для всех
+        классификаторов с этим эмбеддером: токенизатор Hugging Face не
+        потокобезопасен. Эмбеддер и блокировка читаются вместе под
+        _embedder_lock, поэтому параллельный close() не может оставить
+        проход без блокировки: он дорабатывает на полученном экземпляре.
+
+        Args:
+            texts: Список текстов
+
+        Returns:
+            Массив эмбеддингов формы (n_texts, embedding_dim) с типом float32
+        """
+        with self._embedder_lock:
+            if self._embedder is None:
+                self._embedder = self._load_embedder()
+            embedder, inference_lock = self._embedder, self._inference_lock
+        if inference_lock is None:
+            raise ValueError("Эмбеддер не загружен")
+        with inference_lock:
+            return self._forward(embedder, texts)
+
+    def _forward(self, embedder: SentenceTransformer, texts: list[str]) -> np.ndarray:
+        """
+        Прямой проход эмбеддера (вызывается под блокировкой эмбеддера).
+
+        При заданном max_tokens_per_batch тексты токенизируются окнами по
+        TOKENIZE_WINDOW штук; внутри окна они сортируются по длине в токенах
+        и нарезаются на батчи так, чтобы число токенов с учетом паддинга
+        (размер батча x длина самого длинного текста) не превышало бюджет.
+        Короткие тексты идут большими батчами, длинные - маленькими, а
+        эмбеддинги возвращаются в исходном порядке.
+
+        Args:
+            embedder: Эмбеддер
+            texts: Список текстов
+
+        Returns:
+            Массив эмбеддингов формы (n_texts, embedding_dim) с типом float32
+        """
+        tokenizer = getattr(embedder, "tokenizer", None)
+        if (
+            self.max_tokens_per_batch is None
+            or len(texts) <= 1
+            or getattr(tokenizer, "padding_side", "right") != "right"
+        ):
+            embeddings = embedder.encode(texts, show_progress_bar=False)
+            self._encode_counters["batches"] += 1
+            return np.asarray(embeddings, dtype=np.float32)
+
+        result = np.empty((len(texts), self.embedding_dim), dtype=np.float32)
+        for start in range(0, len(texts), TOKENIZE_WINDOW):
+            window = texts[start : start + TOKENIZE_WINDOW]
+            result[start : start + len(window)] = self._forward_window(embedder, window)
+        return result
+
+    def _forward_window(self, embedder: SentenceTransformer, texts: list[str]) -> np.ndarray:
+        """
+        Прямой проход эмбеддера по окну текстов батчами по бюджету токенов.
+
+        Args:
+            embedder: Эмбеддер
+            texts: Тексты окна
+
+        Returns:
+            Массив эмбеддингов формы (n_texts, embedding_dim) с типом float32
+        """
+        # Токенизация окна (с обрезкой по max_seq_length); паддинг справа,
+        # поэтому батч из коротких текстов - это срез по первым столбцам
+        features = embedder.tokenize(texts)
+        lengths = features["attention_mask"].sum(dim=1).numpy()
+        order = np.argsort(lengths, kind="stable")
+
+        result = np.empty((len(texts), self.embedding_dim), dtype=np.float32)
+        device = embedder.device
+        for batch in self._token_budget_batches(lengths[order]):
+            positions = order[batch]
+            max_length = int(lengths[positions].max())
+            rows = torch.from_numpy(positions)
+            batch_features = {
+                name: (
+                    value[rows, :max_length]
+                    if isinstance(value, torch.Tensor) and value.dim() == 2
+                    else value
+                )
+                for name, value in features.items()
+            }
+
+            with torch.no_grad():
+                output = embedder.forward(batch_to_device(batch_features, device))
+            result[positions] = output["sentence_embedding"].float().cpu().numpy()
+
+            self._encode_counters["batches"] += 1
+            self._encode_counters["tokens"] += int(lengths[positions].sum())
+            self._encode_counters["padded_tokens"] += len(positions) * max_length
+
+        return result
+
+    def _token_budget_batches(self, sorted_lengths: np.ndarray) -> list[slice]:
+        """
+        Нарезка отсортированных по возрастанию длин на батчи по бюджету токенов.
+
+        Args:
+            sorted_lengths: Длины текстов в токенах, отсортированные по возрастанию
+
+        Returns:
+            Список срезов, задающих батчи
+        """
+        budget = self.max_tokens_per_batch or 0
+        batches = []
+        start = 0
+        for end in range(1, len(sorted_lengths) + 1):
+            # Длины отсортированы, поэтому самый длинный текст батча - последний
+            if end - start > 1 and (end - start) * sorted_lengths[end - 1] > budget:
+                batches.append(slice(start, end - 1))
+                start = end - 1
+        batches.append(slice(start, len(sorted_lengths)))
+        return batches
+
+    def encode_metrics(self) -> dict[str, Any]:
+        """
+        Накопленные метрики кодирования продуктов.
+
+        Returns:
+            Словарь с количеством текстов, уникальных текстов, текстов,
+            дошедших до эмбеддера, батчей и токенов, а также долями
+            дедупликации, сэкономленных проходов и полезных (не паддинг) токенов
+        """
+        metrics: dict[str, Any] = dict(self._encode_counters)
+        texts = metrics["texts"]
+        metrics["dedup_ratio"] = 1 - metrics["unique_texts"] / texts if texts > 0 else 0.0
+        metrics["saved_ratio"] = 1 - metrics["embedded_texts"] / texts if texts > 0 else 0.0
+        padded = metrics["padded_tokens"]
+        metrics["padding_efficiency"] = metrics["tokens"] / padded if padded > 0 else 1.0
+        return metrics
+
+    def embedding_cache_stats(self) -> dict[str, Any]:
+        """
+        Статистика кэшей эмбеддингов.
+
+        Returns:
+            Словарь {уровень кэша: статистика} для включенных уровней ('memory', 'disk')
+        """
+        stats: dict[str, Any] = {}
+        if self.memory_cache is not None:
+            stats["memory"] = self.memory_cache.stats()
+        if self.embedding_cache is not None:
+            stats["disk"] = self.embedding_cache.stats()
+        return stats
 
     def encode_categories(self, categories: list[str]) -> np.ndarray:
         """
@@ -96,14 +552,36 @@ class ProductCategoryClassifier:
             Массив эмбеддингов формы (n_categories, embedding_dim)
         """
         logger.debug(f"Кодирование {len(categories)} категорий")
-        embeddings = self.embedder.encode(categories, show_progress_bar=False)
-        return np.array(embeddings)
+        return self._embed(categories)
+
+    def category_matrix(self, categories: list[str]) -> tuple[list[str], np.ndarray]:
+        """
+        Нормализованные по L2 эмбеддинги названий категорий.
+
+        Матрица кэшируется и пересчитывается только при изменении набора
+        категорий; порядок и повторы в categories не важны.
+
+        Args:
+            categories: Список названий категорий
+
+        Returns:
+            Tuple (отсортированные уникальные категории, матрица формы
+            (n_categories, embedding_dim) в float32)
+        """
+        key = tuple(sorted(set(categories)))
+        if self._category_matrix is None or self._category_matrix[0] != key:
+            embeddings = self.encode_categories(list(key)).astype(np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._category_matrix = (key, embeddings / norms)
+        return list(key), self._category_matrix[1]
 
     def fit(
         self,
         product_titles: list[str],
         categories: list[str],
         class_weights: np.ndarray | None = None,
+        warm_start_from: "ProductCategoryClassifier | None" = None,
     ) -> "ProductCategoryClassifier":
         """
         Обучение модели.
@@ -112,24 +590,113 @@ class ProductCategoryClassifier:
             product_titles: Список названий продуктов
             categories: Список категорий (строками)
             class_weights: Веса классов (опционально)
+            warm_start_from: Предыдущая модель, с весов которой продолжается
+                оптимизация (опционально, см. fit_from_embeddings)
 
         Returns:
             self
         """
         logger.info(f"Начало обучения на {len(product_titles)} примерах")
 
+        # Получение эмбеддингов для продуктов
+        x_data = self.encode_products(product_titles)
+
+        return self.fit_from_embeddings(
+            x_data, categories, class_weights=class_weights, warm_start_from=warm_start_from
+        )
+
+    def fit_zero_shot(self, categories: list[str]) -> "ProductCategoryClassifier":
+        """
+        Обучение без размеченных примеров (холодный старт).
+
+        Центроидом каждой категории становится эмбеддинг ее названия, а
+        вероятности - softmax косинусных близостей с температурой. Предсказание
+        стоит одного кодирования названий продуктов и одного умножения матриц.
+        Последующий partial_fit уточняет центроиды по размеченным примерам
+        (название категории остается в центроиде как один пример).
+
+        Поддерживается классификатором 'centroid'.
+
+        Args:
+            categories: Список названий категорий пользователя
+
+        Returns:
+            self
+        """
+        if self.classifier_type != "centroid":
+            raise ValueError(
+                f"Zero-shot режим не поддерживается для классификатора типа "
+                f"{self.classifier_type}"
+            )
+        if self.projection is not None and not self.projection.is_fitted:
+            raise ValueError("Zero-shot режим требует обученную проекцию эмбеддингов")
+
+        labels, matrix = self.category_matrix(categories)
+        self.label_to_id = {label: idx for idx, label in enumerate(labels)}
+        self.id_to_label = dict(enumerate(labels))
+        self.removed_categories = set()
+        self._column_labels_cache = None
+        self._removed_columns_cache = None
+        self._compiled_head = None
+        self.head_version += 1
+
+        self.classifier.fit(self.project(matrix), np.arange(len(labels)))
+        self.is_fitted = True
+        logger.info(f"Zero-shot классификатор по {len(labels)} названиям категорий")
+
+        return self
+
+    def fit_from_embeddings(
+        self,
+        embeddings: np.ndarray,
+        categories: list[str],
+        class_weights: np.ndarray | None = None,
+        warm_start_from: "ProductCategoryClassifier | None" = None,
+    ) -> "ProductCategoryClassifier":
+        """
+        Обучение модели по готовым эмбеддингам.
+
+        Позволяет обучить несколько классификаторов на одних и тех же
+        эмбеддингах без повторного прохода эмбеддера.
+
+        При warm start оптимизация начинается с весов предыдущей модели того
+        же типа: строки выходного слоя сопоставляются по названиям категорий,
+        новые категории получают нулевые веса, удаленные отбрасываются.
+        Проекция эмбеддингов берется из предыдущей модели без переобучения,
+        чтобы признаки совпадали.
+
+        Args:
+            embeddings: Эмбеддинги продуктов формы (n_products, embedding_dim)
+            categories: Список категорий (строками)
+            class_weights: Веса классов (опционально)
+            warm_start_from: Предыдущая обученная модель (опционально,
+                для классификаторов 'lr', 'mlp' и 'sgd')
+
+        Returns:
+            self
+        """
         # Создание mapping для категорий
         unique_categories = sorted(set(categories))
         self.label_to_id = {label: idx for idx, label in enumerate(unique_categories)}
         self.id_to_label = {idx: label for label, idx in self.label_to_id.items()}
+        self.removed_categories = set()
+        self._column_labels_cache = None
+        self._removed_columns_cache = None
+        self._compiled_head = None
+        self.head_version += 1
 
         logger.info(f"Количество категорий: {len(unique_categories)}")
 
         # Кодирование категорий в числовые метки
         y_data = np.array([self.label_to_id[cat] for cat in categories])
 
-        # Получение эмбеддингов для продуктов
-        x_data = self.encode_products(product_titles)
+        x_data = embeddings
+        if warm_start_from is not None:
+            x_data = warm_start_from.project(x_data)
+            self._transfer_weights(warm_start_from, n_features=x_data.shape[1])
+            self.projection = warm_start_from.projection
+        elif self.projection is not None:
+            x_data = self.projection.fit(x_data).transform(x_data)
 
         logger.info(f"Форма данных для обучения: X={x_data.shape}, y={y_data.shape}")
 
@@ -140,13 +707,279 @@ class ProductCategoryClassifier:
             self.classifier.set_params(class_weight=class_weight_dict)
 
         logger.info("Обучение классификатора...")
-        self.classifier.fit(x_data, y_data)
+        try:
+            self.classifier.fit(x_data, y_data)
+        finally:
+            if warm_start_from is not None:
+                # Следующий fit снова начинается с нуля
+                self.classifier.set_params(warm_start=False)
+
+        if not isinstance(self.classifier, CentroidClassifier):
+            self.background_mean = output_features(self.classifier, x_data).mean(axis=0)
 
         self.is_fitted = True
         logger.info("Обучение завершено успешно")
 
         return self
 
+    def _transfer_weights(self, previous: "ProductCategoryClassifier", n_features: int) -> None:
+        """
+        Перенос весов предыдущей модели в необученный классификатор.
+
+        Args:
+            previous: Предыдущая обученная модель
+            n_features: Размерность признаков классификатора
+        """
+        if self.classifier_type not in WARM_START_TYPES:
+            raise ValueError(
+                f"Warm start не поддерживается для классификатора типа {self.classifier_type}"
+            )
+        if previous.classifier_type != self.classifier_type:
+            raise ValueError(
+                f"Тип классификатора изменился: {previous.classifier_type} -> "
+                f"{self.classifier_type}"
+            )
+        if previous.embedding_model_name != self.embedding_model_name:
+            raise ValueError(
+                f"Модель эмбеддингов изменилась: {previous.embedding_model_name} -> "
+                f"{self.embedding_model_name}"
+            )
+        if self.id_to_label is None:
+            raise ValueError("Метки категорий не заданы")
+
+        previous_rows = {label: row for row, label in enumerate(previous._column_labels())}
+        rows = np.array(
+            [previous_rows.get(self.id_to_label[idx], -1) for idx in range(len(self.id_to_label))]
+        )
+        transfer_weights(previous.classifier, self.classifier, rows, n_features=n_features)
+
+        n_new = int((rows < 0).sum())
+        n_removed = len(previous_rows) - (len(rows) - n_new)
+        logger.info(
+            f"Warm start от предыдущей модели: новых категорий {n_new}, удаленных {n_removed}"
+        )
+
+    def partial_fit(
+        self,
+        product_titles: list[str],
+        categories: list[str],
+    ) -> "ProductCategoryClassifier":
+        """
+        Дообучение модели на новых размеченных примерах.
+
+        Поддерживается классификаторами:
+
+        - 'centroid': каждый пример обновляет только центроид своей категории;
+        - 'sgd': один проход SGD по примерам, для новых категорий добавляются
+          нулевые строки весов;
+        - 'mlp': один проход оптимизатора по примерам, только для известных
+          категорий (число выходов сети фиксировано);
+        - 'lr': веса уточняются по примерам со штрафом за отклонение от
+          текущих весов (см. proximal_refit), только для известных категорий.
+
+        Новые категории добавляются к существующим. Необученная модель
+        обучается с нуля. Веса, загруженные через memory map, копируются
+        перед первым обновлением.
+
+        Args:
+            product_titles: Список названий продуктов
+            categories: Список категорий (строками)
+
+        Returns:
+            self
+        """
+        if not self.is_fitted:
+            return self.fit(product_titles, categories)
+        if self.classifier_type not in PARTIAL_FIT_TYPES:
+            raise ValueError(
+                f"Дообучение не поддерживается для классификатора типа {self.classifier_type}"
+            )
+        if self.id_to_label is None or self.label_to_id is None:
+            raise ValueError("Модель не обучена")
+
+        new_categories = [
+            category for category in dict.fromkeys(categories) if category not in self.label_to_id
+        ]
+        if new_categories and self.classifier_type in ("mlp", "lr"):
+            raise ValueError(
+                f"Классификатор {self.classifier_type} не поддерживает новые категории "
+                f"при дообучении: {new_categories}"
+            )
+
+        start = time.perf_counter()
+        x_data = self.project(self.encode_products(product_titles)).astype(np.float32, copy=False)
+
+        # Новые категории получают следующие свободные идентификаторы
+        for category in new_categories:
+            new_id = max(self.id_to_label, default=-1) + 1
+            self.label_to_id[category] = new_id
+            self.id_to_label[new_id] = category
+            logger.info(f"Добавлена категория: {category}")
+        y_data = np.array([self.label_to_id[cat] for cat in categories])
+
+        ensure_writable(self.classifier)
+        if self.classifier_type == "sgd":
+            extend_classes(
+                self.classifier,
+                np.array([self.label_to_id[cat] for cat in new_categories], dtype=np.int64),
+            )
+            # SGDClassifier требует, чтобы тип входа совпадал с типом весов
+            x_data = x_data.astype(self.classifier.coef_.dtype, copy=False)
+            self.classifier.partial_fit(x_data, y_data)
+        elif self.classifier_type == "mlp":
+            # Ранняя остановка MLPClassifier несовместима с partial_fit
+            early_stopping = self.classifier.early_stopping
+            self.classifier.early_stopping = False
+            try:
+                self.classifier.partial_fit(x_data, y_data)
+            finally:
+                self.classifier.early_stopping = early_stopping
+        elif self.classifier_type == "lr":
+            n_iter = proximal_refit(self.classifier, x_data, y_data)
+            logger.info(f"Уточнение весов логистической регрессии за {n_iter} итераций")
+        else:
+            self.classifier.partial_fit(x_data, y_data)
+
+        logger.info(
+            f"Дообучение на {len(categories)} примерах за "
+            f"{(time.perf_counter() - start) * 1000:.1f} мс"
+        )
+
+        self._column_labels_cache = None
+        self._removed_columns_cache = None
+        self.head_version += 1
+        if self._compiled_head is not None:
+            self.compile_head(self._compiled_head.buffer_rows)
+
+        return self
+
+    def add_category(self, category: str, product_titles: list[str]) -> "ProductCategoryClassifier":
+        """
+        Добавление категории по нескольким примерам без переобучения.
+
+        Подбирается только строка весов новой категории (для 'centroid' -
+        ее центроид), веса остальных категорий не меняются. Удаленная
+        категория восстанавливается с новыми весами по примерам.
+
+        Args:
+            category: Название категории
+            product_titles: Примеры продуктов категории
+
+        Returns:
+            self
+        """
+        if not self.is_fitted or self.id_to_label is None or self.label_to_id is None:
+            raise ValueError("Модель не обучена. Вызовите fit() перед add_category()")
+        if category in self.label_to_id and category not in self.removed_categories:
+            raise ValueError(f"Категория уже существует: {category}")
+        if not product_titles:
+            raise ValueError("Для добавления категории нужен хотя бы один пример")
+
+        start = time.perf_counter()
+        x_data = self.project(self.encode_products(product_titles))
+
+        label_id = self.label_to_id.get(category)
+        if label_id is None:
+            label_id = max(self.id_to_label, default=-1) + 1
+        ensure_writable(self.classifier)
+        imprint_class(self.classifier, x_data, label_id, background=self.background_mean)
+
+        self.label_to_id[category] = label_id
+        self.id_to_label[label_id] = category
+        self.removed_categories.discard(category)
+        self._column_labels_cache = None
+        self._removed_columns_cache = None
+        self.head_version += 1
+        if self._compiled_head is not None:
+            self.compile_head(self._compiled_head.buffer_rows)
+
+        logger.info(
+            f"Добавлена категория {category} по {len(product_titles)} примерам за "
+            f"{(time.perf_counter() - start) * 1000:.1f} мс"
+        )
+        return self
+
+    def apply_feedback(
+        self, product_titles: list[str], categories: list[str]
+    ) -> "ProductCategoryClassifier":
+        """
+        Применение исправлений пользователя к обученной модели.
+
+        Новые (и удаленные) категории добавляются через add_category по своим
+        примерам. Примеры известных категорий применяются через partial_fit.
+
+        Args:
+            product_titles: Список названий продуктов
+            categories: Исправленные категории
+
+        Returns:
+            self
+        """
+        if not self.is_fitted or self.label_to_id is None:
+            raise ValueError("Модель не обучена. Вызовите fit() перед apply_feedback()")
+        if len(product_titles) != len(categories):
+            raise ValueError(
+                f"Длины product_titles ({len(product_titles)}) и categories "
+                f"({len(categories)}) не совпадают"
+            )
+
+        new_categories = [
+            category
+            for category in dict.fromkeys(categories)
+            if category not in self.label_to_id or category in self.removed_categories
+        ]
+        known = [
+            (title, category)
+            for title, category in zip(product_titles, categories, strict=True)
+            if category not in new_categories
+        ]
+        if known and self.classifier_type not in PARTIAL_FIT_TYPES:
+            raise ValueError(
+                f"Исправления известных категорий не поддерживаются для классификатора "
+                f"типа {self.classifier_type}"
+            )
+
+        for category in new_categories:
+            self.add_category(
+                category,
+                [
+                    title
+                    for title, label in zip(product_titles, categories, strict=True)
+                    if label == category
+                ],
+            )
+        if known:
+            self.partial_fit([title for title, _ in known], [category for _, category in known])
+        return self
+
+    def remove_category(self, category: str) -> "ProductCategoryClassifier":
+        """
+        Удаление категории.
+
+        Веса не меняются: столбец категории маскируется, а вероятности
+        остальных категорий перенормируются, что для softmax совпадает с
+        классификатором без этой категории. Идентификатор категории остается
+        занятым, поэтому сохраненные артефакты не пересчитываются.
+
+        Args:
+            category: Название категории
+
+        Returns:
+            self
+        """
+        if self.label_to_id is None or category not in self.label_to_id:
+            raise ValueError(f"Категория не найдена: {category}")
+        if category in self.removed_categories:
+            raise ValueError(f"Категория уже удалена: {category}")
+        if len(self.label_to_id) - len(self.removed_categories) == 1:
+            raise ValueError("Нельзя удалить последнюю категорию")
+
+        self.removed_categories.add(category)
+        self._removed_columns_cache = None
+        self.head_version += 1
+        logger.info(f"Удалена категория: {category}")
+        return self
+
     def predict(self, product_titles: list[str]) -> list[str]:
         """
         Предсказание категорий для списка продуктов.
@@ -166,16 +999,12 @@ class ProductCategoryClassifier:
 
         logger.debug(f"Предсказание для {len(product_titles)} продуктов")
 
-        # Получение эмбеддингов
+        # Получение эмбеддингов и вероятностей
         x_data = self.encode_products(product_titles)
-
-        # Предсказание
-        y_pred = self.classifier.predict(x_data)
+        probabilities = self.predict_proba_embeddings(x_data)
 
         # Преобразование обратно в категории
-        if self.id_to_label is None:
-            raise ValueError("Модель не обучена")
-        categories = [self.id_to_label[int(pred)] for pred in y_pred]
+        categories: list[str] = self._column_labels()[probabilities.argmax(axis=1)].tolist()
 
         return categories
 
@@ -203,10 +1032,64 @@ class ProductCategoryClassifier:
         # Получение эмбеддингов
         x_data = self.encode_products(product_titles)
 
-        # Предсказание вероятностей
-        probabilities: np.ndarray = self.classifier.predict_proba(x_data)
+        return self.predict_proba_embeddings(x_data)
+
+    def infer(self, product_titles: list[str], top_k: int = 3) -> InferenceResult:
+        """
+        Полный инференс за один проход эмбеддера и классификатора.
+
+        Из одной матрицы вероятностей вычисляются предсказанные категории,
+        уверенность и top-k категорий с вероятностями.
+
+        Args:
+            product_titles: Список названий продуктов
+            top_k: Количество лучших категорий для каждого продукта
+
+        Returns:
+            Результат инференса
+        """
+        if not self.is_fitted:
+            raise ValueError("Модель не обучена. Вызовите fit() перед infer()")
+        if top_k < 1:
+            raise ValueError(f"top_k должен быть положительным, получено: {top_k}")
 
-        return probabilities
+        column_labels = self._column_labels()
+        n_classes = len(column_labels)
+        k = min(top_k, n_classes)
+
+        # Обработка пустого списка
+        if len(product_titles) == 0:
+            return InferenceResult(
+                labels=[],
+                confidences=np.array([]),
+                top_k_labels=[],
+                top_k_scores=np.empty((0, k)),
+                probabilities=np.empty((0, n_classes)),
+            )
+
+        logger.debug(f"Инференс для {len(product_titles)} продуктов (top_k={k})")
+
+        x_data = self.encode_products(product_titles)
+        probabilities = self.predict_proba_embeddings(x_data)
+
+        # Top-k без полной сортировки: argpartition отбирает k лучших,
+        # затем сортируются только они
+        if k < n_classes:
+            top_idx = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+        else:
+            top_idx = np.tile(np.arange(n_classes), (len(probabilities), 1))
+        top_scores = np.take_along_axis(probabilities, top_idx, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top_idx = np.take_along_axis(top_idx, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return InferenceResult(
+            labels=column_labels[top_idx[:, 0]].tolist(),
+            confidences=top_scores[:, 0],
+            top_k_labels=column_labels[top_idx].tolist(),
+            top_k_scores=top_scores,
+            probabilities=probabilities,
+        )
 
     def predict_with_confidence(self, product_titles: list[str]) -> tuple[list[str], np.ndarray]:
         """
@@ -222,31 +1105,229 @@ class ProductCategoryClassifier:
         if len(product_titles) == 0:
             return [], np.array([])
 
-        probabilities = self.predict_proba(product_titles)
-        confidences = np.max(probabilities, axis=1)
-        predictions = self.predict(product_titles)
+        result = self.infer(product_titles, top_k=1)
+
+        return result.labels, result.confidences
+
+    async def apredict(self, product_titles: list[str]) -> list[str]:
+        """
+        Асинхронное предсказание категорий (см. predict).
+
+        Кодирование и скоринг выполняются в пуле async_executor, event loop
+        остается свободным. При переполнении очереди пула выбрасывается
+        asyncio.QueueFull.
+
+        Args:
+            product_titles: Список названий продуктов
+
+        Returns:
+            Список предсказанных категорий
+        """
+        return await self.async_executor.run(self.predict, product_titles)
+
+    async def apredict_proba(self, product_titles: list[str]) -> np.ndarray:
+        """
+        Асинхронное предсказание вероятностей (см. predict_proba).
 
-        return predictions, confidences
+        Args:
+            product_titles: Список названий продуктов
 
-    def save_pretrained(self, save_path: str | Path) -> None:
+        Returns:
+            Массив вероятностей формы (n_products, n_classes)
+        """
+        return await self.async_executor.run(self.predict_proba, product_titles)
+
+    async def ainfer(self, product_titles: list[str], top_k: int = 3) -> InferenceResult:
+        """
+        Асинхронный полный инференс (см. infer).
+
+        Args:
+            product_titles: Список названий продуктов
+            top_k: Количество лучших категорий для каждого продукта
+
+        Returns:
+            Результат инференса
+        """
+        return await self.async_executor.run(self.infer, product_titles, top_k)
+
+    async def apredict_with_confidence(
+        self, product_titles: list[str]
+    ) -> tuple[list[str], np.ndarray]:
+        """
+        Асинхронное предсказание категорий с уровнями уверенности.
+
+        Args:
+            product_titles: Список названий продуктов
+
+        Returns:
+            Tuple (предсказанные категории, уровни уверенности)
+        """
+        return await self.async_executor.run(self.predict_with_confidence, product_titles)
+
+    @property
+    def classes_(self) -> np.ndarray:
+        """
+        Категории, соответствующие столбцам матрицы вероятностей.
+
+        Удаленные категории остаются в списке, их вероятность всегда равна нулю.
+        """
+        if not self.is_fitted:
+            raise ValueError("Модель не обучена. Вызовите fit() перед classes_")
+        return self._column_labels()
+
+    def predict_proba_embeddings(
+        self, x_data: np.ndarray, head: NumpyHead | None = None
+    ) -> np.ndarray:
+        """
+        Вероятности классов по готовым эмбеддингам.
+
+        Столбцы соответствуют classes_; вероятности удаленных категорий
+        обнуляются, а остальные перенормируются.
+
+        Args:
+            x_data: Эмбеддинги формы (n_products, embedding_dim)
+            head: Классификатор вместо собственного с теми же столбцами
+                (опционально, например с весами пониженной точности)
+
+        Returns:
+            Массив вероятностей формы (n_products, n_classes)
+        """
+        if not self.is_fitted:
+            raise ValueError("Модель не обучена. Вызовите fit() перед predict_proba_embeddings()")
+
+        x_data = self.project(x_data)
+        head = head if head is not None else self._compiled_head
+        if head is not None:
+            probabilities = head.predict_proba(x_data)
+        else:
+            probabilities = self.classifier.predict_proba(x_data)
+
+        removed = self._removed_columns()
+        if removed is not None:
+            probabilities[:, removed] = 0
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+        result: np.ndarray = probabilities
+        return result
+
+    def project(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Применение проекции эмбеддингов (если она задана).
+
+        Args:
+            embeddings: Эмбеддинги формы (n_products, embedding_dim)
+
+        Returns:
+            Признаки для классификатора
+        """
+        if self.projection is None:
+            return embeddings
+        return self.projection.transform(embeddings)
+
+    def compile_head(self, buffer_rows: int = DEFAULT_BUFFER_ROWS) -> NumpyHead:
+        """
+        Компиляция обученного классификатора в прямой проход на NumPy.
+
+        После компиляции predict, predict_proba и infer используют
+        NumpyHead вместо sklearn, что снижает накладные расходы на маленьких
+        батчах. Повторное обучение сбрасывает компиляцию.
+
+        Args:
+            buffer_rows: Число строк, под которое заранее выделяются буферы
+
+        Returns:
+            Скомпилированный классификатор
+        """
+        if not self.is_fitted:
+            raise ValueError("Модель не обучена. Вызовите fit() перед compile_head()")
+
+        self._compiled_head = NumpyHead.from_estimator(
+            self.classifier, self._column_labels(), buffer_rows=buffer_rows
+        )
+        logger.info("Классификатор скомпилирован в NumPy")
+        return self._compiled_head
+
+    def _column_labels(self) -> np.ndarray:
+        """
+        Категории, соответствующие столбцам матрицы вероятностей.
+
+        Returns:
+            Массив названий категорий
+        """
+        if self.id_to_label is None:
+            raise ValueError("Модель не обучена")
+        if self._column_labels_cache is None:
+            self._column_labels_cache = np.array(
+                [self.id_to_label[int(class_id)] for class_id in self.classifier.classes_],
+                dtype=object,
+            )
+        return self._column_labels_cache
+
+    def _removed_columns(self) -> np.ndarray | None:
+        """
+        Маска столбцов удаленных категорий.
+
+        Returns:
+            Булев массив по столбцам вероятностей или None, если удаленных нет
+        """
+        if not self.removed_categories:
+            return None
+        if self._removed_columns_cache is None:
+            self._removed_columns_cache = np.isin(
+                self._column_labels(), list(self.removed_categories)
+            )
+        return self._removed_columns_cache
+
+    def save_pretrained(
+        self,
+        save_path: str | Path,
+        head_format: str = "joblib",
+        head_precision: str = "float32",
+    ) -> None:
         """
         Сохранение модели в формате, совместимом с Hugging Face.
 
         Args:
             save_path: Путь для сохранения модели
+            head_format: Формат классификатора: 'joblib' (pickle sklearn) или 'npy'
+                (веса float32 в одном head.npy и описание в head.json, загружаются
+                через memory map)
+            head_precision: Точность сохраняемых весов классификатора: 'float32',
+                'float16' или 'int8' (только для head_format='npy')
         """
+        if head_format not in HEAD_FORMATS:
+            raise ValueError(
+                f"Неизвестный формат классификатора: {head_format}. Доступны: {HEAD_FORMATS}"
+            )
+        check_precision(head_precision)
+        if head_precision != "float32" and head_format != "npy":
+            raise ValueError("Квантизация весов классификатора поддерживается только в формате npy")
+
         save_path = Path(save_path)
         save_path.mkdir(parents=True, exist_ok=True)
 
         logger.info(f"Сохранение модели в {save_path}")
 
-        # Сохранение эмбеддера
+        # Сохранение эмбеддера. Если эмбеддер еще не загружен, его локальная
+        # директория копируется как есть, без материализации весов
         embedder_path = save_path / "embedder"
-        self.embedder.save(str(embedder_path))
+        if self._embedder is None and self.embedder_path is not None:
+            if self.embedder_path.resolve() != embedder_path.resolve():
+                shutil.copytree(self.embedder_path, embedder_path, dirs_exist_ok=True)
+        else:
+            self.embedder.save(str(embedder_path))
 
         # Сохранение классификатора
-        classifier_path = save_path / "classifier.joblib"
-        joblib.dump(self.classifier, classifier_path)
+        if head_format == "npy":
+            header, arrays = export_head(self.classifier)
+            header["labels"] = self._column_labels().tolist()
+            save_head_arrays(save_path, header, arrays, precision=head_precision)
+        else:
+            classifier_path = save_path / "classifier.joblib"
+            joblib.dump(self.classifier, classifier_path)
+
+        # Сохранение проекции эмбеддингов
+        if self.projection is not None and self.projection.is_fitted:
+            self.projection.save(save_path)
 
         # Сохранение метаданных
         import json
@@ -256,9 +1337,24 @@ class ProductCategoryClassifier:
             "classifier_type": self.classifier_type,
             "classifier_params": self.classifier_params,
             "embedding_dim": self.embedding_dim,
+            "max_seq_length": self.max_seq_length,
+            "max_tokens_per_batch": self.max_tokens_per_batch,
             "id_to_label": self.id_to_label,
             "label_to_id": self.label_to_id,
+            "removed_categories": sorted(self.removed_categories),
+            "background_mean": (
+                self.background_mean.tolist() if self.background_mean is not None else None
+            ),
             "is_fitted": self.is_fitted,
+            "head_format": head_format,
+            "head_precision": head_precision,
+            "embedding_precision": self.embedding_precision,
+            # Параметры проекции записываются только вместе с ее весами (projection.npz)
+            "projection": (
+                self.projection.get_params()
+                if self.projection is not None and self.projection.is_fitted
+                else None
+            ),
         }
 
         metadata_path = save_path / "metadata.json"
@@ -267,13 +1363,79 @@ class ProductCategoryClassifier:
 
         logger.info("Модель успешно сохранена")
 
+    def persist_head(
+        self,
+        save_path: str | Path,
+        head_precision: str = "float32",
+        extra_metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Атомарное сохранение дообученного классификатора в сохраненную модель.
+
+        Перезаписываются только веса классификатора (формат npy) и метаданные;
+        эмбеддер и проекция не меняются. Сначала публикуется head.json с
+        новыми весами, затем metadata.json - оба через os.replace, поэтому
+        процессы, загружающие модель параллельно, видят согласованную версию.
+
+        Args:
+            save_path: Директория модели, сохраненной save_pretrained
+            head_precision: Точность сохраняемых весов классификатора
+            extra_metadata: Дополнительные поля metadata.json, публикуемые
+                вместе с весами (опционально)
+        """
+        import json
+
+        if not self.is_fitted:
+            raise ValueError("Модель не обучена")
+        check_precision(head_precision)
+
+        save_path = Path(save_path)
+        metadata_path = save_path / "metadata.json"
+        if not metadata_path.exists():
+            raise ValueError(f"Сохраненная модель не найдена в {save_path}")
+        with metadata_path.open(encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        start = time.perf_counter()
+        header, arrays = export_head(self.classifier)
+        header["labels"] = self._column_labels().tolist()
+        save_head_arrays(save_path, header, arrays, precision=head_precision, atomic=True)
+
+        metadata.update(
+            {
+                "id_to_label": self.id_to_label,
+                "label_to_id": self.label_to_id,
+                "removed_categories": sorted(self.removed_categories),
+                "head_format": "npy",
+                "head_precision": head_precision,
+                **(extra_metadata or {}),
+            }
+        )
+        write_json_atomic(metadata_path, metadata)
+        (save_path / "classifier.joblib").unlink(missing_ok=True)
+
+        logger.info(
+            f"Классификатор сохранен в {save_path} за "
+            f"{(time.perf_counter() - start) * 1000:.1f} мс"
+        )
+
     @classmethod
-    def from_pretrained(cls, load_path: str | Path) -> "ProductCategoryClassifier":
+    def from_pretrained(
+        cls,
+        load_path: str | Path,
+        embedding_cache_dir: str | Path | None = None,
+        memory_cache_bytes: int | None = None,
+    ) -> "ProductCategoryClassifier":
         """
         Загрузка модели из сохраненного состояния.
 
+        Эмбеддер берется из сохраненной директории ``embedder/`` без обращения
+        к Hugging Face Hub и загружается лениво - при первом кодировании.
+
         Args:
             load_path: Путь к сохраненной модели
+            embedding_cache_dir: Директория дискового кэша эмбеддингов (опционально)
+            memory_cache_bytes: Бюджет LRU-кэша эмбеддингов в памяти в байтах (опционально)
 
         Returns:
             Загруженная модель
@@ -281,6 +1443,7 @@ class ProductCategoryClassifier:
         load_path = Path(load_path)
 
         logger.info(f"Загрузка модели из {load_path}")
+        start = time.perf_counter()
 
         # Загрузка метаданных
         import json
@@ -289,22 +1452,64 @@ class ProductCategoryClassifier:
         with metadata_path.open(encoding="utf-8") as f:
             metadata = json.load(f)
 
-        # Создание экземпляра модели
+        # Модели, сохраненные без эмбеддера, загружают его по названию
+        embedder_path: Path | None = load_path / "embedder"
+        if not (load_path / "embedder").exists():
+            logger.warning(f"Директория эмбеддера не найдена в {load_path}")
+            embedder_path = None
+
+        # Классификатор в формате joblib загружается целиком, в формате npy -
+        # восстанавливается поверх необученного классификатора из memory-mapped весов
+        head_format = metadata.get("head_format", "joblib")
+        classifier = None
+        if head_format == "joblib":
+            classifier = joblib.load(load_path / "classifier.joblib")
+
+        projection = None
+        if metadata.get("projection") is not None:
+            projection = EmbeddingProjection.load(load_path, metadata["projection"])
+
         model = cls(
             embedding_model_name=metadata["embedding_model_name"],
             classifier_type=metadata["classifier_type"],
             classifier_params=metadata["classifier_params"],
+            embedding_cache_dir=embedding_cache_dir,
+            memory_cache_bytes=memory_cache_bytes,
+            max_seq_length=metadata.get("max_seq_length"),
+            max_tokens_per_batch=metadata.get("max_tokens_per_batch"),
+            embedder_path=embedder_path,
+            embedding_precision=metadata.get("embedding_precision", "float32"),
+            projection=projection,
+            classifier=classifier,
         )
 
-        # Загрузка классификатора
-        classifier_path = load_path / "classifier.joblib"
-        model.classifier = joblib.load(classifier_path)
-
         # Загрузка метаданных
-        model.id_to_label = {int(k): v for k, v in metadata["id_to_label"].items()}
-        model.label_to_id = {v: int(k) for k, v in metadata["id_to_label"].items()}
+        model._embedding_dim = metadata.get("embedding_dim")
+        # У необученной модели словари категорий не заданы
+        if metadata.get("id_to_label") is not None:
+            model.id_to_label = {int(k): v for k, v in metadata["id_to_label"].items()}
+            model.label_to_id = {v: int(k) for k, v in metadata["id_to_label"].items()}
         model.is_fitted = metadata["is_fitted"]
-
-        logger.info("Модель успешно загружена")
+        model.removed_categories = set(metadata.get("removed_categories", []))
+        if metadata.get("background_mean") is not None:
+            model.background_mean = np.array(metadata["background_mean"], dtype=np.float32)
+
+        if head_format == "npy":
+            header, arrays = load_head_arrays(load_path)
+            # head.json публикуется раньше metadata.json (см. persist_head),
+            # поэтому метки классов берутся из него
+            id_to_label = model.id_to_label if model.id_to_label is not None else {}
+            label_to_id = model.label_to_id if model.label_to_id is not None else {}
+            if "labels" in header:
+                for class_id, label in zip(header["classes"], header["labels"], strict=True):
+                    id_to_label[int(class_id)] = label
+                    label_to_id[label] = int(class_id)
+            model.id_to_label, model.label_to_id = id_to_label, label_to_id
+            missing = [c for c in header["classes"] if int(c) not in id_to_label]
+            if missing:
+                raise ValueError(f"Метки классов {missing} не найдены в {load_path}")
+            model.classifier = restore_head(header, arrays, model.classifier)
+
+        logger.info(f"Модель успешно загружена за {time.perf_counter() - start:.2f} с")
 
         return model
@@ -0,0 +1,255 @@
+"""Модуль для разделяемого реестра эмбеддеров."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _RegistryEntry:
+    """Запись реестра: эмбеддер и число классификаторов, которые его используют."""
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Токенизатор Hugging Face не потокобезопасен: вызовы эмбеддера сериализуются
+    inference_lock: threading.Lock = field(default_factory=threading.Lock)
+    embedder: SentenceTransformer | None = None
+    refcount: int = 0
+    nbytes: int = 0
+
+
+class EmbedderRegistry:
+    """
+    Реестр эмбеддеров с подсчетом ссылок, общий для процесса.
+
+    Классификаторы берут эмбеддер во временное пользование через acquire()
+    и возвращают через release(). Эмбеддеры идентифицируются названием
+    модели и настройками, а путь к весам используется только как источник
+    при первой загрузке: сохраненные копии одной и той же модели у разных
+    пользователей разделяют один экземпляр весов. Когда ссылок не остается,
+    эмбеддер выгружается.
+
+    max_seq_length=None означает родную длину модели: в ключе она заменяется
+    числом, поэтому новый классификатор (None) и загруженный из сохраненной
+    модели (длина из метаданных) получают один и тот же эмбеддер.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустого реестра."""
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, int | None], _RegistryEntry] = {}
+        # Родная max_seq_length моделей, известная после первой загрузки
+        self._native_lengths: dict[str, int] = {}
+        self._native_locks: dict[str, threading.Lock] = {}
+        # Эмбеддеры, загруженные ради родной длины и ждущие своей записи
+        self._spare: dict[str, SentenceTransformer] = {}
+
+    def make_key(
+        self, model_name: str, max_seq_length: int | None = None
+    ) -> tuple[str, int | None]:
+        """
+        Ключ эмбеддера в реестре.
+
+        Args:
+            model_name: Название модели эмбеддера
+            max_seq_length: Максимальная длина входа (None - значение модели)
+
+        Returns:
+            Ключ реестра; None заменяется родной длиной модели, если она известна
+        """
+        if max_seq_length is None:
+            max_seq_length = self._native_lengths.get(model_name)
+        return (model_name, max_seq_length)
+
+    def _native_length(self, model_name: str, source: str | Path | None) -> int:
+        """
+        Родная максимальная длина входа модели.
+
+        Если модель еще не загружалась, она загружается один раз; экземпляр
+        откладывается и используется записью реестра, так что лишней
+        загрузки не происходит.
+
+        Args:
+            model_name: Название модели эмбеддера
+            source: Локальная директория с весами (опционально)
+
+        Returns:
+            Максимальная длина входа в токенах
+        """
+        with self._lock:
+            lock = self._native_locks.setdefault(model_name, threading.Lock())
+        with lock:
+            if model_name not in self._native_lengths:
+                embedder = self._load(model_name, source, None)
+                with self._lock:
+                    self._spare[model_name] = embedder
+            return self._native_lengths[model_name]
+
+    def acquire(
+        self,
+        model_name: str,
+        source: str | Path | None = None,
+        max_seq_length: int | None = None,
+    ) -> SentenceTransformer:
+        """
+        Получение эмбеддера с увеличением счетчика ссылок.
+
+        Если эмбеддер еще не загружен, он загружается из source (или по
+        названию модели). Параллельные запросы одного эмбеддера дожидаются
+        единственной загрузки, запросы разных эмбеддеров не блокируют друг друга.
+
+        Args:
+            model_name: Название модели эмбеддера
+            source: Локальная директория с весами (опционально)
+            max_seq_length: Максимальная длина входа в токенах (опционально)
+
+        Returns:
+            Общий экземпляр эмбеддера
+        """
+        if max_seq_length is None:
+            max_seq_length = self._native_length(model_name, source)
+        key = self.make_key(model_name, max_seq_length)
+
+        with self._lock:
+            entry = self._entries.setdefault(key, _RegistryEntry())
+            entry.refcount += 1
+
+        try:
+            with entry.lock:
+                if entry.embedder is None:
+                    with self._lock:
+                        spare = self._spare.pop(model_name, None)
+                    if spare is not None:
+                        spare.max_seq_length = max_seq_length
+                        entry.embedder = spare
+                    else:
+                        entry.embedder = self._load(model_name, source, max_seq_length)
+                    entry.nbytes = self._embedder_nbytes(entry.embedder)
+                return entry.embedder
+        except Exception:
+            self.release(model_name, max_seq_length)
+            raise
+
+    def inference_lock(self, model_name: str, max_seq_length: int | None = None) -> threading.Lock:
+        """
+        Блокировка для вызовов эмбеддера, общая для всех его пользователей.
+
+        Args:
+            model_name: Название модели эмбеддера
+            max_seq_length: Максимальная длина входа в токенах
+
+        Returns:
+            Блокировка эмбеддера (эмбеддер должен быть получен через acquire())
+        """
+        key = self.make_key(model_name, max_seq_length)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            raise ValueError(f"Эмбеддер {model_name} не получен из реестра")
+        return entry.inference_lock
+
+    def release(self, model_name: str, max_seq_length: int | None = None) -> None:
+        """
+        Возврат эмбеддера с уменьшением счетчика ссылок.
+
+        Args:
+            model_name: Название модели эмбеддера
+            max_seq_length: Максимальная длина входа в токенах
+        """
+        key = self.make_key(model_name, max_seq_length)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refcount -= 1
+            if entry.refcount <= 0:
+                del self._entries[key]
+                logger.info(f"Эмбеддер {model_name} выгружен из реестра")
+
+    def _load(
+        self,
+        model_name: str,
+        source: str | Path | None,
+        max_seq_length: int | None,
+    ) -> SentenceTransformer:
+        """
+        Загрузка эмбеддера.
+
+        Args:
+            model_name: Название модели эмбеддера
+            source: Локальная директория с весами (опционально)
+            max_seq_length: Максимальная длина входа в токенах (опционально)
+
+        Returns:
+            Загруженный эмбеддер
+        """
+        location = str(source or model_name)
+        logger.info(f"Загрузка эмбеддера: {location}")
+
+        start = time.perf_counter()
+        embedder = SentenceTransformer(location)
+        with self._lock:
+            self._native_lengths.setdefault(model_name, int(embedder.max_seq_length))
+
+        # Политика обрезки длинных текстов
+        if max_seq_length is not None:
+            embedder.max_seq_length = max_seq_length
+
+        logger.info(f"Эмбеддер загружен за {time.perf_counter() - start:.2f} с")
+        return embedder
+
+    @staticmethod
+    def _embedder_nbytes(embedder: SentenceTransformer) -> int:
+        """
+        Объем памяти, занимаемый весами и буферами эмбеддера.
+
+        Args:
+            embedder: Эмбеддер
+
+        Returns:
+            Объем в байтах
+        """
+        tensors = [*embedder.parameters(), *embedder.buffers()]
+        return int(sum(t.numel() * t.element_size() for t in tensors))
+
+    def __len__(self) -> int:
+        """Количество загруженных эмбеддеров."""
+        with self._lock:
+            return sum(1 for entry in self._entries.values() if entry.embedder is not None)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Статистика реестра.
+
+        Returns:
+            Словарь с числом эмбеддеров, суммарным объемом весов и
+            списком записей (название, max_seq_length, ссылки, байты)
+        """
+        with self._lock:
+            entries = [
+                {
+                    "model_name": key[0],
+                    "max_seq_length": key[1],
+                    "refcount": entry.refcount,
+                    "bytes": entry.nbytes,
+                }
+                for key, entry in self._entries.items()
+                if entry.embedder is not None
+            ]
+
+        return {
+            "embedders": len(entries),
+            "total_bytes": sum(entry["bytes"] for entry in entries),
+            "entries": entries,
+        }
+
+
+# Реестр по умолчанию, общий для всех классификаторов процесса
+default_registry = EmbedderRegistry()
@@ -0,0 +1,516 @@
+"""Модуль для кэширования эмбеддингов продуктов."""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import unicodedata
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from categoraize.models.quantization import (
+    bytes_per_vector,
+    check_precision,
+    dequantize,
+    quantize,
+    storage_dtype,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - на Windows файловые блокировки недоступны
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Расширения файла векторов дискового кэша по режиму точности
+_FILE_SUFFIXES = {"float32": "f32", "float16": "f16", "int8": "i8"}
+
+
+def normalize_text(text: str) -> str:
+    """
+    Нормализация текста для построения ключа кэша.
+
+    Приводит строку к форме NFC, убирает крайние пробелы и схлопывает
+    повторяющиеся пробельные символы. Такие преобразования не меняют
+    токенизацию, поэтому эмбеддинг нормализованной строки совпадает с исходным.
+
+    Args:
+        text: Исходный текст
+
+    Returns:
+        Нормализованный текст
+    """
+    text = unicodedata.normalize("NFC", str(text))
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def hash_texts(texts: list[str]) -> np.ndarray:
+    """
+    Вычисление 64-битных хэшей нормализованных текстов.
+
+    Args:
+        texts: Список текстов
+
+    Returns:
+        Массив хэшей формы (n_texts,) с типом uint64
+    """
+    keys = np.empty(len(texts), dtype=np.uint64)
+    for idx, text in enumerate(texts):
+        digest = hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=8).digest()
+        keys[idx] = int.from_bytes(digest, "little")
+    return keys
+
+
+class DiskEmbeddingCache:
+    """
+    Персистентный кэш эмбеддингов на диске.
+
+    Эмбеддинги хранятся в memory-mapped матрице (``vectors.f32``, ``vectors.f16``
+    или ``vectors.i8`` с масштабами строк ``scales.f32`` - по режиму точности),
+    а хэши текстов - в отдельном файле uint64 (``keys.u64``). Строки только
+    дописываются в конец, поэтому кэш можно разделять между перезапусками
+    и параллельными процессами: запись выполняется под файловой блокировкой,
+    а читатели подхватывают новые строки по размеру файлов. В оперативной
+    памяти держится только отсортированный индекс хэшей.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        embedder_id: str,
+        embedding_dim: int,
+        precision: str = "float32",
+    ) -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            cache_dir: Корневая директория кэша
+            embedder_id: Идентификатор эмбеддера (модель и ее настройки)
+            embedding_dim: Размерность эмбеддингов
+            precision: Точность хранения векторов ('float32', 'float16' или 'int8')
+        """
+        self.embedder_id = embedder_id
+        self.embedding_dim = int(embedding_dim)
+        self.precision = check_precision(precision)
+        self._dtype = storage_dtype(precision)
+
+        # Отдельная поддиректория на каждый эмбеддер и режим точности:
+        # векторы разных моделей несовместимы
+        namespace_key = embedder_id if precision == "float32" else f"{embedder_id}|{precision}"
+        namespace = hashlib.sha1(namespace_key.encode("utf-8")).hexdigest()[:16]
+        self.cache_path = Path(cache_dir) / namespace
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+
+        self._keys_path = self.cache_path / "keys.u64"
+        self._vectors_path = self.cache_path / f"vectors.{_FILE_SUFFIXES[precision]}"
+        self._scales_path = self.cache_path / "scales.f32"
+        self._lock_path = self.cache_path / "cache.lock"
+        self._write_meta()
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._n_rows = 0
+        self._vectors: np.ndarray = np.empty((0, self.embedding_dim), dtype=self._dtype)
+        self._scales: np.ndarray | None = None
+        self._sorted_keys: np.ndarray = np.empty(0, dtype=np.uint64)
+        self._sorted_rows: np.ndarray = np.empty(0, dtype=np.int64)
+
+        with self._lock:
+            self._refresh()
+
+        logger.info(
+            f"Инициализирован дисковый кэш эмбеддингов: {self.cache_path} ({len(self)} записей)"
+        )
+
+    def _write_meta(self) -> None:
+        """Запись и проверка метаданных кэша."""
+        meta_path = self.cache_path / "meta.json"
+        meta = {
+            "embedder_id": self.embedder_id,
+            "embedding_dim": self.embedding_dim,
+            "precision": self.precision,
+        }
+
+        if meta_path.exists():
+            with meta_path.open(encoding="utf-8") as f:
+                existing = json.load(f)
+            if existing.get("embedding_dim") != self.embedding_dim:
+                raise ValueError(
+                    f"Размерность эмбеддингов в кэше {self.cache_path} "
+                    f"({existing.get('embedding_dim')}) не совпадает с {self.embedding_dim}"
+                )
+            return
+
+        with meta_path.open("w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+    def __len__(self) -> int:
+        """Количество закэшированных эмбеддингов."""
+        return self._n_rows
+
+    def _file_rows(self) -> tuple[int, int, int]:
+        """
+        Число полностью записанных строк в файлах кэша.
+
+        Returns:
+            Tuple (ключи, векторы, масштабы); для точностей без масштабов
+            третье значение совпадает с числом векторов
+        """
+        n_keys = self._keys_path.stat().st_size // 8 if self._keys_path.exists() else 0
+        row_bytes = self.embedding_dim * self._dtype.itemsize
+        n_vectors = (
+            self._vectors_path.stat().st_size // row_bytes if self._vectors_path.exists() else 0
+        )
+        n_scales = n_vectors
+        if self.precision == "int8":
+            n_scales = self._scales_path.stat().st_size // 4 if self._scales_path.exists() else 0
+        return n_keys, n_vectors, n_scales
+
+    def _refresh(self) -> None:
+        """Подхват строк, дописанных этим или другими процессами."""
+        # Векторы (и масштабы) пишутся раньше ключей, поэтому каждой видимой
+        # строке ключа гарантированно соответствует полностью записанный вектор
+        n_rows = min(self._file_rows())
+        if n_rows == self._n_rows:
+            return
+
+        keys = np.memmap(self._keys_path, dtype=np.uint64, mode="r", shape=(n_rows,))
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=self._dtype, mode="r", shape=(n_rows, self.embedding_dim)
+        )
+        if self.precision == "int8":
+            self._scales = np.memmap(self._scales_path, dtype=np.float32, mode="r", shape=(n_rows,))
+
+        if n_rows > self._n_rows:
+            # Строки только дописываются: сливаем отсортированные новые ключи
+            # с имеющимся индексом за O(N) вместо полной пересортировки
+            new_keys = np.asarray(keys[self._n_rows :])
+            order = np.argsort(new_keys, kind="stable")
+            positions = np.searchsorted(self._sorted_keys, new_keys[order])
+            self._sorted_keys = np.insert(self._sorted_keys, positions, new_keys[order])
+            self._sorted_rows = np.insert(self._sorted_rows, positions, order + self._n_rows)
+        else:
+            order = np.argsort(keys, kind="stable")
+            self._sorted_keys = np.asarray(keys[order])
+            self._sorted_rows = order
+        self._n_rows = n_rows
+
+    def _truncate_partial_rows(self) -> None:
+        """
+        Отбрасывание хвостов файлов, оставшихся от прерванной записи.
+
+        Запись, прерванная сбоем, нехваткой места или kill, может оставить
+        векторы (и масштабы) без ключей или недописанную строку. Новые строки
+        должны начинаться с номера, равного числу ключей, иначе все следующие
+        ключи сопоставятся чужим векторам. Вызывается под файловой блокировкой.
+        """
+        n_rows = min(self._file_rows())
+        row_bytes = self.embedding_dim * self._dtype.itemsize
+        sizes = [(self._keys_path, n_rows * 8), (self._vectors_path, n_rows * row_bytes)]
+        if self.precision == "int8":
+            sizes.append((self._scales_path, n_rows * 4))
+
+        for path, size in sizes:
+            if path.exists() and path.stat().st_size > size:
+                logger.warning(
+                    f"Отброшен недописанный хвост {path.name} дискового кэша "
+                    f"({path.stat().st_size - size} байт)"
+                )
+                with path.open("r+b") as f:
+                    f.truncate(size)
+
+    def _find_rows(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Поиск строк матрицы по хэшам.
+
+        Args:
+            keys: Массив хэшей
+
+        Returns:
+            Массив номеров строк (-1 для отсутствующих ключей)
+        """
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        if self._n_rows == 0 or len(keys) == 0:
+            return rows
+
+        positions = np.searchsorted(self._sorted_keys, keys)
+        positions = np.minimum(positions, self._n_rows - 1)
+        found = self._sorted_keys[positions] == keys
+        rows[found] = self._sorted_rows[positions[found]]
+        return rows
+
+    def lookup(self, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Поиск эмбеддингов в кэше.
+
+        Args:
+            keys: Массив хэшей текстов (см. hash_texts)
+
+        Returns:
+            Tuple (эмбеддинги формы (n_keys, embedding_dim), маска найденных ключей).
+            Строки для ненайденных ключей не инициализированы.
+        """
+        with self._lock:
+            self._refresh()
+            rows = self._find_rows(keys)
+            found = rows >= 0
+
+            embeddings = np.empty((len(keys), self.embedding_dim), dtype=np.float32)
+            if found.any():
+                scales = self._scales[rows[found]] if self._scales is not None else None
+                embeddings[found] = dequantize(self._vectors[rows[found]], scales)
+
+            n_found = int(found.sum())
+            self.hits += n_found
+            self.misses += len(keys) - n_found
+
+        return embeddings, found
+
+    def put(self, keys: np.ndarray, embeddings: np.ndarray) -> None:
+        """
+        Добавление эмбеддингов в кэш.
+
+        Уже закэшированные ключи пропускаются.
+
+        Args:
+            keys: Массив хэшей текстов
+            embeddings: Эмбеддинги формы (n_keys, embedding_dim)
+        """
+        if len(keys) == 0:
+            return
+
+        with self._lock, self._lock_path.open("a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._truncate_partial_rows()
+                self._refresh()
+
+                # Пропускаем ключи, уже записанные этим или другим процессом
+                new_mask = self._find_rows(keys) < 0
+                _, first_idx = np.unique(keys, return_index=True)
+                unique_mask = np.zeros(len(keys), dtype=bool)
+                unique_mask[first_idx] = True
+                new_mask &= unique_mask
+                if not new_mask.any():
+                    return
+
+                new_vectors, new_scales = quantize(embeddings[new_mask], self.precision)
+                new_keys = np.ascontiguousarray(keys[new_mask], dtype=np.uint64)
+
+                with self._vectors_path.open("ab") as f:
+                    f.write(np.ascontiguousarray(new_vectors).tobytes())
+                if new_scales is not None:
+                    with self._scales_path.open("ab") as f:
+                        f.write(new_scales.tobytes())
+                with self._keys_path.open("ab") as f:
+                    f.write(new_keys.tobytes())
+
+                self._refresh()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        logger.debug(f"В дисковый кэш добавлено {int(new_mask.sum())} эмбеддингов")
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Статистика использования кэша.
+
+        Returns:
+            Словарь с количеством попаданий, промахов, долей попаданий и размером кэша
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total > 0 else 0.0,
+            "size": len(self),
+            "precision": self.precision,
+        }
+
+
+class MemoryEmbeddingCache:
+    """
+    LRU-кэш эмбеддингов в оперативной памяти с ограничением по объему.
+
+    Векторы лежат в заранее выделенной матрице (float32, float16 или int8 с
+    масштабом строки), число строк которой определяется бюджетом памяти в
+    байтах: пониженная точность увеличивает емкость кэша. При переполнении вытесняется
+    давно не использовавшаяся запись, а ее строка переиспользуется.
+    """
+
+    def __init__(self, embedding_dim: int, max_bytes: int, precision: str = "float32") -> None:
+        """
+        Инициализация кэша.
+
+        Args:
+            embedding_dim: Размерность эмбеддингов
+            max_bytes: Бюджет памяти под векторы в байтах
+            precision: Точность хранения векторов ('float32', 'float16' или 'int8')
+        """
+        self.embedding_dim = int(embedding_dim)
+        self.max_bytes = int(max_bytes)
+        self.precision = check_precision(precision)
+        self._vector_bytes = bytes_per_vector(self.embedding_dim, precision)
+        self.capacity = self.max_bytes // self._vector_bytes
+        if self.capacity <= 0:
+            raise ValueError(
+                f"Бюджет памяти {max_bytes} байт меньше размера одного эмбеддинга "
+                f"({self._vector_bytes} байт)"
+            )
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        # np.empty не трогает страницы памяти, пока в них ничего не записано
+        self._vectors = np.empty(
+            (self.capacity, self.embedding_dim), dtype=storage_dtype(precision)
+        )
+        self._scales = np.ones(self.capacity, dtype=np.float32) if precision == "int8" else None
+        self._slots: OrderedDict[int, int] = OrderedDict()
+
+        logger.info(
+            f"Инициализирован LRU-кэш эмбеддингов: {self.capacity} записей "
+            f"({self.max_bytes / 2**20:.1f} МБ)"
+        )
+
+    def __len__(self) -> int:
+        """Количество закэшированных эмбеддингов."""
+        return len(self._slots)
+
+    @property
+    def nbytes(self) -> int:
+        """Объем памяти, занятый закэшированными векторами."""
+        return len(self._slots) * self._vector_bytes
+
+    def lookup(self, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Поиск эмбеддингов в кэше.
+
+        Args:
+            keys: Массив хэшей текстов (см. hash_texts)
+
+        Returns:
+            Tuple (эмбеддинги формы (n_keys, embedding_dim), маска найденных ключей).
+            Строки для ненайденных ключей не инициализированы.
+        """
+        found = np.zeros(len(keys), dtype=bool)
+        slots = np.empty(len(keys), dtype=np.int64)
+
+        with self._lock:
+            for idx, key in enumerate(keys.tolist()):
+                slot = self._slots.get(key)
+                if slot is None:
+                    continue
+                self._slots.move_to_end(key)
+                found[idx] = True
+                slots[idx] = slot
+
+            embeddings = np.empty((len(keys), self.embedding_dim), dtype=np.float32)
+            scales = self._scales[slots[found]] if self._scales is not None else None
+            embeddings[found] = dequantize(self._vectors[slots[found]], scales)
+
+            n_found = int(found.sum())
+            self.hits += n_found
+            self.misses += len(keys) - n_found
+
+        return embeddings, found
+
+    def put(self, keys: np.ndarray, embeddings: np.ndarray) -> None:
+        """
+        Добавление эмбеддингов в кэш с вытеснением давно не использованных записей.
+
+        Args:
+            keys: Массив хэшей текстов
+            embeddings: Эмбеддинги формы (n_keys, embedding_dim)
+        """
+        vectors, scales = quantize(embeddings, self.precision)
+
+        with self._lock:
+            for idx, key in enumerate(keys.tolist()):
+                slot = self._slots.get(key)
+                if slot is not None:
+                    self._slots.move_to_end(key)
+                    continue
+
+                if len(self._slots) < self.capacity:
+                    slot = len(self._slots)
+                else:
+                    _, slot = self._slots.popitem(last=False)
+                    self.evictions += 1
+
+                self._vectors[slot] = vectors[idx]
+                if self._scales is not None and scales is not None:
+                    self._scales[slot] = scales[idx]
+                self._slots[key] = slot
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Статистика использования кэша.
+
+        Returns:
+            Словарь с попаданиями, промахами, вытеснениями и занятой памятью
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total > 0 else 0.0,
+            "evictions": self.evictions,
+            "size": len(self),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "precision": self.precision,
+        }
+
+
+# Кэши в памяти, разделяемые всеми классификаторами с одним эмбеддером
+_shared_memory_caches: "weakref.WeakValueDictionary[tuple[str, str], MemoryEmbeddingCache]" = (
+    weakref.WeakValueDictionary()
+)
+_shared_memory_caches_lock = threading.Lock()
+
+
+def get_shared_memory_cache(
+    embedder_id: str, embedding_dim: int, max_bytes: int, precision: str = "float32"
+) -> MemoryEmbeddingCache:
+    """
+    Получение LRU-кэша, общего для всех классификаторов с данным эмбеддером.
+
+    Кэш создается при первом обращении и живет, пока на него есть ссылки.
+    Бюджет памяти задается первым запросившим классификатором.
+
+    Args:
+        embedder_id: Идентификатор эмбеддера
+        embedding_dim: Размерность эмбеддингов
+        max_bytes: Бюджет памяти под векторы в байтах
+        precision: Точность хранения векторов
+
+    Returns:
+        Общий кэш эмбеддингов
+    """
+    with _shared_memory_caches_lock:
+        cache = _shared_memory_caches.get((embedder_id, precision))
+        if cache is None:
+            cache = MemoryEmbeddingCache(embedding_dim, max_bytes, precision=precision)
+            _shared_memory_caches[(embedder_id, precision)] = cache
+        elif cache.max_bytes != max_bytes:
+            logger.debug(
+                f"LRU-кэш для {embedder_id} уже создан с бюджетом {cache.max_bytes} байт, "
+                f"запрошенный бюджет {max_bytes} байт проигнорирован"
+            )
+        return cache
@@ -0,0 +1,413 @@
+"""Модуль для дообучения классификаторов на потоке новых примеров."""
+
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sklearn.base import BaseEstimator
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.neural_network._base import ACTIVATIONS
+from sklearn.preprocessing import LabelBinarizer
+
+from categoraize.models.centroid import CentroidClassifier
+
+# Атрибуты обученных классификаторов с весами, которые меняются при дообучении
+_WEIGHT_ATTRIBUTES = ("coef_", "intercept_", "coefs_", "intercepts_", "sums_", "counts_")
+
+# Запас логита новой категории над лучшей из остальных на ее примерах,
+# в долях медианного разрыва между двумя лучшими логитами
+_IMPRINT_MARGIN = 0.5
+
+
+def ensure_writable(classifier: BaseEstimator) -> None:
+    """
+    Копирование весов, доступных только для чтения, перед дообучением.
+
+    Классификатор, загруженный из head.npy через memory map, ссылается на
+    read-only страницы файла; partial_fit изменяет веса на месте.
+
+    Args:
+        classifier: Обученный классификатор
+    """
+    for name in _WEIGHT_ATTRIBUTES:
+        value = getattr(classifier, name, None)
+        if isinstance(value, np.ndarray) and not value.flags.writeable:
+            setattr(classifier, name, np.array(value))
+        elif isinstance(value, list) and any(
+            isinstance(array, np.ndarray) and not array.flags.writeable for array in value
+        ):
+            setattr(classifier, name, [np.array(array) for array in value])
+
+
+def extend_classes(classifier: SGDClassifier, new_classes: np.ndarray) -> None:
+    """
+    Добавление новых классов в обученный SGDClassifier.
+
+    Для каждого нового класса добавляется нулевая строка весов (one-vs-rest).
+    Бинарный классификатор с одной строкой весов w сначала разворачивается
+    в две строки (-w, w), чтобы сохранить его решения для старых классов.
+
+    Args:
+        classifier: Обученный SGDClassifier
+        new_classes: Метки новых классов (больше всех существующих)
+    """
+    if len(new_classes) == 0:
+        return
+
+    coef, intercept = classifier.coef_, classifier.intercept_
+    if len(classifier.classes_) == 2 and coef.shape[0] == 1:
+        coef = np.vstack([-coef, coef])
+        intercept = np.concatenate([-intercept, intercept])
+
+    classifier.coef_ = np.vstack([coef, np.zeros((len(new_classes), coef.shape[1]), coef.dtype)])
+    classifier.intercept_ = np.concatenate(
+        [intercept, np.zeros(len(new_classes), dtype=intercept.dtype)]
+    )
+    classifier.classes_ = np.concatenate([classifier.classes_, new_classes])
+
+
+def _remap_rows(
+    coef: np.ndarray, intercept: np.ndarray, rows: np.ndarray, ovr: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Перестановка строк выходного слоя под новый набор классов.
+
+    Бинарный выход w разворачивается в две строки: (-w, w) для one-vs-rest
+    и (-w/2, w/2) для softmax, что сохраняет вероятности. Для двух новых
+    классов строки сворачиваются обратно в одну.
+
+    Args:
+        coef: Веса выходного слоя формы (n_outputs, n_inputs)
+        intercept: Смещения формы (n_outputs,)
+        rows: Для каждого нового класса - строка старых весов или -1
+        ovr: Независимые сигмоиды (SGDClassifier) вместо softmax
+
+    Returns:
+        Tuple (веса, смещения) для новых классов
+    """
+    if coef.shape[0] == 1:
+        scale = 1.0 if ovr else 0.5
+        coef = np.vstack([-coef, coef]) * scale
+        intercept = np.concatenate([-intercept, intercept]) * scale
+
+    known = rows >= 0
+    new_coef = np.zeros((len(rows), coef.shape[1]), dtype=coef.dtype)
+    new_intercept = np.zeros(len(rows), dtype=intercept.dtype)
+    new_coef[known] = coef[rows[known]]
+    new_intercept[known] = intercept[rows[known]]
+
+    if len(rows) != 2:
+        return new_coef, new_intercept
+    if ovr:
+        return new_coef[1:], new_intercept[1:]
+    return (new_coef[1] - new_coef[0])[None], (new_intercept[1] - new_intercept[0])[None]
+
+
+def transfer_weights(
+    previous: BaseEstimator, classifier: BaseEstimator, rows: np.ndarray, n_features: int
+) -> None:
+    """
+    Инициализация классификатора весами предыдущего для warm start.
+
+    Скрытые слои MLP копируются как есть, строки выходного слоя
+    переставляются под новые классы; новые классы получают нулевые веса,
+    удаленные - отбрасываются. Классификатору включается warm_start, поэтому
+    следующий fit продолжает оптимизацию с перенесенных весов.
+
+    Args:
+        previous: Обученный классификатор того же типа
+        classifier: Необученный классификатор
+        rows: Для каждого нового класса (по порядку меток 0..n-1) - индекс
+            столбца предыдущего классификатора или -1 для новых классов
+        n_features: Размерность признаков новой обучающей выборки
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    if isinstance(previous, LogisticRegression | SGDClassifier) and type(previous) is type(
+        classifier
+    ):
+        if previous.coef_.shape[1] != n_features:
+            raise ValueError(
+                f"Размерность признаков изменилась: {previous.coef_.shape[1]} -> {n_features}"
+            )
+        ovr = isinstance(previous, SGDClassifier)
+        coef, intercept = _remap_rows(
+            np.array(previous.coef_), np.array(previous.intercept_), rows, ovr
+        )
+        classifier.coef_, classifier.intercept_ = coef, intercept
+    elif isinstance(previous, MLPClassifier) and isinstance(classifier, MLPClassifier):
+        hidden_sizes = [coef.shape[1] for coef in previous.coefs_[:-1]]
+        if hidden_sizes != np.atleast_1d(classifier.hidden_layer_sizes).tolist():
+            raise ValueError(
+                f"Архитектура MLP изменилась: {hidden_sizes} -> {classifier.hidden_layer_sizes}"
+            )
+        if previous.coefs_[0].shape[0] != n_features:
+            raise ValueError(
+                f"Размерность признаков изменилась: {previous.coefs_[0].shape[0]} -> {n_features}"
+            )
+        coef, intercept = _remap_rows(
+            np.array(previous.coefs_[-1]).T, np.array(previous.intercepts_[-1]), rows, ovr=False
+        )
+        classes = np.arange(len(rows))
+        classifier.coefs_ = [np.array(c) for c in previous.coefs_[:-1]] + [coef.T.copy()]
+        classifier.intercepts_ = [np.array(i) for i in previous.intercepts_[:-1]] + [intercept]
+        classifier.classes_ = classes
+        classifier._label_binarizer = LabelBinarizer().fit(classes)
+        classifier.n_layers_ = len(classifier.coefs_) + 1
+        classifier.n_outputs_ = coef.shape[0]
+        classifier.out_activation_ = "logistic" if len(classes) == 2 else "softmax"
+        classifier.activation = previous.activation
+        # Счетчики оптимизатора инициализируются заново, как при первом fit
+        classifier.n_iter_ = 0
+        classifier.t_ = 0
+        classifier.loss_curve_ = []
+        classifier._no_improvement_count = 0
+        if classifier.early_stopping:
+            classifier.validation_scores_ = []
+            classifier.best_validation_score_ = -np.inf
+            classifier.best_loss_ = None
+        else:
+            classifier.validation_scores_ = None
+            classifier.best_validation_score_ = None
+            classifier.best_loss_ = np.inf
+    else:
+        raise ValueError(
+            f"Warm start не поддерживается: {type(previous).__name__} -> "
+            f"{type(classifier).__name__}"
+        )
+    classifier.set_params(warm_start=True)
+
+
+def proximal_refit(classifier: LogisticRegression, features: np.ndarray, labels: np.ndarray) -> int:
+    """
+    Дообучение обученной LogisticRegression на новых примерах.
+
+    Минимизируется функция потерь LogisticRegression - C, умноженное на
+    сумму кросс-энтропий softmax, плюс половина квадрата нормы весов, -
+    но штраф отсчитывается от текущих весов, а не от нуля. Исходная
+    обучающая выборка не нужна: штраф удерживает веса у текущих, и они
+    сдвигаются настолько, насколько этого требуют новые примеры (чем
+    больше C, тем сильнее). Задача сильно выпуклая, поэтому решается
+    ускоренным градиентным спуском с шагом по оценке константы Липшица
+    градиента.
+
+    Args:
+        classifier: Обученная LogisticRegression (softmax) с записываемыми весами
+        features: Признаки примеров формы (n_examples, n_features)
+        labels: Метки примеров; должны быть среди classes_
+
+    Returns:
+        Число итераций
+    """
+    features = np.asarray(features, dtype=np.float64)
+    labels = np.asarray(labels)
+    rows = np.searchsorted(classifier.classes_, labels)
+    if np.any(rows >= len(classifier.classes_)) or np.any(classifier.classes_[rows] != labels):
+        raise ValueError("Метки примеров должны быть среди классов классификатора")
+
+    dtype = classifier.coef_.dtype
+    coef = np.asarray(classifier.coef_, dtype=np.float64)
+    intercept = np.asarray(classifier.intercept_, dtype=np.float64)
+    binary = coef.shape[0] == 1
+    if binary:
+        # Бинарная регрессия: softmax по двум строкам (-w/2, w/2)
+        coef = np.vstack([-coef, coef]) * 0.5
+        intercept = np.concatenate([-intercept, intercept]) * 0.5
+
+    x_data = np.hstack([features, np.ones((len(features), 1))])
+    targets = np.eye(len(coef))[rows]
+    strength = float(classifier.C)
+    start = np.hstack([coef, intercept[:, None]])
+
+    def gradient(weights: np.ndarray) -> np.ndarray:
+        logits = x_data @ weights.T
+        logits -= logits.max(axis=1, keepdims=True)
+        proba = np.exp(logits)
+        proba /= proba.sum(axis=1, keepdims=True)
+        return strength * (proba - targets).T @ x_data + (weights - start)
+
+    # Гессиан кросс-энтропии softmax не больше X^T X / 2, штрафа - единичный
+    lipschitz = 1.0 + 0.5 * strength * np.linalg.norm(x_data, ord=2) ** 2
+    step = 1.0 / lipschitz
+    momentum = (np.sqrt(lipschitz) - 1) / (np.sqrt(lipschitz) + 1)
+    weights = previous = start
+    n_iter = 0
+    while n_iter < classifier.max_iter:
+        n_iter += 1
+        lookahead = weights + momentum * (weights - previous)
+        grad = gradient(lookahead)
+        previous, weights = weights, lookahead - step * grad
+        if np.abs(grad).max() <= classifier.tol:
+            break
+
+    coef, intercept = weights[:, :-1], weights[:, -1]
+    if binary:
+        coef, intercept = _remap_rows(coef, intercept, np.arange(2), ovr=False)
+    classifier.coef_ = coef.astype(dtype)
+    classifier.intercept_ = intercept.astype(dtype)
+    return n_iter
+
+
+def output_features(classifier: BaseEstimator, features: np.ndarray) -> np.ndarray:
+    """
+    Входы выходного слоя классификатора.
+
+    Для MLPClassifier - активации последнего скрытого слоя, для линейных
+    классификаторов - сами признаки.
+
+    Args:
+        classifier: Обученный классификатор
+        features: Признаки формы (n_rows, n_features)
+
+    Returns:
+        Массив формы (n_rows, n_inputs) в float32
+    """
+    hidden = np.asarray(features, dtype=np.float32)
+    if isinstance(classifier, MLPClassifier):
+        for coef, intercept in zip(
+            classifier.coefs_[:-1], classifier.intercepts_[:-1], strict=True
+        ):
+            hidden = (hidden @ coef + intercept).astype(np.float32, copy=False)
+            ACTIVATIONS[classifier.activation](hidden)
+    return hidden
+
+
+def _imprint_row(
+    features: np.ndarray,
+    coef: np.ndarray,
+    intercept: np.ndarray,
+    background: np.ndarray | None,
+) -> tuple[np.ndarray, float]:
+    """
+    Строка выходного слоя для новой категории по ее примерам.
+
+    Направление весов - нормализованное среднее примеров за вычетом среднего
+    по обучающей выборке (без него общая для всех примеров составляющая,
+    например у активаций ReLU, притягивает к новой категории чужие
+    примеры), норма - медиана норм остальных строк. Смещение подбирается так, чтобы на каждом примере
+    логит новой категории превышал лучший из остальных с запасом
+    _IMPRINT_MARGIN в масштабе логитов классификатора.
+
+    Args:
+        features: Признаки примеров формы (n_examples, n_inputs)
+        coef: Веса остальных категорий формы (n_outputs, n_inputs)
+        intercept: Смещения остальных категорий формы (n_outputs,)
+        background: Среднее входов выходного слоя на обучающей выборке или None
+
+    Returns:
+        Tuple (веса формы (n_inputs,), смещение)
+    """
+    direction = features.mean(axis=0)
+    if background is not None:
+        direction = direction - background
+    norm = np.linalg.norm(direction)
+    if norm == 0:
+        raise ValueError("Среднее примеров категории равно нулю")
+    weights = direction / norm * np.median(np.linalg.norm(coef, axis=1))
+
+    logits = np.sort(features @ coef.T + intercept, axis=1)
+    gap = float(np.median(logits[:, -1] - logits[:, -2])) if len(coef) > 1 else 0.0
+    bias = float(np.max(logits[:, -1] - features @ weights)) + _IMPRINT_MARGIN * gap
+    return weights.astype(coef.dtype), bias
+
+
+def imprint_class(
+    classifier: BaseEstimator,
+    features: np.ndarray,
+    label: int,
+    background: np.ndarray | None = None,
+) -> None:
+    """
+    Добавление или замена одной категории без переобучения остальных.
+
+    Для CentroidClassifier центроид категории вычисляется по примерам
+    точно. Для LogisticRegression, SGDClassifier и выходного слоя
+    MLPClassifier подбирается только строка весов категории (см.
+    _imprint_row); веса остальных категорий не меняются. Бинарный выход
+    предварительно разворачивается в две строки.
+
+    Args:
+        classifier: Обученный классификатор с записываемыми весами
+        features: Признаки примеров категории формы (n_examples, n_features)
+        label: Метка категории; существующая метка заменяется, новая
+            должна быть больше всех существующих
+        background: Среднее входов выходного слоя на обучающей выборке
+            (см. output_features); улучшает направление весов
+    """
+    features = np.asarray(features, dtype=np.float32)
+    exists = label in classifier.classes_
+    row = int(np.searchsorted(classifier.classes_, label))
+
+    if isinstance(classifier, CentroidClassifier):
+        if exists:
+            classifier.sums_[row] = 0
+            classifier.counts_[row] = 0
+        classifier.partial_fit(features, np.full(len(features), label))
+        return
+
+    if isinstance(classifier, MLPClassifier):
+        coef, intercept = classifier.coefs_[-1].T, classifier.intercepts_[-1]
+        features = output_features(classifier, features)
+    elif isinstance(classifier, LogisticRegression | SGDClassifier):
+        coef, intercept = classifier.coef_, classifier.intercept_
+    else:
+        raise TypeError(f"Добавление категорий не поддерживается для {type(classifier).__name__}")
+
+    if coef.shape[0] == 1:
+        # Те же вероятности: (-w, w) для one-vs-rest, (-w/2, w/2) для softmax
+        scale = 1.0 if isinstance(classifier, SGDClassifier) else 0.5
+        coef = np.vstack([-coef, coef]) * scale
+        intercept = np.concatenate([-intercept, intercept]) * scale
+
+    others = np.arange(len(coef)) != row
+    weights, bias = _imprint_row(
+        features,
+        coef[others] if exists else coef,
+        intercept[others] if exists else intercept,
+        background,
+    )
+    if exists:
+        coef, intercept = coef.copy(), intercept.copy()
+        coef[row], intercept[row] = weights, bias
+    else:
+        coef = np.vstack([coef, weights[None]])
+        intercept = np.append(intercept, intercept.dtype.type(bias))
+        classifier.classes_ = np.append(classifier.classes_, label)
+    # Две категории снова хранятся одной строкой, как у sklearn
+    coef, intercept = _remap_rows(
+        coef, intercept, np.arange(len(coef)), ovr=isinstance(classifier, SGDClassifier)
+    )
+
+    if isinstance(classifier, MLPClassifier):
+        classifier.coefs_ = [*classifier.coefs_[:-1], np.ascontiguousarray(coef.T)]
+        classifier.intercepts_ = [*classifier.intercepts_[:-1], intercept]
+        classifier.n_outputs_ = len(intercept)
+        classifier.out_activation_ = "logistic" if len(intercept) == 1 else "softmax"
+        classifier._label_binarizer = LabelBinarizer().fit(classifier.classes_)
+    else:
+        classifier.coef_, classifier.intercept_ = coef, intercept
+
+
+def write_json_atomic(path: str | Path, data: dict[str, Any]) -> None:
+    """
+    Атомарная запись JSON: во временный файл рядом и замена им целевого.
+
+    Читатели видят либо старое, либо новое содержимое файла целиком.
+
+    Args:
+        path: Путь к файлу
+        data: Данные для записи
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
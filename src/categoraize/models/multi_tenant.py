@@ -0,0 +1,275 @@
+"""Модуль для пакетного инференса по моделям многих пользователей."""
+
+import logging
+from collections.abc import Mapping
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from categoraize.models.artifacts import export_head
+from categoraize.models.classifier import ProductCategoryClassifier
+
+logger = logging.getLogger(__name__)
+
+# Ограничение на объем весов, собираемых по строкам за один шаг
+_GATHER_BYTES = 64 * 2**20
+
+# Допустимое отношение размера дополненного батча к числу строк
+_MAX_PADDING = 2.0
+
+
+class MultiTenantScorer:
+    """
+    Пакетный инференс для батча транзакций разных пользователей.
+
+    Все тексты батча кодируются один раз общим эмбеддером. Логистические
+    регрессии пользователей сложены в один тензор весов, дополненный до
+    максимального числа категорий, поэтому классификаторы применяются
+    батчевым умножением матриц без цикла по пользователям: стоимость
+    определяется размером батча, а не числом пользователей. Пользователи с
+    другими классификаторами (MLP) обрабатываются группами через sklearn.
+
+    Тензор весов пересобирается, когда меняется head_version какой-либо
+    модели (дообучение, добавление или удаление категории).
+    """
+
+    def __init__(self, models: Mapping[str, ProductCategoryClassifier]) -> None:
+        """
+        Инициализация по обученным моделям пользователей.
+
+        Args:
+            models: Словарь {идентификатор пользователя: обученная модель}.
+                Все модели должны использовать один и тот же эмбеддер
+        """
+        if not models:
+            raise ValueError("Не передано ни одной модели")
+
+        embedder_ids = {
+            f"{model.embedder_id}|precision={model.embedding_precision}"
+            for model in models.values()
+        }
+        if len(embedder_ids) > 1:
+            raise ValueError(f"Модели используют разные эмбеддеры: {sorted(embedder_ids)}")
+
+        for user_id, model in models.items():
+            if not model.is_fitted:
+                raise ValueError(f"Модель пользователя {user_id} не обучена")
+
+        self.models = dict(models)
+        self.user_ids = list(self.models)
+        self._user_index = {user_id: idx for idx, user_id in enumerate(self.user_ids)}
+        self._head_versions: list[int] = []
+        self._build_stacked_heads()
+
+        logger.info(
+            f"Пакетный инференс: {len(self.user_ids)} пользователей, "
+            f"из них с линейным классификатором {int(self._is_linear.sum())}"
+        )
+
+    def _build_stacked_heads(self) -> None:
+        """
+        Сборка весов логистических регрессий в дополненные тензоры.
+
+        В тензор попадают только пользователи с логистической регрессией.
+        Отсутствующие и удаленные у пользователя категории получают смещение
+        -inf и нулевую вероятность после softmax. Бинарная регрессия приводится к
+        двум столбцам: softmax([0, z]) совпадает с сигмоидой sklearn.
+        """
+        models = list(self.models.values())
+        self._head_versions = [model.head_version for model in models]
+        linear = [
+            idx
+            for idx, model in enumerate(models)
+            if isinstance(model.classifier, LogisticRegression)
+        ]
+        self._is_linear = np.zeros(len(self.user_ids), dtype=bool)
+        self._is_linear[linear] = True
+        # Номер пользователя в тензоре весов (-1 для нелинейных классификаторов)
+        self._stack_index = np.full(len(self.user_ids), -1, dtype=np.intp)
+        self._stack_index[linear] = np.arange(len(linear))
+
+        heads = [export_head(models[idx].classifier) for idx in linear]
+        n_classes = [len(header["classes"]) for header, _ in heads]
+        max_classes = max(n_classes, default=1)
+        dim = models[0].embedding_dim
+
+        # Веса хранятся транспонированными: (пользователь, признак, категория)
+        self._weights = np.zeros((len(linear), dim, max_classes), dtype=np.float32)
+        self._biases = np.full((len(linear), max_classes), -np.inf, dtype=np.float32)
+        self._labels = np.full((len(linear), max_classes), "", dtype=object)
+
+        for pos, (idx, (header, arrays)) in enumerate(zip(linear, heads, strict=True)):
+            coef, intercept = arrays["coef"], arrays["intercept"]
+            # Проекция эмбеддингов линейна и переносится в веса регрессии
+            projection = models[idx].projection
+            if projection is not None:
+                coef, intercept = projection.fold_into_linear(coef, intercept)
+            if len(header["classes"]) == 2 and coef.shape[0] == 1:
+                coef = np.vstack([np.zeros_like(coef), coef])
+                intercept = np.concatenate([np.zeros_like(intercept), intercept])
+            n = coef.shape[0]
+            self._weights[pos, :, :n] = coef.T
+            self._biases[pos, :n] = intercept
+            # Удаленные категории маскируются так же, как отсутствующие
+            labels = models[idx].classes_
+            removed = np.isin(labels, list(models[idx].removed_categories))
+            self._biases[pos, :n][removed] = -np.inf
+            self._labels[pos, :n] = labels
+
+    def _refresh_stacked_heads(self) -> None:
+        """Пересборка тензора весов, если хотя бы одна модель изменилась."""
+        versions = [model.head_version for model in self.models.values()]
+        if versions != self._head_versions:
+            logger.debug("Веса моделей изменились, тензор весов пересобирается")
+            self._build_stacked_heads()
+
+    def predict_with_confidence(
+        self,
+        user_ids: list[str],
+        product_titles: list[str],
+    ) -> tuple[list[str], np.ndarray]:
+        """
+        Предсказание категорий для транзакций разных пользователей.
+
+        Args:
+            user_ids: Идентификатор пользователя для каждой транзакции
+            product_titles: Названия продуктов
+
+        Returns:
+            Tuple (предсказанные категории, уровни уверенности)
+        """
+        if len(user_ids) != len(product_titles):
+            raise ValueError(
+                f"Длины user_ids ({len(user_ids)}) и product_titles "
+                f"({len(product_titles)}) не совпадают"
+            )
+        if len(product_titles) == 0:
+            return [], np.array([])
+
+        # Один проход эмбеддера на весь батч (с дедупликацией и кэшами модели)
+        embeddings = next(iter(self.models.values())).encode_products(product_titles)
+
+        return self.predict_embeddings(user_ids, embeddings)
+
+    def predict_embeddings(
+        self,
+        user_ids: list[str],
+        embeddings: np.ndarray,
+    ) -> tuple[list[str], np.ndarray]:
+        """
+        Предсказание категорий по готовым эмбеддингам.
+
+        Args:
+            user_ids: Идентификатор пользователя для каждой строки
+            embeddings: Эмбеддинги формы (n_rows, embedding_dim)
+
+        Returns:
+            Tuple (предсказанные категории, уровни уверенности)
+        """
+        unknown = set(user_ids) - self._user_index.keys()
+        if unknown:
+            raise ValueError(f"Нет моделей для пользователей: {sorted(unknown)}")
+
+        user_idx = np.fromiter(
+            (self._user_index[user_id] for user_id in user_ids),
+            dtype=np.intp,
+            count=len(user_ids),
+        )
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        self._refresh_stacked_heads()
+
+        labels = np.empty(len(user_idx), dtype=object)
+        confidences = np.empty(len(user_idx), dtype=np.float64)
+
+        linear_rows = np.flatnonzero(self._is_linear[user_idx])
+        if len(linear_rows) > 0:
+            row_labels, row_confidences = self._score_linear(
+                self._stack_index[user_idx[linear_rows]], embeddings[linear_rows]
+            )
+            labels[linear_rows] = row_labels
+            confidences[linear_rows] = row_confidences
+
+        # Остальные классификаторы применяются одним вызовом на пользователя
+        other_rows = np.flatnonzero(~self._is_linear[user_idx])
+        for idx in np.unique(user_idx[other_rows]):
+            rows = other_rows[user_idx[other_rows] == idx]
+            model = self.models[self.user_ids[idx]]
+            probabilities = model.predict_proba_embeddings(embeddings[rows])
+            best = probabilities.argmax(axis=1)
+            labels[rows] = model.classes_[best]
+            confidences[rows] = probabilities[np.arange(len(rows)), best]
+
+        return labels.tolist(), confidences
+
+    def _score_linear(
+        self,
+        user_idx: np.ndarray,
+        embeddings: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Применение сложенных логистических регрессий к строкам батча.
+
+        Строки группируются по пользователю и дополняются до размера самой
+        большой группы, после чего все группы умножаются на веса своих
+        пользователей одним батчевым matmul. Если дополнение слишком велико
+        (одна большая группа и много маленьких), каждая строка умножается на
+        веса своего пользователя отдельно.
+
+        Args:
+            user_idx: Индекс пользователя в тензоре весов для каждой строки
+            embeddings: Эмбеддинги строк
+
+        Returns:
+            Tuple (категории, вероятности предсказанных категорий)
+        """
+        order = np.argsort(user_idx, kind="stable")
+        users, starts, counts = np.unique(user_idx[order], return_index=True, return_counts=True)
+        max_rows = int(counts.max())
+
+        if len(users) * max_rows <= _MAX_PADDING * len(user_idx):
+            # Позиция строки внутри группы своего пользователя
+            group = np.repeat(np.arange(len(users)), counts)
+            position = np.arange(len(order)) - np.repeat(starts, counts)
+
+            padded = np.zeros((len(users), max_rows, embeddings.shape[1]), dtype=np.float32)
+            padded[group, position] = embeddings[order]
+            logits = np.matmul(padded, self._weights[users])[group, position]
+
+            scores = np.empty_like(logits)
+            scores[order] = logits
+        else:
+            scores = self._gather_logits(user_idx, embeddings)
+
+        scores += self._biases[user_idx]
+
+        # Softmax: уверенность предсказанной категории равна 1 / sum(exp(z - max))
+        best = scores.argmax(axis=1)
+        shifted = scores - scores[np.arange(len(user_idx)), best][:, None]
+        confidences = 1.0 / np.exp(shifted).sum(axis=1, dtype=np.float64)
+
+        return self._labels[user_idx, best], confidences
+
+    def _gather_logits(self, user_idx: np.ndarray, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Логиты без смещения при умножении каждой строки на веса своего пользователя.
+
+        Строки обрабатываются блоками, чтобы собранные веса не превышали
+        ограничение по памяти.
+
+        Args:
+            user_idx: Индекс пользователя в тензоре весов для каждой строки
+            embeddings: Эмбеддинги строк
+
+        Returns:
+            Логиты формы (n_rows, max_classes)
+        """
+        dim, max_classes = self._weights.shape[1:]
+        block = max(1, _GATHER_BYTES // (dim * max_classes * 4))
+
+        logits = np.empty((len(user_idx), max_classes), dtype=np.float32)
+        for start in range(0, len(user_idx), block):
+            idx = user_idx[start : start + block]
+            rows = embeddings[start : start + block, None, :]
+            logits[start : start + block] = np.matmul(rows, self._weights[idx])[:, 0, :]
+
+        return logits
@@ -0,0 +1,225 @@
+"""Модуль для инференса классификатора на чистом NumPy."""
+
+import threading
+from typing import Any
+
+import numpy as np
+from sklearn.base import BaseEstimator
+
+from categoraize.models.artifacts import export_head
+
+# Число строк, под которое заранее выделяются буферы
+DEFAULT_BUFFER_ROWS = 64
+
+
+def _relu(x: np.ndarray) -> None:
+    np.maximum(x, 0, out=x)
+
+
+def _tanh(x: np.ndarray) -> None:
+    np.tanh(x, out=x)
+
+
+def _logistic(x: np.ndarray) -> None:
+    np.negative(x, out=x)
+    # Переполнение exp дает inf, а 1 / (1 + inf) - корректный ноль
+    with np.errstate(over="ignore"):
+        np.exp(x, out=x)
+    x += 1
+    np.reciprocal(x, out=x)
+
+
+def _identity(x: np.ndarray) -> None:
+    pass
+
+
+# Функции активации скрытых слоев MLPClassifier, применяются на месте
+_ACTIVATIONS = {
+    "relu": _relu,
+    "tanh": _tanh,
+    "logistic": _logistic,
+    "identity": _identity,
+}
+
+
+class NumpyHead:
+    """
+    Прямой проход обученного классификатора без sklearn.
+
+    Веса LogisticRegression, SGDClassifier, MLPClassifier или CentroidClassifier хранятся
+    как массивы float32, а predict_proba сводится к умножениям матриц и
+    активациям без проверок входа и диспетчеризации sklearn. Промежуточные
+    буферы выделяются заранее
+    и отдельно для каждого потока, поэтому один экземпляр можно вызывать из
+    нескольких потоков.
+    """
+
+    def __init__(
+        self,
+        header: dict[str, Any],
+        arrays: dict[str, np.ndarray],
+        labels: list[str] | np.ndarray,
+        buffer_rows: int = DEFAULT_BUFFER_ROWS,
+    ) -> None:
+        """
+        Инициализация по весам классификатора.
+
+        Args:
+            header: Описание классификатора (см. artifacts.export_head)
+            arrays: Словарь {имя: массив весов}
+            labels: Названия категорий для столбцов вероятностей
+            buffer_rows: Число строк, под которое заранее выделяются буферы;
+                большие батчи обрабатываются с выделением памяти
+        """
+        # Классификатор по центроидам нормализует вход и делит близости на температуру
+        self.normalize_input = False
+        if header["kind"] == "linear":
+            self.coefs = [np.ascontiguousarray(arrays["coef"].T, dtype=np.float32)]
+            self.intercepts = [np.asarray(arrays["intercept"], dtype=np.float32)]
+            self.activation = "identity"
+            # Бинарная регрессия имеет один выход с сигмоидой; SGDClassifier
+            # нормирует независимые сигмоиды классов (one-vs-rest)
+            if self.coefs[0].shape[1] == 1:
+                self.out_activation = "logistic"
+            elif header.get("multi_class") == "ovr":
+                self.out_activation = "ovr"
+            else:
+                self.out_activation = "softmax"
+        elif header["kind"] == "mlp":
+            n_layers = header["n_layers"]
+            self.coefs = [
+                np.ascontiguousarray(arrays[f"coef_{idx}"], dtype=np.float32)
+                for idx in range(n_layers)
+            ]
+            self.intercepts = [
+                np.asarray(arrays[f"intercept_{idx}"], dtype=np.float32) for idx in range(n_layers)
+            ]
+            self.activation = header["activation"]
+            self.out_activation = header["out_activation"]
+        elif header["kind"] == "centroid":
+            sums = np.asarray(arrays["sums"], dtype=np.float32)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = sums / norms
+            self.coefs = [np.ascontiguousarray(centroids.T / header["temperature"])]
+            self.intercepts = [np.zeros(len(centroids), dtype=np.float32)]
+            self.activation = "identity"
+            self.out_activation = "softmax"
+            self.normalize_input = True
+        else:
+            raise ValueError(f"Неизвестный тип классификатора: {header['kind']}")
+
+        if self.activation not in _ACTIVATIONS:
+            raise ValueError(f"Неподдерживаемая функция активации: {self.activation}")
+
+        self.labels = np.asarray(labels, dtype=object)
+        self.n_features = int(header["n_features"])
+        self.n_classes = len(self.labels)
+        self.buffer_rows = buffer_rows
+        self._local = threading.local()
+
+    @classmethod
+    def from_estimator(
+        cls,
+        classifier: BaseEstimator,
+        labels: list[str] | np.ndarray,
+        buffer_rows: int = DEFAULT_BUFFER_ROWS,
+    ) -> "NumpyHead":
+        """
+        Компиляция обученного классификатора sklearn.
+
+        Args:
+            classifier: Обученный LogisticRegression, MLPClassifier или CentroidClassifier
+            labels: Названия категорий для столбцов вероятностей
+            buffer_rows: Число строк, под которое заранее выделяются буферы
+
+        Returns:
+            Скомпилированный классификатор
+        """
+        header, arrays = export_head(classifier)
+        return cls(header, arrays, labels, buffer_rows=buffer_rows)
+
+    def _buffers(self, n_rows: int) -> list[np.ndarray]:
+        """
+        Буферы выходов слоев для батча из n_rows строк.
+
+        Args:
+            n_rows: Размер батча
+
+        Returns:
+            Список буферов, по одному на слой
+        """
+        if n_rows > self.buffer_rows:
+            return [np.empty((n_rows, coef.shape[1]), dtype=np.float32) for coef in self.coefs]
+
+        buffers: list[np.ndarray] | None = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = [
+                np.empty((self.buffer_rows, coef.shape[1]), dtype=np.float32) for coef in self.coefs
+            ]
+            self._local.buffers = buffers
+        return [buffer[:n_rows] for buffer in buffers]
+
+    def predict_proba(self, x_data: np.ndarray) -> np.ndarray:
+        """
+        Вероятности классов.
+
+        Args:
+            x_data: Эмбеддинги формы (n_rows, n_features)
+
+        Returns:
+            Массив вероятностей формы (n_rows, n_classes)
+        """
+        activations = np.asarray(x_data, dtype=np.float32)
+        if activations.ndim != 2 or activations.shape[1] != self.n_features:
+            raise ValueError(
+                f"Ожидались эмбеддинги формы (n, {self.n_features}), получено: {activations.shape}"
+            )
+
+        if self.normalize_input:
+            norms = np.linalg.norm(activations, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            activations = activations / norms
+
+        buffers = self._buffers(len(activations))
+        hidden_activation = _ACTIVATIONS[self.activation]
+        last = len(self.coefs) - 1
+        for idx, (coef, intercept, out) in enumerate(
+            zip(self.coefs, self.intercepts, buffers, strict=True)
+        ):
+            np.matmul(activations, coef, out=out)
+            np.add(out, intercept, out=out)
+            if idx != last:
+                hidden_activation(out)
+            activations = out
+
+        if self.out_activation == "softmax":
+            activations -= activations.max(axis=1, keepdims=True)
+            np.exp(activations, out=activations)
+            activations /= activations.sum(axis=1, keepdims=True)
+            return activations.copy()
+
+        if self.out_activation == "ovr":
+            _logistic(activations)
+            activations /= activations.sum(axis=1, keepdims=True)
+            return activations.copy()
+
+        # Один логистический выход: вероятности [1 - p, p], как в sklearn
+        _logistic(activations)
+        probabilities = np.empty((len(activations), 2), dtype=np.float32)
+        probabilities[:, 1] = activations[:, 0]
+        np.subtract(1, activations[:, 0], out=probabilities[:, 0])
+        return probabilities
+
+    def predict(self, x_data: np.ndarray) -> np.ndarray:
+        """
+        Предсказание категорий.
+
+        Args:
+            x_data: Эмбеддинги формы (n_rows, n_features)
+
+        Returns:
+            Массив названий категорий
+        """
+        result: np.ndarray = self.labels[self.predict_proba(x_data).argmax(axis=1)]
+        return result
@@ -0,0 +1,183 @@
+"""Модуль для понижения размерности эмбеддингов."""
+
+import logging
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Поддерживаемые методы понижения размерности
+PROJECTION_METHODS = ("pca", "random")
+
+PROJECTION_FILENAME = "projection.npz"
+
+
+class EmbeddingProjection:
+    """
+    Линейная проекция эмбеддингов в пространство меньшей размерности.
+
+    Проекция применяется между эмбеддером и классификатором:
+    ``(x - mean) @ components.T``. Метод 'pca' обучается на эмбеддингах
+    обучающей выборки и сохраняет главные компоненты, метод 'random' -
+    гауссова случайная проекция с фиксированным seed, не требующая обучения.
+    """
+
+    def __init__(self, method: str = "pca", dim: int = 64, random_state: int = 42) -> None:
+        """
+        Инициализация проекции.
+
+        Args:
+            method: Метод проекции ('pca' или 'random')
+            dim: Целевая размерность
+            random_state: Seed для случайной проекции
+        """
+        if method not in PROJECTION_METHODS:
+            raise ValueError(
+                f"Неизвестный метод проекции: {method}. Доступны: {PROJECTION_METHODS}"
+            )
+        if dim < 1:
+            raise ValueError(f"Размерность проекции должна быть положительной, получено: {dim}")
+
+        self.method = method
+        self.dim = int(dim)
+        self.random_state = random_state
+
+        self.components: np.ndarray | None = None
+        self.mean: np.ndarray | None = None
+        self.explained_variance_ratio: float | None = None
+
+    @property
+    def is_fitted(self) -> bool:
+        """Обучена ли проекция."""
+        return self.components is not None
+
+    def get_params(self) -> dict[str, Any]:
+        """
+        Параметры проекции для метаданных модели.
+
+        Returns:
+            Словарь параметров конструктора
+        """
+        return {"method": self.method, "dim": self.dim, "random_state": self.random_state}
+
+    def fit(self, embeddings: np.ndarray) -> "EmbeddingProjection":
+        """
+        Обучение проекции.
+
+        Args:
+            embeddings: Эмбеддинги формы (n_samples, embedding_dim)
+
+        Returns:
+            self
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float64)
+        n_samples, embedding_dim = embeddings.shape
+        if self.dim > embedding_dim:
+            raise ValueError(
+                f"Размерность проекции {self.dim} больше размерности эмбеддингов {embedding_dim}"
+            )
+
+        if self.method == "random":
+            rng = np.random.default_rng(self.random_state)
+            components = rng.normal(size=(self.dim, embedding_dim)) / np.sqrt(self.dim)
+            self.mean = np.zeros(embedding_dim, dtype=np.float32)
+        else:
+            if self.dim > n_samples:
+                raise ValueError(
+                    f"Размерность PCA {self.dim} больше числа обучающих примеров {n_samples}"
+                )
+            mean = embeddings.mean(axis=0)
+            centered = embeddings - mean
+            # Разложение ковариационной матрицы (embedding_dim x embedding_dim)
+            # дешевле SVD всей выборки, когда примеров больше, чем признаков
+            covariance = centered.T @ centered / max(n_samples - 1, 1)
+            eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+            order = np.argsort(eigenvalues)[::-1][: self.dim]
+            components = eigenvectors[:, order].T
+            total = eigenvalues.sum()
+            self.explained_variance_ratio = (
+                float(eigenvalues[order].sum() / total) if total > 0 else 1.0
+            )
+            self.mean = mean.astype(np.float32)
+
+        self.components = np.ascontiguousarray(components, dtype=np.float32)
+
+        logger.info(
+            f"Проекция {self.method}: {embedding_dim} -> {self.dim}"
+            + (
+                f", доля объясненной дисперсии {self.explained_variance_ratio:.3f}"
+                if self.explained_variance_ratio is not None
+                else ""
+            )
+        )
+        return self
+
+    def transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Применение проекции.
+
+        Args:
+            embeddings: Эмбеддинги формы (n_samples, embedding_dim)
+
+        Returns:
+            Эмбеддинги формы (n_samples, dim) в float32
+        """
+        if self.components is None or self.mean is None:
+            raise ValueError("Проекция не обучена. Вызовите fit() перед transform()")
+        projected: np.ndarray = (np.asarray(embeddings, dtype=np.float32) - self.mean) @ (
+            self.components.T
+        )
+        return projected
+
+    def fold_into_linear(
+        self, coef: np.ndarray, intercept: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Перенос проекции в веса линейного классификатора.
+
+        Линейный классификатор над проекцией эквивалентен линейному
+        классификатору над исходными эмбеддингами с весами coef @ components
+        и смещением intercept - coef @ components @ mean.
+
+        Args:
+            coef: Веса формы (n_outputs, dim)
+            intercept: Смещения формы (n_outputs,)
+
+        Returns:
+            Tuple (веса формы (n_outputs, embedding_dim), смещения)
+        """
+        if self.components is None or self.mean is None:
+            raise ValueError("Проекция не обучена")
+        folded = np.asarray(coef, dtype=np.float32) @ self.components
+        return folded, np.asarray(intercept, dtype=np.float32) - folded @ self.mean
+
+    def save(self, save_path: str | Path) -> None:
+        """
+        Сохранение обученной проекции в projection.npz.
+
+        Args:
+            save_path: Директория модели
+        """
+        if self.components is None or self.mean is None:
+            raise ValueError("Проекция не обучена")
+        np.savez(Path(save_path) / PROJECTION_FILENAME, components=self.components, mean=self.mean)
+
+    @classmethod
+    def load(cls, load_path: str | Path, params: dict[str, Any]) -> "EmbeddingProjection":
+        """
+        Загрузка проекции из projection.npz.
+
+        Args:
+            load_path: Директория модели
+            params: Параметры проекции из метаданных модели
+
+        Returns:
+            Обученная проекция
+        """
+        projection = cls(**params)
+        with np.load(Path(load_path) / PROJECTION_FILENAME) as data:
+            projection.components = data["components"]
+            projection.mean = data["mean"]
+        return projection
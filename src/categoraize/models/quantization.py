@@ -0,0 +1,110 @@
+"""Модуль для хранения эмбеддингов и весов с пониженной точностью."""
+
+import numpy as np
+
+# Поддерживаемые режимы точности
+PRECISIONS = ("float32", "float16", "int8")
+
+# Максимальное по модулю значение int8, на которое отображается максимум строки
+_INT8_MAX = 127
+
+
+def check_precision(precision: str) -> str:
+    """
+    Проверка режима точности.
+
+    Args:
+        precision: Режим точности
+
+    Returns:
+        Тот же режим точности
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Неизвестный режим точности: {precision}. Доступны: {PRECISIONS}")
+    return precision
+
+
+def storage_dtype(precision: str) -> np.dtype:
+    """
+    Тип данных для хранения в заданном режиме точности.
+
+    Args:
+        precision: Режим точности
+
+    Returns:
+        Тип данных numpy
+    """
+    return np.dtype(check_precision(precision))
+
+
+def bytes_per_vector(dim: int, precision: str) -> int:
+    """
+    Объем памяти под один вектор с учетом масштаба int8.
+
+    Args:
+        dim: Размерность вектора
+        precision: Режим точности
+
+    Returns:
+        Объем в байтах
+    """
+    scale_bytes = 4 if precision == "int8" else 0
+    return dim * storage_dtype(precision).itemsize + scale_bytes
+
+
+def quantize(array: np.ndarray, precision: str) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Перевод матрицы в режим пониженной точности.
+
+    В режиме int8 каждая строка масштабируется отдельно: максимум модуля
+    строки отображается в 127, масштаб строки хранится в float32.
+
+    Args:
+        array: Матрица формы (n_rows, dim)
+        precision: Режим точности
+
+    Returns:
+        Tuple (данные в типе режима, масштабы строк формы (n_rows,) или None)
+    """
+    array = np.asarray(array, dtype=np.float32)
+    if check_precision(precision) != "int8":
+        return array.astype(storage_dtype(precision), copy=False), None
+
+    scales = np.abs(array).max(axis=-1) / _INT8_MAX
+    # Нулевые строки квантуются в нули с единичным масштабом
+    scales[scales == 0] = 1.0
+    data = np.rint(array / scales[..., None]).astype(np.int8)
+    return data, scales.astype(np.float32)
+
+
+def dequantize(data: np.ndarray, scales: np.ndarray | None = None) -> np.ndarray:
+    """
+    Восстановление матрицы float32 из режима пониженной точности.
+
+    Args:
+        data: Данные в типе режима
+        scales: Масштабы строк для int8 (None для float32 и float16)
+
+    Returns:
+        Матрица float32
+    """
+    if scales is None:
+        return np.asarray(data, dtype=np.float32)
+    result: np.ndarray = data.astype(np.float32) * np.asarray(scales, dtype=np.float32)[..., None]
+    return result
+
+
+def round_trip(array: np.ndarray, precision: str) -> np.ndarray:
+    """
+    Матрица float32, какой она станет после хранения в заданном режиме.
+
+    Args:
+        array: Матрица формы (n_rows, dim)
+        precision: Режим точности
+
+    Returns:
+        Матрица float32
+    """
+    if precision == "float32":
+        return np.asarray(array, dtype=np.float32)
+    return dequantize(*quantize(array, precision))
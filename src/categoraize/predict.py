@@ -0,0 +1,447 @@
+"""Скрипт для пакетной классификации больших файлов сохраненной моделью."""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import numpy as np
+import pandas as pd
+import torch
+
+from categoraize.data.formats import detect_format, iter_columnar, read_columns
+from categoraize.data.loader import TITLE_COLUMN_VARIANTS
+from categoraize.data.preprocessor import DataPreprocessor
+from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.serving.prefork import available_cores, worker_threads
+from categoraize.train import load_config, setup_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_TOP_K = 3
+# Файл прогресса рядом с выходным файлом: <output>.progress.json
+PROGRESS_SUFFIX = ".progress.json"
+
+# Модель и препроцессор процесса-воркера
+_worker: dict[str, Any] = {}
+
+
+def read_chunks(
+    input_path: str | Path, columns: list[str], chunk_size: int, skip_rows: int = 0
+) -> Iterator[pd.DataFrame]:
+    """
+    Чтение входного файла по частям.
+
+    В памяти одновременно находится только один чанк, из файла читаются
+    только указанные колонки.
+
+    Args:
+        input_path: Путь к файлу CSV, Parquet, Arrow IPC или Feather
+        columns: Читаемые колонки
+        chunk_size: Число строк в чанке
+        skip_rows: Число пропускаемых строк данных от начала файла
+
+    Yields:
+        DataFrame с указанными колонками
+    """
+    if detect_format(input_path) != "csv":
+        yield from iter_columnar(input_path, columns, chunk_size, skip_rows=skip_rows)
+        return
+
+    reader = pd.read_csv(
+        input_path,
+        usecols=columns,
+        dtype=str,
+        keep_default_na=False,
+        skip_blank_lines=False,
+        chunksize=chunk_size,
+        skiprows=range(1, skip_rows + 1),
+    )
+    # usecols сохраняет порядок колонок файла
+    for chunk in reader:
+        yield chunk[columns]
+
+
+def _init_worker(
+    model_path: str, lowercase: bool, remove_punctuation: bool, threads: int | None
+) -> None:
+    """
+    Загрузка модели и препроцессора в процессе-воркере.
+
+    Args:
+        model_path: Путь к сохраненной модели
+        lowercase: Приводить ли текст к нижнему регистру
+        remove_punctuation: Удалять ли пунктуацию
+        threads: Число потоков torch в воркере (None - не менять)
+    """
+    if threads is not None:
+        torch.set_num_threads(threads)
+    _worker["model"] = ProductCategoryClassifier.from_pretrained(model_path)
+    _worker["preprocessor"] = DataPreprocessor(
+        lowercase=lowercase, remove_punctuation=remove_punctuation
+    )
+
+
+def _score_chunk(titles: list[str], top_k: int) -> pd.DataFrame:
+    """
+    Предобработка и классификация названий одного чанка.
+
+    Названия, пустые после предобработки, получают пустую категорию
+    и уверенность NaN, чтобы строки выхода соответствовали строкам входа.
+
+    Args:
+        titles: Названия продуктов
+        top_k: Количество лучших категорий для каждого продукта
+
+    Returns:
+        DataFrame с колонками category, confidence и top_<i>_category, top_<i>_score
+    """
+    model: ProductCategoryClassifier = _worker["model"]
+    preprocessor: DataPreprocessor = _worker["preprocessor"]
+
+    processed = [preprocessor.preprocess_text(title) for title in titles]
+    mask = np.array([len(title) > 0 for title in processed], dtype=bool)
+    result = model.infer([title for title in processed if title], top_k=top_k)
+
+    k = result.top_k_scores.shape[1]
+    labels = np.full((len(titles), k), "", dtype=object)
+    scores = np.full((len(titles), k), np.nan)
+    labels[mask] = np.array(result.top_k_labels, dtype=object).reshape(-1, k)
+    scores[mask] = result.top_k_scores
+
+    columns: dict[str, np.ndarray] = {"category": labels[:, 0], "confidence": scores[:, 0]}
+    for idx in range(k):
+        columns[f"top_{idx + 1}_category"] = labels[:, idx]
+        columns[f"top_{idx + 1}_score"] = scores[:, idx]
+    return pd.DataFrame(columns)
+
+
+def _resolve_columns(
+    columns: list[str], title_column: str | None, keep_columns: list[str]
+) -> tuple[str, list[str]]:
+    """
+    Выбор колонки с названиями продуктов и колонок выхода.
+
+    Args:
+        columns: Колонки входного файла
+        title_column: Явно указанная колонка с названиями (None - автодетект)
+        keep_columns: Колонки входа, копируемые в выход
+
+    Returns:
+        Tuple (колонка с названиями, читаемые колонки входа)
+    """
+    if title_column is None:
+        title_column = next((c for c in TITLE_COLUMN_VARIANTS if c in columns), None)
+        if title_column is None:
+            raise ValueError(
+                f"Не найдена колонка с названиями продуктов. Доступные колонки: {columns}"
+            )
+    elif title_column not in columns:
+        raise ValueError(f"Колонка '{title_column}' не найдена. Доступные колонки: {columns}")
+
+    missing = [column for column in keep_columns if column not in columns]
+    if missing:
+        raise ValueError(f"Колонки {missing} не найдены. Доступные колонки: {columns}")
+    return title_column, [title_column] + [c for c in keep_columns if c != title_column]
+
+
+def _load_progress(input_path: Path, output_path: Path, overwrite: bool) -> dict[str, Any]:
+    """
+    Загрузка прогресса прерванного запуска.
+
+    Args:
+        input_path: Путь к входному файлу
+        output_path: Путь к выходному файлу
+        overwrite: Начать заново, удалив выходной файл и прогресс
+
+    Returns:
+        Прогресс: input, rows_read, rows_written, offset (байт выхода), chunks
+    """
+    progress_path = output_path.with_name(output_path.name + PROGRESS_SUFFIX)
+    progress: dict[str, Any] = {
+        "input": str(input_path.resolve()),
+        "rows_read": 0,
+        "rows_written": 0,
+        "offset": 0,
+        "chunks": 0,
+    }
+
+    if overwrite:
+        output_path.unlink(missing_ok=True)
+        progress_path.unlink(missing_ok=True)
+    elif progress_path.exists():
+        saved = json.loads(progress_path.read_text(encoding="utf-8"))
+        if saved["input"] != progress["input"]:
+            raise ValueError(
+                f"Прогресс {progress_path} относится к другому входному файлу: {saved['input']}"
+            )
+        progress.update(saved)
+        logger.info(
+            f"Продолжение со строки {progress['rows_read']} "
+            f"(записано чанков: {progress['chunks']})"
+        )
+    elif output_path.exists():
+        raise ValueError(
+            f"Выходной файл {output_path} уже существует. Удалите его или запустите с перезаписью"
+        )
+    return progress
+
+
+def _save_progress(progress_path: Path, progress: dict[str, Any]) -> None:
+    """Атомарная запись файла прогресса."""
+    tmp_path = progress_path.with_name(progress_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(progress), encoding="utf-8")
+    tmp_path.replace(progress_path)
+
+
+def _write_chunk(
+    f: BinaryIO, chunk: pd.DataFrame, predictions: pd.DataFrame, progress: dict[str, Any]
+) -> None:
+    """
+    Запись предсказаний чанка в выходной файл.
+
+    Данные сбрасываются на диск до обновления прогресса, поэтому прогресс
+    никогда не указывает на незаписанные строки.
+
+    Args:
+        f: Выходной файл, открытый на дозапись
+        chunk: Читаемые колонки входа
+        predictions: Предсказания для строк чанка
+        progress: Прогресс (обновляется на месте)
+    """
+    output = pd.concat([chunk.reset_index(drop=True), predictions], axis=1)
+    f.write(output.to_csv(index=False, header=progress["offset"] == 0).encode("utf-8"))
+    f.flush()
+    os.fsync(f.fileno())
+
+    progress["rows_read"] += len(chunk)
+    progress["rows_written"] += len(output)
+    progress["offset"] = f.tell()
+    progress["chunks"] += 1
+
+
+def _start_workers(
+    model_path: str | Path, workers: int, lowercase: bool, remove_punctuation: bool
+) -> ProcessPoolExecutor | None:
+    """
+    Запуск пула процессов с моделью в каждом воркере.
+
+    Воркеры запускаются через spawn: fork процесса, уже выполнявшего
+    инференс torch, может зависнуть на блокировках пула потоков OpenMP.
+
+    Args:
+        model_path: Путь к сохраненной модели
+        workers: Число процессов-воркеров
+        lowercase: Приводить ли текст к нижнему регистру
+        remove_punctuation: Удалять ли пунктуацию
+
+    Returns:
+        Пул процессов или None, если модель загружена в текущем процессе (workers=1)
+    """
+    init_args = (str(model_path), lowercase, remove_punctuation)
+    if workers == 1:
+        _init_worker(*init_args, threads=None)
+        return None
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(*init_args, worker_threads(workers)),
+    )
+
+
+def predict_file(  # noqa: PLR0913
+    model_path: str | Path,
+    input_path: str | Path,
+    output_path: str | Path,
+    title_column: str | None = None,
+    keep_columns: list[str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    top_k: int = DEFAULT_TOP_K,
+    lowercase: bool = True,
+    remove_punctuation: bool = False,
+    overwrite: bool = False,
+) -> dict[str, Any]:
+    """
+    Потоковая классификация файла с продуктами.
+
+    Чанки входного файла предобрабатываются и классифицируются в пуле
+    процессов (в каждом воркере своя копия модели) и дописываются в
+    выходной CSV в исходном порядке. В обработке одновременно находится
+    не больше двух чанков на воркер. После каждого чанка в файл прогресса
+    записываются число прочитанных строк и размер выходного файла, поэтому
+    прерванный запуск продолжается с первого незаписанного чанка.
+
+    Args:
+        model_path: Путь к модели, сохраненной save_pretrained
+        input_path: Путь к входному файлу CSV, Parquet, Arrow IPC или Feather
+        output_path: Путь к выходному файлу CSV
+        title_column: Колонка с названиями продуктов (по умолчанию - автодетект)
+        keep_columns: Колонки входа, копируемые в выход (например, id транзакции)
+        chunk_size: Число строк в чанке
+        workers: Число процессов-воркеров (1 - в текущем процессе)
+        top_k: Количество лучших категорий для каждого продукта
+        lowercase: Приводить ли текст к нижнему регистру
+        remove_punctuation: Удалять ли пунктуацию
+        overwrite: Начать заново, удалив выходной файл и прогресс
+
+    Returns:
+        Словарь со статистикой: rows, resumed_rows, chunks, seconds, rows_per_second
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size должен быть положительным, получено: {chunk_size}")
+    if workers < 1:
+        raise ValueError(f"Число воркеров должно быть положительным, получено: {workers}")
+
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    title_column, columns = _resolve_columns(
+        read_columns(input_path), title_column, keep_columns or []
+    )
+    progress = _load_progress(input_path, output_path, overwrite)
+    progress_path = output_path.with_name(output_path.name + PROGRESS_SUFFIX)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Частично записанный чанк прерванного запуска отбрасывается
+    if output_path.exists():
+        os.truncate(output_path, progress["offset"])
+
+    executor = _start_workers(model_path, workers, lowercase, remove_punctuation)
+    max_in_flight = 2 * workers if executor is not None else 1
+
+    resumed_rows = progress["rows_read"]
+    start = time.perf_counter()
+    pending: deque[tuple[pd.DataFrame, Future]] = deque()
+
+    def write_oldest(f: BinaryIO) -> None:
+        chunk, future = pending.popleft()
+        _write_chunk(f, chunk, future.result(), progress)
+        _save_progress(progress_path, progress)
+        rows = progress["rows_read"] - resumed_rows
+        logger.info(
+            f"Чанк {progress['chunks']}: всего {progress['rows_read']} строк, "
+            f"{rows / (time.perf_counter() - start):.0f} строк/с"
+        )
+
+    try:
+        with output_path.open("ab") as f:
+            for chunk in read_chunks(input_path, columns, chunk_size, resumed_rows):
+                titles = chunk[title_column].tolist()
+                if executor is not None:
+                    future = executor.submit(_score_chunk, titles, top_k)
+                else:
+                    future = Future()
+                    future.set_result(_score_chunk(titles, top_k))
+                pending.append((chunk, future))
+                while len(pending) >= max_in_flight:
+                    write_oldest(f)
+            while pending:
+                write_oldest(f)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        _worker.clear()
+
+    progress_path.unlink(missing_ok=True)
+    rows = progress["rows_read"] - resumed_rows
+    seconds = time.perf_counter() - start
+    stats = {
+        "rows": progress["rows_read"],
+        "resumed_rows": resumed_rows,
+        "chunks": progress["chunks"],
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds > 0 else 0.0,
+    }
+    logger.info(
+        f"Классифицировано {rows} строк за {seconds:.1f} с "
+        f"({stats['rows_per_second']:.0f} строк/с), результат: {output_path}"
+    )
+    return stats
+
+
+def main() -> None:
+    """Главная функция для пакетной классификации."""
+    parser = argparse.ArgumentParser(description="Пакетная классификация файла с продуктами")
+    parser.add_argument("model", type=str, help="Путь к сохраненной модели")
+    parser.add_argument(
+        "input", type=str, help="Входной файл (CSV, Parquet, Arrow IPC или Feather)"
+    )
+    parser.add_argument("output", type=str, help="Выходной файл CSV")
+    parser.add_argument(
+        "--title-column",
+        type=str,
+        default=None,
+        help="Колонка с названиями продуктов (по умолчанию - автодетект)",
+    )
+    parser.add_argument(
+        "--keep-columns",
+        type=str,
+        default=None,
+        help="Колонки входа через запятую, копируемые в выход",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Число строк в чанке"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=available_cores(),
+        help="Число процессов-воркеров (по умолчанию - число доступных ядер)",
+    )
+    parser.add_argument(
+        "--top-k", type=int, default=DEFAULT_TOP_K, help="Количество лучших категорий"
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        help="Конфигурация обучения (YAML), из которой берется секция preprocessing",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Начать заново вместо продолжения прерванного запуска",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Включить детальное логирование",
+    )
+
+    args = parser.parse_args()
+
+    setup_logging(verbose=args.verbose)
+
+    try:
+        preprocessing = load_config(args.config).get("preprocessing", {}) if args.config else {}
+        predict_file(
+            args.model,
+            args.input,
+            args.output,
+            title_column=args.title_column,
+            keep_columns=args.keep_columns.split(",") if args.keep_columns else None,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            top_k=args.top_k,
+            lowercase=preprocessing.get("lowercase", True),
+            remove_punctuation=preprocessing.get("remove_punctuation", False),
+            overwrite=args.overwrite,
+        )
+    except Exception as e:
+        logger.error(f"Ошибка при классификации: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Скрипт для запуска сервиса предсказаний."""
+
+import argparse
+import logging
+import sys
+
+import uvicorn
+
+from categoraize.models.batching import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS
+from categoraize.serving.app import create_app
+from categoraize.serving.batcher import DEFAULT_MAX_PENDING
+from categoraize.serving.model_store import DEFAULT_MEMORY_BUDGET_BYTES, ModelStore
+from categoraize.serving.prefork import PreforkServer, preload
+from categoraize.serving.retrain import (
+    DEFAULT_DEBOUNCE_SECONDS,
+    DEFAULT_MAX_DELAY_SECONDS,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_MIN_EVENTS,
+    RetrainScheduler,
+)
+from categoraize.train import setup_logging
+
+
+def main() -> None:
+    """Главная функция для запуска сервиса."""
+    parser = argparse.ArgumentParser(description="Сервис предсказания категорий продуктов")
+    parser.add_argument(
+        "--models-dir",
+        type=str,
+        default="models",
+        help="Директория с моделями пользователей (models/<user_id>)",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Адрес сервиса")
+    parser.add_argument("--port", type=int, default=8000, help="Порт сервиса")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Число процессов-воркеров; при значении больше 1 эмбеддер загружается "
+        "один раз до fork и разделяется воркерами",
+    )
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=None,
+        help="Число потоков torch на воркер (по умолчанию - ядра, поделенные между воркерами)",
+    )
+    parser.add_argument(
+        "--preload-users",
+        type=str,
+        default=None,
+        help="Пользователи через запятую, модели которых загружаются до fork",
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET_BYTES / 2**20,
+        help="Бюджет памяти на загруженные модели пользователей, МБ",
+    )
+    parser.add_argument(
+        "--memory-cache-mb",
+        type=float,
+        default=None,
+        help="Бюджет общего LRU-кэша эмбеддингов в памяти, МБ (опционально)",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=DEFAULT_MAX_BATCH_SIZE,
+        help="Число названий, после которого батч обрабатывается без ожидания",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=DEFAULT_MAX_WAIT_MS,
+        help="Максимальное ожидание следующих запросов в батч, мс",
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=DEFAULT_MAX_PENDING,
+        help="Максимальное число названий в очереди (сверх - ответ 503)",
+    )
+    parser.add_argument(
+        "--retrain-min-events",
+        type=int,
+        default=DEFAULT_MIN_EVENTS,
+        help="Число исправлений, после которого модель пользователя дообучается",
+    )
+    parser.add_argument(
+        "--retrain-debounce-seconds",
+        type=float,
+        default=DEFAULT_DEBOUNCE_SECONDS,
+        help="Пауза без новых исправлений перед дообучением, с",
+    )
+    parser.add_argument(
+        "--retrain-max-delay-hours",
+        type=float,
+        default=DEFAULT_MAX_DELAY_SECONDS / 3600,
+        help="Максимальное ожидание исправления до дообучения, ч",
+    )
+    parser.add_argument(
+        "--retrain-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="Число параллельных дообучений",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Включить детальное логирование",
+    )
+
+    args = parser.parse_args()
+
+    setup_logging(verbose=args.verbose)
+    logger = logging.getLogger(__name__)
+
+    store = ModelStore(
+        args.models_dir,
+        memory_budget_bytes=int(args.memory_budget_mb * 2**20),
+        memory_cache_bytes=(
+            int(args.memory_cache_mb * 2**20) if args.memory_cache_mb is not None else None
+        ),
+    )
+    logger.info(f"Доступно моделей пользователей: {len(store.available())} в {args.models_dir}")
+
+    if args.workers > 1:
+        # Планировщик хранит очередь обратной связи в памяти процесса и не
+        # разделяется между воркерами, поэтому /feedback и /train отключены
+        logger.warning("В режиме нескольких воркеров эндпоинты /feedback и /train отключены")
+        preload(store, args.preload_users.split(",") if args.preload_users else None)
+        server = PreforkServer(
+            lambda: create_app(
+                store,
+                max_batch_size=args.max_batch_size,
+                max_wait_ms=args.max_wait_ms,
+                max_pending=args.max_pending,
+            ),
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            threads_per_worker=args.threads_per_worker,
+        )
+        try:
+            server.run()
+        except RuntimeError as e:
+            logger.error(f"Ошибка pre-fork сервиса: {e}", exc_info=True)
+            sys.exit(1)
+        return
+
+    # После публикации новой версии загруженная модель заменяется без закрытия старой
+    scheduler = RetrainScheduler(
+        args.models_dir,
+        min_events=args.retrain_min_events,
+        debounce_seconds=args.retrain_debounce_seconds,
+        max_delay_seconds=args.retrain_max_delay_hours * 3600,
+        max_workers=args.retrain_workers,
+        on_published=store.refresh,
+    )
+
+    app = create_app(
+        store,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_pending=args.max_pending,
+        scheduler=scheduler,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_config=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""Модуль для онлайн-сервиса предсказаний."""
+
+from categoraize.serving.app import create_app
+from categoraize.serving.batcher import DynamicBatcher
+from categoraize.serving.latency import LatencyHistogram, LatencyRecorder
+from categoraize.serving.model_store import InvalidUserIdError, ModelNotFoundError, ModelStore
+from categoraize.serving.prefork import PreforkServer, preload, process_memory, worker_threads
+from categoraize.serving.retrain import FeedbackEvent, RetrainScheduler
+
+__all__ = [
+    "create_app",
+    "DynamicBatcher",
+    "LatencyHistogram",
+    "LatencyRecorder",
+    "InvalidUserIdError",
+    "ModelNotFoundError",
+    "ModelStore",
+    "PreforkServer",
+    "preload",
+    "process_memory",
+    "worker_threads",
+    "FeedbackEvent",
+    "RetrainScheduler",
+]
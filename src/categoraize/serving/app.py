@@ -0,0 +1,245 @@
+"""Модуль для HTTP API предсказаний на FastAPI."""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+
+from categoraize.models.batching import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS
+from categoraize.models.embedder_registry import default_registry
+from categoraize.serving.batcher import DEFAULT_MAX_PENDING, DynamicBatcher
+from categoraize.serving.latency import LatencyRecorder
+from categoraize.serving.model_store import InvalidUserIdError, ModelNotFoundError, ModelStore
+from categoraize.serving.prefork import process_stats
+from categoraize.serving.retrain import RetrainScheduler
+
+logger = logging.getLogger(__name__)
+
+# Максимальное число названий в одном запросе /predict/batch
+MAX_BATCH_TITLES = 1024
+
+
+class PredictRequest(BaseModel):
+    """Запрос предсказания для одного продукта."""
+
+    user_id: str = Field(min_length=1)
+    product_title: str = Field(min_length=1)
+
+
+class BatchPredictRequest(BaseModel):
+    """Запрос предсказания для нескольких продуктов одного пользователя."""
+
+    user_id: str = Field(min_length=1)
+    product_titles: list[str] = Field(min_length=1, max_length=MAX_BATCH_TITLES)
+
+
+class Prediction(BaseModel):
+    """Предсказанная категория с уверенностью."""
+
+    category: str
+    confidence: float
+
+
+class BatchPredictResponse(BaseModel):
+    """Предсказания для нескольких продуктов в порядке запроса."""
+
+    predictions: list[Prediction]
+
+
+class FeedbackRequest(BaseModel):
+    """Исправление категории продукта пользователем."""
+
+    user_id: str = Field(min_length=1)
+    product_title: str = Field(min_length=1)
+    category: str = Field(min_length=1)
+
+
+class FeedbackResponse(BaseModel):
+    """Результат приема обратной связи."""
+
+    status: str
+    pending: int
+
+
+class TrainRequest(BaseModel):
+    """Запрос дообучения модели пользователя."""
+
+    user_id: str = Field(min_length=1)
+
+
+class TrainResponse(BaseModel):
+    """Результат запроса дообучения: 'scheduled' или 'up_to_date'."""
+
+    status: str
+
+
+async def _predict(app: FastAPI, user_id: str, product_titles: list[str]) -> list[Prediction]:
+    """
+    Предсказание через динамические батчи с переводом ошибок в HTTP-статусы.
+
+    404 возвращается только для пользователя без сохраненной модели, 400 -
+    для некорректного идентификатора. Остальные ошибки (поврежденный
+    артефакт, сбой инференса) - ошибки сервиса: они логируются, а клиент
+    получает 500 без текста внутреннего исключения.
+
+    Args:
+        app: Приложение
+        user_id: Идентификатор пользователя
+        product_titles: Названия продуктов
+
+    Returns:
+        Предсказания в порядке названий
+    """
+    batcher: DynamicBatcher = app.state.batcher
+    try:
+        results = await batcher.predict(user_id, product_titles)
+    except asyncio.QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"}) from e
+    except ModelNotFoundError as e:
+        raise HTTPException(status_code=404, detail=e.args[0]) from e
+    except InvalidUserIdError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        logger.exception(f"Ошибка предсказания для пользователя {user_id}")
+        raise HTTPException(status_code=500, detail="Внутренняя ошибка сервиса") from e
+    return [Prediction(category=label, confidence=confidence) for label, confidence in results]
+
+
+def _add_feedback_routes(app: FastAPI, scheduler: RetrainScheduler) -> None:
+    """
+    Эндпоинты обратной связи /feedback и дообучения /train.
+
+    Args:
+        app: Приложение
+        scheduler: Планировщик дообучения
+    """
+
+    # Обычные функции: FastAPI выполняет их в пуле потоков, и запись журнала
+    # с fsync не блокирует цикл событий
+    @app.post("/feedback", response_model=FeedbackResponse)
+    def feedback(request: FeedbackRequest) -> FeedbackResponse:
+        """Прием исправления категории; дообучение запускается по расписанию."""
+        try:
+            pending = scheduler.record(request.user_id, request.product_title, request.category)
+        except ModelNotFoundError as e:
+            raise HTTPException(status_code=404, detail=e.args[0]) from e
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        except Exception as e:
+            logger.exception(f"Ошибка приема обратной связи пользователя {request.user_id}")
+            raise HTTPException(status_code=500, detail="Внутренняя ошибка сервиса") from e
+        return FeedbackResponse(status="accepted", pending=pending)
+
+    @app.post("/train", response_model=TrainResponse)
+    def train(request: TrainRequest) -> TrainResponse:
+        """Запуск дообучения по накопленной обратной связи без ожидания расписания."""
+        try:
+            job = scheduler.trigger(request.user_id)
+        except ModelNotFoundError as e:
+            raise HTTPException(status_code=404, detail=e.args[0]) from e
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        except Exception as e:
+            logger.exception(f"Ошибка запуска дообучения пользователя {request.user_id}")
+            raise HTTPException(status_code=500, detail="Внутренняя ошибка сервиса") from e
+        return TrainResponse(status="scheduled" if job is not None else "up_to_date")
+
+
+def create_app(
+    store: ModelStore,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    scheduler: RetrainScheduler | None = None,
+) -> FastAPI:
+    """
+    Создание приложения с эндпоинтами /predict, /predict/batch, /health и /metrics.
+
+    Задержка каждого запроса записывается в гистограмму его маршрута и
+    возвращается в заголовке Server-Timing. Если передан планировщик
+    дообучения, добавляются эндпоинты /feedback и /train.
+
+    Args:
+        store: Хранилище моделей пользователей
+        max_batch_size: Число названий, после которого батч обрабатывается без ожидания
+        max_wait_ms: Максимальное ожидание следующих запросов в батч, мс
+        max_pending: Максимальное число названий в очереди предсказаний
+        scheduler: Планировщик дообучения по обратной связи (опционально)
+
+    Returns:
+        Приложение FastAPI
+    """
+    latency = LatencyRecorder()
+    batcher = DynamicBatcher(
+        store,
+        max_batch_size=max_batch_size,
+        max_wait_ms=max_wait_ms,
+        max_pending=max_pending,
+        latency=latency,
+    )
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        yield
+        if scheduler is not None:
+            scheduler.close()
+        batcher.close()
+        store.close()
+        logger.info("Сервис предсказаний остановлен")
+
+    app = FastAPI(title="CategorAIze", lifespan=lifespan)
+    app.state.store = store
+    app.state.batcher = batcher
+    app.state.latency = latency
+    app.state.scheduler = scheduler
+
+    @app.middleware("http")
+    async def record_latency(
+        request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        start = time.perf_counter()
+        response = await call_next(request)
+        elapsed = time.perf_counter() - start
+        route = request.scope.get("route")
+        name = getattr(route, "path", "unmatched")
+        latency.observe(f"{request.method} {name}", elapsed)
+        response.headers["Server-Timing"] = f"app;dur={elapsed * 1000:.2f}"
+        return response
+
+    @app.post("/predict", response_model=Prediction)
+    async def predict(request: PredictRequest) -> Prediction:
+        """Предсказание категории одного продукта."""
+        return (await _predict(app, request.user_id, [request.product_title]))[0]
+
+    @app.post("/predict/batch", response_model=BatchPredictResponse)
+    async def predict_batch(request: BatchPredictRequest) -> BatchPredictResponse:
+        """Предсказание категорий нескольких продуктов одного пользователя."""
+        predictions = await _predict(app, request.user_id, request.product_titles)
+        return BatchPredictResponse(predictions=predictions)
+
+    if scheduler is not None:
+        _add_feedback_routes(app, scheduler)
+
+    @app.get("/health")
+    async def health() -> dict[str, Any]:
+        """Проверка готовности сервиса."""
+        return {"status": "ok", "models_loaded": len(store)}
+
+    @app.get("/metrics")
+    async def metrics() -> dict[str, Any]:
+        """Гистограммы задержек, статистика батчей, моделей, эмбеддеров и процесса."""
+        return {
+            "latency": latency.snapshot(),
+            "batcher": batcher.stats(),
+            "models": store.stats(),
+            "embedders": default_registry.stats(),
+            "retrain": scheduler.stats() if scheduler is not None else None,
+            "process": process_stats(),
+        }
+
+    return app
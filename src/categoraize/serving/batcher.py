@@ -0,0 +1,303 @@
+"""Модуль для динамических батчей запросов разных пользователей."""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from categoraize.models.batching import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS
+from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.serving.latency import LatencyRecorder
+from categoraize.serving.model_store import ModelStore
+
+logger = logging.getLogger(__name__)
+
+# Ограничение на число названий в очереди по умолчанию
+DEFAULT_MAX_PENDING = 4096
+
+
+@dataclass
+class _Request:
+    """Запрос на классификацию продуктов одного пользователя."""
+
+    user_id: str
+    product_titles: list[str]
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class DynamicBatcher:
+    """
+    Динамические батчи запросов разных пользователей.
+
+    Запросы попадают в общую очередь; фоновый поток собирает их в батч,
+    пока число названий не достигнет max_batch_size или не истечет
+    max_wait_ms с момента первого запроса. Названия батча кодируются
+    одним проходом эмбеддера на каждую группу моделей с общим эмбеддером,
+    после чего к строкам каждого пользователя применяется его классификатор.
+
+    Число названий в очереди ограничено max_pending: при переполнении
+    запрос отклоняется с asyncio.QueueFull.
+    """
+
+    def __init__(
+        self,
+        store: ModelStore,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        latency: LatencyRecorder | None = None,
+    ) -> None:
+        """
+        Инициализация и запуск фонового потока.
+
+        Args:
+            store: Хранилище моделей пользователей
+            max_batch_size: Число названий, после которого батч обрабатывается без ожидания
+            max_wait_ms: Максимальное ожидание следующих запросов после первого, мс
+            max_pending: Максимальное число названий в очереди и в обработке
+            latency: Гистограммы задержек этапов (ожидание в очереди, инференс)
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"Размер батча должен быть положительным, получено: {max_batch_size}")
+        if max_wait_ms < 0:
+            raise ValueError(f"Время ожидания не может быть отрицательным, получено: {max_wait_ms}")
+        if max_pending < 1:
+            raise ValueError(f"Размер очереди должен быть положительным, получено: {max_pending}")
+
+        self.store = store
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_pending = max_pending
+        self.latency = latency if latency is not None else LatencyRecorder()
+
+        self._queue: queue.SimpleQueue[_Request | None] = queue.SimpleQueue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counters = {"requests": 0, "titles": 0, "batches": 0, "errors": 0, "rejected": 0}
+
+        self._thread = threading.Thread(
+            target=self._run, name="categoraize-dynamic-batcher", daemon=True
+        )
+        self._thread.start()
+
+        logger.info(
+            f"Динамические батчи: до {max_batch_size} названий, ожидание до {max_wait_ms:.1f} мс"
+        )
+
+    def submit(self, user_id: str, product_titles: list[str]) -> Future:
+        """
+        Постановка запроса в очередь.
+
+        Args:
+            user_id: Идентификатор пользователя
+            product_titles: Названия продуктов
+
+        Returns:
+            Future со списком пар (категория, уверенность)
+        """
+        request = _Request(user_id, list(product_titles))
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DynamicBatcher остановлен")
+            if self._pending + len(request.product_titles) > self.max_pending:
+                self._counters["rejected"] += 1
+                raise asyncio.QueueFull(
+                    f"Очередь предсказаний заполнена: {self._pending} названий в работе"
+                )
+            self._pending += len(request.product_titles)
+            self._queue.put(request)
+        return request.future
+
+    async def predict(self, user_id: str, product_titles: list[str]) -> list[tuple[str, float]]:
+        """
+        Асинхронное предсказание категорий без блокировки event loop.
+
+        Args:
+            user_id: Идентификатор пользователя
+            product_titles: Названия продуктов
+
+        Returns:
+            Список пар (категория, уверенность)
+        """
+        future = self.submit(user_id, product_titles)
+        result: list[tuple[str, float]] = await asyncio.wrap_future(future)
+        return result
+
+    def _collect(self) -> tuple[list[_Request], bool]:
+        """
+        Сбор следующего батча из очереди.
+
+        Returns:
+            Tuple (запросы батча, получен ли сигнал остановки)
+        """
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        n_titles = len(first.product_titles)
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while n_titles < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    request = self._queue.get(timeout=remaining)
+                else:
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+            n_titles += len(request.product_titles)
+        return batch, False
+
+    def _run(self) -> None:
+        """Цикл фонового потока: сбор батчей и инференс."""
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            started = time.perf_counter()
+            active = []
+            for request in batch:
+                if request.future.set_running_or_notify_cancel():
+                    self.latency.observe("queue_wait", started - request.enqueued_at)
+                    active.append(request)
+                else:
+                    self._release(request)
+            if active:
+                self._process(active, started)
+
+    def _release(self, request: _Request) -> None:
+        """Освобождение места в очереди после обработки запроса."""
+        with self._lock:
+            self._pending -= len(request.product_titles)
+
+    def _process(self, batch: list[_Request], started: float) -> None:
+        """
+        Инференс на батче и раздача результатов.
+
+        Ошибка загрузки модели или инференса затрагивает только запросы
+        соответствующего пользователя или группы моделей.
+
+        Args:
+            batch: Запросы батча
+            started: Момент начала обработки батча (time.perf_counter)
+        """
+        self._counters["requests"] += len(batch)
+        self._counters["titles"] += sum(len(request.product_titles) for request in batch)
+        self._counters["batches"] += 1
+
+        # Модели с одним эмбеддером кодируют названия одним проходом
+        groups: dict[str, list[tuple[_Request, ProductCategoryClassifier]]] = defaultdict(list)
+        failed: list[tuple[_Request, Exception]] = []
+        for request in batch:
+            try:
+                model = self.store.get(request.user_id)
+            except Exception as e:
+                failed.append((request, e))
+                continue
+            groups[f"{model.embedder_id}|precision={model.embedding_precision}"].append(
+                (request, model)
+            )
+
+        scored: list[tuple[_Request, list[tuple[str, float]]]] = []
+        for group in groups.values():
+            try:
+                results = self._score_group(group)
+            except Exception as e:
+                logger.exception(f"Ошибка инференса на группе из {len(group)} запросов")
+                failed.extend((request, e) for request, _ in group)
+                continue
+            scored.extend(
+                (request, result) for (request, _), result in zip(group, results, strict=True)
+            )
+
+        # Задержка записывается до ответа, чтобы метрики учитывали все отвеченные запросы
+        self.latency.observe("inference", time.perf_counter() - started)
+
+        self._counters["errors"] += len(failed)
+        for request, error in failed:
+            self._release(request)
+            request.future.set_exception(error)
+        for request, result in scored:
+            self._release(request)
+            request.future.set_result(result)
+
+    def _score_group(
+        self, group: list[tuple[_Request, ProductCategoryClassifier]]
+    ) -> list[list[tuple[str, float]]]:
+        """
+        Кодирование названий группы одним проходом и применение классификаторов.
+
+        Args:
+            group: Пары (запрос, модель пользователя) с общим эмбеддером
+
+        Returns:
+            Результаты для каждого запроса группы
+        """
+        titles = [title for request, _ in group for title in request.product_titles]
+        embeddings = group[0][1].encode_products(titles) if titles else np.empty((0, 0))
+
+        results: list[list[tuple[str, float]]] = []
+        start = 0
+        for request, model in group:
+            end = start + len(request.product_titles)
+            if end == start:
+                results.append([])
+                continue
+            probabilities = model.predict_proba_embeddings(embeddings[start:end])
+            best = probabilities.argmax(axis=1)
+            labels = model.classes_[best]
+            confidences = probabilities[np.arange(len(best)), best]
+            results.append(
+                [
+                    (str(label), float(confidence))
+                    for label, confidence in zip(labels, confidences, strict=True)
+                ]
+            )
+            start = end
+        return results
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Статистика батчей.
+
+        Returns:
+            Словарь с числом запросов, названий, батчей, ошибок, отклоненных
+            запросов, глубиной очереди и средним размером батча
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            pending = self._pending
+        return {
+            **counters,
+            "pending_titles": pending,
+            "mean_batch_size": counters["titles"] / max(counters["batches"], 1),
+        }
+
+    def close(self) -> None:
+        """Остановка фонового потока после обработки уже поставленных запросов."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self) -> "DynamicBatcher":
+        """Вход в контекстный менеджер."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Выход из контекстного менеджера с остановкой фонового потока."""
+        self.close()
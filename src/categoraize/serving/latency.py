@@ -0,0 +1,161 @@
+"""Модуль для гистограмм задержек сервиса."""
+
+import bisect
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+# Границы корзин гистограммы по умолчанию, мс
+DEFAULT_BUCKETS_MS = (1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0, 1000.0, 2000.0, 5000.0)
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек с фиксированными корзинами.
+
+    Наблюдение - O(log числа корзин) без хранения отдельных значений,
+    поэтому гистограмму можно обновлять на пути ответа. Квантили
+    оцениваются верхней границей корзины, в которую они попадают.
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        """
+        Инициализация пустой гистограммы.
+
+        Args:
+            buckets_ms: Возрастающие верхние границы корзин, мс
+        """
+        if list(buckets_ms) != sorted(buckets_ms) or len(buckets_ms) == 0:
+            raise ValueError(f"Границы корзин должны возрастать, получено: {buckets_ms}")
+
+        self.buckets_ms = tuple(float(bound) for bound in buckets_ms)
+        # Последняя корзина - значения больше всех границ
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """
+        Добавление наблюдения.
+
+        Args:
+            seconds: Задержка в секундах
+        """
+        value_ms = seconds * 1000
+        idx = bisect.bisect_left(self.buckets_ms, value_ms)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum_ms += value_ms
+            self._max_ms = max(self._max_ms, value_ms)
+
+    @property
+    def count(self) -> int:
+        """Число наблюдений."""
+        with self._lock:
+            return sum(self._counts)
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценка квантиля задержки.
+
+        Args:
+            q: Уровень квантиля от 0 до 1
+
+        Returns:
+            Верхняя граница корзины квантиля в мс (0 для пустой гистограммы)
+        """
+        with self._lock:
+            return self._quantile(q)
+
+    def _quantile(self, q: float) -> float:
+        """Оценка квантиля; вызывается под блокировкой."""
+        total = sum(self._counts)
+        if total == 0:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        for idx, count in enumerate(self._counts):
+            cumulative += count
+            if cumulative >= rank and count > 0:
+                if idx == len(self.buckets_ms):
+                    return self._max_ms
+                return min(self.buckets_ms[idx], self._max_ms)
+        return self._max_ms
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Текущее состояние гистограммы.
+
+        Returns:
+            Словарь с числом наблюдений, средним, квантилями p50/p95/p99,
+            максимумом и кумулятивными счетчиками корзин
+        """
+        with self._lock:
+            total = sum(self._counts)
+            buckets: dict[str, int] = {}
+            cumulative = 0
+            for bound, count in zip((*self.buckets_ms, float("inf")), self._counts, strict=True):
+                cumulative += count
+                buckets[f"le_{bound:g}"] = cumulative
+            return {
+                "count": total,
+                "mean_ms": self._sum_ms / max(total, 1),
+                "p50_ms": self._quantile(0.5),
+                "p95_ms": self._quantile(0.95),
+                "p99_ms": self._quantile(0.99),
+                "max_ms": self._max_ms,
+                "buckets": buckets,
+            }
+
+
+class LatencyRecorder:
+    """Набор гистограмм задержек по именам (маршрутам или этапам обработки)."""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        """
+        Инициализация пустого набора.
+
+        Args:
+            buckets_ms: Границы корзин для всех гистограмм, мс
+        """
+        self.buckets_ms = tuple(buckets_ms)
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """
+        Гистограмма по имени; создается при первом обращении.
+
+        Args:
+            name: Имя гистограммы
+
+        Returns:
+            Гистограмма
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram(self.buckets_ms)
+            return histogram
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Добавление наблюдения в гистограмму.
+
+        Args:
+            name: Имя гистограммы
+            seconds: Задержка в секундах
+        """
+        self.histogram(name).observe(seconds)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Состояние всех гистограмм.
+
+        Returns:
+            Словарь {имя: состояние гистограммы}
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histogram.snapshot() for name, histogram in sorted(histograms.items())}
@@ -0,0 +1,322 @@
+"""Модуль для загрузки моделей пользователей с LRU-вытеснением по памяти."""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from categoraize.models.artifacts import export_head
+from categoraize.models.classifier import ProductCategoryClassifier
+
+logger = logging.getLogger(__name__)
+
+# Бюджет памяти на классификаторы пользователей по умолчанию (эмбеддер общий и не учитывается)
+DEFAULT_MEMORY_BUDGET_BYTES = 256 * 2**20
+
+# Идентификатор пользователя - имя директории модели без разделителей пути
+_USER_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+class ModelNotFoundError(KeyError):
+    """Сохраненная модель пользователя не найдена."""
+
+
+class InvalidUserIdError(ValueError):
+    """Некорректный идентификатор пользователя."""
+
+
+def user_model_path(models_dir: str | Path, user_id: str) -> Path:
+    """
+    Директория модели пользователя с проверкой идентификатора.
+
+    Args:
+        models_dir: Директория с моделями пользователей
+        user_id: Идентификатор пользователя
+
+    Returns:
+        Путь models_dir/<user_id>
+    """
+    if not _USER_ID_PATTERN.match(user_id):
+        raise InvalidUserIdError(f"Некорректный идентификатор пользователя: {user_id!r}")
+    return Path(models_dir) / user_id
+
+
+class ModelStore:
+    """
+    Хранилище моделей пользователей, сохраненных в models_dir/<user_id>.
+
+    Модели загружаются лениво при первом запросе и держатся в LRU с
+    бюджетом памяти: при превышении бюджета вытесняются давно не
+    использованные модели. В бюджет входят веса классификатора и проекции;
+    эмбеддер берется из разделяемого реестра и один на все модели с
+    одинаковой моделью эмбеддингов. Параллельные запросы одной модели
+    дожидаются единственной загрузки.
+
+    Вытесненные и замененные модели не закрываются: запросы, которые уже
+    получили модель (например, батч DynamicBatcher), дорабатывают на ней, а
+    ссылка на эмбеддер возвращается в реестр, когда модель перестает
+    использоваться (weakref.finalize в ProductCategoryClassifier).
+    """
+
+    def __init__(
+        self,
+        models_dir: str | Path,
+        memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES,
+        memory_cache_bytes: int | None = None,
+    ) -> None:
+        """
+        Инициализация хранилища.
+
+        Args:
+            models_dir: Директория с сохраненными моделями пользователей
+            memory_budget_bytes: Бюджет памяти на загруженные модели в байтах
+            memory_cache_bytes: Бюджет LRU-кэша эмбеддингов в памяти, общего
+                для моделей с одним эмбеддером (опционально)
+        """
+        if memory_budget_bytes <= 0:
+            raise ValueError(
+                f"Бюджет памяти должен быть положительным, получено: {memory_budget_bytes}"
+            )
+
+        self.models_dir = Path(models_dir)
+        self.memory_budget_bytes = memory_budget_bytes
+        self.memory_cache_bytes = memory_cache_bytes
+
+        self._models: OrderedDict[str, tuple[ProductCategoryClassifier, int]] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def model_path(self, user_id: str) -> Path:
+        """
+        Директория модели пользователя.
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            Путь к директории модели
+        """
+        return user_model_path(self.models_dir, user_id)
+
+    def available(self) -> list[str]:
+        """
+        Пользователи, для которых есть сохраненные модели.
+
+        Returns:
+            Отсортированный список идентификаторов пользователей
+        """
+        if not self.models_dir.exists():
+            return []
+        return sorted(
+            path.name
+            for path in self.models_dir.iterdir()
+            if (path / "metadata.json").exists() and _USER_ID_PATTERN.match(path.name)
+        )
+
+    def get(self, user_id: str) -> ProductCategoryClassifier:
+        """
+        Модель пользователя; загружается с диска при промахе.
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            Обученная модель
+        """
+        with self._lock:
+            entry = self._models.get(user_id)
+            if entry is not None:
+                self._models.move_to_end(user_id)
+                self._counters["hits"] += 1
+                return entry[0]
+            load_lock = self._load_locks.setdefault(user_id, threading.Lock())
+
+        with load_lock:
+            try:
+                # Модель могла загрузиться, пока ожидалась блокировка
+                with self._lock:
+                    entry = self._models.get(user_id)
+                    if entry is not None:
+                        self._models.move_to_end(user_id)
+                        self._counters["hits"] += 1
+                        return entry[0]
+                    self._counters["misses"] += 1
+
+                model = self._load(user_id)
+                nbytes = self.model_nbytes(model)
+                with self._lock:
+                    self._models[user_id] = (model, nbytes)
+                    self._nbytes += nbytes
+                    self._evict_over_budget(keep=user_id)
+            finally:
+                # Блокировка удаляется и после ошибки загрузки, иначе запросы
+                # несуществующих пользователей копят блокировки без ограничения
+                with self._lock:
+                    if self._load_locks.get(user_id) is load_lock:
+                        del self._load_locks[user_id]
+
+        return model
+
+    def _load(self, user_id: str) -> ProductCategoryClassifier:
+        """
+        Загрузка модели пользователя с диска.
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            Обученная модель
+        """
+        path = self.model_path(user_id)
+        if not (path / "metadata.json").exists():
+            raise ModelNotFoundError(
+                f"Модель пользователя {user_id} не найдена в {self.models_dir}"
+            )
+
+        start = time.perf_counter()
+        model = ProductCategoryClassifier.from_pretrained(
+            path, memory_cache_bytes=self.memory_cache_bytes
+        )
+        if not model.is_fitted:
+            raise ValueError(f"Модель пользователя {user_id} не обучена")
+        logger.info(
+            f"Модель пользователя {user_id} загружена за "
+            f"{(time.perf_counter() - start) * 1000:.1f} мс"
+        )
+        return model
+
+    def _evict_over_budget(self, keep: str) -> None:
+        """
+        Вытеснение давно не использованных моделей до соблюдения бюджета.
+
+        Вызывается под блокировкой. Только что загруженная модель не
+        вытесняется, даже если одна превышает бюджет.
+
+        Args:
+            keep: Пользователь, модель которого нельзя вытеснять
+        """
+        while self._nbytes > self.memory_budget_bytes and len(self._models) > 1:
+            user_id, (model, nbytes) = next(iter(self._models.items()))
+            if user_id == keep:
+                break
+            del self._models[user_id]
+            self._nbytes -= nbytes
+            self._counters["evictions"] += 1
+            logger.info(f"Модель пользователя {user_id} вытеснена из памяти")
+
+    def evict(self, user_id: str) -> bool:
+        """
+        Выгрузка модели пользователя; следующий запрос загрузит ее с диска.
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            True, если модель была загружена
+        """
+        with self._lock:
+            entry = self._models.pop(user_id, None)
+            if entry is not None:
+                self._nbytes -= entry[1]
+        return entry is not None
+
+    def refresh(self, user_id: str) -> bool:
+        """
+        Замена загруженной модели пользователя новой версией с диска.
+
+        Новая версия загружается и получает эмбеддер из реестра до замены,
+        поэтому общий эмбеддер не выгружается, даже если старая модель
+        держала на него последнюю ссылку. Запросы во время загрузки
+        обслуживает старая версия. Незагруженная модель не загружается.
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            True, если модель была загружена и заменена
+        """
+        with self._lock:
+            if user_id not in self._models:
+                return False
+            load_lock = self._load_locks.setdefault(user_id, threading.Lock())
+
+        with load_lock:
+            try:
+                model = self._load(user_id)
+                # Ссылка на эмбеддер берется, пока его держит старая версия
+                _ = model.embedder
+                nbytes = self.model_nbytes(model)
+                with self._lock:
+                    entry = self._models.pop(user_id, None)
+                    if entry is not None:
+                        self._nbytes -= entry[1]
+                    self._models[user_id] = (model, nbytes)
+                    self._nbytes += nbytes
+                    self._evict_over_budget(keep=user_id)
+            finally:
+                with self._lock:
+                    if self._load_locks.get(user_id) is load_lock:
+                        del self._load_locks[user_id]
+
+        logger.info(f"Модель пользователя {user_id} заменена новой версией")
+        return True
+
+    @staticmethod
+    def model_nbytes(model: ProductCategoryClassifier) -> int:
+        """
+        Объем памяти модели без учета общего эмбеддера.
+
+        Args:
+            model: Обученная модель
+
+        Returns:
+            Объем весов классификатора, проекции и служебных массивов в байтах
+        """
+        _, arrays = export_head(model.classifier)
+        nbytes = sum(array.nbytes for array in arrays.values())
+        if model.projection is not None:
+            for array in (model.projection.components, model.projection.mean):
+                nbytes += array.nbytes if array is not None else 0
+        if model.background_mean is not None:
+            nbytes += model.background_mean.nbytes
+        return int(nbytes)
+
+    def __contains__(self, user_id: object) -> bool:
+        """Загружена ли модель пользователя."""
+        with self._lock:
+            return user_id in self._models
+
+    def __len__(self) -> int:
+        """Количество загруженных моделей."""
+        with self._lock:
+            return len(self._models)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Статистика хранилища.
+
+        Returns:
+            Словарь с числом загруженных моделей, объемом, бюджетом и
+            счетчиками попаданий, промахов и вытеснений
+        """
+        with self._lock:
+            return {
+                "models": len(self._models),
+                "bytes": self._nbytes,
+                "budget_bytes": self.memory_budget_bytes,
+                **self._counters,
+            }
+
+    def close(self) -> None:
+        """Выгрузка всех моделей."""
+        with self._lock:
+            models = [model for model, _ in self._models.values()]
+            self._models.clear()
+            self._nbytes = 0
+        for model in models:
+            model.close()
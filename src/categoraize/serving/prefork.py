@@ -0,0 +1,352 @@
+"""Модуль для многопроцессного сервиса с общими весами эмбеддера (pre-fork)."""
+
+import contextlib
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+import torch
+import uvicorn
+from fastapi import FastAPI
+
+from categoraize.serving.model_store import ModelStore
+
+logger = logging.getLogger(__name__)
+
+# Номер текущего воркера (None - однопроцессный режим)
+_worker_state: dict[str, int | None] = {"index": None}
+
+# Перезапуск упавших воркеров: пауза удваивается с каждым падением воркера
+# в пределах окна, а при превышении числа падений сервис останавливается
+DEFAULT_MAX_RESTARTS = 5
+DEFAULT_RESTART_WINDOW_SECONDS = 60.0
+DEFAULT_RESTART_BACKOFF_SECONDS = 0.5
+MAX_RESTART_BACKOFF_SECONDS = 30.0
+
+
+def available_cores() -> int:
+    """
+    Число ядер, доступных процессу.
+
+    Returns:
+        Число ядер с учетом привязки процесса к CPU
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_threads(workers: int, cores: int | None = None) -> int:
+    """
+    Число потоков torch на воркер, при котором воркеры не конкурируют за ядра.
+
+    Args:
+        workers: Число воркеров
+        cores: Число ядер (по умолчанию - доступные процессу)
+
+    Returns:
+        Число потоков intra-op на воркер (не меньше одного)
+    """
+    if workers < 1:
+        raise ValueError(f"Число воркеров должно быть положительным, получено: {workers}")
+    cores = cores if cores is not None else available_cores()
+    return max(1, cores // workers)
+
+
+def preload(store: ModelStore, users: list[str] | None = None) -> list[str]:
+    """
+    Загрузка эмбеддера и горячих моделей пользователей до fork.
+
+    Веса загружаются без прямого прохода: пул потоков torch и токенизатор
+    не должны инициализироваться в родительском процессе до fork. После
+    загрузки объекты переносятся в постоянное поколение сборщика мусора
+    (gc.freeze), чтобы сборки в воркерах не записывали в страницы
+    родителя и веса оставались общими copy-on-write.
+
+    Args:
+        store: Хранилище моделей пользователей
+        users: Пользователи, модели которых загружаются заранее
+            (по умолчанию - первая доступная модель, только ради эмбеддера)
+
+    Returns:
+        Пользователи, модели которых загружены
+    """
+    if users is None:
+        users = store.available()[:1]
+
+    start = time.perf_counter()
+    loaded = []
+    for user_id in users:
+        model = store.get(user_id)
+        # Эмбеддер загружается при первом обращении; обучение в воркерах не нужно
+        embedder = model.embedder
+        embedder.eval()
+        for parameter in embedder.parameters():
+            parameter.requires_grad_(False)
+        loaded.append(user_id)
+
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        f"Предзагружено моделей: {len(loaded)} за {time.perf_counter() - start:.2f} с, "
+        f"объектов в постоянном поколении: {gc.get_freeze_count()}"
+    )
+    return loaded
+
+
+def process_memory(pid: int | str = "self") -> dict[str, int]:
+    """
+    Память процесса по /proc (только Linux).
+
+    PSS делит общие страницы между процессами, которые их используют,
+    поэтому сумма PSS воркеров - реальный объем памяти сервиса, а разница
+    RSS и PSS показывает, сколько памяти общие веса экономят.
+
+    Args:
+        pid: Идентификатор процесса (по умолчанию - текущий)
+
+    Returns:
+        Словарь с rss_bytes, pss_bytes, shared_bytes и private_bytes
+        (пустой, если /proc недоступен)
+    """
+    path = Path(f"/proc/{pid}/smaps_rollup")
+    if not path.exists():
+        return {}
+
+    fields: dict[str, int] = {}
+    for line in path.read_text().splitlines()[1:]:
+        name, _, value = line.partition(":")
+        parts = value.split()
+        if len(parts) == 2 and parts[1] == "kB":
+            fields[name] = int(parts[0]) * 1024
+
+    return {
+        "rss_bytes": fields.get("Rss", 0),
+        "pss_bytes": fields.get("Pss", 0),
+        "shared_bytes": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private_bytes": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def process_stats() -> dict[str, Any]:
+    """
+    Статистика текущего процесса сервиса для /metrics.
+
+    Returns:
+        Словарь с pid, номером воркера, числом потоков torch и памятью процесса
+    """
+    return {
+        "pid": os.getpid(),
+        "worker": _worker_state["index"],
+        "torch_threads": torch.get_num_threads(),
+        **process_memory(),
+    }
+
+
+class PreforkServer:
+    """
+    Сервис из нескольких процессов, созданных fork от общего родителя.
+
+    Родитель открывает сокет и загружает эмбеддер (и горячие модели)
+    до fork, поэтому воркеры разделяют страницы весов copy-on-write, а не
+    загружают собственные копии. Каждый воркер создает приложение
+    (фоновые потоки после fork не наследуются), ограничивает число
+    потоков torch своей долей ядер и обслуживает запросы на общем сокете.
+    Упавший воркер перезапускается новым fork от родителя с экспоненциальной
+    паузой; если воркер падает больше max_restarts раз за restart_window
+    секунд (например, не создается приложение), сервис останавливается.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        app_factory: Callable[[], FastAPI],
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 2,
+        threads_per_worker: int | None = None,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+        restart_window: float = DEFAULT_RESTART_WINDOW_SECONDS,
+        restart_backoff: float = DEFAULT_RESTART_BACKOFF_SECONDS,
+    ) -> None:
+        """
+        Инициализация сервиса.
+
+        Args:
+            app_factory: Создание приложения; вызывается в каждом воркере после fork
+            host: Адрес сервиса
+            port: Порт сервиса
+            workers: Число воркеров
+            threads_per_worker: Число потоков torch на воркер
+                (по умолчанию - доступные ядра, поделенные между воркерами)
+            max_restarts: Допустимое число падений одного воркера за окно
+            restart_window: Окно подсчета падений, с
+            restart_backoff: Пауза перед первым перезапуском, с
+        """
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Режим pre-fork доступен только на POSIX-системах")
+
+        self.app_factory = app_factory
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads_per_worker = (
+            threads_per_worker if threads_per_worker is not None else worker_threads(workers)
+        )
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.restart_backoff = restart_backoff
+        self._children: dict[int, int] = {}
+        # Моменты падений каждого воркера в пределах окна
+        self._failures: dict[int, list[float]] = {}
+        self._stopping = False
+        self._parent_pid = os.getpid()
+
+    def run(self) -> None:
+        """
+        Запуск воркеров и ожидание их завершения (по SIGTERM или SIGINT).
+
+        Raises:
+            RuntimeError: Воркер падал чаще, чем допускает max_restarts
+        """
+        sock = socket.create_server((self.host, self.port), backlog=2048)
+        sock.set_inheritable(True)
+        logger.info(
+            f"Pre-fork: {self.workers} воркеров по {self.threads_per_worker} потоков torch "
+            f"на http://{self.host}:{self.port}"
+        )
+
+        # Обработчики ставятся до первого fork: сигнал во время запуска
+        # воркеров не должен завершить родителя, оставив воркеры без него
+        self._parent_pid = os.getpid()
+        previous = {
+            signum: signal.signal(signum, self._stop) for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        failed_worker = None
+        try:
+            for idx in range(self.workers):
+                if not self._stopping:
+                    self._spawn(idx, sock)
+
+            while self._children:
+                try:
+                    pid, status = os.wait()
+                except ChildProcessError:
+                    break
+                if pid not in self._children:
+                    continue
+                idx = self._children.pop(pid)
+                if self._stopping:
+                    continue
+                logger.warning(
+                    f"Воркер {idx} (pid {pid}) завершился с кодом "
+                    f"{os.waitstatus_to_exitcode(status)}"
+                )
+                delay = self._restart_delay(idx)
+                if delay is None:
+                    failed_worker = idx
+                    self._terminate()
+                    continue
+                logger.info(f"Перезапуск воркера {idx} через {delay:.1f} с")
+                deadline = time.monotonic() + delay
+                while not self._stopping and time.monotonic() < deadline:
+                    time.sleep(min(0.05, delay))
+                if not self._stopping:
+                    self._spawn(idx, sock)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+            sock.close()
+
+        if failed_worker is not None:
+            raise RuntimeError(
+                f"Воркер {failed_worker} упал {self.max_restarts + 1} раз за "
+                f"{self.restart_window:.0f} с, сервис остановлен"
+            )
+        logger.info("Pre-fork сервис остановлен")
+
+    def _restart_delay(self, idx: int) -> float | None:
+        """
+        Пауза перед перезапуском упавшего воркера.
+
+        Args:
+            idx: Номер воркера
+
+        Returns:
+            Пауза в секундах или None, если падений за окно больше max_restarts
+        """
+        now = time.monotonic()
+        failures = [t for t in self._failures.get(idx, []) if now - t < self.restart_window]
+        failures.append(now)
+        self._failures[idx] = failures
+        if len(failures) > self.max_restarts:
+            logger.error(
+                f"Воркер {idx} упал {len(failures)} раз за {self.restart_window:.0f} с, "
+                f"остановка сервиса"
+            )
+            return None
+        return float(
+            min(MAX_RESTART_BACKOFF_SECONDS, self.restart_backoff * 2 ** (len(failures) - 1))
+        )
+
+    def _spawn(self, idx: int, sock: socket.socket) -> None:
+        """
+        Запуск воркера через fork.
+
+        Args:
+            idx: Номер воркера
+            sock: Общий слушающий сокет
+        """
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._serve(idx, sock)
+            except BaseException:
+                logger.exception(f"Ошибка воркера {idx}")
+                code = 1
+            finally:
+                os._exit(code)
+        self._children[pid] = idx
+        logger.info(f"Запущен воркер {idx} (pid {pid})")
+
+    def _serve(self, idx: int, sock: socket.socket) -> None:
+        """
+        Обслуживание запросов в воркере.
+
+        Args:
+            idx: Номер воркера
+            sock: Общий слушающий сокет
+        """
+        _worker_state["index"] = idx
+
+        # Обработчики родителя сбрасываются: uvicorn устанавливает свои
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        torch.set_num_threads(self.threads_per_worker)
+
+        config = uvicorn.Config(self.app_factory(), log_config=None)
+        uvicorn.Server(config).run(sockets=[sock])
+
+    def _stop(self, signum: int, _frame: FrameType | None) -> None:
+        """Остановка воркеров по сигналу."""
+        if os.getpid() != self._parent_pid:
+            # Сигнал пришел в воркер до сброса унаследованных обработчиков
+            os._exit(128 + signum)
+        if self._stopping:
+            return
+        logger.info(f"Получен сигнал {signal.Signals(signum).name}, остановка воркеров")
+        self._terminate()
+
+    def _terminate(self) -> None:
+        """Отправка SIGTERM всем воркерам."""
+        self._stopping = True
+        for pid in list(self._children):
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
@@ -0,0 +1,531 @@
+"""Модуль для приема обратной связи и фонового дообучения моделей пользователей."""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.serving.latency import LatencyHistogram
+from categoraize.serving.model_store import ModelNotFoundError, user_model_path
+
+logger = logging.getLogger(__name__)
+
+# Журнал обратной связи в директории модели пользователя
+FEEDBACK_FILE = "feedback.jsonl"
+# События, которые нельзя применить к модели (карантин)
+REJECTED_FEEDBACK_FILE = "feedback.rejected.jsonl"
+
+# Параметры расписания по умолчанию: дообучение после N исправлений
+# (с паузой без новых событий) или не позже чем через сутки
+DEFAULT_MIN_EVENTS = 20
+DEFAULT_DEBOUNCE_SECONDS = 30.0
+DEFAULT_MAX_DELAY_SECONDS = 24 * 3600.0
+DEFAULT_RETRY_DELAY_SECONDS = 300.0
+DEFAULT_MAX_WORKERS = 2
+
+# Границы корзин гистограммы длительности дообучения, мс
+_RETRAIN_BUCKETS_MS = (100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0, 30000.0, 60000.0)
+
+
+@dataclass
+class FeedbackEvent:
+    """Исправление категории продукта пользователем."""
+
+    product_title: str
+    category: str
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class _UserState:
+    """Состояние обратной связи пользователя."""
+
+    # События журнала, еще не примененные к опубликованной модели
+    pending: list[FeedbackEvent] = field(default_factory=list)
+    # Число событий журнала, примененных к опубликованной модели
+    applied: int = 0
+    last_event_at: float = 0.0
+    last_published_at: float | None = None
+    # Число событий, отправленных в карантин
+    rejected: int = 0
+    forced: bool = False
+    not_before: float = 0.0
+    job: Future | None = None
+    # Блокировка обучения: у пользователя не бывает двух обучений одновременно
+    train_lock: threading.Lock = field(default_factory=threading.Lock)
+    # Блокировка журнала: запись и fsync идут вне общей блокировки планировщика
+    log_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class RetrainScheduler:
+    """
+    Планировщик дообучения моделей пользователей по обратной связи.
+
+    События обратной связи дописываются в журнал models/<user_id>/feedback.jsonl
+    и копятся в очереди пользователя. Дообучение запускается, когда
+    накопилось min_events событий и в течение debounce_seconds не было
+    новых (серия исправлений дает одно обучение), или когда самое старое
+    событие ждет дольше max_delay_seconds, или по явному запросу trigger().
+
+    Обучения выполняются в ограниченном пуле потоков с блокировкой на
+    пользователя. Событие, которое модель отвергает (apply_feedback
+    бросает ValueError), не применится и при повторе: оно переносится в
+    карантин models/<user_id>/feedback.rejected.jsonl и считается
+    обработанным, а остальные события применяются. Прочие ошибки
+    (например, ввода-вывода) повторяются через retry_delay_seconds.
+    Дообученная модель публикуется через persist_head:
+    веса и число примененных событий журнала (feedback_applied) попадают
+    в metadata.json одной атомарной заменой, поэтому после перезапуска
+    непримененные события восстанавливаются из журнала.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        models_dir: str | Path,
+        min_events: int = DEFAULT_MIN_EVENTS,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = DEFAULT_MAX_DELAY_SECONDS,
+        retry_delay_seconds: float = DEFAULT_RETRY_DELAY_SECONDS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        on_published: Callable[[str], Any] | None = None,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """
+        Инициализация и запуск фонового потока расписания.
+
+        Args:
+            models_dir: Директория с моделями пользователей
+            min_events: Число событий, после которого запускается дообучение
+            debounce_seconds: Пауза без новых событий перед дообучением, с
+            max_delay_seconds: Максимальное ожидание самого старого события, с
+            retry_delay_seconds: Пауза перед повтором после неудачного обучения, с
+            max_workers: Число потоков пула обучения
+            on_published: Вызывается с user_id после публикации новой версии
+                (например, для замены модели в кэше сервиса)
+            poll_interval: Период проверки расписания, с
+        """
+        if min_events < 1:
+            raise ValueError(f"min_events должен быть положительным, получено: {min_events}")
+        if max_workers < 1:
+            raise ValueError(f"Число потоков должно быть положительным, получено: {max_workers}")
+
+        self.models_dir = Path(models_dir)
+        self.min_events = min_events
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.max_workers = max_workers
+        self.on_published = on_published
+        self.poll_interval = poll_interval
+        self.retrain_latency = LatencyHistogram(_RETRAIN_BUCKETS_MS)
+
+        self._states: dict[str, _UserState] = {}
+        self._lock = threading.Lock()
+        self._counters = {"events": 0, "retrains": 0, "failures": 0, "rejected": 0}
+
+        # Непримененные события восстанавливаются из журналов
+        if self.models_dir.exists():
+            with self._lock:
+                for log_path in sorted(self.models_dir.glob(f"*/{FEEDBACK_FILE}")):
+                    if (log_path.parent / "metadata.json").exists():
+                        self._state(log_path.parent.name)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="categoraize-retrain"
+        )
+        self._closed = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="categoraize-scheduler", daemon=True)
+        self._thread.start()
+
+    def _state(self, user_id: str) -> _UserState:
+        """
+        Состояние пользователя; при первом обращении восстанавливается из журнала.
+
+        Вызывается под блокировкой.
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            Состояние пользователя
+        """
+        state = self._states.get(user_id)
+        if state is not None:
+            return state
+
+        state = _UserState()
+        path = user_model_path(self.models_dir, user_id)
+        state.applied = int(self._read_metadata(path).get("feedback_applied", 0))
+        log_path = path / FEEDBACK_FILE
+        if log_path.exists():
+            events = self._read_log(log_path)
+            if len(events) < state.applied:
+                logger.warning(
+                    f"Журнал обратной связи пользователя {user_id} короче числа "
+                    f"примененных событий ({len(events)} < {state.applied})"
+                )
+                state.applied = len(events)
+            state.pending = events[state.applied :]
+            if state.pending:
+                state.last_event_at = state.pending[-1].created_at
+                logger.info(
+                    f"Восстановлено {len(state.pending)} событий обратной связи "
+                    f"пользователя {user_id}"
+                )
+        self._states[user_id] = state
+        return state
+
+    @staticmethod
+    def _read_log(log_path: Path) -> list[FeedbackEvent]:
+        """
+        Чтение журнала обратной связи с восстановлением после сбоя записи.
+
+        Запись, прерванная сбоем процесса, оставляет в конце журнала
+        недописанную строку. Такой хвост отбрасывается (файл обрезается),
+        чтобы следующие события дописывались с начала строки. Поврежденная
+        строка в середине журнала считается ошибкой: номера событий
+        сопоставляются с feedback_applied.
+
+        Args:
+            log_path: Путь к журналу
+
+        Returns:
+            События журнала
+        """
+        data = log_path.read_bytes()
+        lines = data.splitlines(keepends=True)
+        events: list[FeedbackEvent] = []
+        valid_bytes = 0
+        for idx, line in enumerate(lines):
+            # Без перевода строки может быть только последняя, недописанная строка
+            if not line.endswith(b"\n"):
+                break
+            try:
+                if line.strip():
+                    events.append(FeedbackEvent(**json.loads(line)))
+            except (ValueError, TypeError) as e:
+                if idx < len(lines) - 1:
+                    raise ValueError(f"Поврежден журнал {log_path}, строка {idx + 1}: {e}") from e
+                break
+            valid_bytes += len(line)
+
+        if valid_bytes < len(data):
+            logger.warning(
+                f"Отброшена недописанная строка журнала {log_path} "
+                f"({len(data) - valid_bytes} байт)"
+            )
+            with log_path.open("r+b") as f:
+                f.truncate(valid_bytes)
+        return events
+
+    @staticmethod
+    def _read_metadata(path: Path) -> dict[str, Any]:
+        """
+        Чтение metadata.json модели пользователя.
+
+        Args:
+            path: Директория модели
+
+        Returns:
+            Метаданные модели
+        """
+        metadata_path = path / "metadata.json"
+        if not metadata_path.exists():
+            raise ModelNotFoundError(f"Модель пользователя {path.name} не найдена в {path.parent}")
+        with metadata_path.open(encoding="utf-8") as f:
+            metadata: dict[str, Any] = json.load(f)
+        return metadata
+
+    def record(self, user_id: str, product_title: str, category: str) -> int:
+        """
+        Прием исправления категории.
+
+        Args:
+            user_id: Идентификатор пользователя
+            product_title: Название продукта
+            category: Исправленная категория
+
+        Returns:
+            Число событий пользователя, ожидающих дообучения
+        """
+        if not product_title or not category:
+            raise ValueError("Название продукта и категория не могут быть пустыми")
+
+        event = FeedbackEvent(product_title, category)
+        log_path = user_model_path(self.models_dir, user_id) / FEEDBACK_FILE
+        with self._lock:
+            state = self._state(user_id)
+        # Строка пишется одним вызовом и сбрасывается на диск до того, как
+        # событие может попасть в обучение и в feedback_applied. Запись идет
+        # под блокировкой пользователя, чтобы порядок событий в журнале совпадал
+        # с pending, а fsync не задерживал обратную связь других пользователей
+        line = json.dumps(asdict(event), ensure_ascii=False) + "\n"
+        with state.log_lock:
+            with log_path.open("ab") as f:
+                f.write(line.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            with self._lock:
+                state.pending.append(event)
+                state.last_event_at = event.created_at
+                self._counters["events"] += 1
+                pending = len(state.pending)
+
+        self._wakeup.set()
+        return pending
+
+    def trigger(self, user_id: str) -> Future | None:
+        """
+        Запуск дообучения без ожидания расписания.
+
+        Если обучение пользователя уже идет, события, пришедшие после его
+        начала, будут применены следующим обучением сразу после текущего.
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            Future обучения или None, если новых событий нет
+        """
+        with self._lock:
+            state = self._state(user_id)
+            if state.job is not None:
+                state.forced = True
+                return state.job
+            if not state.pending:
+                return None
+            return self._submit(user_id, state)
+
+    def _submit(self, user_id: str, state: _UserState) -> Future:
+        """Постановка обучения в пул; вызывается под блокировкой."""
+        state.forced = False
+        state.job = self._executor.submit(self._retrain, user_id)
+        return state.job
+
+    def _is_due(self, state: _UserState, now: float) -> bool:
+        """
+        Пора ли дообучать модель пользователя; вызывается под блокировкой.
+
+        Args:
+            state: Состояние пользователя
+            now: Текущее время (time.time)
+
+        Returns:
+            True, если обучение нужно запустить
+        """
+        if not state.pending or state.job is not None or now < state.not_before:
+            return False
+        if state.forced:
+            return True
+        if len(state.pending) >= self.min_events and now - state.last_event_at >= (
+            self.debounce_seconds
+        ):
+            return True
+        return now - state.pending[0].created_at >= self.max_delay_seconds
+
+    def _run(self) -> None:
+        """Цикл фонового потока: запуск обучений по расписанию."""
+        while not self._closed.is_set():
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            now = time.time()
+            with self._lock:
+                if self._closed.is_set():
+                    break
+                for user_id, state in self._states.items():
+                    if self._is_due(state, now):
+                        self._submit(user_id, state)
+
+    def _retrain(self, user_id: str) -> dict[str, Any]:
+        """
+        Дообучение модели пользователя и атомарная публикация новой версии.
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            Словарь с числом обработанных событий, числом событий в карантине
+            и длительностью обучения
+        """
+        with self._lock:
+            state = self._states[user_id]
+        with state.train_lock:
+            with self._lock:
+                events = list(state.pending)
+                applied = state.applied + len(events)
+
+            start = time.perf_counter()
+            path = user_model_path(self.models_dir, user_id)
+            model = None
+            rejected: list[FeedbackEvent] = []
+            try:
+                head_precision = self._read_metadata(path).get("head_precision", "float32")
+                model, rejected = self._apply_feedback(user_id, path, events)
+                model.persist_head(
+                    path,
+                    head_precision=head_precision,
+                    extra_metadata={"feedback_applied": applied},
+                )
+            except Exception:
+                logger.exception(f"Ошибка дообучения модели пользователя {user_id}")
+                with self._lock:
+                    self._counters["failures"] += 1
+                    state.not_before = time.time() + self.retry_delay_seconds
+                    state.job = None
+                raise
+            finally:
+                if model is not None:
+                    model.close()
+
+            seconds = time.perf_counter() - start
+            self.retrain_latency.observe(seconds)
+            with self._lock:
+                del state.pending[: len(events)]
+                state.applied = applied
+                state.rejected += len(rejected)
+                state.last_published_at = time.time()
+                state.job = None
+                self._counters["retrains"] += 1
+                self._counters["rejected"] += len(rejected)
+
+        logger.info(
+            f"Модель пользователя {user_id} дообучена на {len(events) - len(rejected)} "
+            f"событиях за {seconds:.2f} с (в карантине: {len(rejected)})"
+        )
+        if self.on_published is not None:
+            self.on_published(user_id)
+        # События, пришедшие во время обучения, могут быть уже готовы к следующему
+        self._wakeup.set()
+        return {"events": len(events), "rejected": len(rejected), "seconds": seconds}
+
+    def _apply_feedback(
+        self, user_id: str, path: Path, events: list[FeedbackEvent]
+    ) -> tuple[ProductCategoryClassifier, list[FeedbackEvent]]:
+        """
+        Применение событий к опубликованной модели с карантином неприменимых.
+
+        События применяются одним вызовом apply_feedback. Если модель
+        отвергает пакет, она загружается заново и события применяются по
+        одному: отвергнутые записываются в карантин, остальные применяются.
+
+        Args:
+            user_id: Идентификатор пользователя
+            path: Директория модели
+            events: События обратной связи
+
+        Returns:
+            Tuple (модель с примененными событиями, события в карантине)
+        """
+        model = ProductCategoryClassifier.from_pretrained(path)
+        try:
+            model.apply_feedback(
+                [event.product_title for event in events],
+                [event.category for event in events],
+            )
+        except ValueError as e:
+            logger.warning(
+                f"Модель пользователя {user_id} отвергла {len(events)} событий ({e}), "
+                f"события применяются по одному"
+            )
+            model.close()
+        else:
+            return model, []
+
+        # Пакет мог изменить модель до ошибки, поэтому события применяются к исходной
+        model = ProductCategoryClassifier.from_pretrained(path)
+        rejected: list[tuple[FeedbackEvent, str]] = []
+        try:
+            for event in events:
+                try:
+                    model.apply_feedback([event.product_title], [event.category])
+                except ValueError as e:
+                    rejected.append((event, str(e)))
+            if rejected:
+                self._quarantine(user_id, path, rejected)
+        except Exception:
+            model.close()
+            raise
+        return model, [event for event, _ in rejected]
+
+    @staticmethod
+    def _quarantine(user_id: str, path: Path, rejected: list[tuple[FeedbackEvent, str]]) -> None:
+        """
+        Запись неприменимых событий в карантин с причиной отказа.
+
+        Args:
+            user_id: Идентификатор пользователя
+            path: Директория модели
+            rejected: Пары (событие, текст ошибки)
+        """
+        lines = "".join(
+            json.dumps({**asdict(event), "error": error}, ensure_ascii=False) + "\n"
+            for event, error in rejected
+        )
+        with (path / REJECTED_FEEDBACK_FILE).open("ab") as f:
+            f.write(lines.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        for event, error in rejected:
+            logger.warning(
+                f"Событие обратной связи пользователя {user_id} отправлено в карантин: "
+                f"{event.product_title!r} -> {event.category!r} ({error})"
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Метрики очереди обратной связи и дообучения.
+
+        Returns:
+            Словарь с длиной очереди (пользователи и события, ожидающие
+            дообучения), числом идущих обучений, устареванием моделей
+            (возраст самого старого непримененного события), гистограммой
+            длительности обучения и счетчиками, включая число событий в
+            карантине
+        """
+        now = time.time()
+        with self._lock:
+            users: dict[str, dict[str, Any]] = {
+                user_id: {
+                    "pending": len(state.pending),
+                    "staleness_seconds": (
+                        now - state.pending[0].created_at if state.pending else 0.0
+                    ),
+                    "last_published_at": state.last_published_at,
+                    "rejected": state.rejected,
+                    "training": state.job is not None and state.job.running(),
+                }
+                for user_id, state in self._states.items()
+            }
+            counters = dict(self._counters)
+            jobs = [state.job for state in self._states.values() if state.job is not None]
+
+        pending = [int(user["pending"]) for user in users.values()]
+        return {
+            "users_pending": sum(1 for count in pending if count > 0),
+            "pending_events": sum(pending),
+            "running": sum(1 for job in jobs if job.running()),
+            "queued": sum(1 for job in jobs if not job.running() and not job.done()),
+            "max_staleness_seconds": max(
+                (float(user["staleness_seconds"]) for user in users.values()), default=0.0
+            ),
+            "retrain_latency": self.retrain_latency.snapshot(),
+            **counters,
+            "users": users,
+        }
+
+    def close(self) -> None:
+        """Остановка расписания с ожиданием уже запущенных обучений."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
@@ -119,6 +119,14 @@ def main() -> None:
             validation_data["y_test"],
         )
 
+        # Влияние пониженной точности на качество
+        logger.info("\nВлияние точности эмбеддингов и весов на Test set:")
+        evaluator.evaluate_precision(
+            model,
+            validation_data["X_test"],
+            validation_data["y_test"],
+        )
+
         logger.info("=" * 60)
         logger.info("Обучение и оценка завершены успешно")
         logger.info("=" * 60)
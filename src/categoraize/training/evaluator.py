@@ -13,6 +13,10 @@ from sklearn.metrics import (
     recall_score,
 )
 
+from categoraize.models.artifacts import export_head
+from categoraize.models.numpy_head import NumpyHead
+from categoraize.models.quantization import bytes_per_vector, round_trip
+
 logger = logging.getLogger(__name__)
 
 
@@ -137,6 +141,46 @@ class Evaluator:
 
         return metrics
 
+    def evaluate_top_k(
+        self,
+        model: Any,
+        X: list[str],
+        y_true: list[str],
+        k: int = 3,
+    ) -> dict[str, float]:
+        """
+        Оценка Top-k accuracy: доля примеров, истинная категория которых входит в k лучших.
+
+        Args:
+            model: Обученная модель с методом infer()
+            X: Список названий продуктов
+            y_true: Истинные категории
+            k: Количество лучших категорий
+
+        Returns:
+            Словарь с метриками top-1 и top-k accuracy
+        """
+        logger.info(f"Оценка Top-{k} accuracy на {len(X)} примерах")
+
+        result = model.infer(X, top_k=k)
+
+        top_1_accuracy = accuracy_score(y_true, result.labels)
+        top_k_hits = [
+            true_label in top_labels
+            for true_label, top_labels in zip(y_true, result.top_k_labels, strict=True)
+        ]
+        top_k_accuracy = float(np.mean(top_k_hits)) if top_k_hits else 0.0
+
+        metrics = {
+            "top_1_accuracy": float(top_1_accuracy),
+            f"top_{k}_accuracy": top_k_accuracy,
+        }
+
+        logger.info(f"  Top-1 accuracy: {top_1_accuracy:.4f}")
+        logger.info(f"  Top-{k} accuracy: {top_k_accuracy:.4f}")
+
+        return metrics
+
     def classification_report_detailed(
         self,
         model: Any,
@@ -190,3 +234,72 @@ class Evaluator:
         logger.info(f"\n{cm}")
 
         return cm
+
+    def evaluate_precision(
+        self,
+        model: Any,
+        X: list[str],
+        y_true: list[str],
+        precisions: tuple[str, ...] = ("float16", "int8"),
+    ) -> dict[str, dict[str, float]]:
+        """
+        Оценка потери точности при хранении эмбеддингов и весов с пониженной точностью.
+
+        Эмбеддинги вычисляются один раз, затем для каждого режима эмбеддинги
+        и матрицы весов классификатора приводятся к нему и обратно к float32,
+        и accuracy сравнивается с режимом float32.
+
+        Args:
+            model: Обученная модель
+            X: Список названий продуктов
+            y_true: Истинные категории
+            precisions: Проверяемые режимы точности
+
+        Returns:
+            Словарь {режим: {"accuracy", "accuracy_delta", "bytes_per_embedding",
+            "head_bytes"}}, включая базовый режим float32
+        """
+        logger.info(f"Оценка режимов точности {precisions} на {len(X)} примерах")
+
+        embeddings = model.encode_products(X)
+        header, arrays = export_head(model.classifier)
+        labels = model.classes_
+        dim = embeddings.shape[1]
+
+        results: dict[str, dict[str, float]] = {}
+        baseline = 0.0
+        for precision in ("float32", *precisions):
+            quantized = {
+                name: round_trip(array, precision) if array.ndim == 2 else array
+                for name, array in arrays.items()
+            }
+            # Удаленные категории маскируются так же, как при предсказании моделью
+            probabilities = model.predict_proba_embeddings(
+                round_trip(embeddings, precision), head=NumpyHead(header, quantized, labels)
+            )
+            y_pred = labels[probabilities.argmax(axis=1)]
+            accuracy = float(accuracy_score(y_true, y_pred.tolist()))
+            if precision == "float32":
+                baseline = accuracy
+
+            head_bytes = sum(
+                (
+                    bytes_per_vector(array.shape[1], precision) * array.shape[0]
+                    if array.ndim == 2
+                    else array.nbytes
+                )
+                for array in arrays.values()
+            )
+            results[precision] = {
+                "accuracy": accuracy,
+                "accuracy_delta": accuracy - baseline,
+                "bytes_per_embedding": float(bytes_per_vector(dim, precision)),
+                "head_bytes": float(head_bytes),
+            }
+            logger.info(
+                f"  {precision}: accuracy {accuracy:.4f} ({accuracy - baseline:+.4f}), "
+                f"{bytes_per_vector(dim, precision)} байт на эмбеддинг, "
+                f"классификатор {head_bytes / 1024:.1f} КБ"
+            )
+
+        return results
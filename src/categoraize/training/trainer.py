@@ -1,15 +1,21 @@
 """Модуль для обучения модели."""
 
 import logging
+import time
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
+from sklearn.metrics import accuracy_score
 from sklearn.model_selection import train_test_split
 
 from categoraize.data.loader import DataLoader
 from categoraize.data.preprocessor import DataPreprocessor
+from categoraize.models.artifacts import export_head
 from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.models.projection import EmbeddingProjection
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +49,7 @@ class Trainer:
         filename = data_config.get("filename", "product_titles.csv")
         column_mapping = data_config.get("column_mapping", None)
 
-        loader = DataLoader(data_path)
+        loader = DataLoader(data_path, data_format=data_config.get("format"))
         df = loader.load_kaggle_dataset(filename, column_mapping=column_mapping)
 
         # Валидация данных
@@ -61,14 +67,59 @@ class Trainer:
         Returns:
             Обработанный DataFrame
         """
+        self.preprocessor = self._create_preprocessor()
+
+        df_processed = self.preprocessor.preprocess_dataframe(df)
+        return df_processed
+
+    def _create_preprocessor(self) -> DataPreprocessor:
+        """Создание препроцессора по секции preprocessing конфигурации."""
         preprocessor_config = self.config.get("preprocessing", {})
-        self.preprocessor = DataPreprocessor(
+        return DataPreprocessor(
             lowercase=preprocessor_config.get("lowercase", True),
             remove_punctuation=preprocessor_config.get("remove_punctuation", False),
         )
 
-        df_processed = self.preprocessor.preprocess_dataframe(df)
-        return df_processed
+    def load_and_preprocess_chunks(self, chunk_size: int) -> pd.DataFrame:
+        """
+        Потоковая загрузка и предобработка данных.
+
+        Файл читается чанками по chunk_size строк, каждый чанк валидируется
+        и предобрабатывается сразу после чтения. В памяти одновременно
+        находятся только очередной сырой чанк и уже обработанные колонки
+        product_title и category, а не весь исходный файл.
+
+        Args:
+            chunk_size: Число строк в чанке
+
+        Returns:
+            Обработанный DataFrame
+        """
+        data_config = self.config["data"]
+        loader = DataLoader(Path(data_config["path"]), data_format=data_config.get("format"))
+        self.preprocessor = self._create_preprocessor()
+
+        def validated(chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+            # Категории проверяются по всему датасету: чанк отсортированного
+            # файла может содержать одну категорию
+            for chunk in chunks:
+                loader.validate_data(chunk, min_categories=1)
+                yield chunk
+
+        chunks = loader.iter_kaggle_dataset(
+            data_config.get("filename", "product_titles.csv"),
+            column_mapping=data_config.get("column_mapping", None),
+            chunk_size=chunk_size,
+        )
+        processed = list(self.preprocessor.preprocess_chunks(validated(chunks)))
+        if not processed:
+            raise ValueError("Датасет пуст")
+
+        df = pd.concat(processed, ignore_index=True)
+        unique_categories = df["category"].nunique()
+        if unique_categories < 2:
+            raise ValueError(f"Недостаточно категорий для классификации: {unique_categories}")
+        return df
 
     def split_data(self, df: pd.DataFrame) -> tuple:
         """
@@ -161,19 +212,46 @@ class Trainer:
         Returns:
             Инициализированная модель
         """
+        self.model = self._build_model()
+
+        logger.info("Модель создана")
+        return self.model
+
+    def _build_model(self, use_projection: bool = True) -> ProductCategoryClassifier:
+        """
+        Создание необученной модели по секции model конфигурации.
+
+        Args:
+            use_projection: Добавлять ли проекцию эмбеддингов, если она настроена
+
+        Returns:
+            Необученная модель
+        """
         model_config = self.config["model"]
 
-        self.model = ProductCategoryClassifier(
+        projection = None
+        projection_config = model_config.get("projection")
+        if use_projection and projection_config:
+            projection = EmbeddingProjection(
+                method=projection_config.get("method", "pca"),
+                dim=projection_config.get("dim", 64),
+                random_state=projection_config.get("random_state", 42),
+            )
+
+        return ProductCategoryClassifier(
             embedding_model_name=model_config.get(
                 "embedding_model_name", "sentence-transformers/all-MiniLM-L6-v2"
             ),
             classifier_type=model_config.get("classifier_type", "mlp"),
             classifier_params=model_config.get("classifier_params", {}),
+            embedding_cache_dir=model_config.get("embedding_cache_dir"),
+            memory_cache_bytes=model_config.get("memory_cache_bytes"),
+            max_seq_length=model_config.get("max_seq_length"),
+            max_tokens_per_batch=model_config.get("max_tokens_per_batch"),
+            embedding_precision=model_config.get("embedding_precision", "float32"),
+            projection=projection,
         )
 
-        logger.info("Модель создана")
-        return self.model
-
     def train(
         self,
         X_train: list[str],
@@ -196,21 +274,211 @@ class Trainer:
 
         logger.info("Начало обучения модели...")
 
-        class_weights = None
-        if use_class_weights:
-            if self.preprocessor is None:
-                raise ValueError("Preprocessor не инициализирован")
-            # Вычисление весов классов
-            y_train_series = pd.Series(y_train)
-            encoded_labels, id_to_label = self.preprocessor.encode_labels(y_train_series)
-            class_weights = self.preprocessor.get_class_weights(encoded_labels)
-
-        self.model.fit(X_train, y_train, class_weights=class_weights)
+        class_weights = self._class_weights(y_train) if use_class_weights else None
+
+        # Warm start от предыдущего чекпоинта, если он настроен и существует
+        warm_start_config = self.config["model"].get("warm_start")
+        previous = None
+        if warm_start_config:
+            previous = self._load_previous_model(warm_start_config.get("path", "models/checkpoint"))
+
+        if previous is None:
+            self.model.fit(X_train, y_train, class_weights=class_weights)
+        else:
+            self.train_warm_start(
+                X_train,
+                y_train,
+                previous,
+                class_weights=class_weights,
+                compare=warm_start_config.get("compare", True),
+            )
 
         logger.info("Обучение завершено")
 
         return self.model
 
+    def _load_previous_model(self, path: str | Path) -> ProductCategoryClassifier | None:
+        """
+        Загрузка предыдущего чекпоинта для warm start.
+
+        Args:
+            path: Директория сохраненной модели
+
+        Returns:
+            Загруженная модель или None, если чекпоинта нет
+        """
+        path = Path(path)
+        if not (path / "metadata.json").exists():
+            logger.warning(f"Чекпоинт для warm start не найден в {path}, обучение с нуля")
+            return None
+        return ProductCategoryClassifier.from_pretrained(path)
+
+    def train_warm_start(
+        self,
+        X_train: list[str],
+        y_train: list[str],
+        previous: ProductCategoryClassifier,
+        class_weights: np.ndarray | None = None,
+        compare: bool = True,
+    ) -> dict[str, dict[str, float]]:
+        """
+        Обучение модели с весов предыдущей модели.
+
+        Эмбеддинги вычисляются один раз. При compare=True на них же обучается
+        модель с нуля, чтобы сравнить число итераций оптимизатора и время
+        обучения. Если warm start невозможен (изменились тип классификатора,
+        архитектура или эмбеддер), модель обучается с нуля.
+
+        Args:
+            X_train: Список названий продуктов для обучения
+            y_train: Список категорий для обучения
+            previous: Предыдущая обученная модель
+            class_weights: Веса классов (опционально)
+            compare: Обучать ли для сравнения модель с нуля
+
+        Returns:
+            Словарь {"warm": метрики, "cold": метрики}; "cold" - только при compare
+        """
+        if self.model is None:
+            raise ValueError("Модель не создана. Вызовите create_model()")
+
+        embeddings = self.model.encode_products(X_train)
+
+        results: dict[str, dict[str, float]] = {}
+        if compare:
+            cold_model = self._build_model()
+            start = time.perf_counter()
+            cold_model.fit_from_embeddings(embeddings, y_train, class_weights=class_weights)
+            results["cold"] = {
+                "fit_seconds": time.perf_counter() - start,
+                "n_iter": float(np.max(getattr(cold_model.classifier, "n_iter_", 0))),
+            }
+
+        start = time.perf_counter()
+        try:
+            self.model.fit_from_embeddings(
+                embeddings, y_train, class_weights=class_weights, warm_start_from=previous
+            )
+        except ValueError as e:
+            logger.warning(f"Warm start невозможен: {e}. Обучение с нуля")
+            self.model.fit_from_embeddings(embeddings, y_train, class_weights=class_weights)
+        results["warm"] = {
+            "fit_seconds": time.perf_counter() - start,
+            "n_iter": float(np.max(getattr(self.model.classifier, "n_iter_", 0))),
+        }
+
+        warm = results["warm"]
+        logger.info(f"Warm start: {int(warm['n_iter'])} итераций, {warm['fit_seconds']:.2f} с")
+        if "cold" in results:
+            cold = results["cold"]
+            logger.info(
+                f"Обучение с нуля: {int(cold['n_iter'])} итераций, {cold['fit_seconds']:.2f} с"
+            )
+
+        return results
+
+    def _class_weights(self, y_train: list[str]) -> np.ndarray:
+        """
+        Вычисление весов классов для обучающей выборки.
+
+        Args:
+            y_train: Список категорий для обучения
+
+        Returns:
+            Массив весов классов
+        """
+        if self.preprocessor is None:
+            raise ValueError("Preprocessor не инициализирован")
+        y_train_series = pd.Series(y_train)
+        encoded_labels, id_to_label = self.preprocessor.encode_labels(y_train_series)
+        return self.preprocessor.get_class_weights(encoded_labels)
+
+    def compare_projection(
+        self,
+        X_train: list[str],
+        y_train: list[str],
+        X_val: list[str],
+        y_val: list[str],
+        use_class_weights: bool = True,
+    ) -> dict[str, dict[str, float]]:
+        """
+        Сравнение модели с проекцией эмбеддингов и без нее.
+
+        Эмбеддинги вычисляются один раз, после чего на них обучаются две
+        модели: с проекцией из конфигурации и без нее. Сравниваются время
+        обучения и инференса классификатора, объем признаков и весов и
+        accuracy на валидации.
+
+        Args:
+            X_train: Список названий продуктов для обучения
+            y_train: Список категорий для обучения
+            X_val: Список названий продуктов для валидации
+            y_val: Список категорий для валидации
+            use_class_weights: Использовать ли веса классов
+
+        Returns:
+            Словарь {"full": метрики, "projected": метрики}
+        """
+        if self.model is None:
+            raise ValueError("Модель не создана. Вызовите create_model()")
+        if self.model.projection is None:
+            raise ValueError("Проекция эмбеддингов не настроена")
+
+        class_weights = self._class_weights(y_train) if use_class_weights else None
+        train_embeddings = self.model.encode_products(X_train)
+        val_embeddings = self.model.encode_products(X_val)
+
+        results: dict[str, dict[str, float]] = {}
+        for name, use_projection in (("full", False), ("projected", True)):
+            model = self._build_model(use_projection=use_projection)
+
+            start = time.perf_counter()
+            model.fit_from_embeddings(train_embeddings, y_train, class_weights=class_weights)
+            fit_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            probabilities = model.predict_proba_embeddings(val_embeddings)
+            predict_seconds = time.perf_counter() - start
+            y_pred = model.classes_[probabilities.argmax(axis=1)]
+
+            _, arrays = export_head(model.classifier)
+            n_features = model.project(train_embeddings[:1]).shape[1]
+            results[name] = {
+                "n_features": float(n_features),
+                "fit_seconds": fit_seconds,
+                "predict_seconds": predict_seconds,
+                "features_bytes": float(len(train_embeddings) * n_features * 4),
+                "head_bytes": float(sum(array.nbytes for array in arrays.values())),
+                "accuracy": float(accuracy_score(y_val, y_pred.tolist())),
+            }
+
+        full, projected = results["full"], results["projected"]
+        logger.info(
+            f"Проекция эмбеддингов {int(full['n_features'])} -> {int(projected['n_features'])}:"
+        )
+        logger.info(
+            f"  Обучение классификатора: {full['fit_seconds']:.2f} с -> "
+            f"{projected['fit_seconds']:.2f} с"
+        )
+        logger.info(
+            f"  Инференс на валидации: {full['predict_seconds'] * 1000:.1f} мс -> "
+            f"{projected['predict_seconds'] * 1000:.1f} мс"
+        )
+        logger.info(
+            f"  Признаки для обучения: {full['features_bytes'] / 2**20:.1f} МБ -> "
+            f"{projected['features_bytes'] / 2**20:.1f} МБ"
+        )
+        logger.info(
+            f"  Веса классификатора: {full['head_bytes'] / 1024:.1f} КБ -> "
+            f"{projected['head_bytes'] / 1024:.1f} КБ"
+        )
+        logger.info(
+            f"  Accuracy на валидации: {full['accuracy']:.4f} -> {projected['accuracy']:.4f} "
+            f"({projected['accuracy'] - full['accuracy']:+.4f})"
+        )
+
+        return results
+
     def save_model(self, save_path: str | Path) -> None:
         """
         Сохранение обученной модели.
@@ -222,8 +490,12 @@ class Trainer:
             raise ValueError("Модель не обучена")
 
         save_path = Path(save_path)
+        head_format = self.config.get("output", {}).get("head_format", "joblib")
+        head_precision = self.config.get("model", {}).get("head_precision", "float32")
         logger.info(f"Сохранение модели в {save_path}")
-        self.model.save_pretrained(save_path)
+        self.model.save_pretrained(
+            save_path, head_format=head_format, head_precision=head_precision
+        )
 
     def run_training(self) -> tuple:
         """
@@ -236,13 +508,19 @@ class Trainer:
         logger.info("Начало пайплайна обучения")
         logger.info("=" * 60)
 
-        # 1. Загрузка данных
-        logger.info("Шаг 1: Загрузка данных")
-        df = self.load_data()
+        chunk_size = self.config["data"].get("chunk_size")
+        if chunk_size:
+            # 1-2. Потоковая загрузка и предобработка больших датасетов
+            logger.info("Шаги 1-2: Потоковая загрузка и предобработка данных")
+            df_processed = self.load_and_preprocess_chunks(chunk_size)
+        else:
+            # 1. Загрузка данных
+            logger.info("Шаг 1: Загрузка данных")
+            df = self.load_data()
 
-        # 2. Предобработка
-        logger.info("Шаг 2: Предобработка данных")
-        df_processed = self.preprocess_data(df)
+            # 2. Предобработка
+            logger.info("Шаг 2: Предобработка данных")
+            df_processed = self.preprocess_data(df)
 
         # 3. Разделение данных
         logger.info("Шаг 3: Разделение данных")
@@ -256,6 +534,12 @@ class Trainer:
         logger.info("Шаг 5: Обучение модели")
         model = self.train(X_train, y_train)
 
+        # Влияние проекции эмбеддингов на скорость, память и качество
+        projection_config = self.config["model"].get("projection")
+        if projection_config and projection_config.get("compare", True):
+            logger.info("Сравнение с моделью без проекции эмбеддингов")
+            self.compare_projection(X_train, y_train, X_val, y_val)
+
         # 6. Сохранение модели
         save_path = Path(self.config.get("output", {}).get("model_path", "models/checkpoint"))
         logger.info("Шаг 6: Сохранение модели")
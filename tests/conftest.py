@@ -35,3 +35,21 @@ def sample_product_data():
             ],
         }
     )
+
+
+@pytest.fixture(scope="session")
+def user_models_dir(tmp_path_factory, sample_product_data):
+    """Директория с сохраненными моделями двух пользователей (models/<user_id>)."""
+    from categoraize.models.classifier import ProductCategoryClassifier
+
+    models_dir = tmp_path_factory.mktemp("models")
+    products = sample_product_data["product_title"].tolist()
+    categories = sample_product_data["category"].tolist()
+
+    ProductCategoryClassifier(classifier_type="lr").fit(products, categories).save_pretrained(
+        models_dir / "alice"
+    )
+    ProductCategoryClassifier(classifier_type="centroid").fit(products, categories).save_pretrained(
+        models_dir / "bob", head_format="npy"
+    )
+    return models_dir
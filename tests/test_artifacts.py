@@ -0,0 +1,144 @@
+"""Тесты для модуля компактного формата классификаторов."""
+
+import json
+
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.neural_network import MLPClassifier
+
+from categoraize.models.artifacts import (
+    HEAD_HEADER_FILENAME,
+    export_head,
+    load_head_arrays,
+    restore_head,
+    save_head_arrays,
+)
+
+
+@pytest.fixture
+def sample_embeddings():
+    """Создание тестовых эмбеддингов и меток."""
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(60, 16)).astype(np.float32)
+    y = rng.integers(0, 3, size=60)
+    return X, y
+
+
+class TestHeadArtifacts:
+    """Тесты для экспорта и восстановления классификаторов."""
+
+    @pytest.mark.parametrize(
+        "classifier",
+        [
+            LogisticRegression(max_iter=200),
+            MLPClassifier(hidden_layer_sizes=(8,), max_iter=50, random_state=42),
+            SGDClassifier(loss="log_loss", random_state=42),
+        ],
+    )
+    def test_round_trip(self, sample_embeddings, tmp_path, classifier):
+        """Тест, что сохраненный и восстановленный классификатор дает те же вероятности."""
+        X, y = sample_embeddings
+        classifier.fit(X, y)
+
+        header, arrays = export_head(classifier)
+        save_head_arrays(tmp_path, header, arrays)
+        loaded_header, loaded_arrays = load_head_arrays(tmp_path)
+        restored = restore_head(loaded_header, loaded_arrays, clone(classifier))
+
+        assert np.allclose(restored.predict_proba(X), classifier.predict_proba(X), atol=1e-5)
+        assert np.array_equal(restored.predict(X), classifier.predict(X))
+
+    def test_binary_logistic_regression(self, sample_embeddings, tmp_path):
+        """Тест бинарной логистической регрессии (одна строка весов)."""
+        X, y = sample_embeddings
+        classifier = LogisticRegression(max_iter=200).fit(X, y % 2)
+
+        save_head_arrays(tmp_path, *export_head(classifier))
+        restored = restore_head(*load_head_arrays(tmp_path), LogisticRegression())
+
+        assert np.allclose(restored.predict_proba(X), classifier.predict_proba(X), atol=1e-5)
+
+    @pytest.mark.parametrize("n_classes", [2, 3])
+    def test_restored_mlp_label_binarizer(self, sample_embeddings, n_classes):
+        """Тест, что восстановленный без fit LabelBinarizer MLP совпадает с обученным."""
+        X, y = sample_embeddings
+        y = y % n_classes
+        classifier = MLPClassifier(hidden_layer_sizes=(8,), max_iter=50, random_state=42)
+        classifier.fit(X, y)
+
+        header, arrays = export_head(classifier)
+        arrays = {name: np.array(array) for name, array in arrays.items()}
+        restored = restore_head(header, arrays, clone(classifier))
+        expected = classifier._label_binarizer
+
+        assert restored._label_binarizer.y_type_ == expected.y_type_
+        onehot = expected.transform(y)
+        assert np.array_equal(restored._label_binarizer.transform(y), onehot)
+        assert np.array_equal(restored._label_binarizer.inverse_transform(onehot), y)
+        assert np.array_equal(restored.predict(X), classifier.predict(X))
+
+    def test_arrays_are_float32_memmap(self, sample_embeddings, tmp_path):
+        """Тест, что веса хранятся в float32 и отображаются в память."""
+        X, y = sample_embeddings
+        classifier = LogisticRegression(max_iter=200).fit(X, y)
+
+        save_head_arrays(tmp_path, *export_head(classifier))
+        _, arrays = load_head_arrays(tmp_path)
+
+        assert arrays["coef"].dtype == np.float32
+        assert isinstance(arrays["coef"].base, np.memmap)
+
+    @pytest.mark.parametrize("precision", ["float16", "int8"])
+    def test_reduced_precision(self, sample_embeddings, tmp_path, precision):
+        """Тест сохранения весов с пониженной точностью."""
+        X, y = sample_embeddings
+        classifier = LogisticRegression(max_iter=200).fit(X, y)
+
+        save_head_arrays(tmp_path, *export_head(classifier), precision=precision)
+        header, arrays = load_head_arrays(tmp_path)
+        restored = restore_head(header, arrays, LogisticRegression())
+
+        assert header["precision"] == precision
+        assert arrays["coef"].dtype == np.float32
+        assert np.allclose(restored.predict_proba(X), classifier.predict_proba(X), atol=0.02)
+
+    def test_atomic_save_keeps_previous_version(self, sample_embeddings, tmp_path):
+        """Тест атомарной публикации: старые файлы весов удаляются, предыдущий остается."""
+        X, y = sample_embeddings
+        classifier = LogisticRegression(max_iter=200).fit(X, y)
+        header, arrays = export_head(classifier)
+
+        save_head_arrays(tmp_path, header, arrays)
+        names = []
+        for _ in range(3):
+            save_head_arrays(tmp_path, header, arrays, atomic=True)
+            with (tmp_path / HEAD_HEADER_FILENAME).open(encoding="utf-8") as f:
+                names.append(json.load(f)["arrays_file"])
+
+        assert len(set(names)) == 3
+        assert {path.name for path in tmp_path.glob("*.npy")} == set(names[-2:])
+        assert not list(tmp_path.glob("*.tmp"))
+        restored = restore_head(*load_head_arrays(tmp_path), LogisticRegression())
+        assert np.allclose(restored.predict_proba(X), classifier.predict_proba(X), atol=1e-5)
+
+    def test_kind_mismatch(self, sample_embeddings):
+        """Тест ошибки при восстановлении в классификатор другого типа."""
+        X, y = sample_embeddings
+        header, arrays = export_head(LogisticRegression(max_iter=200).fit(X, y))
+
+        with pytest.raises(ValueError, match="не подходит"):
+            restore_head(header, arrays, MLPClassifier())
+
+    def test_unsupported_version(self, sample_embeddings, tmp_path):
+        """Тест ошибки при неизвестной версии формата."""
+        X, y = sample_embeddings
+        save_head_arrays(tmp_path, *export_head(LogisticRegression(max_iter=200).fit(X, y)))
+        header_path = tmp_path / HEAD_HEADER_FILENAME
+        header = json.loads(header_path.read_text(encoding="utf-8"))
+        header["format_version"] = 999
+        header_path.write_text(json.dumps(header), encoding="utf-8")
+
+        with pytest.raises(ValueError, match="версия формата"):
+            load_head_arrays(tmp_path)
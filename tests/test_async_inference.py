@@ -0,0 +1,173 @@
+"""Тесты для модуля асинхронного инференса."""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from categoraize.models.async_inference import AsyncInferenceExecutor
+from categoraize.models.classifier import ProductCategoryClassifier
+
+
+@pytest.fixture(scope="module")
+def fitted_model():
+    """Обучение модели на небольшом наборе продуктов."""
+    products = [
+        "iPhone 15 Pro Max",
+        "Samsung Galaxy S24",
+        "Laptop Dell XPS 13",
+        "MacBook Pro M3",
+        "iPad Air",
+        "Surface Pro",
+    ]
+    categories = ["Electronics", "Electronics", "Computers", "Computers", "Tablets", "Computers"]
+    model = ProductCategoryClassifier(
+        classifier_type="lr", async_executor=AsyncInferenceExecutor(max_workers=2, max_pending=8)
+    ).fit(products, categories)
+    return products, model
+
+
+class TestAsyncInferenceExecutor:
+    """Тесты для класса AsyncInferenceExecutor."""
+
+    def test_invalid_params(self):
+        """Тест проверки параметров пула."""
+        with pytest.raises(ValueError, match="положительным"):
+            AsyncInferenceExecutor(max_workers=0)
+        with pytest.raises(ValueError, match="меньше числа потоков"):
+            AsyncInferenceExecutor(max_workers=4, max_pending=2)
+
+    def test_loop_is_not_blocked(self):
+        """Тест, что event loop обрабатывает другие задачи во время инференса."""
+        executor = AsyncInferenceExecutor(max_workers=1, max_pending=2)
+        release = threading.Event()
+
+        async def scenario():
+            task = asyncio.create_task(executor.run(release.wait, 5))
+            # Пока вызов заблокирован в пуле, корутины продолжают выполняться
+            await asyncio.sleep(0.01)
+            assert not task.done()
+            assert executor.stats()["running"] == 1
+            release.set()
+            return await task
+
+        assert asyncio.run(scenario()) is True
+        executor.shutdown()
+
+    def test_backpressure_and_queue_depth(self):
+        """Тест отклонения запросов сверх max_pending и метрик очереди."""
+        executor = AsyncInferenceExecutor(max_workers=1, max_pending=2)
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking() -> str:
+            started.set()
+            release.wait(5)
+            return "done"
+
+        async def scenario():
+            first = asyncio.create_task(executor.run(blocking))
+            second = asyncio.create_task(executor.run(blocking))
+            await asyncio.to_thread(started.wait, 5)
+            stats = executor.stats()
+            with pytest.raises(asyncio.QueueFull):
+                await executor.run(blocking)
+            release.set()
+            return stats, await asyncio.gather(first, second)
+
+        stats, results = asyncio.run(scenario())
+        executor.shutdown()
+
+        assert results == ["done", "done"]
+        assert stats["pending"] == 2
+        assert stats["running"] == 1
+        assert stats["queued"] == 1
+        final = executor.stats()
+        assert final["pending"] == 0
+        assert final["completed"] == 2
+        assert final["rejected"] == 1
+
+    def test_cancel_queued_request(self):
+        """Тест, что отмена ожидающего запроса снимает его с очереди пула."""
+        executor = AsyncInferenceExecutor(max_workers=1, max_pending=4)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def blocking() -> None:
+            started.set()
+            release.wait(5)
+
+        async def scenario():
+            running = asyncio.create_task(executor.run(blocking))
+            queued = asyncio.create_task(executor.run(calls.append, "queued"))
+            await asyncio.to_thread(started.wait, 5)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            release.set()
+            await running
+
+        asyncio.run(scenario())
+        executor.shutdown()
+
+        assert calls == []
+        stats = executor.stats()
+        assert stats["cancelled"] == 1
+        assert stats["pending"] == 0
+
+    def test_error_is_propagated(self):
+        """Тест передачи исключения из пула в корутину."""
+        executor = AsyncInferenceExecutor(max_workers=1)
+
+        def failing() -> None:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(executor.run(failing))
+        executor.shutdown()
+        assert executor.stats()["failed"] == 1
+
+
+class TestAsyncClassifier:
+    """Тесты асинхронных методов ProductCategoryClassifier."""
+
+    def test_async_methods_match_sync(self, fitted_model):
+        """Тест, что асинхронные методы дают те же результаты, что и синхронные."""
+        products, model = fitted_model
+
+        async def scenario():
+            return await asyncio.gather(
+                model.apredict(products),
+                model.apredict_proba(products),
+                model.apredict_with_confidence(products),
+                model.ainfer(products, top_k=2),
+            )
+
+        labels, probabilities, (conf_labels, confidences), result = asyncio.run(scenario())
+
+        assert labels == model.predict(products)
+        np.testing.assert_allclose(probabilities, model.predict_proba(products), atol=1e-6)
+        assert conf_labels == labels
+        np.testing.assert_allclose(confidences, probabilities.max(axis=1), atol=1e-6)
+        assert result.top_k_labels == model.infer(products, top_k=2).top_k_labels
+
+    def test_concurrent_requests(self, fitted_model):
+        """Тест множества одновременных запросов из одного event loop."""
+        products, model = fitted_model
+
+        async def scenario():
+            return await asyncio.gather(*(model.apredict([title]) for title in products))
+
+        results = asyncio.run(scenario())
+
+        assert [labels[0] for labels in results] == model.predict(products)
+        assert model.async_executor.stats()["pending"] == 0
+
+    def test_not_fitted(self):
+        """Тест ошибки для необученной модели."""
+        model = ProductCategoryClassifier(classifier_type="lr")
+
+        with pytest.raises(ValueError, match="не обучена"):
+            asyncio.run(model.apredict(["iPhone"]))
@@ -0,0 +1,91 @@
+"""Тесты для модуля микро-батчей."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from categoraize.models.batching import MicroBatcher
+from categoraize.models.classifier import ProductCategoryClassifier
+
+
+@pytest.fixture(scope="module")
+def fitted_model():
+    """Обучение модели на небольшом наборе продуктов."""
+    products = [
+        "iPhone 15 Pro Max",
+        "Samsung Galaxy S24",
+        "Laptop Dell XPS 13",
+        "MacBook Pro M3",
+        "iPad Air",
+        "Surface Pro",
+    ]
+    categories = ["Electronics", "Electronics", "Computers", "Computers", "Tablets", "Computers"]
+    model = ProductCategoryClassifier(classifier_type="lr").fit(products, categories)
+    return products, model
+
+
+class TestMicroBatcher:
+    """Тесты для класса MicroBatcher."""
+
+    def test_concurrent_requests_match_model(self, fitted_model):
+        """Тест, что запросы из многих потоков дают те же результаты, что и модель."""
+        products, model = fitted_model
+        titles = products * 10
+        expected_labels, expected_confidences = model.predict_with_confidence(titles)
+
+        with MicroBatcher(model, max_batch_size=16, max_wait_ms=20) as batcher:
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                results = list(executor.map(batcher.predict_with_confidence, titles))
+            stats = batcher.stats()
+
+        assert [label for label, _ in results] == expected_labels
+        for (_, confidence), expected in zip(results, expected_confidences, strict=True):
+            assert confidence == pytest.approx(expected, abs=1e-5)
+        assert stats["requests"] == len(titles)
+        assert stats["batches"] < len(titles)
+        assert stats["mean_batch_size"] > 1
+
+    def test_max_batch_size(self, fitted_model):
+        """Тест ограничения размера микро-батча."""
+        products, model = fitted_model
+
+        with MicroBatcher(model, max_batch_size=2, max_wait_ms=50) as batcher:
+            futures = [batcher.submit(title) for title in products]
+            labels = [future.result()[0] for future in futures]
+
+        assert labels == model.predict(products)
+        assert batcher.stats()["batches"] >= len(products) // 2
+
+    def test_error_is_propagated(self, fitted_model, monkeypatch):
+        """Тест передачи ошибки инференса всем запросам батча."""
+        products, model = fitted_model
+        batcher = MicroBatcher(model, max_wait_ms=1)
+
+        def failing_predict(_titles):
+            raise RuntimeError("сбой инференса")
+
+        monkeypatch.setattr(model, "predict_with_confidence", failing_predict)
+        with pytest.raises(RuntimeError, match="сбой инференса"):
+            batcher.predict(products[0], timeout=5)
+        batcher.close()
+
+        assert batcher.stats()["errors"] == 1
+
+    def test_submit_after_close(self, fitted_model):
+        """Тест ошибки постановки запроса после остановки."""
+        _, model = fitted_model
+        batcher = MicroBatcher(model)
+        batcher.close()
+        batcher.close()
+
+        with pytest.raises(RuntimeError, match="остановлен"):
+            batcher.submit("iPad Air")
+
+    def test_invalid_params(self, fitted_model):
+        """Тест проверки параметров и необученной модели."""
+        _, model = fitted_model
+
+        with pytest.raises(ValueError, match="Размер батча"):
+            MicroBatcher(model, max_batch_size=0)
+        with pytest.raises(ValueError, match="не обучена"):
+            MicroBatcher(ProductCategoryClassifier(classifier_type="lr"))
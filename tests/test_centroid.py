@@ -0,0 +1,70 @@
+"""Тесты для модуля классификатора по центроидам."""
+
+import numpy as np
+import pytest
+
+from categoraize.models.centroid import CentroidClassifier
+from categoraize.models.numpy_head import NumpyHead
+
+
+@pytest.fixture
+def sample_embeddings():
+    """Создание тестовых эмбеддингов вокруг трех центров."""
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(3, 16))
+    y = np.repeat([0, 1, 2], 20)
+    X = (centers[y] + 0.1 * rng.normal(size=(60, 16))).astype(np.float32)
+    return X, y
+
+
+class TestCentroidClassifier:
+    """Тесты для класса CentroidClassifier."""
+
+    def test_fit_predict(self, sample_embeddings):
+        """Тест обучения и предсказания."""
+        X, y = sample_embeddings
+        classifier = CentroidClassifier().fit(X, y)
+
+        assert classifier.counts_.tolist() == [20, 20, 20]
+        assert np.allclose(np.linalg.norm(classifier.centroids_, axis=1), 1.0)
+        assert np.array_equal(classifier.predict(X), y)
+
+    def test_predict_proba_temperature(self, sample_embeddings):
+        """Тест, что температура управляет уверенностью вероятностей."""
+        X, y = sample_embeddings
+        sharp = CentroidClassifier(temperature=0.01).fit(X, y).predict_proba(X)
+        smooth = CentroidClassifier(temperature=1.0).fit(X, y).predict_proba(X)
+
+        assert np.allclose(sharp.sum(axis=1), 1.0)
+        assert sharp.max(axis=1).mean() > smooth.max(axis=1).mean()
+
+    def test_partial_fit_matches_fit(self, sample_embeddings):
+        """Тест, что поштучное добавление примеров дает те же центроиды."""
+        X, y = sample_embeddings
+        full = CentroidClassifier().fit(X, y)
+        incremental = CentroidClassifier().fit(X[:2], y[:2])
+        for idx in range(2, len(X)):
+            incremental.partial_fit(X[idx : idx + 1], y[idx : idx + 1])
+
+        assert np.array_equal(incremental.classes_, full.classes_)
+        assert np.array_equal(incremental.counts_, full.counts_)
+        assert np.allclose(incremental.centroids_, full.centroids_, atol=1e-5)
+
+    def test_partial_fit_new_class(self, sample_embeddings):
+        """Тест добавления новой категории."""
+        X, y = sample_embeddings
+        classifier = CentroidClassifier().fit(X[y > 0], y[y > 0])
+
+        classifier.partial_fit(X[:1], y[:1])
+
+        assert classifier.classes_.tolist() == [0, 1, 2]
+        assert classifier.counts_.tolist() == [1, 20, 20]
+        assert classifier.predict(X[:1]).tolist() == [0]
+
+    def test_numpy_head(self, sample_embeddings):
+        """Тест, что скомпилированный классификатор совпадает с исходным."""
+        X, y = sample_embeddings
+        classifier = CentroidClassifier(temperature=0.1).fit(X, y)
+        head = NumpyHead.from_estimator(classifier, ["a", "b", "c"])
+
+        assert np.allclose(head.predict_proba(X), classifier.predict_proba(X), atol=1e-5)
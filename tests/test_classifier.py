@@ -1,9 +1,14 @@
 """Тесты для модуля классификатора."""
 
+import json
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pytest
 
+from categoraize.models import classifier as classifier_module
 from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.models.projection import EmbeddingProjection
 
 
 @pytest.fixture
@@ -64,6 +69,104 @@ class TestProductCategoryClassifier:
         assert embeddings.shape[0] == 3
         assert embeddings.shape[1] == model.embedding_dim
 
+    def test_encode_products_deduplicates_batch(self, sample_data, monkeypatch):
+        """Тест, что дубликаты в батче кодируются один раз."""
+        products, _ = sample_data
+        model = ProductCategoryClassifier()
+        batch = [products[0], products[1], products[0], products[0] + "  ", products[1]]
+
+        embedded = []
+        original_embed = model._embed
+
+        def counting_embed(texts):
+            embedded.extend(texts)
+            return original_embed(texts)
+
+        monkeypatch.setattr(model, "_embed", counting_embed)
+        embeddings = model.encode_products(batch)
+
+        assert len(embedded) == 2
+        assert embeddings.shape == (5, model.embedding_dim)
+        assert np.allclose(embeddings[0], embeddings[2])
+        assert np.allclose(embeddings[0], embeddings[3])
+        assert np.allclose(embeddings[1], embeddings[4])
+        metrics = model.encode_metrics()
+        assert metrics["texts"] == 5
+        assert metrics["unique_texts"] == 2
+        assert metrics["dedup_ratio"] == pytest.approx(0.6)
+
+    def test_encode_products_token_budget_batches(self, sample_data):
+        """Тест, что батчи по бюджету токенов не меняют эмбеддинги и порядок."""
+        products, _ = sample_data
+        texts = [*products, "Пятёрочка хлеб молоко " * 10, "кофе"]
+        model = ProductCategoryClassifier()
+        budgeted = ProductCategoryClassifier(max_tokens_per_batch=64)
+
+        expected = model.encode_products(texts)
+        embeddings = budgeted.encode_products(texts)
+
+        assert np.allclose(embeddings, expected, atol=1e-5)
+        metrics = budgeted.encode_metrics()
+        assert metrics["batches"] > 1
+        assert 0 < metrics["padding_efficiency"] <= 1
+
+    def test_encode_products_tokenize_window(self, sample_data, monkeypatch):
+        """Тест, что тексты токенизируются ограниченными окнами в исходном порядке."""
+        products, _ = sample_data
+        model = ProductCategoryClassifier()
+        budgeted = ProductCategoryClassifier(max_tokens_per_batch=64)
+        expected = model.encode_products(products)
+
+        tokenize = budgeted.embedder.tokenize
+        window_sizes = []
+
+        def tracking_tokenize(texts):
+            window_sizes.append(len(texts))
+            return tokenize(texts)
+
+        monkeypatch.setattr(classifier_module, "TOKENIZE_WINDOW", 3)
+        monkeypatch.setattr(budgeted.embedder, "tokenize", tracking_tokenize)
+        embeddings = budgeted.encode_products(products)
+
+        assert np.allclose(embeddings, expected, atol=1e-5)
+        assert max(window_sizes) <= 3
+        assert sum(window_sizes) == len(set(products))
+
+    def test_max_seq_length(self):
+        """Тест настройки обрезки длинных текстов."""
+        model = ProductCategoryClassifier(max_seq_length=16)
+
+        assert model.max_seq_length == 16
+        assert model.embedder.max_seq_length == 16
+        assert "max_seq_length=16" in model.embedder_id
+
+    def test_encode_products_with_disk_cache(self, sample_data, tmp_path):
+        """Тест, что повторное кодирование берется из дискового кэша."""
+        products, _ = sample_data
+        model = ProductCategoryClassifier(embedding_cache_dir=tmp_path)
+
+        first = model.encode_products(products[:3])
+        second = model.encode_products(products[:3])
+
+        assert np.allclose(first, second)
+        stats = model.embedding_cache_stats()["disk"]
+        assert stats["misses"] == 3
+        assert stats["hits"] == 3
+
+    def test_memory_cache_shared_between_classifiers(self, sample_data):
+        """Тест, что LRU-кэш общий для классификаторов с одним эмбеддером."""
+        products, _ = sample_data
+        model_a = ProductCategoryClassifier(memory_cache_bytes=2**20)
+        model_b = ProductCategoryClassifier(classifier_type="lr", memory_cache_bytes=2**20)
+
+        first = model_a.encode_products(products[:3])
+        hits_before = model_a.embedding_cache_stats()["memory"]["hits"]
+        second = model_b.encode_products(products[:3])
+
+        assert model_a.memory_cache is model_b.memory_cache
+        assert np.allclose(first, second)
+        assert model_b.embedding_cache_stats()["memory"]["hits"] - hits_before == 3
+
     def test_encode_categories(self):
         """Тест кодирования категорий."""
         categories = ["Electronics", "Computers", "Tablets"]
@@ -162,3 +265,475 @@ class TestProductCategoryClassifier:
         loaded_preds = loaded_model.predict(test_products)
 
         assert original_preds == loaded_preds
+
+    def test_init_does_not_load_embedder(self):
+        """Тест, что эмбеддер загружается лениво."""
+        model = ProductCategoryClassifier(classifier_type="lr")
+
+        assert model._embedder is None
+        assert model.embedding_dim > 0
+        assert model._embedder is not None
+
+    def test_from_pretrained_uses_local_embedder(self, sample_data, tmp_path):
+        """Тест, что загрузка не обращается к Hub и не загружает эмбеддер заранее."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="lr")
+        model.fit(products, categories)
+        save_path = tmp_path / "test_model"
+        model.save_pretrained(save_path)
+
+        # Несуществующее название модели: загрузка возможна только из embedder/
+        metadata_path = save_path / "metadata.json"
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        metadata["embedding_model_name"] = "nonexistent-org/nonexistent-model"
+        metadata_path.write_text(json.dumps(metadata), encoding="utf-8")
+
+        loaded_model = ProductCategoryClassifier.from_pretrained(save_path)
+
+        assert loaded_model._embedder is None
+        assert loaded_model.embedder_path == save_path / "embedder"
+        assert loaded_model.predict(products[:2]) == model.predict(products[:2])
+
+    def test_save_pretrained_copies_unloaded_embedder(self, sample_data, tmp_path):
+        """Тест пересохранения модели без материализации эмбеддера."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="lr")
+        model.fit(products, categories)
+        model.save_pretrained(tmp_path / "first")
+
+        loaded_model = ProductCategoryClassifier.from_pretrained(tmp_path / "first")
+        loaded_model.save_pretrained(tmp_path / "second")
+
+        assert loaded_model._embedder is None
+        assert (tmp_path / "second" / "embedder" / "modules.json").exists()
+
+    @pytest.mark.parametrize(
+        ("classifier_type", "classifier_params"),
+        [("lr", None), ("mlp", {"early_stopping": False, "max_iter": 50})],
+    )
+    def test_save_and_load_npy_head(
+        self, sample_data, tmp_path, classifier_type, classifier_params
+    ):
+        """Тест сохранения и загрузки классификатора в компактном формате."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(
+            classifier_type=classifier_type, classifier_params=classifier_params
+        )
+        model.fit(products, categories)
+
+        save_path = tmp_path / "test_model"
+        model.save_pretrained(save_path, head_format="npy")
+
+        assert (save_path / "head.npy").exists()
+        assert (save_path / "head.json").exists()
+        assert not (save_path / "classifier.joblib").exists()
+
+        loaded_model = ProductCategoryClassifier.from_pretrained(save_path)
+
+        assert loaded_model.id_to_label == model.id_to_label
+        assert np.allclose(
+            loaded_model.predict_proba(products), model.predict_proba(products), atol=1e-5
+        )
+
+    def test_save_invalid_head_format(self, sample_data, tmp_path):
+        """Тест ошибки при неизвестном формате классификатора."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="lr")
+        model.fit(products, categories)
+
+        with pytest.raises(ValueError, match="Неизвестный формат"):
+            model.save_pretrained(tmp_path, head_format="onnx")
+
+    def test_compile_head(self, sample_data):
+        """Тест, что скомпилированный классификатор дает те же предсказания."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="lr")
+        model.fit(products, categories)
+        expected = model.predict_proba(products)
+
+        head = model.compile_head()
+
+        assert model.predict(products) == head.predict(model.encode_products(products)).tolist()
+        assert np.allclose(model.predict_proba(products), expected, atol=1e-5)
+
+        # Повторное обучение сбрасывает компиляцию
+        model.fit(products, categories)
+        assert model._compiled_head is None
+
+    def test_compile_head_not_fitted(self):
+        """Тест компиляции необученной модели."""
+        model = ProductCategoryClassifier(classifier_type="lr")
+
+        with pytest.raises(ValueError, match="Модель не обучена"):
+            model.compile_head()
+
+    @pytest.mark.parametrize("precision", ["float16", "int8"])
+    def test_embedding_precision(self, sample_data, precision):
+        """Тест эмбеддингов с пониженной точностью."""
+        products, _ = sample_data
+        expected = ProductCategoryClassifier().encode_products(products)
+        model = ProductCategoryClassifier(embedding_precision=precision, memory_cache_bytes=2**20)
+
+        first = model.encode_products(products)
+        second = model.encode_products(products)
+
+        assert first.dtype == np.float32
+        assert np.allclose(first, expected, atol=0.01)
+        # Новые и закэшированные эмбеддинги совпадают точно
+        assert np.array_equal(first, second)
+        assert model.memory_cache.precision == precision
+
+    def test_save_and_load_quantized_head(self, sample_data, tmp_path):
+        """Тест сохранения весов классификатора в int8."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="lr", embedding_precision="float16")
+        model.fit(products, categories)
+
+        model.save_pretrained(tmp_path, head_format="npy", head_precision="int8")
+        loaded_model = ProductCategoryClassifier.from_pretrained(tmp_path)
+
+        assert loaded_model.embedding_precision == "float16"
+        assert np.allclose(
+            loaded_model.predict_proba(products), model.predict_proba(products), atol=0.02
+        )
+
+    def test_quantized_head_requires_npy(self, sample_data, tmp_path):
+        """Тест ошибки при квантизации весов в формате joblib."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="lr")
+        model.fit(products, categories)
+
+        with pytest.raises(ValueError, match="только в формате npy"):
+            model.save_pretrained(tmp_path, head_precision="int8")
+
+    @pytest.mark.parametrize("head_format", ["joblib", "npy"])
+    def test_projection(self, sample_data, tmp_path, head_format):
+        """Тест обучения, предсказания и сохранения модели с проекцией эмбеддингов."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(
+            classifier_type="lr", projection=EmbeddingProjection(method="pca", dim=4)
+        )
+        model.fit(products, categories)
+
+        assert model.classifier.n_features_in_ == 4
+        expected = model.predict_proba(products)
+
+        model.save_pretrained(tmp_path, head_format=head_format)
+        loaded_model = ProductCategoryClassifier.from_pretrained(tmp_path)
+
+        assert (tmp_path / "projection.npz").exists()
+        assert loaded_model.projection.get_params() == model.projection.get_params()
+        assert np.allclose(loaded_model.predict_proba(products), expected, atol=1e-5)
+
+        loaded_model.compile_head()
+        assert np.allclose(loaded_model.predict_proba(products), expected, atol=1e-5)
+
+    def test_unfitted_projection_round_trip(self, sample_data, tmp_path):
+        """Тест сохранения и загрузки модели с необученной проекцией."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(
+            classifier_type="lr", projection=EmbeddingProjection(method="pca", dim=4)
+        )
+
+        model.save_pretrained(tmp_path)
+        metadata = json.loads((tmp_path / "metadata.json").read_text(encoding="utf-8"))
+        loaded_model = ProductCategoryClassifier.from_pretrained(tmp_path)
+
+        assert not (tmp_path / "projection.npz").exists()
+        assert metadata["projection"] is None
+        assert loaded_model.is_fitted is False
+        assert loaded_model.projection is None
+        loaded_model.fit(products, categories)
+        assert loaded_model.predict(products[:1])
+
+    def test_centroid_classifier(self, sample_data, tmp_path):
+        """Тест классификатора по центроидам и его сохранения."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(
+            classifier_type="centroid", classifier_params={"temperature": 0.1}
+        )
+        model.fit(products, categories)
+
+        assert model.predict(products) == categories
+        expected = model.predict_proba(products)
+
+        model.save_pretrained(tmp_path, head_format="npy")
+        loaded_model = ProductCategoryClassifier.from_pretrained(tmp_path)
+
+        assert loaded_model.classifier.temperature == 0.1
+        assert np.allclose(loaded_model.predict_proba(products), expected, atol=1e-5)
+
+    def test_partial_fit_centroid(self, sample_data):
+        """Тест дообучения классификатора по центроидам новой категорией."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="centroid")
+        model.fit(products, categories)
+        model.compile_head()
+
+        model.partial_fit(["Пятёрочка хлеб молоко"], ["Продукты"])
+
+        assert model.label_to_id["Продукты"] == 3
+        assert model.id_to_label[3] == "Продукты"
+        assert model.predict(["Пятёрочка хлеб молоко"]) == ["Продукты"]
+        assert model.predict_proba(products).shape == (len(products), 4)
+
+    def test_partial_fit_sgd(self, sample_data):
+        """Тест дообучения SGD-классификатора новой категорией."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="sgd")
+        model.fit(products, categories)
+        model.compile_head()
+
+        model.partial_fit(["Пятёрочка хлеб молоко"] * 5, ["Продукты"] * 5)
+
+        assert model.label_to_id["Продукты"] == 3
+        assert model.classifier.coef_.shape[0] == 4
+        assert model.predict(["Пятёрочка хлеб молоко"]) == ["Продукты"]
+        assert np.allclose(
+            model.predict_proba(products),
+            model.classifier.predict_proba(model.encode_products(products)),
+            atol=1e-5,
+        )
+
+    def test_partial_fit_mlp(self, sample_data):
+        """Тест дообучения MLP на известных категориях и ошибки на новой."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(
+            classifier_type="mlp", classifier_params={"early_stopping": False, "max_iter": 50}
+        )
+        model.fit(products, categories)
+        # Ранняя остановка отключается только на время дообучения
+        model.classifier.early_stopping = True
+        before = model.predict_proba(products)
+
+        model.partial_fit(products[:2], categories[:2])
+
+        assert model.classifier.early_stopping
+        assert not np.allclose(model.predict_proba(products), before)
+        with pytest.raises(ValueError, match="не поддерживает новые категории"):
+            model.partial_fit(["Пятёрочка хлеб молоко"], ["Продукты"])
+        assert "Продукты" not in model.label_to_id
+
+    @pytest.mark.parametrize("classifier_type", ["sgd", "centroid"])
+    def test_partial_fit_and_persist_head(self, sample_data, tmp_path, classifier_type):
+        """Тест дообучения модели, загруженной через memory map, и атомарного сохранения."""
+        products, categories = sample_data
+        save_path = tmp_path / "test_model"
+        model = ProductCategoryClassifier(classifier_type=classifier_type)
+        model.fit(products, categories)
+        model.save_pretrained(save_path, head_format="npy")
+
+        loaded_model = ProductCategoryClassifier.from_pretrained(save_path)
+        loaded_model.partial_fit(["Пятёрочка хлеб молоко"] * 5, ["Продукты"] * 5)
+        loaded_model.persist_head(save_path)
+        loaded_model.partial_fit(products[:1], categories[:1])
+        loaded_model.persist_head(save_path)
+
+        assert len(list(save_path.glob("*.npy"))) == 2
+        reloaded_model = ProductCategoryClassifier.from_pretrained(save_path)
+        assert reloaded_model.id_to_label == loaded_model.id_to_label
+        assert np.allclose(
+            reloaded_model.predict_proba(products), loaded_model.predict_proba(products), atol=1e-5
+        )
+
+    def test_apply_feedback(self, sample_data):
+        """Тест применения исправлений с новыми и известными категориями."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="sgd")
+        model.fit(products, categories)
+
+        model.apply_feedback(
+            ["Пятёрочка хлеб молоко", "Магнит кефир", products[0]],
+            ["Продукты", "Продукты", categories[0]],
+        )
+
+        assert "Продукты" in model.label_to_id
+        assert model.predict_proba(products).shape[1] == len(set(categories)) + 1
+
+    def test_apply_feedback_lr_known_categories(self, sample_data):
+        """Тест исправлений известных категорий для логистической регрессии."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="lr")
+        model.fit(products, categories)
+        version = model.head_version
+        corrected = next(
+            category for category in sorted(set(categories)) if category != categories[0]
+        )
+
+        model.apply_feedback(
+            ["Пятёрочка хлеб молоко", products[0], products[0]],
+            ["Продукты", corrected, corrected],
+        )
+
+        assert "Продукты" in model.label_to_id
+        assert model.predict(products[:1]) == [corrected]
+        assert model.head_version > version
+        with pytest.raises(ValueError, match="не поддерживает новые категории"):
+            model.partial_fit(["Магнит кефир"], ["Молочные продукты"])
+
+    def test_persist_head_requires_saved_model(self, sample_data, tmp_path):
+        """Тест ошибки атомарного сохранения без сохраненной модели."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="centroid")
+        model.fit(products, categories)
+
+        with pytest.raises(ValueError, match="Сохраненная модель не найдена"):
+            model.persist_head(tmp_path)
+
+    def test_fit_zero_shot(self, monkeypatch):
+        """Тест предсказания по названиям категорий без обучающих примеров."""
+        model = ProductCategoryClassifier(classifier_type="centroid")
+        calls = []
+        encode_categories = model.encode_categories
+
+        def counting_encode(categories):
+            calls.append(list(categories))
+            return encode_categories(categories)
+
+        monkeypatch.setattr(model, "encode_categories", counting_encode)
+
+        model.fit_zero_shot(["Smartphones", "Furniture", "Groceries"])
+        # Название категории совпадает со своим центроидом
+        products = ["Smartphones", "Furniture", "Groceries"]
+        probabilities = model.predict_proba(products)
+
+        assert model.predict(products) == products
+        assert probabilities.shape == (3, 3)
+        assert np.allclose(probabilities.sum(axis=1), 1.0, atol=1e-5)
+
+        # Тот же набор категорий в другом порядке не кодируется повторно
+        model.fit_zero_shot(["Groceries", "Smartphones", "Furniture", "Furniture"])
+        assert len(calls) == 1
+        model.fit_zero_shot(["Smartphones", "Furniture"])
+        assert len(calls) == 2
+
+        model.partial_fit(["Office chair"], ["Office"])
+        assert model.predict_proba(products).shape == (3, 3)
+
+    def test_fit_zero_shot_not_supported(self):
+        """Тест ошибки zero-shot режима для классификатора без центроидов."""
+        model = ProductCategoryClassifier(classifier_type="lr")
+
+        with pytest.raises(ValueError, match="Zero-shot режим не поддерживается"):
+            model.fit_zero_shot(["Смартфоны", "Мебель"])
+
+    @pytest.mark.parametrize("classifier_type", ["lr", "mlp", "sgd", "centroid"])
+    def test_add_and_remove_category(self, sample_data, tmp_path, classifier_type):
+        """Тест добавления и удаления категорий без переобучения."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(
+            classifier_type=classifier_type,
+            classifier_params={"early_stopping": False} if classifier_type == "mlp" else None,
+        )
+        model.fit(products, categories)
+        model.compile_head()
+        before = model.predict_proba(products)
+
+        model.add_category("Groceries", ["Milk 1L", "Bread", "Eggs 10 pcs"])
+
+        assert model.id_to_label[3] == "Groceries"
+        assert model.predict(["Milk 1L"]) == ["Groceries"]
+        assert model.predict_proba(products).shape == (len(products), 4)
+        with pytest.raises(ValueError, match="уже существует"):
+            model.add_category("Groceries", ["Milk 1L"])
+
+        model.remove_category("Groceries")
+        # Маскирование столбца эквивалентно softmax без удаленной категории
+        after = model.predict_proba(products)
+        assert np.allclose(after[:, 3], 0)
+        if classifier_type != "sgd":
+            assert np.allclose(after[:, :3], before, atol=1e-5)
+        assert "Groceries" not in model.predict(["Milk 1L", *products])
+
+        save_path = tmp_path / "test_model"
+        model.save_pretrained(save_path, head_format="npy")
+        loaded_model = ProductCategoryClassifier.from_pretrained(save_path)
+        assert loaded_model.removed_categories == {"Groceries"}
+        assert loaded_model.label_to_id == model.label_to_id
+        assert np.allclose(loaded_model.predict_proba(products), after, atol=1e-5)
+
+        loaded_model.add_category("Groceries", ["Milk 1L"])
+        assert loaded_model.removed_categories == set()
+        assert loaded_model.predict(["Milk 1L"]) == ["Groceries"]
+
+    def test_predict_proba_embeddings(self, sample_data):
+        """Тест публичного скоринга эмбеддингов с маской удаленных категорий."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="lr")
+        model.fit(products, categories)
+        embeddings = model.encode_products(products)
+        model.remove_category("Tablets")
+
+        probabilities = model.predict_proba_embeddings(embeddings)
+
+        assert probabilities.shape == (len(products), len(model.classes_))
+        assert np.allclose(probabilities[:, model.classes_ == "Tablets"], 0)
+        assert np.allclose(probabilities.sum(axis=1), 1)
+        assert model.classes_[probabilities.argmax(axis=1)].tolist() == model.predict(products)
+        with pytest.raises(ValueError, match="не обучена"):
+            ProductCategoryClassifier(classifier_type="lr").predict_proba_embeddings(embeddings)
+
+    def test_remove_category_errors(self, sample_data):
+        """Тест ошибок удаления категорий."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="centroid")
+        model.fit(products, categories)
+
+        with pytest.raises(ValueError, match="Категория не найдена"):
+            model.remove_category("Groceries")
+        model.remove_category("Tablets")
+        with pytest.raises(ValueError, match="уже удалена"):
+            model.remove_category("Tablets")
+        model.remove_category("Computers")
+        with pytest.raises(ValueError, match="последнюю категорию"):
+            model.remove_category("Electronics")
+
+    def test_concurrent_predict(self, sample_data):
+        """Тест предсказаний из многих потоков одновременно (в том числе первого)."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="lr", max_tokens_per_batch=64)
+        model.fit(products, categories)
+        model.close()
+        expected = model.predict(products)
+        model.close()
+
+        titles = [f"{title} {idx}" for idx in range(8) for title in products]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda title: model.predict([title])[0], titles))
+
+        assert results[: len(products)] == model.predict(titles[: len(products)])
+        assert len(results) == len(titles)
+        assert model.predict(products) == expected
+
+    def test_close_during_embed(self):
+        """Тест, что close() из другого потока не прерывает кодирование."""
+        model = ProductCategoryClassifier(classifier_type="lr")
+        # Вторая модель держит эмбеддер в реестре, чтобы close() не выгружал его
+        keeper = ProductCategoryClassifier(classifier_type="lr")
+        _ = keeper.embedder
+
+        def embed(idx: int) -> np.ndarray:
+            if idx % 2:
+                model.close()
+                return np.empty(0)
+            return model._embed([f"iPhone {idx}"])
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(embed, range(64)))
+
+        assert all(result.shape == (1, model.embedding_dim) for result in results[::2])
+        keeper.close()
+
+    def test_partial_fit_lr(self, sample_data, tmp_path):
+        """Тест дообучения логистической регрессии, загруженной через memory map."""
+        products, categories = sample_data
+        model = ProductCategoryClassifier(classifier_type="lr")
+        model.fit(products, categories)
+        model.save_pretrained(tmp_path / "model", head_format="npy")
+        loaded_model = ProductCategoryClassifier.from_pretrained(tmp_path / "model")
+        probabilities = loaded_model.predict_proba(products)
+
+        loaded_model.partial_fit(products[:1], categories[:1])
+
+        column = loaded_model.label_to_id[categories[0]]
+        assert loaded_model.predict_proba(products)[0, column] > probabilities[0, column]
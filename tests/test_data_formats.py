@@ -0,0 +1,164 @@
+"""Тесты для модуля колоночных форматов данных."""
+
+import pandas as pd
+import pytest
+
+from categoraize.data.formats import (
+    detect_format,
+    iter_columnar,
+    read_columnar,
+    read_columns,
+)
+from categoraize.data.loader import DataLoader
+from categoraize.data.preprocessor import DataPreprocessor
+
+
+@pytest.fixture
+def wide_data():
+    """Датасет с лишними колонками и альтернативными названиями."""
+    return pd.DataFrame(
+        {
+            "id": list(range(7)),
+            "title": [
+                "iPhone 15 Pro Max",
+                "Samsung Galaxy S24",
+                "Laptop Dell XPS 13",
+                "MacBook Pro M3",
+                "iPad Air",
+                "Surface Pro",
+                "Pixel 8",
+            ],
+            "description": ["Длинное описание продукта"] * 7,
+            "category_name": [
+                "Electronics",
+                "Electronics",
+                "Computers",
+                "Computers",
+                "Tablets",
+                "Computers",
+                "Electronics",
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def columnar_files(tmp_path, wide_data):
+    """Датасет в форматах Parquet, Arrow IPC и Feather (батчи по 3 строки)."""
+    pa = pytest.importorskip("pyarrow")
+    from pyarrow import feather, parquet
+
+    table = pa.Table.from_pandas(wide_data, preserve_index=False)
+    parquet.write_table(table, tmp_path / "data.parquet", row_group_size=3)
+    feather.write_feather(table, tmp_path / "data.feather", chunksize=3)
+    with (
+        pa.OSFile(str(tmp_path / "data.arrow"), "wb") as sink,
+        pa.ipc.new_file(sink, table.schema) as writer,
+    ):
+        writer.write_table(table, max_chunksize=3)
+    return {fmt: tmp_path / f"data.{fmt}" for fmt in ("parquet", "feather", "arrow")}
+
+
+class TestDetectFormat:
+    """Тесты для функции detect_format."""
+
+    def test_by_extension(self):
+        """Тест определения формата по расширению."""
+        assert detect_format("data/products.csv") == "csv"
+        assert detect_format("data/products.PARQUET") == "parquet"
+        assert detect_format("data/products.pq") == "parquet"
+        assert detect_format("data/products.arrow") == "arrow"
+        assert detect_format("data/products.feather") == "feather"
+
+    def test_explicit_format(self):
+        """Тест явно указанного формата для файла без расширения."""
+        assert detect_format("data/products", "parquet") == "parquet"
+
+    def test_unsupported(self):
+        """Тест ошибок для неизвестного формата."""
+        with pytest.raises(ValueError, match="Укажите формат явно"):
+            detect_format("data/products.xlsx")
+        with pytest.raises(ValueError, match="Неподдерживаемый формат данных"):
+            detect_format("data/products.csv", "xlsx")
+
+
+class TestColumnarReading:
+    """Тесты для чтения колоночных форматов."""
+
+    @pytest.mark.parametrize("fmt", ["parquet", "feather", "arrow"])
+    def test_read_columns(self, columnar_files, fmt):
+        """Тест чтения схемы без данных."""
+        assert read_columns(columnar_files[fmt]) == ["id", "title", "description", "category_name"]
+
+    @pytest.mark.parametrize("fmt", ["parquet", "feather", "arrow"])
+    def test_read_columnar_projection(self, columnar_files, wide_data, fmt):
+        """Тест чтения только указанных колонок со строками на Arrow."""
+        df = read_columnar(columnar_files[fmt], ["category_name", "title"])
+
+        assert df.columns.tolist() == ["category_name", "title"]
+        assert df["title"].dtype == pd.StringDtype("pyarrow")
+        assert df["title"].tolist() == wide_data["title"].tolist()
+
+    @pytest.mark.parametrize("fmt", ["parquet", "feather", "arrow"])
+    def test_iter_columnar(self, columnar_files, wide_data, fmt):
+        """Тест чтения частями с пропуском строк."""
+        chunks = list(iter_columnar(columnar_files[fmt], ["title"], chunk_size=2, skip_rows=1))
+
+        assert all(len(chunk) <= 2 for chunk in chunks)
+        assert pd.concat(chunks)["title"].tolist() == wide_data["title"].tolist()[1:]
+
+    def test_csv_is_not_columnar(self, tmp_path, wide_data):
+        """Тест ошибки чтения CSV как колоночного формата."""
+        path = tmp_path / "data.csv"
+        wide_data.to_csv(path, index=False)
+
+        assert read_columns(path) == ["id", "title", "description", "category_name"]
+        with pytest.raises(ValueError, match="не является колоночным"):
+            read_columnar(path, ["title"])
+
+
+class TestDataLoaderColumnar:
+    """Тесты для загрузки колоночных форматов через DataLoader."""
+
+    @pytest.mark.parametrize("fmt", ["parquet", "feather", "arrow"])
+    def test_load_kaggle_dataset(self, columnar_files, wide_data, fmt):
+        """Тест загрузки с автодетектом колонок по схеме."""
+        loader = DataLoader(columnar_files[fmt].parent)
+
+        df = loader.load_kaggle_dataset(columnar_files[fmt].name)
+
+        assert df.columns.tolist() == ["product_title", "category"]
+        assert df["product_title"].dtype == pd.StringDtype("pyarrow")
+        assert df["category"].tolist() == wide_data["category_name"].tolist()
+        assert loader.validate_data(df) is True
+
+    @pytest.mark.parametrize("fmt", ["parquet", "feather", "arrow"])
+    def test_iter_kaggle_dataset(self, columnar_files, fmt):
+        """Тест потоковой загрузки, совпадающей с загрузкой целиком."""
+        loader = DataLoader(columnar_files[fmt].parent)
+
+        chunks = list(loader.iter_kaggle_dataset(columnar_files[fmt].name, chunk_size=2))
+
+        assert all(len(chunk) <= 2 for chunk in chunks)
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks, ignore_index=True),
+            loader.load_kaggle_dataset(columnar_files[fmt].name),
+        )
+
+    def test_format_from_config(self, columnar_files):
+        """Тест явного формата для файла с нестандартным расширением."""
+        path = columnar_files["parquet"].rename(columnar_files["parquet"].with_suffix(".bin"))
+        loader = DataLoader(path.parent, data_format="parquet")
+
+        assert len(loader.load_kaggle_dataset(path.name)) == 7
+        with pytest.raises(ValueError, match="Неподдерживаемый формат данных"):
+            DataLoader(path.parent, data_format="xlsx")
+
+    def test_preprocessing_keeps_arrow_strings(self, columnar_files):
+        """Тест, что предобработка сохраняет строки на Arrow."""
+        df = DataLoader(columnar_files["parquet"].parent).load_kaggle_dataset("data.parquet")
+
+        result = DataPreprocessor().preprocess_dataframe(df)
+
+        assert result["product_title"].dtype == pd.StringDtype("pyarrow")
+        assert result["product_title"].iloc[0] == "iphone 15 pro max"
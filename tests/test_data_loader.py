@@ -120,6 +120,48 @@ class TestDataLoader:
         assert "category" in df.columns
         assert len(df) == 4
 
+    def test_iter_kaggle_dataset(self, temp_data_dir, sample_data):
+        """Тест потоковой загрузки чанками."""
+        loader = DataLoader(temp_data_dir)
+
+        chunks = list(loader.iter_kaggle_dataset("product_titles.csv", chunk_size=3))
+
+        assert [len(chunk) for chunk in chunks] == [3, 1]
+        assert all(chunk.columns.tolist() == ["product_title", "category"] for chunk in chunks)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), sample_data)
+
+    def test_iter_kaggle_dataset_reads_only_needed_columns(
+        self, temp_data_dir, sample_data_alternative_columns
+    ):
+        """Тест маппинга колонок по заголовку и пропуска лишних колонок."""
+        df = sample_data_alternative_columns.assign(price=[1, 2, 3, 4], brand="Apple")
+        df.to_csv(Path(temp_data_dir) / "wide.csv", index=False)
+        loader = DataLoader(temp_data_dir)
+
+        chunks = list(loader.iter_kaggle_dataset("wide.csv", chunk_size=2))
+
+        assert len(chunks) == 2
+        assert chunks[0].columns.tolist() == ["product_title", "category"]
+        assert chunks[0]["product_title"].iloc[0] == "iPhone 15 Pro Max"
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks, ignore_index=True), loader.load_kaggle_dataset("wide.csv")
+        )
+
+    def test_iter_kaggle_dataset_errors(self, temp_data_dir):
+        """Тест ошибок потоковой загрузки."""
+        wrong_path = Path(temp_data_dir) / "wrong.csv"
+        pd.DataFrame({"col1": ["Product 1"], "col2": ["Category 1"]}).to_csv(
+            wrong_path, index=False
+        )
+        loader = DataLoader(temp_data_dir)
+
+        with pytest.raises(ValueError, match="отсутствуют необходимые колонки"):
+            next(loader.iter_kaggle_dataset("wrong.csv"))
+        with pytest.raises(FileNotFoundError):
+            next(loader.iter_kaggle_dataset("nonexistent.csv"))
+        with pytest.raises(ValueError, match="положительным"):
+            next(loader.iter_kaggle_dataset(chunk_size=0))
+
     def test_validate_data_success(self, sample_data):
         """Тест успешной валидации данных."""
         loader = DataLoader("data")
@@ -168,6 +210,13 @@ class TestDataLoader:
         with pytest.raises(ValueError, match="пустых названий"):
             loader.validate_data(df_empty)
 
+    def test_validate_data_min_categories(self):
+        """Тест валидации чанка с одной категорией."""
+        loader = DataLoader("data")
+        df = pd.DataFrame({"product_title": ["Product 1", "Product 2"], "category": ["A", "A"]})
+
+        assert loader.validate_data(df, min_categories=1) is True
+
     def test_validate_data_insufficient_categories(self):
         """Тест валидации данных с недостаточным количеством категорий."""
         loader = DataLoader("data")
@@ -101,6 +101,18 @@ class TestDataPreprocessor:
         assert "product 1" in result["product_title"].values  # lowercase применяется
         assert "product 3" in result["product_title"].values
 
+    def test_preprocess_chunks(self, sample_data):
+        """Тест, что потоковая предобработка совпадает с обработкой целиком."""
+        df = pd.concat([sample_data, pd.DataFrame({"product_title": ["  "], "category": ["A"]})])
+        preprocessor = DataPreprocessor()
+
+        chunks = list(preprocessor.preprocess_chunks([df.iloc[:3], df.iloc[3:]]))
+
+        assert [len(chunk) for chunk in chunks] == [3, 2]
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks, ignore_index=True), preprocessor.preprocess_dataframe(df)
+        )
+
     def test_encode_labels(self):
         """Тест кодирования меток."""
         preprocessor = DataPreprocessor()
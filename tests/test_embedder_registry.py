@@ -0,0 +1,150 @@
+"""Тесты для модуля реестра эмбеддеров."""
+
+import gc
+import threading
+
+import pytest
+
+from categoraize.models import embedder_registry
+from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.models.embedder_registry import EmbedderRegistry
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@pytest.fixture
+def registry():
+    """Создание пустого реестра."""
+    return EmbedderRegistry()
+
+
+class TestEmbedderRegistry:
+    """Тесты для класса EmbedderRegistry."""
+
+    def test_acquire_returns_shared_instance(self, registry):
+        """Тест, что повторный запрос возвращает тот же экземпляр."""
+        first = registry.acquire(MODEL_NAME)
+        second = registry.acquire(MODEL_NAME)
+
+        assert first is second
+        assert len(registry) == 1
+        assert registry.stats()["entries"][0]["refcount"] == 2
+
+    def test_settings_are_part_of_key(self, registry):
+        """Тест, что разные настройки дают разные экземпляры."""
+        default = registry.acquire(MODEL_NAME)
+        truncated = registry.acquire(MODEL_NAME, max_seq_length=32)
+
+        assert default is not truncated
+        assert truncated.max_seq_length == 32
+        assert len(registry) == 2
+
+    def test_native_length_shares_key(self, registry, monkeypatch):
+        """Тест, что None и явная родная длина дают один экземпляр и одну загрузку."""
+        loads = []
+        original_load = registry._load
+
+        def counting_load(*args):
+            loads.append(args)
+            return original_load(*args)
+
+        monkeypatch.setattr(registry, "_load", counting_load)
+        default = registry.acquire(MODEL_NAME)
+        explicit = registry.acquire(MODEL_NAME, max_seq_length=default.max_seq_length)
+
+        assert default is explicit
+        assert len(loads) == 1
+        assert registry.stats()["entries"][0]["max_seq_length"] == default.max_seq_length
+
+        registry.release(MODEL_NAME)
+        registry.release(MODEL_NAME, max_seq_length=default.max_seq_length)
+        assert len(registry) == 0
+
+    def test_release_unloads_unused(self, registry):
+        """Тест выгрузки эмбеддера после возврата всех ссылок."""
+        registry.acquire(MODEL_NAME)
+        registry.acquire(MODEL_NAME)
+
+        registry.release(MODEL_NAME)
+        assert len(registry) == 1
+        registry.release(MODEL_NAME)
+        assert len(registry) == 0
+
+    def test_stats_reports_memory(self, registry):
+        """Тест отчета об объеме памяти."""
+        registry.acquire(MODEL_NAME)
+
+        stats = registry.stats()
+
+        assert stats["embedders"] == 1
+        assert stats["total_bytes"] > 0
+        assert stats["total_bytes"] == stats["entries"][0]["bytes"]
+
+    def test_concurrent_acquire_loads_once(self, registry, monkeypatch):
+        """Тест, что параллельные запросы приводят к одной загрузке."""
+        loads = []
+        original_load = registry._load
+
+        def counting_load(*args):
+            loads.append(args)
+            return original_load(*args)
+
+        monkeypatch.setattr(registry, "_load", counting_load)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.acquire(MODEL_NAME)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(loads) == 1
+        assert len(results) == 8
+        assert all(result is results[0] for result in results)
+        assert registry.stats()["entries"][0]["refcount"] == 8
+
+
+class TestClassifierRegistryIntegration:
+    """Тесты использования реестра классификаторами."""
+
+    def test_classifiers_share_embedder(self, registry):
+        """Тест, что классификаторы с одной моделью разделяют эмбеддер."""
+        model_a = ProductCategoryClassifier(classifier_type="lr", embedder_registry=registry)
+        model_b = ProductCategoryClassifier(classifier_type="mlp", embedder_registry=registry)
+
+        assert model_a.embedder is model_b.embedder
+        assert registry.stats()["entries"][0]["refcount"] == 2
+
+    def test_reloaded_classifier_shares_embedder(self, tmp_path):
+        """Тест, что новый и загруженный с диска классификаторы разделяют эмбеддер."""
+        model = ProductCategoryClassifier(classifier_type="centroid")
+        model.fit(["iPhone 15", "MacBook Pro", "хлеб", "молоко"], ["A", "A", "B", "B"])
+        model.save_pretrained(tmp_path / "model")
+
+        loaded = ProductCategoryClassifier.from_pretrained(tmp_path / "model")
+        loaded.predict(["iPad"])
+
+        assert loaded.embedder is model.embedder
+        entries = embedder_registry.default_registry.stats()["entries"]
+        assert [entry["model_name"] for entry in entries].count(MODEL_NAME) == 1
+
+    def test_close_and_gc_release_embedder(self, registry):
+        """Тест возврата эмбеддера при close() и сборке мусора."""
+        model_a = ProductCategoryClassifier(classifier_type="lr", embedder_registry=registry)
+        model_b = ProductCategoryClassifier(classifier_type="lr", embedder_registry=registry)
+        _ = model_a.embedder, model_b.embedder
+
+        model_a.close()
+        assert registry.stats()["entries"][0]["refcount"] == 1
+
+        del model_b
+        gc.collect()
+        assert len(registry) == 0
+
+    def test_default_registry_is_used(self):
+        """Тест, что по умолчанию используется общий реестр процесса."""
+        model = ProductCategoryClassifier(classifier_type="lr")
+
+        assert model.embedder_registry is embedder_registry.default_registry
@@ -0,0 +1,249 @@
+"""Тесты для модуля кэширования эмбеддингов."""
+
+import numpy as np
+import pytest
+
+from categoraize.models.embedding_cache import (
+    DiskEmbeddingCache,
+    MemoryEmbeddingCache,
+    get_shared_memory_cache,
+    hash_texts,
+    normalize_text,
+)
+
+
+@pytest.fixture
+def sample_embeddings():
+    """Создание тестовых эмбеддингов."""
+    rng = np.random.default_rng(42)
+    texts = ["Пятёрочка хлеб молоко", "iPhone 15 Pro Max", "Laptop Dell XPS 13"]
+    embeddings = rng.normal(size=(len(texts), 8)).astype(np.float32)
+    return texts, embeddings
+
+
+class TestHashing:
+    """Тесты для нормализации и хэширования текстов."""
+
+    def test_normalize_text(self):
+        """Тест схлопывания пробелов и обрезки краев."""
+        assert normalize_text("  Пятёрочка   хлеб\tмолоко ") == "Пятёрочка хлеб молоко"
+
+    def test_hash_texts_equal_for_normalized_duplicates(self):
+        """Тест, что тексты с одинаковой нормальной формой имеют одинаковый хэш."""
+        keys = hash_texts(["хлеб  молоко", " хлеб молоко", "хлеб кефир"])
+
+        assert keys.dtype == np.uint64
+        assert keys[0] == keys[1]
+        assert keys[0] != keys[2]
+
+
+class TestDiskEmbeddingCache:
+    """Тесты для класса DiskEmbeddingCache."""
+
+    def test_lookup_empty_cache(self, tmp_path, sample_embeddings):
+        """Тест поиска в пустом кэше."""
+        texts, _ = sample_embeddings
+        cache = DiskEmbeddingCache(tmp_path, embedder_id="test", embedding_dim=8)
+
+        _, found = cache.lookup(hash_texts(texts))
+
+        assert not found.any()
+        assert cache.misses == len(texts)
+        assert cache.hits == 0
+
+    def test_put_and_lookup(self, tmp_path, sample_embeddings):
+        """Тест сохранения и поиска эмбеддингов."""
+        texts, embeddings = sample_embeddings
+        cache = DiskEmbeddingCache(tmp_path, embedder_id="test", embedding_dim=8)
+
+        cache.put(hash_texts(texts[:2]), embeddings[:2])
+        result, found = cache.lookup(hash_texts(texts))
+
+        assert found.tolist() == [True, True, False]
+        assert np.allclose(result[:2], embeddings[:2])
+        assert len(cache) == 2
+
+    def test_put_skips_existing_keys(self, tmp_path, sample_embeddings):
+        """Тест, что повторная запись не дублирует строки."""
+        texts, embeddings = sample_embeddings
+        cache = DiskEmbeddingCache(tmp_path, embedder_id="test", embedding_dim=8)
+
+        cache.put(hash_texts(texts), embeddings)
+        cache.put(hash_texts(texts), embeddings)
+
+        assert len(cache) == len(texts)
+
+    def test_persistence_between_instances(self, tmp_path, sample_embeddings):
+        """Тест, что кэш переживает перезапуск и виден другим экземплярам."""
+        texts, embeddings = sample_embeddings
+        writer = DiskEmbeddingCache(tmp_path, embedder_id="test", embedding_dim=8)
+        reader = DiskEmbeddingCache(tmp_path, embedder_id="test", embedding_dim=8)
+
+        writer.put(hash_texts(texts), embeddings)
+        result, found = reader.lookup(hash_texts(texts))
+
+        assert found.all()
+        assert np.allclose(result, embeddings)
+
+    @pytest.mark.parametrize("precision", ["float32", "int8"])
+    def test_partial_write_is_discarded(self, tmp_path, sample_embeddings, precision):
+        """Тест, что векторы прерванной записи не сдвигают строки следующих ключей."""
+        texts, embeddings = sample_embeddings
+        cache = DiskEmbeddingCache(tmp_path, "test", embedding_dim=8, precision=precision)
+        cache.put(hash_texts(texts[:1]), embeddings[:1])
+
+        # Прерванная запись: вектор (и масштаб) дописан, ключ - нет
+        with cache._vectors_path.open("ab") as f:
+            f.write(np.full(8, 9, dtype=cache._dtype).tobytes())
+            f.write(b"\x01\x02")
+        if precision == "int8":
+            with cache._scales_path.open("ab") as f:
+                f.write(np.ones(1, dtype=np.float32).tobytes())
+
+        cache.put(hash_texts(texts[1:]), embeddings[1:])
+        result, found = DiskEmbeddingCache(
+            tmp_path, "test", embedding_dim=8, precision=precision
+        ).lookup(hash_texts(texts))
+
+        assert found.all()
+        assert np.allclose(result, embeddings, atol=0.05)
+
+    def test_index_merges_appended_keys(self, tmp_path):
+        """Тест, что индекс после нескольких дописываний совпадает с полной сортировкой."""
+        rng = np.random.default_rng(0)
+        cache = DiskEmbeddingCache(tmp_path, embedder_id="test", embedding_dim=8)
+        keys = rng.integers(0, 2**63, size=300, dtype=np.uint64)
+        embeddings = rng.normal(size=(300, 8)).astype(np.float32)
+
+        for start in range(0, 300, 70):
+            cache.put(keys[start : start + 70], embeddings[start : start + 70])
+        result, found = cache.lookup(keys)
+
+        assert found.all()
+        assert np.array_equal(cache._sorted_keys, np.sort(keys))
+        assert np.allclose(result, embeddings)
+
+    def test_embedders_are_isolated(self, tmp_path, sample_embeddings):
+        """Тест, что кэши разных эмбеддеров не пересекаются."""
+        texts, embeddings = sample_embeddings
+        cache_a = DiskEmbeddingCache(tmp_path, embedder_id="model-a", embedding_dim=8)
+        cache_b = DiskEmbeddingCache(tmp_path, embedder_id="model-b", embedding_dim=8)
+
+        cache_a.put(hash_texts(texts), embeddings)
+        _, found = cache_b.lookup(hash_texts(texts))
+
+        assert not found.any()
+
+    def test_dimension_mismatch(self, tmp_path):
+        """Тест ошибки при несовпадении размерности."""
+        DiskEmbeddingCache(tmp_path, embedder_id="test", embedding_dim=8)
+
+        with pytest.raises(ValueError, match="Размерность эмбеддингов"):
+            DiskEmbeddingCache(tmp_path, embedder_id="test", embedding_dim=16)
+
+    def test_stats(self, tmp_path, sample_embeddings):
+        """Тест статистики попаданий и промахов."""
+        texts, embeddings = sample_embeddings
+        cache = DiskEmbeddingCache(tmp_path, embedder_id="test", embedding_dim=8)
+        cache.put(hash_texts(texts[:1]), embeddings[:1])
+
+        cache.lookup(hash_texts(texts[:2]))
+        stats = cache.stats()
+
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.5)
+        assert stats["size"] == 1
+
+    @pytest.mark.parametrize("precision", ["float16", "int8"])
+    def test_reduced_precision(self, tmp_path, sample_embeddings, precision):
+        """Тест хранения векторов с пониженной точностью."""
+        texts, embeddings = sample_embeddings
+        writer = DiskEmbeddingCache(tmp_path, "test", embedding_dim=8, precision=precision)
+        reader = DiskEmbeddingCache(tmp_path, "test", embedding_dim=8, precision=precision)
+
+        writer.put(hash_texts(texts), embeddings)
+        result, found = reader.lookup(hash_texts(texts))
+
+        assert found.all()
+        assert result.dtype == np.float32
+        assert np.allclose(result, embeddings, atol=0.05)
+        assert reader.stats()["precision"] == precision
+
+    def test_precisions_are_isolated(self, tmp_path, sample_embeddings):
+        """Тест, что кэши с разной точностью не пересекаются."""
+        texts, embeddings = sample_embeddings
+        DiskEmbeddingCache(tmp_path, "test", embedding_dim=8).put(hash_texts(texts), embeddings)
+        cache = DiskEmbeddingCache(tmp_path, "test", embedding_dim=8, precision="int8")
+
+        _, found = cache.lookup(hash_texts(texts))
+
+        assert not found.any()
+
+
+class TestMemoryEmbeddingCache:
+    """Тесты для класса MemoryEmbeddingCache."""
+
+    def test_put_and_lookup(self, sample_embeddings):
+        """Тест сохранения и поиска эмбеддингов."""
+        texts, embeddings = sample_embeddings
+        cache = MemoryEmbeddingCache(embedding_dim=8, max_bytes=1024)
+
+        cache.put(hash_texts(texts[:2]), embeddings[:2])
+        result, found = cache.lookup(hash_texts(texts))
+
+        assert found.tolist() == [True, True, False]
+        assert np.allclose(result[:2], embeddings[:2])
+
+    def test_capacity_from_byte_budget(self):
+        """Тест, что емкость определяется бюджетом в байтах."""
+        cache = MemoryEmbeddingCache(embedding_dim=8, max_bytes=100)
+
+        # Один эмбеддинг размерности 8 занимает 32 байта
+        assert cache.capacity == 3
+
+    def test_budget_smaller_than_vector(self):
+        """Тест ошибки при слишком маленьком бюджете."""
+        with pytest.raises(ValueError, match="Бюджет памяти"):
+            MemoryEmbeddingCache(embedding_dim=8, max_bytes=16)
+
+    def test_lru_eviction(self, sample_embeddings):
+        """Тест вытеснения давно не использованной записи."""
+        texts, embeddings = sample_embeddings
+        keys = hash_texts(texts)
+        cache = MemoryEmbeddingCache(embedding_dim=8, max_bytes=64)
+
+        cache.put(keys[:2], embeddings[:2])
+        # Обращение к первой записи делает вторую самой старой
+        cache.lookup(keys[:1])
+        cache.put(keys[2:], embeddings[2:])
+        result, found = cache.lookup(keys)
+
+        assert found.tolist() == [True, False, True]
+        assert np.allclose(result[2], embeddings[2])
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes"] <= stats["max_bytes"]
+
+    def test_reduced_precision_capacity(self, sample_embeddings):
+        """Тест, что пониженная точность увеличивает емкость при том же бюджете."""
+        texts, embeddings = sample_embeddings
+        cache = MemoryEmbeddingCache(embedding_dim=8, max_bytes=96, precision="int8")
+
+        # Вектор int8 размерности 8 занимает 8 байт и 4 байта масштаба
+        assert cache.capacity == 8
+        cache.put(hash_texts(texts), embeddings)
+        result, found = cache.lookup(hash_texts(texts))
+
+        assert found.all()
+        assert np.allclose(result, embeddings, atol=0.05)
+        assert cache.stats()["bytes"] == 36
+
+    def test_shared_cache_per_embedder(self):
+        """Тест, что общий кэш выдается по идентификатору эмбеддера."""
+        cache_a = get_shared_memory_cache("shared-a", embedding_dim=8, max_bytes=1024)
+        cache_b = get_shared_memory_cache("shared-a", embedding_dim=8, max_bytes=1024)
+        cache_c = get_shared_memory_cache("shared-c", embedding_dim=8, max_bytes=1024)
+
+        assert cache_a is cache_b
+        assert cache_a is not cache_c
@@ -77,6 +77,53 @@ class TestEvaluator:
         assert 0 <= metrics["mean_confidence"] <= 1
         assert 0 <= metrics["median_confidence"] <= 1
 
+    def test_evaluate_top_k(self, trained_model):
+        """Тест оценки Top-k accuracy."""
+        evaluator = Evaluator()
+        X = ["iPhone 15", "MacBook Pro", "iPad Mini"]
+        y_true = ["Electronics", "Computers", "Tablets"]
+
+        metrics = evaluator.evaluate_top_k(trained_model, X, y_true, k=3)
+
+        assert "top_1_accuracy" in metrics
+        # В модели всего 3 категории, поэтому Top-3 покрывает все
+        assert metrics["top_3_accuracy"] == 1.0
+        assert metrics["top_1_accuracy"] <= metrics["top_3_accuracy"]
+
+    def test_evaluate_precision(self, trained_model):
+        """Тест оценки потери точности при квантизации."""
+        evaluator = Evaluator()
+        X = ["iPhone 15", "MacBook Pro", "iPad Air"]
+        y_true = ["Electronics", "Computers", "Tablets"]
+
+        results = evaluator.evaluate_precision(trained_model, X, y_true)
+
+        assert set(results) == {"float32", "float16", "int8"}
+        assert results["float32"]["accuracy"] == pytest.approx(
+            evaluator.evaluate(trained_model, X, y_true)["accuracy"]
+        )
+        assert results["float32"]["accuracy_delta"] == 0.0
+        for precision in ("float16", "int8"):
+            assert results[precision]["accuracy_delta"] == pytest.approx(
+                results[precision]["accuracy"] - results["float32"]["accuracy"]
+            )
+        assert results["int8"]["bytes_per_embedding"] < results["float32"]["bytes_per_embedding"]
+        assert results["int8"]["head_bytes"] < results["float32"]["head_bytes"]
+
+    def test_evaluate_precision_removed_category(self, trained_model):
+        """Тест, что удаленная категория не предсказывается при оценке точности."""
+        evaluator = Evaluator()
+        X = ["iPhone 15", "MacBook Pro", "iPad Air", "Dell XPS"]
+        y_true = ["Electronics", "Computers", "Tablets", "Computers"]
+        trained_model.remove_category("Tablets")
+
+        results = evaluator.evaluate_precision(trained_model, X, y_true, precisions=())
+
+        assert results["float32"]["accuracy"] == pytest.approx(
+            evaluator.evaluate(trained_model, X, y_true)["accuracy"]
+        )
+        assert results["float32"]["accuracy"] <= 0.75
+
     def test_classification_report_detailed(self, trained_model):
         """Тест детального отчета по классификации."""
         evaluator = Evaluator()
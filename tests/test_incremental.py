@@ -0,0 +1,192 @@
+"""Тесты для модуля дообучения классификаторов."""
+
+import json
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.neural_network import MLPClassifier
+
+from categoraize.models.centroid import CentroidClassifier
+from categoraize.models.incremental import (
+    ensure_writable,
+    extend_classes,
+    imprint_class,
+    output_features,
+    proximal_refit,
+    transfer_weights,
+    write_json_atomic,
+)
+from categoraize.models.numpy_head import NumpyHead
+
+
+class TestIncremental:
+    """Тесты для вспомогательных функций дообучения."""
+
+    def test_ensure_writable(self):
+        """Тест копирования весов, доступных только для чтения."""
+        rng = np.random.default_rng(0)
+        classifier = CentroidClassifier().fit(rng.normal(size=(6, 4)), [0, 0, 1, 1, 2, 2])
+        classifier.sums_.flags.writeable = False
+
+        ensure_writable(classifier)
+
+        assert classifier.sums_.flags.writeable
+        classifier.partial_fit(rng.normal(size=(1, 4)), [1])
+        assert classifier.counts_.tolist() == [2, 3, 2]
+
+    def test_extend_binary_classes(self):
+        """Тест добавления класса в бинарный SGDClassifier без изменения старых решений."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(40, 8)).astype(np.float32)
+        y = (X[:, 0] > 0).astype(np.int64)
+        classifier = SGDClassifier(loss="log_loss", random_state=0).fit(X, y)
+        expected = classifier.predict(X)
+
+        extend_classes(classifier, np.array([2]))
+
+        assert classifier.coef_.shape == (3, 8)
+        assert classifier.coef_.dtype == np.float32
+        assert classifier.classes_.tolist() == [0, 1, 2]
+        assert np.array_equal(classifier.predict(X), expected)
+
+        classifier.partial_fit(X[:5], np.full(5, 2))
+        assert classifier.predict_proba(X).shape == (40, 3)
+
+    def test_write_json_atomic(self, tmp_path):
+        """Тест атомарной записи JSON без временных файлов."""
+        path = tmp_path / "metadata.json"
+        write_json_atomic(path, {"a": 1})
+        write_json_atomic(path, {"категория": 2})
+
+        with path.open(encoding="utf-8") as f:
+            assert json.load(f) == {"категория": 2}
+        assert [p.name for p in tmp_path.iterdir()] == ["metadata.json"]
+
+    @pytest.mark.parametrize("estimator", [LogisticRegression, SGDClassifier])
+    def test_transfer_linear_weights(self, estimator):
+        """Тест переноса весов линейного классификатора с перестановкой классов."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(90, 8))
+        y = rng.integers(0, 3, size=90)
+        previous = estimator(random_state=0).fit(X, y)
+
+        # Новые классы: старый 2, новый класс, старый 0 (класс 1 удален)
+        classifier = estimator(random_state=0)
+        transfer_weights(previous, classifier, np.array([2, -1, 0]), n_features=8)
+
+        assert classifier.warm_start
+        assert np.allclose(classifier.coef_[0], previous.coef_[2])
+        assert np.allclose(classifier.coef_[1], 0)
+        assert np.allclose(classifier.coef_[2], previous.coef_[0])
+
+    def test_transfer_binary_weights_keeps_probabilities(self):
+        """Тест разворачивания и сворачивания бинарной логистической регрессии."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(60, 8))
+        previous = LogisticRegression().fit(X, (X[:, 0] > 0).astype(int))
+
+        classifier = LogisticRegression()
+        transfer_weights(previous, classifier, np.array([0, 1]), n_features=8)
+        classifier.classes_ = previous.classes_
+
+        assert np.allclose(classifier.predict_proba(X), previous.predict_proba(X))
+
+    def test_warm_start_converges_faster(self):
+        """Тест, что warm start требует меньше итераций, чем обучение с нуля."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(300, 16))
+        y = (X[:, :3].argmax(axis=1) + (X[:, 3] > 1)).clip(0, 2)
+        previous = LogisticRegression(max_iter=500).fit(X[:250], y[:250])
+
+        classifier = LogisticRegression(max_iter=500)
+        transfer_weights(previous, classifier, np.arange(3), n_features=16)
+        classifier.fit(X, y)
+        cold = LogisticRegression(max_iter=500).fit(X, y)
+
+        assert classifier.n_iter_[0] < cold.n_iter_[0]
+
+    @pytest.mark.parametrize("n_classes", [2, 3])
+    def test_proximal_refit(self, n_classes):
+        """Тест дообучения логистической регрессии на исправлениях."""
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(n_classes, 16)) * 2
+        y = rng.integers(0, n_classes, size=150)
+        X = centers[y] + rng.normal(size=(150, 16))
+        classifier = LogisticRegression(max_iter=500).fit(X, y)
+        coef = classifier.coef_.copy()
+        predicted = classifier.predict(X)
+
+        # Примеры с уже предсказанными метками почти не меняют веса
+        proximal_refit(classifier, X[:5], predicted[:5])
+        assert np.array_equal(classifier.predict(X), predicted)
+        small = np.abs(classifier.coef_ - coef).max()
+
+        target = (predicted[5] + 1) % n_classes
+        n_iter = proximal_refit(classifier, X[5:8], np.full(3, target))
+
+        assert 0 < n_iter < classifier.max_iter
+        assert classifier.coef_.shape == coef.shape
+        assert (classifier.predict(X[5:8]) == target).all()
+        assert np.abs(classifier.coef_ - coef).max() > small
+        with pytest.raises(ValueError, match="среди классов"):
+            proximal_refit(classifier, X[:1], np.array([n_classes]))
+
+    def test_transfer_mlp_weights_new_class(self):
+        """Тест переноса весов MLP при переходе от двух классов к трем."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(60, 8))
+        previous = MLPClassifier(hidden_layer_sizes=(6,), max_iter=50, random_state=0)
+        previous.fit(X, (X[:, 0] > 0).astype(int))
+
+        classifier = MLPClassifier(hidden_layer_sizes=(6,), max_iter=20, random_state=0)
+        transfer_weights(previous, classifier, np.array([0, 1, -1]), n_features=8)
+
+        assert np.allclose(classifier.coefs_[0], previous.coefs_[0])
+        assert classifier.coefs_[-1].shape == (6, 3)
+        classifier.fit(X, rng.integers(0, 3, size=60))
+        assert classifier.predict_proba(X).shape == (60, 3)
+
+    def test_transfer_incompatible(self):
+        """Тест ошибок переноса весов между несовместимыми классификаторами."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(30, 8))
+        y = rng.integers(0, 3, size=30)
+        previous = LogisticRegression().fit(X, y)
+
+        with pytest.raises(ValueError, match="Размерность признаков"):
+            transfer_weights(previous, LogisticRegression(), np.arange(3), n_features=4)
+        with pytest.raises(ValueError, match="Warm start не поддерживается"):
+            transfer_weights(previous, MLPClassifier(), np.arange(3), n_features=8)
+
+    @pytest.mark.parametrize(
+        "classifier",
+        [
+            LogisticRegression(max_iter=500),
+            SGDClassifier(loss="log_loss", alpha=0.01, random_state=0),
+            MLPClassifier(hidden_layer_sizes=(16,), max_iter=300, random_state=0),
+            CentroidClassifier(),
+        ],
+    )
+    @pytest.mark.parametrize("n_classes", [2, 3])
+    def test_imprint_class(self, classifier, n_classes):
+        """Тест добавления категории по нескольким примерам без изменения остальных."""
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(n_classes + 1, 16)) * 3
+        y = rng.integers(0, n_classes + 1, size=400)
+        X = (centers[y] + rng.normal(size=(400, 16))).astype(np.float32)
+        known = y < n_classes
+        classifier.fit(X[known], y[known])
+        expected = classifier.predict(X[known])
+
+        background = None
+        if not isinstance(classifier, CentroidClassifier):
+            background = output_features(classifier, X[known]).mean(axis=0)
+
+        imprint_class(classifier, X[~known][:5], n_classes, background=background)
+
+        assert classifier.classes_.tolist() == list(range(n_classes + 1))
+        assert (classifier.predict(X[~known]) == n_classes).mean() > 0.7
+        assert (classifier.predict(X[known]) == expected).mean() > 0.95
+        head = NumpyHead.from_estimator(classifier, classifier.classes_.astype(str))
+        assert np.allclose(head.predict_proba(X), classifier.predict_proba(X), atol=1e-5)
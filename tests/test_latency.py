@@ -0,0 +1,59 @@
+"""Тесты для модуля гистограмм задержек."""
+
+import pytest
+
+from categoraize.serving.latency import LatencyHistogram, LatencyRecorder
+
+
+class TestLatencyHistogram:
+    """Тесты для класса LatencyHistogram."""
+
+    def test_empty(self):
+        """Тест пустой гистограммы."""
+        histogram = LatencyHistogram()
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot["count"] == 0
+        assert snapshot["p99_ms"] == 0.0
+
+    def test_quantiles(self):
+        """Тест оценки квантилей верхней границей корзины."""
+        histogram = LatencyHistogram(buckets_ms=[1, 10, 100])
+        for _ in range(90):
+            histogram.observe(0.0005)
+        for _ in range(9):
+            histogram.observe(0.005)
+        histogram.observe(0.5)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot["count"] == 100
+        assert snapshot["p50_ms"] == 1
+        assert snapshot["p95_ms"] == 10
+        assert snapshot["p99_ms"] == 10
+        # Значение выше всех границ оценивается максимумом
+        assert histogram.quantile(1.0) == pytest.approx(500)
+        assert snapshot["buckets"] == {"le_1": 90, "le_10": 99, "le_100": 99, "le_inf": 100}
+
+    def test_invalid_buckets(self):
+        """Тест проверки границ корзин."""
+        with pytest.raises(ValueError, match="возрастать"):
+            LatencyHistogram(buckets_ms=[10, 1])
+
+
+class TestLatencyRecorder:
+    """Тесты для класса LatencyRecorder."""
+
+    def test_observe_by_name(self):
+        """Тест гистограмм по именам."""
+        recorder = LatencyRecorder()
+        recorder.observe("POST /predict", 0.003)
+        recorder.observe("POST /predict", 0.004)
+        recorder.observe("GET /health", 0.001)
+
+        snapshot = recorder.snapshot()
+
+        assert list(snapshot) == ["GET /health", "POST /predict"]
+        assert snapshot["POST /predict"]["count"] == 2
+        assert recorder.histogram("GET /health").count == 1
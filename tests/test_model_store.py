@@ -0,0 +1,137 @@
+"""Тесты для модуля хранилища моделей пользователей."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from categoraize.serving.model_store import ModelNotFoundError, ModelStore
+
+
+class TestModelStore:
+    """Тесты для класса ModelStore."""
+
+    def test_get_loads_and_caches(self, user_models_dir, sample_product_data):
+        """Тест ленивой загрузки и повторного использования модели."""
+        store = ModelStore(user_models_dir)
+
+        model = store.get("alice")
+
+        assert store.get("alice") is model
+        assert "alice" in store
+        stats = store.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["bytes"] == ModelStore.model_nbytes(model) > 0
+        assert model.predict(sample_product_data["product_title"].tolist()[:2])
+        store.close()
+
+    def test_available(self, user_models_dir):
+        """Тест списка сохраненных моделей."""
+        assert ModelStore(user_models_dir).available() == ["alice", "bob"]
+
+    def test_unknown_user(self, user_models_dir):
+        """Тест ошибки для пользователя без модели."""
+        with pytest.raises(ModelNotFoundError, match="не найдена"):
+            ModelStore(user_models_dir).get("carol")
+
+    def test_failed_load_releases_lock(self, user_models_dir):
+        """Тест, что блокировки загрузки не копятся после ошибок загрузки."""
+        store = ModelStore(user_models_dir)
+
+        for idx in range(10):
+            with pytest.raises(ModelNotFoundError):
+                store.get(f"unknown_{idx}")
+        with pytest.raises(ValueError, match="Некорректный идентификатор"):
+            store.get("../alice")
+        store.get("alice")
+
+        assert store._load_locks == {}
+        store.close()
+
+    @pytest.mark.parametrize("user_id", ["../alice", "a/b", ".hidden", ""])
+    def test_invalid_user_id(self, user_models_dir, user_id):
+        """Тест отказа для идентификаторов с разделителями пути."""
+        with pytest.raises(ValueError, match="Некорректный идентификатор"):
+            ModelStore(user_models_dir).get(user_id)
+
+    def test_lru_eviction_by_budget(self, user_models_dir):
+        """Тест вытеснения давно не использованной модели при превышении бюджета."""
+        store = ModelStore(user_models_dir, memory_budget_bytes=1)
+
+        alice = store.get("alice")
+        store.get("bob")
+
+        assert "alice" not in store
+        assert "bob" in store
+        assert store.stats()["evictions"] == 1
+        # Повторный запрос загружает модель заново
+        assert store.get("alice") is not alice
+        assert "bob" not in store
+        store.close()
+
+    def test_shared_embedder(self, user_models_dir, sample_product_data):
+        """Тест, что модели пользователей используют один экземпляр эмбеддера."""
+        store = ModelStore(user_models_dir)
+        titles = sample_product_data["product_title"].tolist()[:2]
+        alice, bob = store.get("alice"), store.get("bob")
+        alice.predict(titles)
+        bob.predict(titles)
+
+        assert alice.embedder is bob.embedder
+        store.close()
+
+    def test_concurrent_get_loads_once(self, user_models_dir):
+        """Тест единственной загрузки при параллельных запросах."""
+        store = ModelStore(user_models_dir)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            models = list(executor.map(store.get, ["alice"] * 8))
+
+        assert all(model is models[0] for model in models)
+        assert store.stats()["misses"] == 1
+        store.close()
+
+    def test_evict(self, user_models_dir):
+        """Тест явной выгрузки модели."""
+        store = ModelStore(user_models_dir)
+        store.get("alice")
+
+        assert store.evict("alice")
+        assert not store.evict("alice")
+        assert store.stats()["bytes"] == 0
+
+    def test_evicted_model_stays_usable(self, user_models_dir, sample_product_data):
+        """Тест, что выгруженная модель не закрывается и дорабатывает запросы."""
+        store = ModelStore(user_models_dir, memory_budget_bytes=1)
+        titles = sample_product_data["product_title"].tolist()[:2]
+        alice = store.get("alice")
+        expected = alice.predict(titles)
+
+        store.get("bob")
+        store.evict("bob")
+
+        assert "alice" not in store
+        assert alice._embedder is not None
+        assert alice.predict(titles) == expected
+
+    def test_refresh(self, user_models_dir, sample_product_data):
+        """Тест замены загруженной модели новой версией без выгрузки эмбеддера."""
+        store = ModelStore(user_models_dir)
+        titles = sample_product_data["product_title"].tolist()[:2]
+        alice = store.get("alice")
+        expected = alice.predict(titles)
+        embedder = alice.embedder
+
+        assert store.refresh("alice")
+        assert not store.refresh("bob")
+
+        refreshed = store.get("alice")
+        assert refreshed is not alice
+        assert "bob" not in store
+        # Новая версия получила тот же экземпляр эмбеддера, старая не закрыта
+        assert refreshed._embedder is embedder
+        del alice
+        assert refreshed.embedder is embedder
+        assert refreshed.predict(titles) == expected
+        assert store._load_locks == {}
+        store.close()
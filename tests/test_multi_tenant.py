@@ -0,0 +1,138 @@
+"""Тесты для модуля пакетного инференса по моделям многих пользователей."""
+
+import numpy as np
+import pytest
+
+from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.models.multi_tenant import MultiTenantScorer
+from categoraize.models.projection import EmbeddingProjection
+
+
+@pytest.fixture(scope="module")
+def user_models():
+    """Обучение моделей трех пользователей с разными наборами категорий."""
+    products = [
+        "iPhone 15 Pro Max",
+        "Samsung Galaxy S24",
+        "Laptop Dell XPS 13",
+        "MacBook Pro M3",
+        "iPad Air",
+        "Surface Pro",
+    ]
+    multiclass = ProductCategoryClassifier(classifier_type="lr").fit(
+        products,
+        ["Electronics", "Electronics", "Computers", "Computers", "Tablets", "Computers"],
+    )
+    binary = ProductCategoryClassifier(classifier_type="lr").fit(
+        products, ["Телефоны", "Телефоны", "Другое", "Другое", "Другое", "Другое"]
+    )
+    mlp = ProductCategoryClassifier(
+        classifier_type="mlp", classifier_params={"early_stopping": False, "max_iter": 50}
+    ).fit(products, ["A", "B", "A", "B", "A", "B"])
+    projected = ProductCategoryClassifier(
+        classifier_type="lr", projection=EmbeddingProjection(method="random", dim=16)
+    ).fit(products, ["Apple", "Samsung", "Dell", "Apple", "Apple", "Microsoft"])
+    return products, {"alice": multiclass, "bob": binary, "carol": mlp, "dave": projected}
+
+
+class TestMultiTenantScorer:
+    """Тесты для класса MultiTenantScorer."""
+
+    def test_matches_per_user_predictions(self, user_models):
+        """Тест, что пакетный инференс совпадает с предсказаниями каждой модели."""
+        products, models = user_models
+        scorer = MultiTenantScorer(models)
+        user_ids = ["alice", "bob", "carol", "dave", "alice", "dave"]
+
+        labels, confidences = scorer.predict_with_confidence(user_ids, products)
+
+        for row, (user_id, title) in enumerate(zip(user_ids, products, strict=True)):
+            expected_labels, expected_confidences = models[user_id].predict_with_confidence([title])
+            assert labels[row] == expected_labels[0]
+            assert confidences[row] == pytest.approx(expected_confidences[0], abs=1e-5)
+
+    def test_removed_category(self, user_models):
+        """Тест, что удаленная категория не предсказывается в пакетном инференсе."""
+        products, models = user_models
+        model = ProductCategoryClassifier(classifier_type="lr").fit(
+            products,
+            ["Electronics", "Electronics", "Computers", "Computers", "Tablets", "Computers"],
+        )
+        model.remove_category("Computers")
+        scorer = MultiTenantScorer({"erin": model})
+
+        labels, confidences = scorer.predict_with_confidence(["erin"] * len(products), products)
+
+        expected_labels, expected_confidences = model.predict_with_confidence(products)
+        assert "Computers" not in labels
+        assert labels == expected_labels
+        assert np.allclose(confidences, expected_confidences, atol=1e-5)
+
+    def test_stack_only_linear_heads(self, user_models):
+        """Тест, что тензор весов содержит только пользователей с линейной регрессией."""
+        _, models = user_models
+        scorer = MultiTenantScorer(models)
+
+        assert scorer._weights.shape[0] == 3
+        assert scorer._stack_index[scorer.user_ids.index("carol")] == -1
+
+    def test_model_changes_rebuild_stack(self, user_models):
+        """Тест, что изменения модели после создания скорера попадают в предсказания."""
+        products, models = user_models
+        model = ProductCategoryClassifier(classifier_type="lr").fit(
+            products,
+            ["Electronics", "Electronics", "Computers", "Computers", "Tablets", "Computers"],
+        )
+        scorer = MultiTenantScorer({"erin": model, "carol": models["carol"]})
+        scorer.predict_with_confidence(["erin"], products[:1])
+
+        model.remove_category("Computers")
+        model.add_category("Phones", ["iPhone 15", "Samsung Galaxy"])
+        labels, confidences = scorer.predict_with_confidence(["erin"] * len(products), products)
+
+        expected_labels, expected_confidences = model.predict_with_confidence(products)
+        assert "Computers" not in labels
+        assert labels == expected_labels
+        assert np.allclose(confidences, expected_confidences, atol=1e-5)
+
+    def test_empty_batch(self, user_models):
+        """Тест пустого батча."""
+        _, models = user_models
+        labels, confidences = MultiTenantScorer(models).predict_with_confidence([], [])
+
+        assert labels == []
+        assert len(confidences) == 0
+
+    def test_unknown_user(self, user_models):
+        """Тест ошибки для пользователя без модели."""
+        products, models = user_models
+
+        with pytest.raises(ValueError, match="Нет моделей"):
+            MultiTenantScorer(models).predict_with_confidence(["erin"], products[:1])
+
+    def test_length_mismatch(self, user_models):
+        """Тест ошибки при разной длине списков."""
+        products, models = user_models
+
+        with pytest.raises(ValueError, match="не совпадают"):
+            MultiTenantScorer(models).predict_with_confidence(["alice"], products[:2])
+
+    def test_not_fitted_model(self):
+        """Тест ошибки для необученной модели."""
+        with pytest.raises(ValueError, match="не обучена"):
+            MultiTenantScorer({"alice": ProductCategoryClassifier(classifier_type="lr")})
+
+    def test_gather_path_matches_padded_path(self, user_models, monkeypatch):
+        """Тест, что поблочное умножение по строкам совпадает с дополненными группами."""
+        products, models = user_models
+        scorer = MultiTenantScorer(models)
+        user_ids = ["alice", "bob", "dave"] * 2
+        embeddings = models["alice"].encode_products(products)
+
+        expected = scorer.predict_embeddings(user_ids, embeddings)
+        monkeypatch.setattr("categoraize.models.multi_tenant._MAX_PADDING", 0.0)
+        monkeypatch.setattr("categoraize.models.multi_tenant._GATHER_BYTES", 1)
+        labels, confidences = scorer.predict_embeddings(user_ids, embeddings)
+
+        assert labels == expected[0]
+        assert np.allclose(confidences, expected[1])
@@ -0,0 +1,105 @@
+"""Тесты для модуля инференса классификатора на NumPy."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.neural_network import MLPClassifier
+
+from categoraize.models.numpy_head import NumpyHead
+
+
+@pytest.fixture
+def sample_embeddings():
+    """Создание тестовых эмбеддингов и меток."""
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(80, 16)).astype(np.float32)
+    y = rng.integers(0, 4, size=80)
+    return X, y
+
+
+def make_labels(classifier):
+    """Названия категорий для классов классификатора."""
+    return [f"category_{c}" for c in classifier.classes_]
+
+
+class TestNumpyHead:
+    """Тесты для класса NumpyHead."""
+
+    @pytest.mark.parametrize(
+        ("classifier", "n_classes"),
+        [
+            (LogisticRegression(max_iter=300), 4),
+            (LogisticRegression(max_iter=300), 2),
+            (SGDClassifier(loss="log_loss", alpha=0.01, random_state=0), 4),
+            (SGDClassifier(loss="log_loss", alpha=0.01, random_state=0), 2),
+            (MLPClassifier(hidden_layer_sizes=(8, 4), max_iter=300, random_state=0), 4),
+            (MLPClassifier(hidden_layer_sizes=(8,), max_iter=300, random_state=0), 2),
+            (
+                MLPClassifier(
+                    hidden_layer_sizes=(8,), activation="tanh", max_iter=300, random_state=0
+                ),
+                4,
+            ),
+            (
+                MLPClassifier(
+                    hidden_layer_sizes=(8,), activation="logistic", max_iter=300, random_state=0
+                ),
+                4,
+            ),
+        ],
+    )
+    def test_matches_sklearn(self, sample_embeddings, classifier, n_classes):
+        """Тест, что вероятности совпадают с sklearn."""
+        X, y = sample_embeddings
+        classifier.fit(X, y % n_classes)
+        head = NumpyHead.from_estimator(classifier, make_labels(classifier))
+
+        assert np.allclose(head.predict_proba(X), classifier.predict_proba(X), atol=1e-5)
+        assert np.allclose(head.predict_proba(X[:1]), classifier.predict_proba(X[:1]), atol=1e-5)
+        expected = np.array(make_labels(classifier), dtype=object)[classifier.predict(X)]
+        assert head.predict(X).tolist() == expected.tolist()
+
+    def test_batches_larger_than_buffers(self, sample_embeddings):
+        """Тест батча больше заранее выделенных буферов."""
+        X, y = sample_embeddings
+        classifier = LogisticRegression(max_iter=300).fit(X, y)
+        head = NumpyHead.from_estimator(classifier, make_labels(classifier), buffer_rows=4)
+
+        assert np.allclose(head.predict_proba(X), classifier.predict_proba(X), atol=1e-5)
+
+    def test_results_are_not_overwritten(self, sample_embeddings):
+        """Тест, что следующий вызов не перезаписывает предыдущий результат."""
+        X, y = sample_embeddings
+        classifier = LogisticRegression(max_iter=300).fit(X, y)
+        head = NumpyHead.from_estimator(classifier, make_labels(classifier))
+
+        first = head.predict_proba(X[:2])
+        expected = first.copy()
+        head.predict_proba(X[2:4])
+
+        assert np.array_equal(first, expected)
+
+    def test_thread_safety(self, sample_embeddings):
+        """Тест параллельных вызовов из нескольких потоков."""
+        X, y = sample_embeddings
+        classifier = LogisticRegression(max_iter=300).fit(X, y)
+        head = NumpyHead.from_estimator(classifier, make_labels(classifier))
+        expected = classifier.predict_proba(X)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(lambda row: head.predict_proba(X[row : row + 1]), range(80))
+            )
+
+        assert np.allclose(np.vstack(results), expected, atol=1e-5)
+
+    def test_wrong_shape(self, sample_embeddings):
+        """Тест ошибки при неверной размерности эмбеддингов."""
+        X, y = sample_embeddings
+        classifier = LogisticRegression(max_iter=300).fit(X, y)
+        head = NumpyHead.from_estimator(classifier, make_labels(classifier))
+
+        with pytest.raises(ValueError, match="Ожидались эмбеддинги"):
+            head.predict_proba(X[:, :8])
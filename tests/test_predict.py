@@ -0,0 +1,189 @@
+"""Тесты для скрипта пакетной классификации."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from categoraize import predict
+from categoraize.predict import PROGRESS_SUFFIX, predict_file, read_chunks, read_columns
+
+
+@pytest.fixture
+def input_csv(tmp_path, sample_product_data):
+    """CSV с транзакциями: id, название и сумма."""
+    df = pd.DataFrame(
+        {
+            "id": [f"t{idx}" for idx in range(len(sample_product_data))],
+            "title": sample_product_data["product_title"],
+            "amount": np.arange(len(sample_product_data)) * 10.0,
+        }
+    )
+    path = tmp_path / "transactions.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+class TestReadChunks:
+    """Тесты для функций read_columns и read_chunks."""
+
+    def test_columns_and_chunks(self, input_csv):
+        """Тест чтения только нужных колонок по частям."""
+        chunks = list(read_chunks(input_csv, ["title"], chunk_size=4))
+
+        assert read_columns(input_csv) == ["id", "title", "amount"]
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        assert all(chunk.columns.tolist() == ["title"] for chunk in chunks)
+
+    def test_skip_rows(self, input_csv, sample_product_data):
+        """Тест пропуска уже обработанных строк."""
+        chunks = list(read_chunks(input_csv, ["title"], chunk_size=4, skip_rows=6))
+
+        assert (
+            pd.concat(chunks)["title"].tolist() == sample_product_data["product_title"].tolist()[6:]
+        )
+
+    def test_unsupported_format(self, tmp_path):
+        """Тест ошибки для неподдерживаемого формата."""
+        path = tmp_path / "data.xlsx"
+        path.write_bytes(b"")
+
+        with pytest.raises(ValueError, match="Неподдерживаемый формат"):
+            read_columns(path)
+
+    def test_missing_file(self, tmp_path):
+        """Тест ошибки для отсутствующего файла."""
+        with pytest.raises(FileNotFoundError):
+            read_columns(tmp_path / "missing.csv")
+
+
+class TestPredictFile:
+    """Тесты для функции predict_file."""
+
+    def test_predict_file(self, user_models_dir, input_csv, tmp_path):
+        """Тест классификации файла с сохранением колонок и top-k."""
+        output = tmp_path / "out" / "predictions.csv"
+
+        stats = predict_file(
+            user_models_dir / "alice", input_csv, output, keep_columns=["id"], chunk_size=4
+        )
+        result = pd.read_csv(output)
+
+        assert stats["rows"] == 10
+        assert stats["chunks"] == 3
+        assert stats["resumed_rows"] == 0
+        assert stats["rows_per_second"] > 0
+        assert result.columns.tolist()[:4] == ["title", "id", "category", "confidence"]
+        assert result["id"].tolist() == [f"t{idx}" for idx in range(10)]
+        assert (result["category"] == result["top_1_category"]).all()
+        assert (result["top_1_score"] >= result["top_2_score"]).all()
+        assert (result["top_2_score"] >= result["top_3_score"]).all()
+        assert not (tmp_path / "out" / f"predictions.csv{PROGRESS_SUFFIX}").exists()
+
+    def test_empty_titles(self, user_models_dir, tmp_path):
+        """Тест, что пустые названия не сдвигают строки выхода."""
+        path = tmp_path / "input.csv"
+        pd.DataFrame({"product_title": ["iPhone 15", "   ", "", "MacBook Pro"]}).to_csv(
+            path, index=False
+        )
+        output = tmp_path / "predictions.csv"
+
+        predict_file(user_models_dir / "bob", path, output, top_k=2)
+        result = pd.read_csv(output, keep_default_na=False)
+
+        assert len(result) == 4
+        assert result["category"].tolist()[1:3] == ["", ""]
+        assert result["category"].tolist()[0] != ""
+        assert result["confidence"].tolist()[1] == ""
+        assert "top_3_category" not in result.columns
+
+    def test_resume_after_failure(self, user_models_dir, input_csv, tmp_path, monkeypatch):
+        """Тест продолжения прерванного запуска с первого незаписанного чанка."""
+        expected_path = tmp_path / "expected.csv"
+        predict_file(user_models_dir / "alice", input_csv, expected_path, chunk_size=4)
+
+        score_chunk = predict._score_chunk
+        calls = []
+
+        def failing(titles, top_k):
+            calls.append(len(titles))
+            if len(calls) == 2:
+                raise RuntimeError("Сбой воркера")
+            return score_chunk(titles, top_k)
+
+        monkeypatch.setattr(predict, "_score_chunk", failing)
+        output = tmp_path / "predictions.csv"
+        with pytest.raises(RuntimeError, match="Сбой"):
+            predict_file(user_models_dir / "alice", input_csv, output, chunk_size=4)
+        monkeypatch.setattr(predict, "_score_chunk", score_chunk)
+
+        progress_path = tmp_path / f"predictions.csv{PROGRESS_SUFFIX}"
+        progress = json.loads(progress_path.read_text())
+        assert progress["rows_read"] == 4
+        # Частично записанные данные отбрасываются при продолжении
+        with output.open("a") as f:
+            f.write("oborvannaya stroka")
+
+        stats = predict_file(user_models_dir / "alice", input_csv, output, chunk_size=4)
+
+        assert stats["resumed_rows"] == 4
+        assert stats["rows"] == 10
+        assert output.read_text() == expected_path.read_text()
+        assert not progress_path.exists()
+
+    def test_existing_output(self, user_models_dir, input_csv, tmp_path):
+        """Тест защиты существующего результата и перезаписи."""
+        output = tmp_path / "predictions.csv"
+        output.write_text("old")
+
+        with pytest.raises(ValueError, match="уже существует"):
+            predict_file(user_models_dir / "alice", input_csv, output)
+
+        predict_file(user_models_dir / "alice", input_csv, output, overwrite=True)
+        assert len(pd.read_csv(output)) == 10
+
+    def test_progress_of_other_input(self, user_models_dir, input_csv, tmp_path):
+        """Тест ошибки при продолжении с прогрессом другого входного файла."""
+        output = tmp_path / "predictions.csv"
+        (tmp_path / f"predictions.csv{PROGRESS_SUFFIX}").write_text(
+            json.dumps({"input": "/other.csv", "rows_read": 0, "offset": 0, "chunks": 0})
+        )
+
+        with pytest.raises(ValueError, match="другому входному файлу"):
+            predict_file(user_models_dir / "alice", input_csv, output)
+
+    def test_invalid_columns(self, user_models_dir, input_csv, tmp_path):
+        """Тест ошибок для отсутствующих колонок."""
+        output = tmp_path / "predictions.csv"
+
+        with pytest.raises(ValueError, match="не найдена"):
+            predict_file(user_models_dir / "alice", input_csv, output, title_column="name")
+        with pytest.raises(ValueError, match="не найдены"):
+            predict_file(user_models_dir / "alice", input_csv, output, keep_columns=["user"])
+
+    def test_parquet_input(self, user_models_dir, input_csv, tmp_path):
+        """Тест, что Parquet дает тот же результат, что и CSV."""
+        pytest.importorskip("pyarrow")
+        parquet_path = tmp_path / "transactions.parquet"
+        pd.read_csv(input_csv).to_parquet(parquet_path, row_group_size=3)
+        expected = tmp_path / "expected.csv"
+        output = tmp_path / "predictions.csv"
+
+        predict_file(user_models_dir / "bob", input_csv, expected, keep_columns=["id"])
+        predict_file(
+            user_models_dir / "bob", parquet_path, output, keep_columns=["id"], chunk_size=4
+        )
+
+        pd.testing.assert_frame_equal(pd.read_csv(output), pd.read_csv(expected), atol=1e-5)
+
+    def test_process_pool(self, user_models_dir, input_csv, tmp_path):
+        """Тест, что пул процессов дает тот же результат в том же порядке."""
+        expected = tmp_path / "expected.csv"
+        output = tmp_path / "predictions.csv"
+
+        predict_file(user_models_dir / "bob", input_csv, expected, chunk_size=3)
+        stats = predict_file(user_models_dir / "bob", input_csv, output, chunk_size=3, workers=2)
+
+        assert stats["chunks"] == 4
+        pd.testing.assert_frame_equal(pd.read_csv(output), pd.read_csv(expected), atol=1e-5)
@@ -140,3 +140,54 @@ class TestPredictions:
         # Предсказания должны совпадать
         predicted_from_proba = trained_model.predict(test_products)
         assert predictions == predicted_from_proba
+
+    def test_infer_consistency_with_predict_proba(self, trained_model):
+        """Тест, что infer согласован с predict и predict_proba."""
+        test_products = ["Test Product 1", "New Laptop", "New iPhone"]
+
+        result = trained_model.infer(test_products, top_k=2)
+        probabilities = trained_model.predict_proba(test_products)
+
+        assert result.labels == trained_model.predict(test_products)
+        assert np.allclose(result.probabilities, probabilities, atol=1e-6)
+        assert np.allclose(result.confidences, probabilities.max(axis=1), atol=1e-6)
+        assert [labels[0] for labels in result.top_k_labels] == result.labels
+
+    def test_infer_top_k_sorted(self, trained_model):
+        """Тест, что top-k отсортирован по убыванию вероятности."""
+        result = trained_model.infer(["New iPhone", "New Laptop"], top_k=2)
+
+        assert result.top_k_scores.shape == (2, 2)
+        assert np.all(np.diff(result.top_k_scores, axis=1) <= 0)
+        assert all(len(set(labels)) == 2 for labels in result.top_k_labels)
+
+    def test_infer_top_k_larger_than_classes(self, trained_model):
+        """Тест, что top_k ограничивается количеством категорий."""
+        n_classes = len(trained_model.id_to_label)
+
+        result = trained_model.infer(["New iPhone"], top_k=n_classes + 5)
+
+        assert result.top_k_scores.shape == (1, n_classes)
+        assert np.isclose(result.top_k_scores.sum(), 1.0)
+
+    def test_infer_encodes_once(self, trained_model, monkeypatch):
+        """Тест, что infer вызывает эмбеддер один раз."""
+        calls = []
+        original = trained_model.encode_products
+
+        def counting_encode(products):
+            calls.append(len(products))
+            return original(products)
+
+        monkeypatch.setattr(trained_model, "encode_products", counting_encode)
+        trained_model.predict_with_confidence(["New iPhone", "New Laptop"])
+
+        assert calls == [2]
+
+    def test_infer_handles_empty_list(self, trained_model):
+        """Тест обработки пустого списка в infer."""
+        result = trained_model.infer([])
+
+        assert result.labels == []
+        assert result.top_k_labels == []
+        assert result.probabilities.shape == (0, len(trained_model.id_to_label))
@@ -0,0 +1,216 @@
+"""Тесты для модуля многопроцессного сервиса (pre-fork)."""
+
+import gc
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from categoraize.serving.model_store import ModelStore
+from categoraize.serving.prefork import (
+    PreforkServer,
+    preload,
+    process_memory,
+    process_stats,
+    worker_threads,
+)
+
+
+def _wait_for(condition, timeout: float = 60.0) -> None:
+    """Ожидание выполнения условия."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Условие не выполнено")
+        time.sleep(0.1)
+
+
+def _children(pid: int) -> list[int]:
+    """Дочерние процессы по /proc."""
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(child) for child in path.read_text().split()] if path.exists() else []
+
+
+def _get(url: str) -> dict:
+    """GET-запрос с разбором JSON."""
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.load(response)
+
+
+def _is_up(url: str) -> bool:
+    """Проверка, что сервис отвечает."""
+    try:
+        return _get(url)["status"] == "ok"
+    except OSError:
+        return False
+
+
+class TestWorkerThreads:
+    """Тесты для функции worker_threads."""
+
+    def test_cores_split_between_workers(self):
+        """Тест деления ядер между воркерами."""
+        assert worker_threads(1, cores=8) == 8
+        assert worker_threads(4, cores=8) == 2
+        assert worker_threads(3, cores=8) == 2
+
+    def test_at_least_one_thread(self):
+        """Тест, что воркер получает хотя бы один поток."""
+        assert worker_threads(4, cores=1) == 1
+        assert worker_threads(2) >= 1
+
+    def test_invalid_workers(self):
+        """Тест ошибки для неположительного числа воркеров."""
+        with pytest.raises(ValueError, match="положительным"):
+            worker_threads(0)
+
+
+@pytest.mark.skipif(not Path("/proc/self/smaps_rollup").exists(), reason="Нужен /proc Linux")
+class TestProcessMemory:
+    """Тесты для функций process_memory и process_stats."""
+
+    def test_current_process(self):
+        """Тест чтения памяти текущего процесса."""
+        memory = process_memory()
+
+        assert memory["rss_bytes"] > 0
+        assert 0 < memory["pss_bytes"] <= memory["rss_bytes"]
+        assert memory["shared_bytes"] + memory["private_bytes"] == memory["rss_bytes"]
+
+    def test_missing_process(self):
+        """Тест пустого результата для несуществующего процесса."""
+        assert process_memory(2**22 + 1) == {}
+
+    def test_process_stats(self):
+        """Тест статистики процесса вне режима pre-fork."""
+        stats = process_stats()
+
+        assert stats["pid"] == os.getpid()
+        assert stats["worker"] is None
+        assert stats["torch_threads"] >= 1
+
+
+class TestPreload:
+    """Тесты для функции preload."""
+
+    def test_preload_loads_embedder(self, user_models_dir):
+        """Тест загрузки эмбеддера и замораживания объектов до fork."""
+        store = ModelStore(user_models_dir)
+        try:
+            loaded = preload(store, ["bob"])
+            frozen = gc.get_freeze_count()
+        finally:
+            gc.unfreeze()
+
+        model = store.get("bob")
+        assert loaded == ["bob"]
+        assert "bob" in store
+        assert model._embedder is not None
+        assert not model._embedder.training
+        assert not any(p.requires_grad for p in model._embedder.parameters())
+        assert frozen > 0
+        store.close()
+
+    def test_default_preloads_first_model(self, user_models_dir):
+        """Тест загрузки первой доступной модели по умолчанию."""
+        store = ModelStore(user_models_dir)
+        try:
+            loaded = preload(store)
+        finally:
+            gc.unfreeze()
+
+        assert loaded == store.available()[:1]
+        store.close()
+
+    def test_unknown_user(self, user_models_dir):
+        """Тест ошибки для пользователя без модели."""
+        store = ModelStore(user_models_dir)
+
+        with pytest.raises(KeyError):
+            preload(store, ["carol"])
+        store.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Нужен fork")
+class TestPreforkServer:
+    """Тесты для класса PreforkServer (запуск categoraize-serve --workers)."""
+
+    def test_crash_loop_stops_server(self):
+        """Тест остановки сервиса, если воркер падает при каждом запуске."""
+
+        def broken_app():
+            raise RuntimeError("Модель не загружается")
+
+        server = PreforkServer(broken_app, port=0, workers=1, max_restarts=2, restart_backoff=0.05)
+        previous = signal.getsignal(signal.SIGTERM)
+        start = time.monotonic()
+
+        with pytest.raises(RuntimeError, match="упал 3 раз"):
+            server.run()
+
+        # Паузы 0.05 и 0.1 с между перезапусками
+        assert time.monotonic() - start >= 0.15
+        assert server._children == {}
+        assert signal.getsignal(signal.SIGTERM) is previous
+
+    def test_workers_serve_and_restart(self, user_models_dir):
+        """Тест обслуживания запросов воркерами и перезапуска упавшего воркера."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        url = f"http://127.0.0.1:{port}"
+
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "categoraize.serve",
+                "--models-dir",
+                str(user_models_dir),
+                "--port",
+                str(port),
+                "--workers",
+                "2",
+                "--preload-users",
+                "bob",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_for(lambda: _is_up(f"{url}/health"))
+            _wait_for(lambda: len(_children(process.pid)) == 2)
+            workers = _children(process.pid)
+
+            request = urllib.request.Request(
+                f"{url}/predict",
+                data=json.dumps({"user_id": "bob", "product_title": "Nokia 3310"}).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(request, timeout=10) as response:
+                assert "category" in json.load(response)
+
+            stats = _get(f"{url}/metrics")["process"]
+            assert stats["pid"] in workers
+            assert stats["worker"] in (0, 1)
+            assert stats["torch_threads"] >= 1
+
+            # Упавший воркер заменяется новым
+            os.kill(workers[0], signal.SIGKILL)
+            _wait_for(
+                lambda: len(_children(process.pid)) == 2
+                and workers[0] not in _children(process.pid)
+            )
+            _wait_for(lambda: _is_up(f"{url}/health"))
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=60)
+
+        assert process.returncode == 0
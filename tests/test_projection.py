@@ -0,0 +1,82 @@
+"""Тесты для модуля понижения размерности эмбеддингов."""
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from categoraize.models.projection import EmbeddingProjection
+
+
+@pytest.fixture
+def sample_embeddings():
+    """Создание тестовых эмбеддингов с разной дисперсией признаков."""
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(100, 16)).astype(np.float32)
+    X[:, :4] *= 10
+    y = (X[:, 0] > 0).astype(int) + (X[:, 1] > 0).astype(int)
+    return X, y
+
+
+class TestEmbeddingProjection:
+    """Тесты для класса EmbeddingProjection."""
+
+    def test_pca(self, sample_embeddings):
+        """Тест, что PCA находит ортонормированные главные компоненты."""
+        X, _ = sample_embeddings
+        projection = EmbeddingProjection(method="pca", dim=4).fit(X)
+
+        projected = projection.transform(X)
+
+        assert projected.shape == (100, 4)
+        assert projected.dtype == np.float32
+        assert np.allclose(projection.components @ projection.components.T, np.eye(4), atol=1e-5)
+        assert projection.explained_variance_ratio > 0.9
+
+    def test_random_projection_is_seeded(self, sample_embeddings):
+        """Тест, что случайная проекция воспроизводима."""
+        X, _ = sample_embeddings
+        first = EmbeddingProjection(method="random", dim=8, random_state=1).fit(X)
+        second = EmbeddingProjection(method="random", dim=8, random_state=1).fit(X)
+
+        assert np.array_equal(first.transform(X), second.transform(X))
+
+    def test_fold_into_linear(self, sample_embeddings):
+        """Тест, что перенос проекции в веса регрессии не меняет логиты."""
+        X, y = sample_embeddings
+        projection = EmbeddingProjection(method="pca", dim=4).fit(X)
+        classifier = LogisticRegression(max_iter=300).fit(projection.transform(X), y)
+
+        coef, intercept = projection.fold_into_linear(classifier.coef_, classifier.intercept_)
+
+        assert np.allclose(
+            X @ coef.T + intercept, classifier.decision_function(projection.transform(X)), atol=1e-3
+        )
+
+    def test_save_and_load(self, sample_embeddings, tmp_path):
+        """Тест сохранения и загрузки проекции."""
+        X, _ = sample_embeddings
+        projection = EmbeddingProjection(method="pca", dim=4).fit(X)
+
+        projection.save(tmp_path)
+        loaded = EmbeddingProjection.load(tmp_path, projection.get_params())
+
+        assert np.array_equal(loaded.transform(X), projection.transform(X))
+
+    def test_dim_larger_than_embeddings(self, sample_embeddings):
+        """Тест ошибки при размерности больше исходной."""
+        X, _ = sample_embeddings
+
+        with pytest.raises(ValueError, match="больше размерности эмбеддингов"):
+            EmbeddingProjection(method="pca", dim=32).fit(X)
+
+    def test_not_fitted(self, sample_embeddings):
+        """Тест ошибки при применении необученной проекции."""
+        X, _ = sample_embeddings
+
+        with pytest.raises(ValueError, match="Проекция не обучена"):
+            EmbeddingProjection().transform(X)
+
+    def test_invalid_method(self):
+        """Тест ошибки при неизвестном методе."""
+        with pytest.raises(ValueError, match="Неизвестный метод проекции"):
+            EmbeddingProjection(method="umap")
@@ -0,0 +1,66 @@
+"""Тесты для модуля хранения с пониженной точностью."""
+
+import numpy as np
+import pytest
+
+from categoraize.models.quantization import (
+    bytes_per_vector,
+    dequantize,
+    quantize,
+    round_trip,
+)
+
+
+@pytest.fixture
+def sample_matrix():
+    """Создание тестовой матрицы с разным масштабом строк."""
+    rng = np.random.default_rng(42)
+    matrix = rng.normal(size=(4, 32)).astype(np.float32)
+    matrix[1] *= 100
+    matrix[3] = 0
+    return matrix
+
+
+class TestQuantization:
+    """Тесты для функций квантизации."""
+
+    def test_float32_is_lossless(self, sample_matrix):
+        """Тест, что режим float32 не меняет данные."""
+        data, scales = quantize(sample_matrix, "float32")
+
+        assert scales is None
+        assert np.array_equal(dequantize(data), sample_matrix)
+
+    def test_float16(self, sample_matrix):
+        """Тест хранения во float16."""
+        data, scales = quantize(sample_matrix, "float16")
+
+        assert data.dtype == np.float16
+        assert scales is None
+        assert np.allclose(dequantize(data), sample_matrix, rtol=1e-3)
+
+    def test_int8_per_row_scale(self, sample_matrix):
+        """Тест, что масштаб int8 подбирается для каждой строки отдельно."""
+        data, scales = quantize(sample_matrix, "int8")
+
+        assert data.dtype == np.int8
+        assert scales.shape == (4,)
+        assert np.abs(data).max(axis=1)[:3].tolist() == [127, 127, 127]
+        restored = dequantize(data, scales)
+        # Ошибка не превышает половины шага квантования своей строки
+        assert np.all(np.abs(restored - sample_matrix) <= scales[:, None] / 2 + 1e-6)
+
+    def test_int8_zero_row(self, sample_matrix):
+        """Тест квантизации нулевой строки."""
+        assert np.array_equal(round_trip(sample_matrix, "int8")[3], np.zeros(32))
+
+    def test_bytes_per_vector(self):
+        """Тест объема памяти на вектор."""
+        assert bytes_per_vector(384, "float32") == 1536
+        assert bytes_per_vector(384, "float16") == 768
+        assert bytes_per_vector(384, "int8") == 388
+
+    def test_invalid_precision(self, sample_matrix):
+        """Тест ошибки при неизвестном режиме точности."""
+        with pytest.raises(ValueError, match="Неизвестный режим точности"):
+            quantize(sample_matrix, "bfloat16")
@@ -0,0 +1,247 @@
+"""Тесты для модуля фонового дообучения по обратной связи."""
+
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from categoraize.models.classifier import ProductCategoryClassifier
+from categoraize.serving import retrain
+from categoraize.serving.model_store import ModelNotFoundError
+from categoraize.serving.retrain import FEEDBACK_FILE, REJECTED_FEEDBACK_FILE, RetrainScheduler
+
+
+def _wait_for(condition, timeout: float = 30.0) -> None:
+    """Ожидание выполнения условия."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Условие не выполнено")
+        time.sleep(0.02)
+
+
+def _metadata(path):
+    """Чтение metadata.json модели."""
+    with (path / "metadata.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def models_dir(user_models_dir, tmp_path):
+    """Копия директории моделей пользователей, которую можно изменять."""
+    return shutil.copytree(user_models_dir, tmp_path / "models")
+
+
+class TestRetrainScheduler:
+    """Тесты для класса RetrainScheduler."""
+
+    def test_trigger_publishes_new_version(self, models_dir):
+        """Тест дообучения по запросу и публикации новой версии модели."""
+        published = []
+        scheduler = RetrainScheduler(
+            models_dir, min_events=100, poll_interval=0.02, on_published=published.append
+        )
+
+        scheduler.record("bob", "Nokia 3310", "Phones")
+        assert scheduler.record("bob", "Motorola Razr", "Phones") == 2
+        assert scheduler.record("bob", "Galaxy Tab S9", "Tablets") == 3
+        result = scheduler.trigger("bob").result(timeout=30)
+        stats = scheduler.stats()
+        scheduler.close()
+
+        assert result["events"] == 3
+        assert published == ["bob"]
+        assert _metadata(models_dir / "bob")["feedback_applied"] == 3
+        model = ProductCategoryClassifier.from_pretrained(models_dir / "bob")
+        assert "Phones" in model.label_to_id
+        assert stats["pending_events"] == 0
+        assert stats["retrains"] == 1
+        assert stats["retrain_latency"]["count"] == 1
+        # Журнал обратной связи сохраняется целиком
+        assert len((models_dir / "bob" / FEEDBACK_FILE).read_text().splitlines()) == 3
+
+    def test_trigger_without_events(self, models_dir):
+        """Тест запроса дообучения без новых событий."""
+        scheduler = RetrainScheduler(models_dir)
+
+        assert scheduler.trigger("bob") is None
+        scheduler.close()
+
+    def test_debounced_burst_gives_one_retrain(self, models_dir):
+        """Тест, что серия событий дает одно дообучение после паузы."""
+        scheduler = RetrainScheduler(
+            models_dir, min_events=3, debounce_seconds=0.3, poll_interval=0.02
+        )
+
+        for idx in range(6):
+            scheduler.record("bob", f"Nokia {idx}", "Phones")
+        assert scheduler.stats()["retrains"] == 0
+        _wait_for(lambda: scheduler.stats()["retrains"] == 1)
+        time.sleep(0.1)
+        stats = scheduler.stats()
+        scheduler.close()
+
+        assert stats["retrains"] == 1
+        assert stats["pending_events"] == 0
+        assert _metadata(models_dir / "bob")["feedback_applied"] == 6
+
+    def test_max_delay(self, models_dir):
+        """Тест дообучения по возрасту события без накопления min_events."""
+        scheduler = RetrainScheduler(
+            models_dir, min_events=100, max_delay_seconds=0.1, poll_interval=0.02
+        )
+
+        scheduler.record("bob", "Nokia 3310", "Phones")
+        _wait_for(lambda: scheduler.stats()["retrains"] == 1)
+        scheduler.close()
+
+        assert _metadata(models_dir / "bob")["feedback_applied"] == 1
+
+    def test_pending_events_restored_after_restart(self, models_dir):
+        """Тест восстановления непримененных событий из журнала."""
+        scheduler = RetrainScheduler(models_dir, min_events=100)
+        scheduler.record("bob", "Nokia 3310", "Phones")
+        scheduler.record("bob", "Motorola Razr", "Phones")
+        scheduler.close()
+
+        restarted = RetrainScheduler(models_dir, min_events=100)
+        stats = restarted.stats()
+        restarted.trigger("bob").result(timeout=30)
+        restarted.close()
+
+        assert stats["pending_events"] == 2
+        assert stats["max_staleness_seconds"] > 0
+        assert RetrainScheduler(models_dir).stats()["pending_events"] == 0
+
+    def test_truncated_log_line_is_discarded(self, models_dir):
+        """Тест запуска после сбоя посреди записи события в журнал."""
+        scheduler = RetrainScheduler(models_dir, min_events=100)
+        scheduler.record("bob", "Nokia 3310", "Phones")
+        scheduler.close()
+        log_path = models_dir / "bob" / FEEDBACK_FILE
+        with log_path.open("ab") as f:
+            f.write(b'{"product_title": "Moto')
+
+        restarted = RetrainScheduler(models_dir, min_events=100)
+        restarted.record("bob", "Motorola Razr", "Phones")
+        stats = restarted.stats()
+        restarted.close()
+
+        assert stats["pending_events"] == 2
+        lines = log_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["product_title"] for line in lines] == [
+            "Nokia 3310",
+            "Motorola Razr",
+        ]
+
+    def test_corrupted_log_line_in_the_middle(self, models_dir):
+        """Тест ошибки для поврежденной строки в середине журнала."""
+        log_path = models_dir / "bob" / FEEDBACK_FILE
+        log_path.write_text('{"product_title": "Nokia\n{"product_title": "x"}\n')
+
+        with pytest.raises(ValueError, match="Поврежден журнал"):
+            RetrainScheduler(models_dir)
+
+    def test_one_training_per_user(self, models_dir):
+        """Тест, что повторный запрос во время обучения не запускает второе обучение."""
+        scheduler = RetrainScheduler(models_dir, min_events=100, poll_interval=0.02)
+        scheduler.record("bob", "Nokia 3310", "Phones")
+
+        first = scheduler.trigger("bob")
+        second = scheduler.trigger("bob")
+        first.result(timeout=30)
+        scheduler.close()
+
+        # Пока обучение не завершено, возвращается то же задание
+        assert second is first or second is None
+        assert scheduler.stats()["retrains"] == 1
+
+    def test_known_category_lr(self, models_dir):
+        """Тест дообучения логистической регрессии на исправлении известной категории."""
+        scheduler = RetrainScheduler(models_dir, min_events=100)
+        scheduler.record("alice", "Nokia 3310", "Electronics")
+
+        result = scheduler.trigger("alice").result(timeout=30)
+        scheduler.close()
+
+        assert result["events"] == 1
+        assert result["rejected"] == 0
+        assert _metadata(models_dir / "alice")["feedback_applied"] == 1
+
+    def test_rejected_events_are_quarantined(self, models_dir, monkeypatch):
+        """Тест, что неприменимое событие уходит в карантин и не блокирует остальные."""
+        apply_feedback = ProductCategoryClassifier.apply_feedback
+
+        def reject_bad(model, product_titles, categories):
+            if "bad" in product_titles:
+                raise ValueError("Неприменимое исправление")
+            return apply_feedback(model, product_titles, categories)
+
+        monkeypatch.setattr(ProductCategoryClassifier, "apply_feedback", reject_bad)
+        scheduler = RetrainScheduler(models_dir, min_events=100)
+        scheduler.record("bob", "bad", "Phones")
+        scheduler.record("bob", "Nokia 3310", "Phones")
+
+        result = scheduler.trigger("bob").result(timeout=30)
+        stats = scheduler.stats()
+        scheduler.close()
+
+        assert result["events"] == 2
+        assert result["rejected"] == 1
+        assert stats["rejected"] == 1
+        assert stats["users"]["bob"]["rejected"] == 1
+        assert stats["pending_events"] == 0
+        assert _metadata(models_dir / "bob")["feedback_applied"] == 2
+        assert "Phones" in ProductCategoryClassifier.from_pretrained(models_dir / "bob").label_to_id
+        (line,) = (models_dir / "bob" / REJECTED_FEEDBACK_FILE).read_text().splitlines()
+        assert json.loads(line)["product_title"] == "bad"
+        assert json.loads(line)["error"] == "Неприменимое исправление"
+
+    def test_failure_keeps_events(self, models_dir, monkeypatch):
+        """Тест, что неудачная публикация оставляет события в очереди."""
+
+        def fail(*_args, **_kwargs):
+            raise OSError("Нет места на диске")
+
+        monkeypatch.setattr(ProductCategoryClassifier, "persist_head", fail)
+        scheduler = RetrainScheduler(models_dir, min_events=100, retry_delay_seconds=60)
+        scheduler.record("alice", "Nokia 3310", "Electronics")
+
+        with pytest.raises(OSError, match="Нет места"):
+            scheduler.trigger("alice").result(timeout=30)
+        stats = scheduler.stats()
+        scheduler.close()
+
+        assert stats["failures"] == 1
+        assert stats["pending_events"] == 1
+        assert "feedback_applied" not in _metadata(models_dir / "alice")
+
+    def test_fsync_outside_scheduler_lock(self, models_dir, monkeypatch):
+        """Тест, что fsync журнала не выполняется под общей блокировкой планировщика."""
+        scheduler = RetrainScheduler(models_dir, min_events=100)
+        locked = []
+        original = os.fsync
+
+        def fsync(fd):
+            locked.append(scheduler._lock.locked())
+            original(fd)
+
+        monkeypatch.setattr(retrain.os, "fsync", fsync)
+        scheduler.record("alice", "Nokia 3310", "Electronics")
+        scheduler.record("alice", "iPhone 15", "Electronics")
+        stats = scheduler.stats()
+        scheduler.close()
+
+        assert locked == [False, False]
+        assert stats["pending_events"] == 2
+
+    def test_unknown_user(self, models_dir):
+        """Тест ошибки для пользователя без модели."""
+        scheduler = RetrainScheduler(models_dir)
+
+        with pytest.raises(ModelNotFoundError, match="не найдена"):
+            scheduler.record("carol", "Nokia 3310", "Phones")
+        assert not (models_dir / "carol").exists()
+        scheduler.close()
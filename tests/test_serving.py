@@ -0,0 +1,241 @@
+"""Тесты для сервиса предсказаний."""
+
+import asyncio
+import json
+import shutil
+from typing import Any
+
+import pytest
+
+from categoraize.serving.app import create_app
+from categoraize.serving.batcher import DynamicBatcher
+from categoraize.serving.model_store import ModelStore
+from categoraize.serving.retrain import RetrainScheduler
+
+
+async def _call(app, method: str, path: str, payload: Any = None) -> tuple[int, dict, Any]:
+    """
+    Вызов ASGI-приложения без сетевого сервера.
+
+    Returns:
+        Tuple (статус, заголовки, тело ответа из JSON)
+    """
+    body = json.dumps(payload).encode() if payload is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive() -> dict:
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    sent: list[dict] = []
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start = next(message for message in sent if message["type"] == "http.response.start")
+    headers = {key.decode(): value.decode() for key, value in start["headers"]}
+    content = b"".join(message.get("body", b"") for message in sent[1:])
+    return start["status"], headers, json.loads(content)
+
+
+class TestDynamicBatcher:
+    """Тесты для класса DynamicBatcher."""
+
+    def test_batches_requests_of_different_users(self, user_models_dir, sample_product_data):
+        """Тест, что запросы разных пользователей объединяются и совпадают с моделями."""
+        titles = sample_product_data["product_title"].tolist()
+        store = ModelStore(user_models_dir)
+        expected = {
+            user_id: store.get(user_id).predict_with_confidence(titles)
+            for user_id in ("alice", "bob")
+        }
+
+        with DynamicBatcher(store, max_batch_size=64, max_wait_ms=50) as batcher:
+            futures = {
+                (user_id, title): batcher.submit(user_id, [title])
+                for title in titles
+                for user_id in ("alice", "bob")
+            }
+            results = {key: future.result(timeout=30)[0] for key, future in futures.items()}
+            stats = batcher.stats()
+
+        for user_id, (labels, confidences) in expected.items():
+            for title, label, confidence in zip(titles, labels, confidences, strict=True):
+                assert results[(user_id, title)][0] == label
+                assert results[(user_id, title)][1] == pytest.approx(confidence, abs=1e-5)
+        assert stats["titles"] == 2 * len(titles)
+        assert stats["batches"] < len(futures)
+        assert stats["pending_titles"] == 0
+        store.close()
+
+    def test_error_only_affects_its_request(self, user_models_dir):
+        """Тест, что ошибка загрузки модели не затрагивает другие запросы батча."""
+        store = ModelStore(user_models_dir)
+
+        with DynamicBatcher(store, max_wait_ms=50) as batcher:
+            missing = batcher.submit("carol", ["iPad Air"])
+            found = batcher.submit("alice", ["iPad Air"])
+
+            assert len(found.result(timeout=30)) == 1
+            with pytest.raises(KeyError):
+                missing.result(timeout=30)
+            assert batcher.stats()["errors"] == 1
+        store.close()
+
+    def test_backpressure(self, user_models_dir):
+        """Тест отклонения запросов сверх max_pending."""
+        store = ModelStore(user_models_dir)
+
+        with DynamicBatcher(store, max_pending=2) as batcher:
+            with pytest.raises(asyncio.QueueFull):
+                batcher.submit("alice", ["a", "b", "c"])
+            assert batcher.stats()["rejected"] == 1
+        store.close()
+
+
+class TestServingApp:
+    """Тесты HTTP API сервиса предсказаний."""
+
+    @pytest.fixture
+    def app(self, user_models_dir):
+        """Приложение с моделями пользователей."""
+        app = create_app(ModelStore(user_models_dir), max_wait_ms=5)
+        yield app
+        app.state.batcher.close()
+        app.state.store.close()
+
+    def test_predict(self, app, user_models_dir):
+        """Тест предсказания для одного продукта."""
+        expected = ModelStore(user_models_dir).get("alice").predict(["MacBook Pro M3"])[0]
+
+        status, headers, body = asyncio.run(
+            _call(app, "POST", "/predict", {"user_id": "alice", "product_title": "MacBook Pro M3"})
+        )
+
+        assert status == 200
+        assert body["category"] == expected
+        assert 0 < body["confidence"] <= 1
+        assert headers["server-timing"].startswith("app;dur=")
+
+    def test_predict_batch_concurrent(self, app, sample_product_data):
+        """Тест батчевых и одновременных запросов разных пользователей."""
+        titles = sample_product_data["product_title"].tolist()
+
+        async def scenario():
+            return await asyncio.gather(
+                _call(
+                    app, "POST", "/predict/batch", {"user_id": "alice", "product_titles": titles}
+                ),
+                _call(app, "POST", "/predict/batch", {"user_id": "bob", "product_titles": titles}),
+                *(
+                    _call(app, "POST", "/predict", {"user_id": "bob", "product_title": title})
+                    for title in titles
+                ),
+            )
+
+        alice, bob, *singles = asyncio.run(scenario())
+
+        assert alice[0] == bob[0] == 200
+        assert len(alice[2]["predictions"]) == len(titles)
+        assert [single[2]["category"] for single in singles] == [
+            prediction["category"] for prediction in bob[2]["predictions"]
+        ]
+
+    def test_errors(self, app):
+        """Тест HTTP-статусов для неизвестного пользователя и некорректного запроса."""
+
+        async def scenario():
+            return await asyncio.gather(
+                _call(app, "POST", "/predict", {"user_id": "carol", "product_title": "iPad"}),
+                _call(app, "POST", "/predict", {"user_id": "../alice", "product_title": "iPad"}),
+                _call(app, "POST", "/predict/batch", {"user_id": "alice", "product_titles": []}),
+            )
+
+        unknown, invalid, empty = asyncio.run(scenario())
+
+        assert unknown[0] == 404
+        assert invalid[0] == 400
+        assert empty[0] == 422
+
+    def test_server_error(self, user_models_dir, tmp_path):
+        """Тест, что ошибка сервиса возвращает 500 без текста исключения."""
+        models_dir = shutil.copytree(user_models_dir, tmp_path / "models")
+        (models_dir / "alice" / "metadata.json").write_text("{", encoding="utf-8")
+        app = create_app(ModelStore(models_dir), max_wait_ms=5)
+
+        status, _, body = asyncio.run(
+            _call(app, "POST", "/predict", {"user_id": "alice", "product_title": "iPad"})
+        )
+
+        assert status == 500
+        assert body["detail"] == "Внутренняя ошибка сервиса"
+        app.state.batcher.close()
+        app.state.store.close()
+
+    def test_metrics(self, app):
+        """Тест гистограмм задержек и статистики в /metrics."""
+
+        async def scenario():
+            await _call(app, "POST", "/predict", {"user_id": "alice", "product_title": "iPad"})
+            return await _call(app, "GET", "/metrics")
+
+        status, _, body = asyncio.run(scenario())
+
+        assert status == 200
+        assert body["latency"]["POST /predict"]["count"] == 1
+        assert body["latency"]["inference"]["count"] >= 1
+        assert body["batcher"]["titles"] == 1
+        assert body["models"]["models"] == 1
+        assert body["embedders"]["embedders"] >= 1
+
+    def test_feedback_and_train(self, user_models_dir, tmp_path):
+        """Тест приема обратной связи и дообучения с перезагрузкой модели в сервисе."""
+        models_dir = shutil.copytree(user_models_dir, tmp_path / "models")
+        store = ModelStore(models_dir)
+        scheduler = RetrainScheduler(models_dir, min_events=100, on_published=store.refresh)
+        app = create_app(store, max_wait_ms=5, scheduler=scheduler)
+
+        async def scenario():
+            await _call(app, "POST", "/predict", {"user_id": "bob", "product_title": "Nokia 3310"})
+            feedback = await _call(
+                app,
+                "POST",
+                "/feedback",
+                {"user_id": "bob", "product_title": "Nokia 3310", "category": "Phones"},
+            )
+            unknown = await _call(
+                app,
+                "POST",
+                "/feedback",
+                {"user_id": "carol", "product_title": "Nokia 3310", "category": "Phones"},
+            )
+            train = await _call(app, "POST", "/train", {"user_id": "bob"})
+            return feedback, unknown, train
+
+        feedback, unknown, train = asyncio.run(scenario())
+        scheduler.close()
+
+        assert feedback[0] == 200
+        assert feedback[2] == {"status": "accepted", "pending": 1}
+        assert unknown[0] == 404
+        assert train[2]["status"] == "scheduled"
+        # Загруженная модель заменена опубликованной версией
+        assert "bob" in store
+        assert "Phones" in store.get("bob").label_to_id
+        assert scheduler.stats()["retrains"] == 1
+        app.state.batcher.close()
+        store.close()
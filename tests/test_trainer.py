@@ -6,6 +6,7 @@ from pathlib import Path
 import pandas as pd
 import pytest
 
+from categoraize.models.classifier import ProductCategoryClassifier
 from categoraize.training.trainer import Trainer
 
 
@@ -107,6 +108,17 @@ class TestTrainer:
         assert len(df_processed) <= len(df)
         assert df_processed["product_title"].iloc[0].islower()
 
+    def test_load_and_preprocess_chunks(self, temp_data_dir):
+        """Тест, что потоковая загрузка совпадает с загрузкой целиком."""
+        _, config = temp_data_dir
+        trainer = Trainer(config)
+
+        df_streamed = trainer.load_and_preprocess_chunks(chunk_size=5)
+        df_full = trainer.preprocess_data(trainer.load_data())
+
+        pd.testing.assert_frame_equal(df_streamed, df_full)
+        assert trainer.preprocessor is not None
+
     def test_split_data(self, temp_data_dir):
         """Тест разделения данных."""
         tmpdir, config = temp_data_dir
@@ -162,6 +174,66 @@ class TestTrainer:
 
         assert model.is_fitted is True
 
+    def test_compare_projection(self, temp_data_dir):
+        """Тест сравнения модели с проекцией эмбеддингов и без нее."""
+        tmpdir, config = temp_data_dir
+        config["model"]["projection"] = {"method": "random", "dim": 16}
+        trainer = Trainer(config)
+        df = trainer.load_data()
+        df_processed = trainer.preprocess_data(df)
+        X_train, X_val, X_test, y_train, y_val, y_test, _ = trainer.split_data(df_processed)
+        trainer.create_model()
+        trainer.train(X_train, y_train)
+
+        results = trainer.compare_projection(X_train, y_train, X_val, y_val)
+
+        assert trainer.model.classifier.n_features_in_ == 16
+        assert results["projected"]["n_features"] == 16
+        assert results["full"]["n_features"] == trainer.model.embedding_dim
+        assert results["projected"]["head_bytes"] < results["full"]["head_bytes"]
+        assert results["projected"]["features_bytes"] < results["full"]["features_bytes"]
+        assert 0 <= results["projected"]["accuracy"] <= 1
+
+    def test_train_warm_start(self, temp_data_dir):
+        """Тест обучения с весов предыдущего чекпоинта."""
+        tmpdir, config = temp_data_dir
+        checkpoint_path = Path(tmpdir) / "previous"
+        trainer = Trainer(config)
+        df_processed = trainer.preprocess_data(trainer.load_data())
+        X_train, X_val, X_test, y_train, y_val, y_test, _ = trainer.split_data(df_processed)
+        trainer.create_model()
+        trainer.train(X_train, y_train)
+        trainer.save_model(checkpoint_path)
+
+        config["model"]["warm_start"] = {"path": str(checkpoint_path)}
+        warm_trainer = Trainer(config)
+        warm_trainer.preprocess_data(df_processed)
+        warm_trainer.create_model()
+        results = warm_trainer.train_warm_start(
+            [*X_train, "Galaxy Tab S9"],
+            [*y_train, "Tablets 2"],
+            ProductCategoryClassifier.from_pretrained(checkpoint_path),
+        )
+
+        assert warm_trainer.model.is_fitted
+        assert not warm_trainer.model.classifier.warm_start
+        assert "Tablets 2" in warm_trainer.model.label_to_id
+        assert set(results) == {"warm", "cold"}
+        assert results["warm"]["n_iter"] <= results["cold"]["n_iter"]
+
+    def test_train_warm_start_missing_checkpoint(self, temp_data_dir):
+        """Тест обучения с нуля, если чекпоинта для warm start нет."""
+        tmpdir, config = temp_data_dir
+        config["model"]["warm_start"] = {"path": str(Path(tmpdir) / "missing")}
+        trainer = Trainer(config)
+        df_processed = trainer.preprocess_data(trainer.load_data())
+        X_train, X_val, X_test, y_train, y_val, y_test, _ = trainer.split_data(df_processed)
+        trainer.create_model()
+
+        model = trainer.train(X_train, y_train)
+
+        assert model.is_fitted
+
     def test_save_model(self, temp_data_dir):
         """Тест сохранения модели."""
         tmpdir, config = temp_data_dir
@@ -193,3 +265,30 @@ class TestTrainer:
         assert "y_test" in validation_data
         assert len(validation_data["X_val"]) > 0
         assert len(validation_data["X_test"]) > 0
+
+    def test_run_training_streaming(self, temp_data_dir):
+        """Тест пайплайна обучения с потоковой загрузкой данных."""
+        _, config = temp_data_dir
+        config["data"]["chunk_size"] = 5
+        trainer = Trainer(config)
+
+        model, validation_data = trainer.run_training()
+
+        assert model.is_fitted is True
+        assert len(validation_data["X_test"]) > 0
+
+    def test_run_training_parquet(self, temp_data_dir):
+        """Тест пайплайна обучения на датасете в формате Parquet."""
+        pytest.importorskip("pyarrow")
+        tmpdir, config = temp_data_dir
+        pd.read_csv(Path(tmpdir) / "product_titles.csv").to_parquet(
+            Path(tmpdir) / "product_titles.parquet"
+        )
+        config["data"]["filename"] = "product_titles.parquet"
+        trainer = Trainer(config)
+
+        model, validation_data = trainer.run_training()
+
+        assert model.is_fitted is True
+        assert all(isinstance(label, str) for label in model.label_to_id)
+        assert len(validation_data["X_test"]) > 0